@@ -43,6 +43,8 @@ pyre_test_python_testcase(journal.pkg/debug_inject.py)
 pyre_test_python_testcase(journal.pkg/debug_instance.py)
 pyre_test_python_testcase(journal.pkg/debug_loop.py)
 pyre_test_python_testcase(journal.pkg/debug_quiet.py)
+pyre_test_python_testcase(journal.pkg/debug_deferred.py)
+pyre_test_python_testcase(journal.pkg/debug_overhead.py)
 pyre_test_python_testcase(journal.pkg/debug_sanity.py)
 pyre_test_python_testcase(journal.pkg/error_cascade.py)
 pyre_test_python_testcase(journal.pkg/error_empty.py)
@@ -56,6 +58,8 @@ pyre_test_python_testcase(journal.pkg/error_loop.py)
 pyre_test_python_testcase(journal.pkg/error_quiet.py)
 pyre_test_python_testcase(journal.pkg/error_sanity.py)
 pyre_test_python_testcase(journal.pkg/file_example.py)
+pyre_test_python_testcase(journal.pkg/spooler_file.py)
+pyre_test_python_testcase(journal.pkg/spooler_overflow.py)
 pyre_test_python_testcase(journal.pkg/file_sanity.py)
 pyre_test_python_testcase(journal.pkg/firewall_cascade.py)
 pyre_test_python_testcase(journal.pkg/firewall_empty.py)
@@ -165,5 +169,13 @@ set_property(TEST journal.pkg.file_example.cleanup PROPERTY
   DEPENDS journal.pkg.file_example.py
   )
 
+add_test(NAME journal.pkg.spooler_file.cleanup
+  COMMAND ${BASH_PROGRAM} -c "rm spooler_file.log"
+  WORKING_DIRECTORY ${PYRE_TESTSUITE_DIR}/journal.pkg
+  )
+set_property(TEST journal.pkg.spooler_file.cleanup PROPERTY
+  DEPENDS journal.pkg.spooler_file.py
+  )
+
 
 # end of file
@@ -274,12 +274,14 @@ pyre_test_python_testcase(pyre.pkg/calc/memo.py)
 pyre_test_python_testcase(pyre.pkg/calc/memo_model.py)
 pyre_test_python_testcase(pyre.pkg/calc/memo_expression.py)
 pyre_test_python_testcase(pyre.pkg/calc/memo_interpolation.py)
+pyre_test_python_testcase(pyre.pkg/calc/batch.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_patch.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_alias.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_group.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_contains.py)
 pyre_test_python_testcase(pyre.pkg/calc/model.py)
+pyre_test_python_testcase(pyre.pkg/calc/plan.py)
 
 
 #
@@ -337,6 +339,7 @@ pyre_test_python_testcase(pyre.pkg/records/simple_immutable_data.py)
 pyre_test_python_testcase(pyre.pkg/records/simple_immutable_kwds.py)
 pyre_test_python_testcase(pyre.pkg/records/simple_immutable_conversions.py)
 pyre_test_python_testcase(pyre.pkg/records/simple_immutable_validations.py)
+pyre_test_python_testcase(pyre.pkg/records/simple_immutable_specialized.py)
 pyre_test_python_testcase(pyre.pkg/records/simple_mutable_data.py)
 pyre_test_python_testcase(pyre.pkg/records/simple_mutable_kwds.py)
 pyre_test_python_testcase(pyre.pkg/records/simple_mutable_conversions.py)
@@ -358,6 +361,7 @@ pyre_test_python_testcase(pyre.pkg/records/csv_read_partial.py)
 pyre_test_python_testcase(pyre.pkg/records/csv_read_mutable.py)
 pyre_test_python_testcase(pyre.pkg/records/csv_read_complex.py)
 pyre_test_python_testcase(pyre.pkg/records/csv_bad_source.py)
+pyre_test_python_testcase(pyre.pkg/records/extractor_benchmark.py)
 
 
 #
@@ -375,6 +379,8 @@ pyre_test_python_testcase(pyre.pkg/tabular/sheet_populate.py)
 pyre_test_python_testcase(pyre.pkg/tabular/sheet_columns.py)
 pyre_test_python_testcase(pyre.pkg/tabular/sheet_index.py)
 pyre_test_python_testcase(pyre.pkg/tabular/sheet_updates.py)
+pyre_test_python_testcase(pyre.pkg/tabular/sheet_columnar.py)
+pyre_test_python_testcase(pyre.pkg/tabular/sheet_columnar_footprint.py)
 pyre_test_python_testcase(pyre.pkg/tabular/view.py)
 pyre_test_python_testcase(pyre.pkg/tabular/chart.py)
 pyre_test_python_testcase(pyre.pkg/tabular/chart_class_layout.py)
@@ -385,6 +391,7 @@ pyre_test_python_testcase(pyre.pkg/tabular/chart_interval_config.py)
 pyre_test_python_testcase(pyre.pkg/tabular/chart_interval.py)
 pyre_test_python_testcase(pyre.pkg/tabular/chart_filter.py)
 pyre_test_python_testcase(pyre.pkg/tabular/chart_sales.py)
+pyre_test_python_testcase(pyre.pkg/tabular/chart_columnar.py)
 pyre_test_python_testcase(pyre.pkg/tabular/pivot.py)
 pyre_test_python_testcase(pyre.pkg/tabular/csv_instance.py)
 pyre_test_python_testcase(pyre.pkg/tabular/csv_read.py)
@@ -400,6 +407,7 @@ pyre_test_python_testcase(pyre.pkg/tracking/command.py)
 pyre_test_python_testcase(pyre.pkg/tracking/file.py)
 pyre_test_python_testcase(pyre.pkg/tracking/fileregion.py)
 pyre_test_python_testcase(pyre.pkg/tracking/script.py)
+pyre_test_python_testcase(pyre.pkg/tracking/frame.py)
 pyre_test_python_testcase(pyre.pkg/tracking/chain.py)
 
 
@@ -451,6 +459,7 @@ pyre_test_python_testcase(pyre.pkg/config/configurator_assignments.py)
 pyre_test_python_testcase(pyre.pkg/config/configurator_load_pml.py)
 pyre_test_python_testcase(pyre.pkg/config/configurator_load_cfg.py)
 pyre_test_python_testcase(pyre.pkg/config/configurator_load_pfg.py)
+pyre_test_python_testcase(pyre.pkg/config/snapshot.py)
 pyre_test_python_testcase(pyre.pkg/config/command.py)
 pyre_test_python_testcase(pyre.pkg/config/command_argv.py)
 pyre_test_python_testcase(pyre.pkg/config/command_config.py)
@@ -475,6 +484,7 @@ pyre_test_python_testcase(pyre.pkg/framework/registrar.py)
 pyre_test_python_testcase(pyre.pkg/framework/linker.py)
 pyre_test_python_testcase(pyre.pkg/framework/linker_codecs.py)
 pyre_test_python_testcase(pyre.pkg/framework/linker_shelves.py)
+pyre_test_python_testcase(pyre.pkg/framework/linker_index.py)
 pyre_test_python_testcase(pyre.pkg/framework/externals.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive_configuration.py)
@@ -625,15 +635,24 @@ pyre_test_python_testcase(pyre.pkg/ipc/pipe.py)
 pyre_test_python_testcase(pyre.pkg/ipc/tcp.py)
 pyre_test_python_testcase(pyre.pkg/ipc/pickler_over_pipe.py)
 pyre_test_python_testcase(pyre.pkg/ipc/pickler_over_tcp.py)
+pyre_test_python_testcase(pyre.pkg/ipc/shared_over_pipe.py)
+pyre_test_python_testcase(pyre.pkg/ipc/framer_over_pipe.py)
+pyre_test_python_testcase(pyre.pkg/ipc/framer_benchmark.py)
 pyre_test_python_testcase(pyre.pkg/ipc/scheduler.py)
 pyre_test_python_testcase(pyre.pkg/ipc/scheduler_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/ipc/scheduler_alarms.py)
+pyre_test_python_testcase(pyre.pkg/ipc/scheduler_cancel.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_alarms.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_signals.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_pickler_over_pipe.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_pickler_over_tcp.py)
+pyre_test_python_testcase(pyre.pkg/ipc/poller.py)
+pyre_test_python_testcase(pyre.pkg/ipc/poller_pipe.py)
+pyre_test_python_testcase(pyre.pkg/ipc/poller_benchmark.py)
+pyre_test_python_testcase(pyre.pkg/ipc/loop.py)
+pyre_test_python_testcase(pyre.pkg/ipc/loop_asyncio.py)
 
 
 #
@@ -645,6 +664,22 @@ pyre_test_python_testcase(pyre.pkg/nexus/node_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/nexus/node_signals.py)
 pyre_test_python_testcase(pyre.pkg/nexus/pool.py)
 pyre_test_python_testcase(pyre.pkg/nexus/pool.py --tasks=4 --team.size=2)
+pyre_test_python_testcase(pyre.pkg/nexus/pool.py --tasks=20 --team.size=3 --team.prefetch=2 --team.chunk=3)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_map.py)
+pyre_test_python_testcase(pyre.pkg/nexus/workplan.py)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_retry.py)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_shared.py)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_remote.py)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_supervision.py)
+
+
+#
+# pyre/http
+#
+pyre_test_python_testcase(pyre.pkg/http/server.py)
+pyre_test_python_testcase(pyre.pkg/http/server_cache.py)
+pyre_test_python_testcase(pyre.pkg/http/server_prefork.py)
+pyre_test_python_testcase(pyre.pkg/http/server_benchmark.py)
 
 
 #
@@ -13,6 +13,10 @@ pyre_test_python_testcase(sqlite.pkg/sqlite_database.py)
 pyre_test_python_testcase(sqlite.pkg/sqlite_attach.py)
 pyre_test_python_testcase(sqlite.pkg/sqlite_table.py)
 pyre_test_python_testcase(sqlite.pkg/sqlite_references.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_prepared.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_load.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_stream.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_pool.py)
 # cleanup
 add_test(NAME sqlite.clean
   WORKING_DIRECTORY "${PYRE_TESTSUITE_DIR}/sqlite.pkg"
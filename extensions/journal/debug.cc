@@ -188,12 +188,18 @@ debug(py::module & m) {
         // add a line to the contents
         .def("line",
              // the handler
-             [](debug_t & channel, const debug_t::string_type & message) {
-                 // inject
-                 channel << message << pyre::journal::newline;
+             [](debug_t & channel, py::object message, py::args args, py::kwargs kwds) {
+                 // if the channel is not active
+                 if (!channel.active()) {
+                     // skip the formatting
+                     return;
+                 }
+                 // otherwise, inject
+                 channel << render(message, args, kwds) << pyre::journal::newline;
              },
              // the docstring
-             "add another line to the message page",
+             "add another line to the message page; if {message} is callable, it is invoked "
+             "with the remaining arguments, otherwise they are used to format it",
              // the arguments
              "message"_a = ""
              )
@@ -201,11 +207,18 @@ debug(py::module & m) {
         // add a message to the channel and flush
         .def("log",
              // the handler
-             [](debug_t & channel, const debug_t::string_type & message) {
-                 // inject and flush
+             [](debug_t & channel, py::object message, py::args args, py::kwargs kwds) {
+                 // if the channel is not active
+                 if (!channel.active()) {
+                     // flush whatever is on the page, but skip the formatting and the locator
+                     channel << pyre::journal::endl;
+                     // all done
+                     return;
+                 }
+                 // otherwise, inject and flush
                  channel
                      << locator()
-                     << message
+                     << render(message, args, kwds)
                      << pyre::journal::endl;
              },
              // the docstring
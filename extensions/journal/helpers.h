@@ -12,6 +12,8 @@
 namespace pyre::journal::py {
     // build a locator that points to the nearest caller from python
     inline auto locator() -> locator_t;
+    // build the text of a message, resolving any deferred formatting
+    inline auto render(py::object message, py::args args, py::kwargs kwds) -> string_t;
 }
 
 
@@ -189,12 +189,18 @@ warning(py::module & m) {
         // add a line to the contents
         .def("line",
              // the handler
-             [](warning_t & channel, const warning_t::string_type & message) {
-                 // inject
-                 channel << message << pyre::journal::newline;
+             [](warning_t & channel, py::object message, py::args args, py::kwargs kwds) {
+                 // if the channel is not active
+                 if (!channel.active()) {
+                     // skip the formatting
+                     return;
+                 }
+                 // otherwise, inject
+                 channel << render(message, args, kwds) << pyre::journal::newline;
              },
              // the docstring
-             "add another line to the message page",
+             "add another line to the message page; if {message} is callable, it is invoked "
+             "with the remaining arguments, otherwise they are used to format it",
              // the arguments
              "message"_a = ""
              )
@@ -202,11 +208,18 @@ warning(py::module & m) {
         // add a message to the channel and flush
         .def("log",
              // the handler
-             [](warning_t & channel, const warning_t::string_type & message) {
-                 // inject and flush
+             [](warning_t & channel, py::object message, py::args args, py::kwargs kwds) {
+                 // if the channel is not active
+                 if (!channel.active()) {
+                     // flush whatever is on the page, but skip the formatting and the locator
+                     channel << pyre::journal::endl;
+                     // all done
+                     return;
+                 }
+                 // otherwise, inject and flush
                  channel
                      << locator()
-                     << message
+                     << render(message, args, kwds)
                      << pyre::journal::endl;
              },
              // the docstring
@@ -7,8 +7,10 @@
 
 #include <portinfo>
 
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <libpq-fe.h>
+#include <vector>
 #include <pyre/journal.h>
 
 #include "execute.h"
@@ -67,6 +69,299 @@ execute(PyObject *, PyObject * args) {
 }
 
 
+// helpers
+namespace {
+    // convert a tuple of strings into an array of parameter values; {None} becomes {NULL}
+    bool parameterValues(PyObject * parameters, std::vector<const char *> & values) {
+        // go through the parameters
+        for (Py_ssize_t index = 0; index < PyTuple_GET_SIZE(parameters); ++index) {
+            // get the item
+            PyObject * item = PyTuple_GET_ITEM(parameters, index);
+            // if it is {None}
+            if (item == Py_None) {
+                // the value is missing
+                values.push_back(0);
+                // and move on
+                continue;
+            }
+            // if it is not a string
+            if (!PyUnicode_Check(item)) {
+                // complain
+                PyErr_SetString(PyExc_TypeError, "statement parameters must be strings or None");
+                return false;
+            }
+            // otherwise, get its representation; it lives as long as the tuple does
+            const char * value = PyUnicode_AsUTF8(item);
+            // if something went wrong
+            if (!value) {
+                // the exception is already set
+                return false;
+            }
+            // store it
+            values.push_back(value);
+        }
+        // all done
+        return true;
+    }
+}
+
+
+// prepare a named statement
+const char * const
+pyre::extensions::postgres::
+prepare__name__ = "prepare";
+
+const char * const
+pyre::extensions::postgres::
+prepare__doc__ = "prepare a named statement for repeated execution";
+
+PyObject *
+pyre::extensions::postgres::
+prepare(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * name;
+    const char * command;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+                          args, "O!ss:prepare",
+                          &PyCapsule_Type, &py_connection, &name, &command)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "preparing '" << name << "': '" << command << "'"
+        << pyre::journal::endl;
+
+    // prepare the statement; let the server infer the parameter types
+    PGresult * result = PQprepare(connection, name, command, 0, 0);
+    // error check
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // delegate
+    return processResult(command, result, buildResultTuple);
+}
+
+
+// execute a named statement
+const char * const
+pyre::extensions::postgres::
+executePrepared__name__ = "executePrepared";
+
+const char * const
+pyre::extensions::postgres::
+executePrepared__doc__ = "execute a prepared statement with the given parameters";
+
+PyObject *
+pyre::extensions::postgres::
+executePrepared(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * name;
+    PyObject * parameters;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+                          args, "O!sO!:executePrepared",
+                          &PyCapsule_Type, &py_connection, &name, &PyTuple_Type, &parameters)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // convert the parameters
+    std::vector<const char *> values;
+    if (!parameterValues(parameters, values)) {
+        return 0;
+    }
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "executing '" << name << "' with " << values.size() << " parameters"
+        << pyre::journal::endl;
+
+    // execute the statement; all parameters are passed as text, and so are the results
+    PGresult * result = PQexecPrepared(
+                                       connection, name,
+                                       values.size(), values.data(), 0, 0, 0);
+    // error check
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // delegate
+    return processResult(name, result, buildResultTuple);
+}
+
+
+// execute a command with separate parameters
+const char * const
+pyre::extensions::postgres::
+executeParameters__name__ = "executeParameters";
+
+const char * const
+pyre::extensions::postgres::
+executeParameters__doc__ = "execute a single command with the given parameters";
+
+PyObject *
+pyre::extensions::postgres::
+executeParameters(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    PyObject * parameters;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+                          args, "O!sO!:executeParameters",
+                          &PyCapsule_Type, &py_connection, &command, &PyTuple_Type, &parameters)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // convert the parameters
+    std::vector<const char *> values;
+    if (!parameterValues(parameters, values)) {
+        return 0;
+    }
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "executing '" << command << "' with " << values.size() << " parameters"
+        << pyre::journal::endl;
+
+    // execute the command
+    PGresult * result = PQexecParams(
+                                     connection, command,
+                                     values.size(), 0, values.data(), 0, 0, 0);
+    // error check
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // delegate
+    return processResult(command, result, buildResultTuple);
+}
+
+
+// load data into a table
+const char * const
+pyre::extensions::postgres::
+copy__name__ = "copy";
+
+const char * const
+pyre::extensions::postgres::
+copy__doc__ = "execute a COPY FROM STDIN command and send it the given data";
+
+PyObject *
+pyre::extensions::postgres::
+copy(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    const char * data;
+    Py_ssize_t length;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+                          args, "O!ss#:copy",
+                          &PyCapsule_Type, &py_connection, &command, &data, &length)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "copying " << length << " bytes: '" << command << "'"
+        << pyre::journal::endl;
+
+    // start the transfer
+    PGresult * result = PQexec(connection, command);
+    // error check
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+    // if the server is not ready to receive the data
+    if (PQresultStatus(result) != PGRES_COPY_IN) {
+        // let the result processor report the problem
+        return processResult(command, result, buildResultTuple);
+    }
+    // otherwise, we are done with this result
+    PQclear(result);
+
+    // send the data, and mark the end of the transfer
+    if (PQputCopyData(connection, data, length) != 1 || PQputCopyEnd(connection, 0) != 1) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // get the outcome of the transfer
+    result = PQgetResult(connection);
+    // process it
+    PyObject * value = processResult(command, result, buildResultTuple);
+    // drain whatever else the server has to say, so the connection is ready for more commands
+    while ((result = PQgetResult(connection))) {
+        PQclear(result);
+    }
+    // all done
+    return value;
+}
+
+
 // submit a query for asynchronous execution
 const char * const
 pyre::extensions::postgres::
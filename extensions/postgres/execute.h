@@ -17,6 +17,26 @@ namespace pyre {
             extern const char * const execute__doc__;
             PyObject * execute(PyObject *, PyObject *);
 
+            // prepare a named statement
+            extern const char * const prepare__name__;
+            extern const char * const prepare__doc__;
+            PyObject * prepare(PyObject *, PyObject *);
+
+            // execute a named statement
+            extern const char * const executePrepared__name__;
+            extern const char * const executePrepared__doc__;
+            PyObject * executePrepared(PyObject *, PyObject *);
+
+            // execute a command with separate parameters
+            extern const char * const executeParameters__name__;
+            extern const char * const executeParameters__doc__;
+            PyObject * executeParameters(PyObject *, PyObject *);
+
+            // load data into a table
+            extern const char * const copy__name__;
+            extern const char * const copy__doc__;
+            PyObject * copy(PyObject *, PyObject *);
+
             // submit a query for asynchronous processing
             extern const char * const submit__name__;
             extern const char * const submit__doc__;
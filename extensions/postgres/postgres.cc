@@ -39,6 +39,12 @@ namespace pyre {
 
                 // SQL command execution
                 { execute__name__, execute, METH_VARARGS, execute__doc__ },
+                { prepare__name__, prepare, METH_VARARGS, prepare__doc__ },
+                { executePrepared__name__,
+                  executePrepared, METH_VARARGS, executePrepared__doc__ },
+                { executeParameters__name__,
+                  executeParameters, METH_VARARGS, executeParameters__doc__ },
+                { copy__name__, copy, METH_VARARGS, copy__doc__ },
                 { submit__name__, submit, METH_VARARGS, submit__doc__ },
                 { busy__name__, busy, METH_VARARGS, busy__doc__ },
                 { consume__name__, consume, METH_VARARGS, consume__doc__ },
@@ -5,7 +5,7 @@
 
 
 # externals
-import traceback       # location information
+import sys             # location information
 # framework
 import pyre              # for my superclass and {tracking}
 
@@ -151,6 +151,31 @@ class Channel(pyre.patterns.named):
 
 
     # access to information from my current entry
+    @property
+    def entry(self):
+        """
+        Return the accumulator of the current message, building it if necessary
+        """
+        # get my entry
+        entry = self._entry
+        # if i don't have one
+        if entry is None:
+            # make one
+            entry = self._entry = self.newEntry()
+        # and return it
+        return entry
+
+    @entry.setter
+    def entry(self, entry):
+        """
+        Replace the accumulator of the current message
+        """
+        # easy
+        self._entry = entry
+        # all done
+        return
+
+
     @property
     def page(self):
         """
@@ -190,36 +215,54 @@ class Channel(pyre.patterns.named):
         return self
 
 
-    def line(self, message=""):
+    def line(self, message="", *args, **kwds):
         """
         Add {message} to the current page
+
+        Inactive channels return immediately, so the cost of formatting can be avoided by
+        deferring it: if {message} is callable, it is invoked with {args} and {kwds} and its
+        return value is used instead; otherwise, any {args} and {kwds} are used to format
+        {message} with {str.format}
         """
+        # if i'm not active
+        if not self.inventory.active:
+            # there is nothing to do
+            return self
         # add message to my page
-        self.page.append(message)
+        self.page.append(self.render(message, args, kwds))
         # all done
         return self
 
 
-    def log(self, message=None):
+    def log(self, message=None, *args, **kwds):
         """
         Add {message} to the current page and then record the entry
+
+        See {line} for the treatment of {args} and {kwds}
         """
+        # if i'm not going to record anything
+        if not self.inventory.active or self.verbosity > self.chronicler.verbosity:
+            # discard my entry, if i have one; a fresh one gets built when it's needed
+            self._entry = None
+            # and skip the formatting and the location harvesting altogether
+            return self
+
         # if there is a final {message} to process
         if message is not None:
             # add it to the page
-            self.page.append(message)
+            self.page.append(self.render(message, args, kwds))
 
-        # get a stack trace
-        trace = traceback.extract_stack(limit=2)
-        # so we can extract location information
-        filename, line, function, *_ = trace[0]
+        # get the frame of my caller
+        caller = sys._getframe(1)
+        # and its code object, so we can extract location information
+        code = caller.f_code
 
         # decorate my current metadata
         notes = self.notes
         # with location information
-        notes["filename"] = filename
-        notes["line"] = str(line)
-        notes["function"] = function
+        notes["filename"] = code.co_filename
+        notes["line"] = str(caller.f_lineno)
+        notes["function"] = code.co_name
 
         # certain channels, e.g. errors and firewalls, raise exceptions as part of committing a
         # message to the journal. such exceptions may be caught and handled, and the channel
@@ -242,8 +285,8 @@ class Channel(pyre.patterns.named):
             raise
         # but in any case
         finally:
-            # flush my entry
-            self.entry = self.newEntry()
+            # flush my entry; a fresh one gets built when it's needed
+            self._entry = None
 
         # all done
         return status
@@ -258,8 +301,8 @@ class Channel(pyre.patterns.named):
         self.verbosity = verbosity
         # look up my inventory
         self.inventory = self.index.lookup(name)
-        # start out with an empty entry
-        self.entry = self.newEntry()
+        # start out without an entry; one gets built on first use
+        self._entry = None
         # and an invalid locator
         self.locator = None
 
@@ -311,7 +354,7 @@ class Channel(pyre.patterns.named):
         Commit the accumulated message to my device and flush
         """
         # if i'm not active
-        if not self.active:
+        if not self.inventory.active:
             # nothing to do
             return self
 
@@ -325,7 +368,9 @@ class Channel(pyre.patterns.named):
 
         # if i'm fatal
         if self.fatal:
-            # complain
+            # make sure everything recorded so far reaches its destination
+            self.device.flush()
+            # and complain
             raise self.complaint()
 
         # all done
@@ -358,6 +403,23 @@ class Channel(pyre.patterns.named):
         raise NotImplementedError(f"class '{type(self).__name__}' must implement 'record'")
 
 
+    @staticmethod
+    def render(message, args, kwds):
+        """
+        Build the text of {message}, resolving any deferred formatting
+        """
+        # if {message} is callable
+        if callable(message):
+            # invoke it
+            return message(*args, **kwds)
+        # if there are formatting arguments
+        if args or kwds:
+            # use them
+            return message.format(*args, **kwds)
+        # otherwise, use the message as is
+        return message
+
+
     def newEntry(self):
         """
         Create a fresh message entry
@@ -388,9 +450,9 @@ class Channel(pyre.patterns.named):
     index = Index(inventory_type)  # the severity wide channel index
 
     # instance data
-    entry = None                   # the accumulator of message content and metadata
     locator = None                 # location information
     inventory = None               # the state shared by all instances of the same name/severity
+    _entry = None                  # the accumulator of message content and metadata
 
 
 # end of file
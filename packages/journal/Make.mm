@@ -38,6 +38,7 @@ EXPORT_PYTHON_MODULES = \
     Memo.py \
     Null.py \
     Renderer.py \
+    Spooler.py \
     Stream.py \
     Trash.py \
     Warning.py \
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import atexit
+import collections
+import threading
+# superclass
+from .Device import Device
+
+
+# record messages on a background thread
+class Spooler(Device):
+    """
+    Journal device that hands entries to a background thread that records them on another device
+
+    Entries are placed in a bounded queue that is drained in batches by a writer thread, so the
+    caller never waits for the output to reach its destination. The target device is flushed
+    after every batch, and periodically while the spooler is idle. Entries from channels whose
+    severity is in {urgent} are recorded before control returns to the caller, and fatal
+    channels flush their device before raising.
+
+    When the queue is full, the {overflow} policy decides what happens to the new entry:
+    "block" waits until there is room, "drop-oldest" discards the oldest entry in the queue,
+    and "count-dropped" discards the new one; either way, discarded entries are counted in
+    {dropped}
+    """
+
+
+    # constants
+    policies = ("block", "drop-oldest", "count-dropped")
+
+
+    # public data
+    dropped = 0 # the number of entries discarded because the queue was full
+    failures = 0 # the number of entries the target device failed to record
+
+
+    # interface
+    def alert(self, entry):
+        """
+        Generate an alert.
+
+        Alerts are user-facing; they are generated by {info}, {warning}, and {error}
+        """
+        # queue it
+        return self.submit(kind="alert", entry=entry)
+
+
+    def memo(self, entry):
+        """
+        Issue a memo
+
+        Memos are developer-facing; they are generated by {debug} and {firewall}
+        """
+        # queue it
+        return self.submit(kind="memo", entry=entry)
+
+
+    def flush(self):
+        """
+        Wait until all entries submitted so far have been recorded
+        """
+        # with the lock held
+        with self._ready:
+            # get the sequence number of the last submitted entry
+            target = self._submitted
+            # if there is no writer, or it's done with everything
+            if self._writer is None or self._done >= target:
+                # nothing to wait for
+                return self
+            # ask the writer to get to it
+            self._ready.notify_all()
+            # and wait until it is done
+            self._ready.wait_for(lambda: self._done >= target)
+        # all done
+        return self
+
+
+    def close(self):
+        """
+        Record the pending entries and stop the writer thread
+        """
+        # with the lock held
+        with self._ready:
+            # get the writer
+            writer = self._writer
+            # mark me as closing
+            self._closing = True
+            # and wake the writer up
+            self._ready.notify_all()
+        # if there is a writer
+        if writer is not None:
+            # wait for it to finish
+            writer.join()
+        # all done
+        return self
+
+
+    # metamethods
+    def __init__(self, device, name="spooler", capacity=1024, batch=64, interval=1.0,
+                 overflow="block", render=False, urgent=("error", "firewall"), **kwds):
+        # chain up
+        super().__init__(name=name, **kwds)
+        # check the overflow policy
+        if overflow not in self.policies:
+            # and complain if it's not one i know
+            raise ValueError(
+                f"unknown overflow policy {overflow!r}; pick one of {self.policies}")
+
+        # save the target device
+        self.device = device
+        # my configuration
+        self.capacity = capacity
+        self.batch = batch
+        self.interval = interval
+        self.overflow = overflow
+        self.render = render
+        self.urgent = frozenset(urgent)
+
+        # the pending entries
+        self._queue = collections.deque()
+        # the lock and the condition the writer and its clients use to talk to each other
+        self._ready = threading.Condition()
+        # the number of entries submitted
+        self._submitted = 0
+        # and the number of them that have been either recorded or discarded
+        self._done = 0
+
+        # all done
+        return
+
+
+    # implementation details
+    def submit(self, kind, entry):
+        """
+        Place {entry} in the queue for the writer thread
+        """
+        # if i'm supposed to render the entries on the caller's thread
+        if self.render:
+            # get the device
+            device = self.device
+            # pick the renderer that matches the kind of entry
+            renderer = device.alertRenderer if kind == "alert" else device.memoRenderer
+            # render it and make a record for the writer
+            record = ("record", list(renderer.render(palette=device.palette, entry=entry)))
+        # otherwise
+        else:
+            # the writer gets the raw entry
+            record = (kind, entry)
+
+        # with the lock held
+        with self._ready:
+            # if i have been closed
+            if self._closing:
+                # there is no writer to hand the entry to, so record it myself
+                self._ready.release()
+                # carefully
+                try:
+                    # record the entry
+                    getattr(self.device, record[0])(record[1])
+                # regardless of what happened
+                finally:
+                    # get the lock back
+                    self._ready.acquire()
+                # all done
+                return self
+            # if there is no writer yet
+            if self._writer is None:
+                # make one
+                self.spawn()
+            # get the queue
+            queue = self._queue
+            # if it's full
+            if len(queue) >= self.capacity:
+                # and the policy is to wait
+                if self.overflow == "block":
+                    # wait until there is room
+                    self._ready.wait_for(lambda: len(queue) < self.capacity)
+                # if the policy is to make room by dropping the oldest entry
+                elif self.overflow == "drop-oldest":
+                    # do it
+                    queue.popleft()
+                    # count it
+                    self.dropped += 1
+                    # and mark it as done, so nobody waits for it
+                    self._done += 1
+                # otherwise
+                else:
+                    # drop the new entry
+                    self.dropped += 1
+                    # and bail
+                    return self
+            # add the record to the queue
+            queue.append(record)
+            # update the counter
+            self._submitted += 1
+            # and let the writer know
+            self._ready.notify_all()
+
+        # if the entry is urgent
+        if entry.notes.get("severity") in self.urgent:
+            # wait until it has been recorded
+            self.flush()
+
+        # all done
+        return self
+
+
+    def spawn(self):
+        """
+        Start the writer thread; must be called with the lock held
+        """
+        # build the thread
+        writer = threading.Thread(target=self.write, name=f"journal.{self.name}", daemon=True)
+        # attach it
+        self._writer = writer
+        # make sure the pending entries get recorded when the interpreter exits
+        atexit.register(self.close)
+        # and start it
+        writer.start()
+        # all done
+        return writer
+
+
+    def write(self):
+        """
+        The body of the writer thread: drain the queue in batches and record its contents
+        """
+        # get the queue
+        queue = self._queue
+        # and the condition
+        ready = self._ready
+        # get the target device
+        device = self.device
+        # indefinitely
+        while True:
+            # with the lock held
+            with ready:
+                # wait for something to do
+                while not queue and not self._closing:
+                    # for at most the flushing interval; if nothing showed up
+                    if not ready.wait(timeout=self.interval):
+                        # flush the device; the target may be slow, so release the lock first
+                        ready.release()
+                        # carefully
+                        try:
+                            # flush
+                            device.flush()
+                        # a broken device should not bring down the writer
+                        except Exception:
+                            # but keep track of its failures
+                            self.failures += 1
+                        # regardless of what happened
+                        finally:
+                            # get the lock back
+                            ready.acquire()
+                # if there's nothing left and we are closing
+                if not queue:
+                    # we are done
+                    break
+                # grab the next batch
+                batch = [queue.popleft() for _ in range(min(self.batch, len(queue)))]
+                # there is room in the queue now
+                ready.notify_all()
+
+            # carefully, so that the batch is marked as done no matter what
+            try:
+                # go through the batch
+                for kind, payload in batch:
+                    # carefully
+                    try:
+                        # record the entry
+                        getattr(device, kind)(payload)
+                    # a broken device should not bring down the writer
+                    except Exception:
+                        # but keep track of its failures
+                        self.failures += 1
+                # carefully
+                try:
+                    # flush the device
+                    device.flush()
+                # same as above
+                except Exception:
+                    # keep track of the failure
+                    self.failures += 1
+            # regardless of what happened
+            finally:
+                # with the lock held
+                with ready:
+                    # mark the batch as done
+                    self._done += len(batch)
+                    # and let anybody waiting for it know
+                    ready.notify_all()
+
+        # all done
+        return
+
+
+    # private data
+    _writer = None
+    _closing = False
+
+
+# end of file
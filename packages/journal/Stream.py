@@ -51,6 +51,16 @@ class Stream(Device):
         return self
 
 
+    def flush(self):
+        """
+        Flush the associated stream
+        """
+        # delegate
+        self.stream.flush()
+        # all done
+        return self
+
+
     def close(self):
         """
         Close the associated stream
@@ -74,6 +74,7 @@ if without_libjournal:
     from .File import File as file
     from .Console import Console as cout
     from .ErrorConsole import ErrorConsole as cerr
+    from .Spooler import Spooler as spooler
 
     # channels
     # developer facing
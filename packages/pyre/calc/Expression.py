@@ -167,6 +167,29 @@ class Expression:
         return eval(program, {'model': model})
 
 
+    def inline(self, symbols):
+        """
+        Rewrite my formula so that each named reference is replaced by the python identifier
+        that {symbols} associates with the {id} of the corresponding operand
+        """
+        # my operands, in the order their names appear in my formula
+        operands = iter(self.operands)
+        # the {re.sub} callback
+        def handler(match):
+            """
+            Callback for {re.sub} that replaces node references with their identifiers
+            """
+            # escaped braces are returned as literals
+            if match.group("esc_open"): return "{"
+            if match.group("esc_close"): return "}"
+            # there are no unmatched braces in a formula that has compiled successfully, so
+            # this must be a node reference; look up the identifier of the next operand
+            return "({})".format(symbols[id(next(operands))])
+
+        # rewrite my formula and return it
+        return self._scanner.sub(handler, self.expression)
+
+
     # private data
     _model = None # my symbol table
     _program = None # the compiled form of my expression
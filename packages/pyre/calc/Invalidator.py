@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import collections
+import contextlib
+
+
+# class declaration
+class Invalidator:
+    """
+    A scheduler that propagates value change notifications through an evaluation graph
+
+    Observables that get flushed don't notify their observers directly; instead, they are added
+    to a frontier of dirty nodes that gets drained iteratively. Observers flushed while the
+    frontier is being drained add themselves to it, so the depth of the call stack no longer
+    grows with the depth of the graph. Clients can also hold on to the frontier while they
+    make a large number of changes, and propagate all of them in a single pass
+    """
+
+
+    # interface
+    def schedule(self, observable):
+        """
+        Add {observable} to the frontier of nodes whose observers must be notified
+        """
+        # get the id of the node
+        key = id(observable)
+        # if it is already in the frontier
+        if key in self._queued:
+            # nothing further to do
+            return self
+        # otherwise, add it to the pile
+        self._queued.add(key)
+        self._frontier.append(observable)
+        # if there is no propagation or batch in progress
+        if not self._depth:
+            # notify the observers now
+            self.drain()
+        # all done
+        return self
+
+
+    def drain(self):
+        """
+        Notify the observers of the nodes in the frontier until there are none left
+        """
+        # get the frontier
+        frontier = self._frontier
+        # and the set of queued nodes
+        queued = self._queued
+        # mark the beginning of the propagation, so that nodes flushed by their observables
+        # get queued rather than processed recursively
+        self._depth += 1
+        # attempt to
+        try:
+            # while there is work to do
+            while frontier:
+                # get the next node
+                observable = frontier.popleft()
+                # remove it from the queued pile, so it can be scheduled again
+                queued.discard(id(observable))
+                # and let its observers know its value has changed
+                observable.notify()
+        # if anything goes wrong
+        except:
+            # forget the rest of the frontier, since it is not possible to resume
+            frontier.clear()
+            queued.clear()
+            # and let the caller handle it
+            raise
+        # either way
+        finally:
+            # mark the end of the propagation
+            self._depth -= 1
+        # all done
+        return self
+
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Defer the propagation of value changes until the end of the block
+
+        Reading the values of nodes whose operands have changed within the block may return
+        stale values, since they don't get invalidated until the block is exited
+        """
+        # mark the beginning of the batch
+        self._depth += 1
+        # attempt to
+        try:
+            # hand control back to the caller
+            yield self
+        # when done, even if the block raised an exception
+        finally:
+            # mark the end of the batch
+            self._depth -= 1
+            # if this was the outermost batch
+            if not self._depth:
+                # propagate the changes that were made
+                self.drain()
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the nodes whose observers must be notified
+        self._frontier = collections.deque()
+        # the ids of the nodes in the frontier
+        self._queued = set()
+        # the number of propagations and batches in progress
+        self._depth = 0
+        # all done
+        return
+
+
+# end of file
@@ -24,6 +24,7 @@ EXPORT_PYTHON_MODULES = \
     Filter.py \
     Hierarchical.py \
     Interpolation.py \
+    Invalidator.py \
     Mapping.py \
     Maximum.py \
     Memo.py \
@@ -32,6 +33,7 @@ EXPORT_PYTHON_MODULES = \
     NodeInfo.py \
     Observable.py \
     Observer.py \
+    Plan.py \
     Preprocessor.py \
     Postprocessor.py \
     Probe.py \
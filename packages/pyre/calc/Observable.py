@@ -10,6 +10,8 @@
 import weakref
 # the superclas
 from .Reactor import  Reactor
+# the propagation scheduler
+from .Invalidator import Invalidator
 
 
 # class declaration
@@ -18,6 +20,10 @@ class Observable(Reactor):
     Mix-in class that notifies its clients when the value of a node changes
     """
 
+    # the scheduler of value change notifications; shared by all nodes
+    invalidator = Invalidator()
+
+
     # public data
     @property
     def observers(self):
@@ -86,19 +92,41 @@ class Observable(Reactor):
     def flush(self, **kwds):
         """
         Handler of the notification event from one of my observables
-       """
-        # take this opportunity to clean up my observers
-        observers = set(self.observers)
-        # go through the pile
-        for observer in observers:
-            # notify each one
-            observer.flush(observable=self)
-        # rebuild the set of references
-        self._observers = set(map(weakref.ref, observers))
+        """
+        # add me to the frontier of nodes whose observers must be notified
+        self.invalidator.schedule(self)
         # chain up
         return super().flush(**kwds)
 
 
+    def notify(self):
+        """
+        Let my observers know that my value has changed
+        """
+        # the references to my observers that have gone dead
+        dead = None
+        # go through the references to my observers; make a copy, since my observers may
+        # attach themselves to me when notified
+        for ref in tuple(self._observers):
+            # unwrap it
+            observer = ref()
+            # if it is dead
+            if observer is None:
+                # take this opportunity to clean up
+                if dead is None: dead = []
+                dead.append(ref)
+                # and move on
+                continue
+            # otherwise, notify it
+            observer.flush(observable=self)
+        # if there were any dead references
+        if dead:
+            # remove them from the pile
+            self._observers.difference_update(dead)
+        # all done
+        return self
+
+
     # meta-methods
     def __init__(self, **kwds):
         # chain up
@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import operator
+import weakref
+# my mix-ins
+from .Memo import Memo
+from .Postprocessor import Postprocessor
+from .Observer import Observer
+# the evaluation strategies i know how to flatten
+from .Value import Value
+from .Const import Const
+from .Evaluator import Evaluator
+from .Expression import Expression
+from .Interpolation import Interpolation
+from .Reference import Reference
+from .Sequence import Sequence
+from .Mapping import Mapping
+from .Sum import Sum
+from .Product import Product
+from .Average import Average
+from .Count import Count
+from .Maximum import Maximum
+from .Minimum import Minimum
+
+
+# class declaration
+class Plan(Observer):
+    """
+    A flat evaluation schedule for the subgraph of a model that is rooted at a set of named
+    nodes
+
+    Plans sort their subgraph in dependency order and generate a single python function that
+    computes the value of every node in sequence, avoiding the recursive method dispatch through
+    the {Memo}, {Postprocessor} and evaluator mix-ins. Memoized nodes that are up to date
+    contribute their cached value, and nodes that get recomputed have their cache refreshed, so
+    the plan and the node-by-node evaluation path see and leave behind the same values.
+
+    Plans observe the nodes in their span so they can detect structural changes to the graph,
+    such as the replacement of a node when a name in the model is assigned a new value, and
+    rebuild themselves the next time they are invoked. Plans are held by weak reference in the
+    graph, so clients must hang on to them.
+
+    Plans also provide {kernel}, a memo-free version of the schedule that takes the values of
+    the {leaves} as arguments. Since arithmetic, comparisons and expressions are inlined, it
+    can be invoked with numpy arrays to evaluate an entire parameter sweep in one pass.
+    """
+
+
+    # exceptions
+    from .exceptions import CircularReferenceError, EvaluationError
+
+
+    # public data
+    names = () # the names of the nodes whose values i compute
+    roots = () # the nodes whose values i compute
+    nodes = () # my span, in dependency order
+    leaves = () # the nodes whose values are arguments to my {kernel}
+
+
+    @property
+    def kernel(self):
+        """
+        Build a function that computes the values of my roots given the values of my leaves,
+        bypassing memoization
+        """
+        # make sure i'm up to date
+        if self._stale: self.rebuild()
+        # if i have built a kernel already
+        if self._kernel is not None:
+            # reuse it
+            return self._kernel
+        # otherwise, generate the code
+        factory = self.generate(memo=False)
+        # attach my nodes and hold on to the result
+        self._kernel = factory(self.nodes)
+        # and return it
+        return self._kernel
+
+
+    # interface
+    def rebuild(self):
+        """
+        Resolve my names and sort the subgraph they span in dependency order
+        """
+        # stop watching my current span
+        self.ignore(self.nodes)
+        # resolve my names
+        roots = tuple(map(self._model.retrieve, self.names))
+        # sort the subgraph in dependency order
+        nodes = tuple(self.sort(roots))
+        # assign each node a position
+        index = {id(node): position for position, node in enumerate(nodes)}
+        # classify them
+        signature = tuple(self.describe(node=node, index=index) for node in nodes)
+        # the leaves are the nodes whose value i can't compute
+        leaves = tuple(
+            node for node, (strategy, *_) in zip(nodes, signature)
+            if strategy in self._leaves
+        )
+
+        # save
+        self.roots = roots
+        self.nodes = nodes
+        self.leaves = leaves
+        self._index = index
+        self._signature = signature
+        # record the formulas of expressions and interpolations so i can detect changes that
+        # modify the structure of the graph
+        self._formulas = {
+            id(node): node.expression for node, (strategy, *_) in zip(nodes, signature)
+            if strategy in self._formulaic
+        }
+        # look for a previously generated evaluator with the same structure
+        factory = self._evaluators.get(signature)
+        # if there isn't one
+        if factory is None:
+            # generate the code
+            factory = self.generate(memo=True)
+            # and cache it
+            self._evaluators[signature] = factory
+        # attach my nodes
+        self._factory = factory
+        self._evaluator = factory(nodes)
+        # invalidate the kernel
+        self._kernel = None
+
+        # watch my span for structural changes
+        self.observe(nodes)
+        # mark me as clean
+        self._stale = False
+        # all done
+        return self
+
+
+    def sort(self, roots):
+        """
+        Generate the nodes in the span of {roots} so that every node comes after its operands
+        """
+        # the ids of nodes that i have scheduled already
+        done = set()
+        # the ids of nodes whose operands are being scheduled
+        active = set()
+        # go through the roots
+        for root in roots:
+            # skip the ones that have been scheduled already
+            if id(root) in done: continue
+            # otherwise, prime the worklist
+            stack = [(root, iter(self.operands(root)))]
+            active.add(id(root))
+            # as long as there is work to do
+            while stack:
+                # get the node at the top of the stack and the iterator over its operands
+                node, operands = stack[-1]
+                # go through the remaining operands
+                for operand in operands:
+                    # get the id
+                    key = id(operand)
+                    # if it's been scheduled already
+                    if key in done:
+                        # move on
+                        continue
+                    # if it's one of the nodes whose operands are being visited
+                    if key in active:
+                        # we have a cycle
+                        raise self.CircularReferenceError(node=operand)
+                    # otherwise, visit it before going on with the current node
+                    stack.append((operand, iter(self.operands(operand))))
+                    active.add(key)
+                    # and interrupt the current traversal
+                    break
+                # if all the operands have been scheduled
+                else:
+                    # the node is ready
+                    stack.pop()
+                    active.remove(id(node))
+                    done.add(id(node))
+                    # hand it to the caller
+                    yield node
+        # all done
+        return
+
+
+    def operands(self, node):
+        """
+        Retrieve the operands of {node} that must be evaluated before {node}
+        """
+        # nodes whose evaluation strategy i don't know are evaluated through their value
+        # property, so they bring their own operands with them
+        if self.classify(node) is None: return ()
+        # everybody else has to wait for their operands
+        return node.operands
+
+
+    @classmethod
+    def classify(cls, node):
+        """
+        Identify the mix-in that supplies the evaluation strategy of {node}
+        """
+        # go through the ancestors of {node}
+        for base in type(node).__mro__:
+            # skip the ones that don't participate in value retrieval
+            if 'getValue' not in base.__dict__: continue
+            # skip the mix-ins whose behavior i replicate
+            if base is Memo or base is Postprocessor: continue
+            # the first one left determines the evaluation strategy
+            return base if base in cls._strategies else None
+        # if we get this far, there is no value retrieval strategy
+        return None
+
+
+    def describe(self, node, index):
+        """
+        Build the part of the structural signature of the plan that describes {node}
+        """
+        # identify the evaluation strategy
+        strategy = self.classify(node)
+        # if it's one i know
+        if strategy is not None:
+            # use its name
+            name = self._strategies[strategy]
+            # and collect the positions of the operands
+            operands = tuple(index[id(operand)] for operand in node.operands)
+        # otherwise
+        else:
+            # treat the node as opaque
+            name = 'opaque'
+            # and don't look inside
+            operands = ()
+
+        # check whether the node memoizes its value
+        memo = strategy is not None and isinstance(node, Memo)
+        # and whether it has a non-trivial postprocessor
+        post = (
+            strategy is not None and isinstance(node, Postprocessor)
+            and node.postprocessor is not Postprocessor.noop
+            )
+
+        # strategy specific information that shapes the generated code
+        if strategy is Evaluator:
+            # operators are inlined when possible
+            detail = self._operators.get(node.evaluator)
+        elif strategy is Expression:
+            # expressions are inlined
+            detail = node.expression
+        elif strategy is Mapping:
+            # mappings need their keys
+            detail = tuple(node.data.keys())
+        else:
+            # nothing else
+            detail = None
+
+        # put it all together
+        return name, memo, post, detail, operands
+
+
+    def generate(self, memo):
+        """
+        Generate the source for the evaluator of my subgraph and compile it into a factory that
+        attaches the evaluator to a sequence of nodes with my structure
+        """
+        # the identifiers of the node values
+        symbols = {id(node): "_v{}".format(position) for position, node in enumerate(self.nodes)}
+        # the code of the body
+        body = []
+        # go through the nodes
+        for position, (node, description) in enumerate(zip(self.nodes, self._signature)):
+            # unpack
+            strategy, memoized, post, detail, operands = description
+            # the name of the node value
+            value = "_v{}".format(position)
+            # and the node itself
+            name = "_n{}".format(position)
+            # kernel leaves get their values from the caller
+            if not memo and strategy in self._leaves: continue
+            # build the expression that computes the raw value
+            raw = self.render(
+                strategy=strategy, node=node, name=name, detail=detail, symbols=symbols,
+                operands=tuple("_v{}".format(operand) for operand in operands))
+            # build the assignment
+            code = ["{} = {}".format(value, raw)]
+            # expressions report failures as evaluation errors
+            if strategy == 'expression':
+                code = [
+                    "try:",
+                    "    {} = {}".format(value, raw),
+                    "except Exception as error:",
+                    "    raise EvaluationError(node={}, error=error) from None".format(name),
+                    ]
+            # if the node has a postprocessor
+            if post:
+                # pass the raw value through it
+                code.append("{0} = {1}.postprocessor(value={0}, node={1})".format(value, name))
+
+            # kernels bypass memoization
+            if memo and memoized:
+                # consult the cache
+                code = [
+                    "if {}.dirty:".format(name),
+                    ] + [
+                    "    " + line for line in code
+                    ] + [
+                    "    {}._cache = {}".format(name, value),
+                    "    {}.dirty = False".format(name),
+                    "else:",
+                    "    {} = {}._cache".format(value, name),
+                    ]
+            # add it to the pile
+            body.extend(code)
+
+        # the result
+        body.append("return ({})".format(" ".join(symbols[id(root)] + "," for root in self.roots)))
+        # the parameters of the evaluator
+        if memo:
+            # are empty
+            parameters = ""
+        else:
+            # kernels take the values of the leaves
+            parameters = ", ".join(symbols[id(leaf)] for leaf in self.leaves)
+
+        # assemble the source
+        source = "\n".join([
+            "def factory(nodes):",
+            "    [{}] = nodes".format(", ".join(
+                "_n{}".format(position) for position in range(len(self.nodes)))),
+            "    def plan({}):".format(parameters),
+            ] + [
+            "        " + line for line in body
+            ] + [
+            "    return plan",
+            ])
+
+        # compile it
+        program = compile(source, filename="plan", mode="exec")
+        # make a namespace
+        namespace = {'EvaluationError': self.EvaluationError}
+        # execute
+        exec(program, namespace)
+        # and return the factory
+        return namespace['factory']
+
+
+    def render(self, strategy, node, name, detail, symbols, operands):
+        """
+        Build the python expression that computes the raw value of {node}
+        """
+        # get the values of the operands
+        values = ", ".join(operands)
+        # reductions over empty operand sequences are left to the node itself
+        if not operands and strategy in self._reductions:
+            return "{}.getValue()".format(name)
+        # variables and constants store their values
+        if strategy == 'value' or strategy == 'const':
+            return "{}._value".format(name)
+        # nodes i know nothing about compute their own values
+        if strategy == 'opaque':
+            return "{}.value".format(name)
+        # operators
+        if strategy == 'evaluator':
+            # if i know how to inline the evaluator
+            if detail is not None:
+                # do it
+                return detail.format(*operands)
+            # otherwise, invoke it
+            return "{}.evaluator({})".format(name, values)
+        # expressions
+        if strategy == 'expression':
+            # rewrite the formula in terms of the values of the operands
+            return "({})".format(node.inline(symbols=symbols))
+        # interpolations
+        if strategy == 'interpolation':
+            # splice together the string representation of the operands
+            return "''.join(({},))".format(", ".join("str({})".format(op) for op in operands))
+        # references
+        if strategy == 'reference':
+            return values
+        # sequences
+        if strategy == 'sequence':
+            return "({},)".format(values) if operands else "()"
+        # mappings
+        if strategy == 'mapping':
+            return "dict(zip({!r}, ({},)))".format(detail, values) if operands else "{}"
+        # the reductions
+        if strategy == 'sum':
+            return "sum(({},))".format(values)
+        if strategy == 'product':
+            return " * ".join(operands)
+        if strategy == 'average':
+            return "sum(({},))/{}".format(values, len(operands))
+        if strategy == 'count':
+            return repr(len(operands))
+        if strategy == 'max':
+            return "max(({},))".format(values)
+        if strategy == 'min':
+            return "min(({},))".format(values)
+        # if we get this far, there is a bug in the strategy table
+        import journal
+        raise journal.firewall('pyre.calc').log(f"unknown evaluation strategy {strategy!r}")
+
+
+    # meta-methods
+    def __init__(self, model, names, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record my model without making cycles
+        self._model = weakref.proxy(model)
+        # and the names of my roots
+        self.names = tuple(names)
+        # build my schedule
+        self.rebuild()
+        # all done
+        return
+
+
+    def __call__(self):
+        """
+        Compute the values of my roots
+        """
+        # if the structure of the graph has changed
+        if self._stale:
+            # rebuild
+            self.rebuild()
+        # evaluate and return the values of my roots
+        return self._evaluator()
+
+
+    # signaling
+    def flush(self, observable=None, **kwds):
+        """
+        Handler of the notification event from one of the nodes in my span
+        """
+        # if i'm already marked as stale
+        if self._stale:
+            # nothing further to do
+            return self
+        # get the id of the node
+        key = id(observable)
+        # if it's not in my span, it's a replacement for one of my nodes
+        if key not in self._index:
+            # so i have to rebuild
+            self._stale = True
+            # all done
+            return self
+        # look up the formula of the node
+        formula = self._formulas.get(key)
+        # if it has one and it has changed
+        if formula is not None and formula != observable.expression:
+            # the node has new operands, so i have to rebuild
+            self._stale = True
+        # all done
+        return self
+
+
+    # implementation details
+    def ignore(self, observables):
+        """
+        Stop observing the {observables}
+        """
+        # go through them
+        for observable in observables:
+            # attempt to
+            try:
+                # stop observing it
+                observable.removeObserver(self)
+            # if i was not one of its observers, or it isn't observable
+            except (KeyError, AttributeError):
+                # no worries
+                pass
+        # all done
+        return self
+
+
+    # private data
+    _model = None
+    _stale = True
+    _index = None
+    _formulas = None
+    _signature = None
+    _factory = None
+    _evaluator = None
+    _kernel = None
+    # the evaluation strategies i know how to flatten
+    _strategies = {
+        Value: 'value',
+        Const: 'const',
+        Evaluator: 'evaluator',
+        Expression: 'expression',
+        Interpolation: 'interpolation',
+        Reference: 'reference',
+        Sequence: 'sequence',
+        Mapping: 'mapping',
+        Sum: 'sum',
+        Product: 'product',
+        Average: 'average',
+        Count: 'count',
+        Maximum: 'max',
+        Minimum: 'min',
+        }
+    # the strategies whose values are supplied by the caller of a kernel
+    _leaves = { 'value', 'opaque' }
+    # the strategies whose operands are determined by a formula
+    _formulaic = { 'expression', 'interpolation' }
+    # the reductions
+    _reductions = { 'sum', 'product', 'average', 'max', 'min' }
+    # the operators i know how to inline
+    _operators = {
+        # arithmetic
+        operator.add: "({} + {})",
+        operator.sub: "({} - {})",
+        operator.mul: "({} * {})",
+        operator.truediv: "({} / {})",
+        operator.floordiv: "({} // {})",
+        operator.mod: "({} % {})",
+        operator.pow: "({} ** {})",
+        operator.pos: "(+{})",
+        operator.neg: "(-{})",
+        operator.abs: "abs({})",
+        # ordering
+        operator.eq: "({} == {})",
+        operator.ne: "({} != {})",
+        operator.le: "({} <= {})",
+        operator.ge: "({} >= {})",
+        operator.lt: "({} < {})",
+        operator.gt: "({} > {})",
+        # boolean
+        operator.and_: "({} & {})",
+        operator.or_: "({} | {})",
+        }
+    # the generated evaluator factories, indexed by the structural signature of their plan
+    _evaluators = weakref.WeakValueDictionary()
+
+
+# end of file
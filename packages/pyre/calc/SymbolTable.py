@@ -129,6 +129,27 @@ class SymbolTable:
 
 
     # interface
+    def compile(self, *names):
+        """
+        Build a flat evaluation plan for the nodes registered under {names}
+        """
+        # get the plan factory
+        from .Plan import Plan
+        # build one and return it
+        return Plan(model=self, names=names)
+
+
+    def batch(self):
+        """
+        Build a context manager that propagates the changes to the model made within its block
+        in a single pass
+        """
+        # get the observable mix-in, which owns the node invalidation scheduler
+        from .Observable import Observable
+        # and delegate
+        return Observable.invalidator.batch()
+
+
     def get(self, name, default=None):
         """
         Attempt to resolve {name} and return its value; if {name} is not in the symbol table,
@@ -59,8 +59,16 @@ class Configurator:
             # and get out of here
             return errors
 
-        # convert the input source into a stream of events
-        events = reader.decode(uri, source, locator)
+        # get the snapshot of previously harvested configuration events
+        snapshot = None if self.executive is None else self.executive.snapshot
+        # if there isn't one
+        if snapshot is None:
+            # convert the input source into a stream of events
+            events = reader.decode(uri, source, locator)
+        # otherwise
+        else:
+            # let the snapshot retrieve the events, or ask the reader to decode them
+            events = snapshot.decode(codec=reader, uri=uri, source=source, locator=locator)
         # process it
         errors.extend(self.processEvents(events=events, priority=priority))
         # and return the errors
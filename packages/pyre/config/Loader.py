@@ -87,9 +87,13 @@ class Loader:
 
 
     @classmethod
-    def locateShelves(cls, executive, protocol, scheme, context, symbol, cfgpath=None, **kwds):
+    def locateShelves(cls, executive, protocol, scheme, context, symbol, cfgpath=None,
+                      viable=None, **kwds):
         """
         Locate candidate shelves for the given {uri}
+
+        If {viable} is supplied, it is used to decide whether a given folder may contain any
+        shelves, so that candidates in folders that don't exist are skipped without forming them
         """
         # sign in
         # print("{.__name__}.locateShelves:".format(cls))
@@ -166,41 +170,67 @@ class Loader:
         # print("  flavors: {}".format(flavors))
         # print("  context: {}".format(contexts))
 
-        # keep track of what we have tried
-        candidates = []
-        # here is the list of product arguments
-        combine = (cfgpath, prefixes, flavors, contexts)
-        # form all possible combinations of (prefix, flavor, context)
-        for path, prefix, flavor, user in itertools.product(*combine):
-            # show me
-            # print(' -- path: {}'.format(path))
-            # print(' -- prefix: {}'.format(prefix))
-            # print(' -- flavor: {}'.format(flavor))
-            # print(' -- user: {}'.format(user))
-            # now, slide a splicer through all positions in the flavor past the first slot
-            for pos in reversed(range(len(flavor)+1)):
-                # show me
-                # print(' ++ pos: {}'.format(pos))
-                # keep the front part
-                front = flavor[:pos]
-                # we use it to form a candidate
-                candidate = cls.assemble(path + prefix + front + user)
+        # the verdicts on the folders we have checked
+        folders = {}
+        # a helper that checks whether a folder may contain shelves
+        def check(folder):
+            """
+            Check whether the {folder} is worth exploring
+            """
+            # if there is no way to tell
+            if viable is None:
+                # assume it is
+                return True
+            # form the key
+            key = tuple(folder)
+            # attempt to
+            try:
+                # look up the verdict
+                return folders[key]
+            # if we haven't seen this folder before
+            except KeyError:
+                # ask {viable} and remember the answer
+                verdict = folders[key] = viable(folder)
+            # all done
+            return verdict
+
+        # form all possible combinations of (path, prefix)
+        for path, prefix in itertools.product(cfgpath, prefixes):
+            # if the folder doesn't exist, nothing in it or below it does either
+            if not check(path + prefix):
+                # so skip it
+                continue
+            # go through all combinations of (flavor, context)
+            for flavor, user in itertools.product(flavors, contexts):
                 # show me
-                # print("    candidate: {}".format(candidate))
-                # and send it for inspection
-                yield candidate
-                # remember this one
-                candidates.append(candidate)
-                # now for each flavor level we spliced off
-                for spliced in reversed(flavor[pos:]):
-                    # use them to form candidates as well
-                    candidate = cls.assemble(path + prefix + front + [spliced])
+                # print(' -- path: {}'.format(path))
+                # print(' -- prefix: {}'.format(prefix))
+                # print(' -- flavor: {}'.format(flavor))
+                # print(' -- user: {}'.format(user))
+                # now, slide a splicer through all positions in the flavor past the first slot
+                for pos in reversed(range(len(flavor)+1)):
+                    # show me
+                    # print(' ++ pos: {}'.format(pos))
+                    # keep the front part
+                    front = flavor[:pos]
+                    # all candidates at this position live in this folder
+                    if not check(path + prefix + front):
+                        # so skip them if it doesn't exist
+                        continue
+                    # we use it to form a candidate
+                    candidate = cls.assemble(path + prefix + front + user)
                     # show me
                     # print("    candidate: {}".format(candidate))
                     # and send it for inspection
                     yield candidate
-                    # remember this one too
-                    candidates.append(candidate)
+                    # now for each flavor level we spliced off
+                    for spliced in reversed(flavor[pos:]):
+                        # use them to form candidates as well
+                        candidate = cls.assemble(path + prefix + front + [spliced])
+                        # show me
+                        # print("    candidate: {}".format(candidate))
+                        # and send it for inspection
+                        yield candidate
 
         # MGA@20160415: the following trick doesn't seem to be necessary anymore, as it appears
         # that the interpretation of the symbol as a shelf is now attempted during the normal
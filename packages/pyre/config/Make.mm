@@ -24,6 +24,7 @@ EXPORT_PYTHON_MODULES = \
     Configurator.py \
     Loader.py \
     Shelf.py \
+    Snapshot.py \
     events.py \
     exceptions.py \
     __init__.py
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import sys
+import pickle
+import hashlib
+import platform
+# support
+from .. import primitives
+
+
+# class declaration
+class Snapshot:
+    """
+    A persistent cache of the configuration events harvested from configuration sources and
+    the results of the discovery of the runtime environment
+
+    The snapshot is stored in a single file and is tagged with a fingerprint of the host, the
+    interpreter, the pyre version and the process environment; any change in these discards
+    the entire snapshot. Configuration events are indexed by the address of their source, the
+    locator of the request, and a digest of the contents of the source, so changes to the
+    contents of a configuration file force it to be parsed again. Discovery results are indexed
+    by a digest of every configuration source processed before the discovery took place.
+    """
+
+
+    # public data
+    path = None # the location of the snapshot file
+    hits = 0 # the number of configuration sources retrieved from the snapshot
+    misses = 0 # the number of configuration sources that had to be parsed
+
+
+    @property
+    def digest(self):
+        """
+        Summarize the configuration sources that have been processed so far
+        """
+        # easy enough
+        return self._inputs.hexdigest()
+
+
+    # interface
+    def decode(self, codec, uri, source, locator):
+        """
+        Retrieve the configuration events in {source}, either from the snapshot or by asking
+        {codec} to decode it
+        """
+        # pull the contents of the source
+        contents = source.read()
+        # normalize to bytes
+        raw = contents.encode('utf-8') if isinstance(contents, str) else contents
+        # build the key
+        key = ('events', str(uri), str(locator), hashlib.sha1(raw).hexdigest())
+        # record the source as an input to the configuration
+        self._inputs.update(repr(key).encode('utf-8'))
+
+        # look up the events
+        events = self._store.get(key)
+        # if they are there
+        if events is not None:
+            # update the counter
+            self.hits += 1
+            # and send them off
+            return events
+
+        # otherwise, update the counter
+        self.misses += 1
+        # rebuild the source stream
+        import io
+        stream = io.StringIO(contents) if isinstance(contents, str) else io.BytesIO(contents)
+        # ask the codec to decode it
+        events = list(codec.decode(uri, stream, locator))
+        # if the source had events; empty sources may have failed to parse, and replaying them
+        # would skip the error report
+        if events:
+            # remember them
+            self.record(key=key, value=events)
+        # and return them
+        return events
+
+
+    def retrieve(self, category, key=None):
+        """
+        Look up the value recorded for {category} in the current configuration context
+        """
+        # build the key
+        key = (category, self.digest if key is None else key)
+        # look it up and return it
+        return self._store.get(key)
+
+
+    def remember(self, category, value, key=None):
+        """
+        Record {value} under {category} in the current configuration context
+        """
+        # build the key
+        key = (category, self.digest if key is None else key)
+        # record the value
+        return self.record(key=key, value=value)
+
+
+    def record(self, key, value):
+        """
+        Store {value} under {key}
+        """
+        # make sure it can be pickled before accepting it, to avoid poisoning the snapshot
+        try:
+            # by attempting to pickle it
+            pickle.dumps(value)
+        # if this fails
+        except Exception:
+            # don't store it
+            return self
+        # otherwise, store it
+        self._store[key] = value
+        # mark me as modified
+        self._dirty = True
+        # all done
+        return self
+
+
+    def load(self):
+        """
+        Retrieve my contents from my file
+        """
+        # attempt to
+        try:
+            # open the snapshot file
+            with open(self.path, 'rb') as stream:
+                # and read it
+                fingerprint, store = pickle.load(stream)
+        # if anything goes wrong
+        except Exception:
+            # start over
+            return self
+        # if the snapshot was taken under different circumstances
+        if fingerprint != self.fingerprint:
+            # discard it
+            return self
+        # otherwise, use it
+        self._store = store
+        # all done
+        return self
+
+
+    def save(self):
+        """
+        Write my contents to my file, if they have changed
+        """
+        # if nothing has changed
+        if not self._dirty:
+            # nothing to do
+            return self
+        # get my path
+        path = self.path
+        # and make a temporary one next to it so the update is atomic
+        scratch = path.parent / f"{path.name}.{os.getpid()}"
+        # attempt to
+        try:
+            # make sure the destination folder exists
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write the snapshot
+            with open(scratch, 'wb') as stream:
+                pickle.dump((self.fingerprint, self._store), stream)
+            # and move it into place
+            os.replace(scratch, path)
+        # if anything goes wrong
+        except OSError:
+            # the snapshot is just an optimization; ignore
+            pass
+        # either way
+        else:
+            # i'm clean
+            self._dirty = False
+        # all done
+        return self
+
+
+    def clear(self):
+        """
+        Discard my contents
+        """
+        # empty the store
+        self._store = {}
+        # and mark me as modified
+        self._dirty = True
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, path, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # normalize and save my path
+        self.path = primitives.path(os.path.expanduser(str(path)))
+        # build my fingerprint
+        self.fingerprint = self.survey()
+        # initialize my store
+        self._store = {}
+        # and the running summary of my inputs
+        self._inputs = hashlib.sha1()
+        # load my contents
+        self.load()
+        # all done
+        return
+
+
+    # implementation details
+    def survey(self):
+        """
+        Build a fingerprint of the runtime environment
+        """
+        # get the pyre version
+        from .. import meta
+        # summarize the environment variables
+        environment = hashlib.sha1(repr(sorted(os.environ.items())).encode('utf-8')).hexdigest()
+        # assemble the fingerprint
+        return (
+            # the host
+            platform.node(), sys.platform, platform.release(), platform.machine(),
+            # the interpreter
+            sys.executable, sys.version,
+            # pyre
+            meta.version,
+            # the environment
+            environment,
+            )
+
+
+    # private data
+    _dirty = False
+    _store = None
+    _inputs = None
+
+
+# end of file
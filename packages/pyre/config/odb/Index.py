@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# declaration
+class Index:
+    """
+    A catalog of the shelves that are present in the configuration folders of the virtual
+    filesystem
+
+    The index is built by walking the contents of each folder that has already been explored by
+    the fileserver, so it reflects exactly what a lookup in the virtual filesystem would find.
+    Each candidate address is checked against the catalog once, and the verdict is cached for
+    both hits and misses. Addresses outside the indexed folders are never rejected: they are
+    left for the fileserver to resolve. The index remembers the size of every folder it has
+    seen, and clients should ask {isCurrent} whether the filesystem has changed since the index
+    was built
+    """
+
+
+    # public data
+    roots = () # the addresses of the indexed folders
+    folders = None # the addresses of all folders below the roots
+    shelves = None # the addresses of all shelves below the roots
+
+
+    # interface
+    def exists(self, address):
+        """
+        Check whether there may be a shelf at {address}
+        """
+        # attempt to
+        try:
+            # look up the verdict
+            return self._verdicts[address]
+        # if this is the first time we see this address
+        except KeyError:
+            # no problem
+            pass
+        # if {address} is within one of my roots, it must be a known shelf; otherwise, i can't
+        # tell, so let the fileserver decide
+        verdict = address in self.shelves if self.covers(address) else True
+        # remember it
+        self._verdicts[address] = verdict
+        # and return it
+        return verdict
+
+
+    def viable(self, address):
+        """
+        Check whether the folder at {address} may contain shelves
+        """
+        # if {address} is within one of my roots, it must be a known folder
+        return address in self.folders if self.covers(address) else True
+
+
+    def covers(self, address):
+        """
+        Check whether {address} is within one of my roots
+        """
+        # go through my roots
+        for root in self.roots:
+            # if {address} is the root itself or it is below it
+            if address == root or address.startswith(root + '/'):
+                # it's mine
+                return True
+        # otherwise, it isn't
+        return False
+
+
+    def isCurrent(self):
+        """
+        Check whether the folders i have explored still have the contents i saw when i was built
+        """
+        # go through the folders i walked and compare their sizes
+        for folder, size in self._sizes:
+            # if any of them differs
+            if len(folder.contents) != size:
+                # i'm stale
+                return False
+        # otherwise, i'm up to date
+        return True
+
+
+    # meta-methods
+    def __init__(self, fileserver, roots, suffix, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize my catalog
+        self.roots = tuple(str(root) for root in roots)
+        self.folders = set()
+        self.shelves = set()
+        # the verdicts i have reached
+        self._verdicts = {}
+        # and the folder sizes
+        self._sizes = []
+        # build the catalog
+        self.build(fileserver=fileserver, suffix=suffix)
+        # all done
+        return
+
+
+    # implementation details
+    def build(self, fileserver, suffix):
+        """
+        Walk the contents of my roots and record the folders and shelves in them
+        """
+        # start a work list of (address, folder) pairs
+        todo = []
+        # go through my roots
+        for root in self.roots:
+            # attempt to
+            try:
+                # get the associated node
+                folder = fileserver[root]
+            # if it's not there
+            except fileserver.NotFoundError:
+                # no problem; there is nothing there to find
+                continue
+            # if it is a folder
+            if folder.isFolder:
+                # add it to the pile
+                todo.append((root, folder))
+
+        # while there is work to do
+        while todo:
+            # get a folder
+            address, folder = todo.pop()
+            # record it
+            self.folders.add(address)
+            # get its contents
+            contents = folder.contents
+            # remember its size
+            self._sizes.append((folder, len(contents)))
+            # go through its contents
+            for name, node in contents.items():
+                # form the address of the child
+                child = address + '/' + name
+                # if it is a folder
+                if node.isFolder:
+                    # add it to the pile
+                    todo.append((child, node))
+                # if it has the right suffix
+                elif name.endswith(suffix):
+                    # it is a shelf
+                    self.shelves.add(child)
+
+        # all done
+        return self
+
+
+    # private data
+    _sizes = None
+    _verdicts = None
+
+
+# end of file
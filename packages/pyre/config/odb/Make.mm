@@ -11,6 +11,7 @@ include pyre.def
 PACKAGE = config/odb
 # the python modules
 EXPORT_PYTHON_MODULES = \
+    Index.py \
     ODB.py \
     Shelf.py \
     __init__.py
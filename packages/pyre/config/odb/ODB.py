@@ -27,6 +27,7 @@ class ODB(Loader):
 
     # type
     from .Shelf import Shelf as shelf
+    from .Index import Index as catalog
 
 
     # constants
@@ -81,11 +82,25 @@ class ODB(Loader):
 
         # collect the list of system folders maintained by the fileserver
         cfgpath = list(str(folder) for folder in executive.fileserver.systemFolders)
+        # if the candidates are in the virtual filesystem
+        if scheme == 'vfs':
+            # get the index of the shelves in the system folders
+            index = cls.index(executive=executive)
+            # use it to skip folders that don't exist
+            viable = lambda context: index.viable(str(primitives.path(context)))
+        # otherwise
+        else:
+            # the fileserver must check every candidate
+            index = viable = None
 
         # chain up for the rest
         for candidate in super().locateShelves(
-                executive=executive, cfgpath=cfgpath,
+                executive=executive, cfgpath=cfgpath, viable=viable,
                 protocol=protocol, scheme=scheme, context=context, **kwds):
+            # if there is an index and it knows there is no shelf at this address
+            if index and not index.exists(candidate):
+                # skip it
+                continue
             # make a uri
             uri = cls.uri(scheme=scheme, address=candidate)
             # show me
@@ -97,6 +112,30 @@ class ODB(Loader):
         return
 
 
+    @classmethod
+    def index(cls, executive):
+        """
+        Retrieve the index of the shelves in the system folders of the {executive} fileserver,
+        building it if necessary
+        """
+        # get the linker
+        linker = executive.linker
+        # look for an existing index
+        index = linker.indices.get(cls)
+        # if it's there and the fileserver hasn't changed since it was built
+        if index is not None and index.isCurrent():
+            # hand it back
+            return index
+        # otherwise, get the fileserver
+        fs = executive.fileserver
+        # build a new index
+        index = cls.catalog(fileserver=fs, roots=fs.systemFolders, suffix=cls.suffix)
+        # attach it to the linker
+        linker.indices[cls] = index
+        # and return it
+        return index
+
+
     # context handling
     @classmethod
     def interpret(cls, request):
@@ -97,6 +97,11 @@ class Measure(records.measure):
             # for the rest, chain up...
             return super().coerce(value=value, **kwds)
 
+        def parameter(self, value):
+            """Convert {value} into a statement parameter"""
+            # most values can be handed to the back end as they are
+            return value
+
 
 
     # mixins for the various supported types
@@ -130,6 +135,15 @@ class Measure(records.measure):
             # make sure the result is quoted in an SQL compliant way
             return "'{}'".format(value)
 
+        def parameter(self, value):
+            """Convert {value} into a statement parameter"""
+            # if {value} is a time struct
+            if isinstance(value, time.struct_time):
+                # use my format to convert it a string
+                return time.strftime(self.format, value)
+            # other types of values just get passed along
+            return value
+
         # meta-methods
         def __init__(self, default=None, **kwds):
             # chain up
@@ -154,6 +168,11 @@ class Measure(records.measure):
             # convert the decimal into a string
             return str(value)
 
+        def parameter(self, value):
+            """Convert {value} into a statement parameter"""
+            # the back ends don't all understand decimals, but they all understand strings
+            return str(value)
+
         # meta-methods
         def __init__(self, precision, scale, **kwds):
             # chain up
@@ -244,6 +263,15 @@ class Measure(records.measure):
             # make sure the result is quoted in an SQL compliant way
             return "'{}'".format(value)
 
+        def parameter(self, value):
+            """Convert {value} into a statement parameter"""
+            # if {value} is a time struct
+            if isinstance(value, time.struct_time):
+                # use my format to convert it a string
+                return time.strftime(self.format, value)
+            # other types of values just get passed along
+            return value
+
         # meta-methods
         def __init__(self, default=None, timezone=False, **kwds):
             # chain up
@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import time
+import threading
+import contextlib
+import contextvars
+# framework
+import pyre
+# my protocols
+from .DataStore import DataStore
+# the default connection type
+from .SQLite import SQLite
+
+
+# declaration
+class Pool(pyre.component, family="pyre.db.pool"):
+    """
+    A pool of connections to a database back end
+
+    The pool manages a set of copies of {server}, each with a connection of its own, and hands
+    them out to its clients through {connection}, a context manager that returns the server to
+    the pool when the client is done with it. Nested {connection} blocks get the same server;
+    the checkouts are tracked per context, so threads, as well as asyncio tasks that share a
+    thread, get servers of their own. The pool opens {minimum} connections the first time it is
+    used in a process, or earlier if {fill} is called, and never opens more than {maximum};
+    clients that find all of them in use wait for up to {timeout} for one to be returned.
+    Connections that have been idle longer than {idle} are closed, as long as at least {minimum}
+    remain, and {prune} opens new ones when there are fewer left; those that have been idle
+    longer than {probe} are checked before they are handed out, by executing the {check}
+    statement, and replaced if they fail. Connecting, checking and closing happen without
+    holding the lock of the pool, so a slow back end doesn't hold up the other clients.
+
+    The connections of a pool are not shared across processes: the first time the pool is used
+    in a process that was forked after the pool was populated, it forgets the connections it
+    inherited, without closing them, since they belong to the parent, and starts afresh.
+    """
+
+
+    # constants
+    from pyre.units.SI import second
+
+
+    # user configurable state
+    server = DataStore(default=SQLite)
+    server.doc = "the prototype of the pooled connections"
+
+    minimum = pyre.properties.int(default=1)
+    minimum.doc = "the number of connections to keep around even when they are idle"
+
+    maximum = pyre.properties.int(default=10)
+    maximum.doc = "the maximum number of connections"
+
+    timeout = pyre.properties.dimensional(default=30*second)
+    timeout.doc = "how long to wait for a connection when all of them are in use"
+
+    idle = pyre.properties.dimensional(default=300*second)
+    idle.doc = "how long a connection may remain idle before it is closed"
+
+    probe = pyre.properties.dimensional(default=1*second)
+    probe.doc = "how long a connection may remain idle before it is checked"
+
+    check = pyre.properties.str(default="SELECT 1;")
+    check.doc = "the statement that checks whether a connection is healthy"
+
+
+    # types
+    from .exceptions import OperationalError
+
+
+    # interface
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Check out a server for the duration of a {with} block
+        """
+        # get the server that is checked out in this context, if any
+        server, depth = self.local.get()
+        # if there isn't one
+        if server is None:
+            # check one out
+            server = self.checkout()
+        # mark the nesting level
+        token = self.local.set((server, depth + 1))
+        # carefully
+        try:
+            # hand it over
+            yield server
+        # no matter what happened
+        finally:
+            # restore the nesting level
+            self.local.reset(token)
+            # if this is the outermost block
+            if not depth:
+                # return the server to the pool
+                self.checkin(server)
+        # all done
+        return
+
+
+    def checkout(self):
+        """
+        Get a healthy server from the pool, opening a new connection if necessary
+        """
+        # make sure the pool belongs to this process
+        self.adopt()
+        # if it hasn't been populated yet
+        if not self.filled:
+            # open its minimum number of connections
+            self.fill()
+        # compute the deadline
+        deadline = time.monotonic() + self.timeout / self.second
+        # until i get a server
+        while True:
+            # with the lock held, figure out what to do
+            with self.available:
+                # take the connections that have been idle for too long out of the pool
+                stale = self.expire()
+                # nothing to do yet
+                server, action = None, None
+                # if there is an idle connection
+                if self.idlers:
+                    # take the most recently used one
+                    server, last = self.idlers.pop()
+                    # mark it as busy
+                    self.busy.add(server)
+                    # figure out how long it's been idle
+                    idle = time.monotonic() - last
+                    # if it hasn't been used in a while, check on it before handing it over
+                    action = "probe" if idle > self.probe / self.second else "use"
+                # if there is room for another connection
+                elif len(self.busy) + self.opening < self.maximum:
+                    # reserve it
+                    self.opening += 1
+                    # and pick a number for it
+                    number = self.serial
+                    self.serial += 1
+                    # make one
+                    action = "open"
+                # if there are no stale connections to close first
+                elif not stale:
+                    # figure out how much longer i can wait
+                    remaining = deadline - time.monotonic()
+                    # if i can't
+                    if remaining <= 0:
+                        # complain
+                        raise self.OperationalError(
+                            description="no connection became available within {}".format(
+                                self.timeout))
+                    # otherwise, wait for one to be returned
+                    self.available.wait(timeout=remaining)
+
+            # close the stale connections
+            for connection in stale:
+                self.close(connection)
+
+            # if i need a new connection
+            if action == "open":
+                # make it
+                return self.open(number=number)
+            # if i got an idle connection that must be checked
+            if action == "probe":
+                # if it's healthy
+                if self.healthy(server):
+                    # hand it over
+                    return server
+                # otherwise, discard it
+                self.discard(server)
+                # and try again
+                continue
+            # if i got an idle connection
+            if action == "use":
+                # hand it over
+                return server
+
+
+    def checkin(self, server):
+        """
+        Return {server} to the pool
+        """
+        # if the pool has been reset since {server} was checked out, there is nothing to do
+        if self.adopt():
+            # because it belongs to my parent process
+            return self
+        # grab the lock
+        with self.available:
+            # if {server} was discarded while it was checked out
+            if server not in self.busy:
+                # leave it alone
+                return self
+            # otherwise, it's no longer busy
+            self.busy.discard(server)
+            # make it available
+            self.idlers.append((server, time.monotonic()))
+            # and let anybody waiting know
+            self.available.notify()
+        # all done
+        return self
+
+
+    def fill(self):
+        """
+        Open connections until the pool has at least {minimum} of them
+        """
+        # make sure the pool belongs to this process
+        self.adopt()
+        # mark it as populated
+        self.filled = True
+        # until the pool is full enough
+        while True:
+            # with the lock held
+            with self.available:
+                # count the connections
+                total = len(self.idlers) + len(self.busy) + self.opening
+                # if there are enough of them
+                if total >= min(self.minimum, self.maximum):
+                    # all done
+                    return self
+                # otherwise, reserve a slot
+                self.opening += 1
+                # and pick a number for it
+                number = self.serial
+                self.serial += 1
+            # make the connection, without holding the lock
+            server = self.open(number=number)
+            # and add it to the idle ones
+            self.checkin(server)
+
+
+    def prune(self):
+        """
+        Close the connections that have been idle too long, and open new ones if there are
+        fewer than {minimum} left
+        """
+        # grab the lock
+        with self.available:
+            # take the stale connections out of the pool
+            stale = self.expire()
+        # close them
+        for server in stale:
+            self.close(server)
+        # and top up the pool
+        return self.fill()
+
+
+    def reset(self):
+        """
+        Forget all my connections without closing them; this is meant for processes that were
+        forked after the pool was populated, since the connections belong to the parent process
+        """
+        # mark me as owned by this process
+        self.pid = os.getpid()
+        # but not populated yet
+        self.filled = False
+        # the locks of the parent may have been held at the time of the fork, so make new ones
+        self.available = threading.Condition()
+        # make a new home for the checkout state, since the values inherited from the parent
+        # refer to its connections
+        self.local = contextvars.ContextVar(
+            "{.pyre_name}.checkout".format(self), default=(None, 0))
+        # and forget the connections
+        self.idlers = []
+        self.busy = set()
+        self.opening = 0
+        # all done
+        return self
+
+
+    def close(self, server=None):
+        """
+        Close the connection of {server}, or all idle connections if {server} is {None}
+        """
+        # if i were given a specific server
+        if server is not None:
+            # attempt to
+            try:
+                # close its connection
+                server.detach()
+            # if anything goes wrong
+            except Exception:
+                # there is nothing left to do
+                pass
+            # all done
+            return self
+        # otherwise, grab the lock
+        with self.available:
+            # take the idle connections out of the pool
+            idlers, self.idlers = self.idlers, []
+        # go through them
+        for server, _ in idlers:
+            # and close each one
+            self.close(server)
+        # all done
+        return self
+
+
+    @property
+    def statistics(self):
+        """
+        Summarize the state of the pool
+        """
+        # easy enough
+        return {
+            'idle': len(self.idlers),
+            'busy': len(self.busy),
+            'opened': self.opened,
+            'discarded': self.discarded,
+            }
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize my state
+        self.reset()
+        # all done
+        return
+
+
+    # implementation details
+    def adopt(self):
+        """
+        Make sure the pool belongs to the current process; return {True} if it had to be reset
+        """
+        # if i was populated in this process
+        if self.pid == os.getpid():
+            # all is well
+            return False
+        # otherwise, start afresh
+        self.reset()
+        # and let the caller know
+        return True
+
+
+    def expire(self):
+        """
+        Take the connections that have been idle too long out of the pool, while keeping at
+        least {minimum} around, and return them; the caller must hold the lock
+        """
+        # get the time
+        now = time.monotonic()
+        # compute how long is too long
+        idle = self.idle / self.second
+        # make a pile
+        stale = []
+        # the idle connections are in the order they were returned, so the oldest are first
+        while self.idlers and len(self.idlers) + len(self.busy) + self.opening > self.minimum:
+            # get the oldest one
+            server, last = self.idlers[0]
+            # if it hasn't been idle long enough
+            if now - last <= idle:
+                # neither have the rest
+                break
+            # otherwise, remove it
+            self.idlers.pop(0)
+            # and add it to the pile
+            stale.append(server)
+        # all done
+        return stale
+
+
+    def open(self, number):
+        """
+        Make a new server and connect it to the database, filling the slot that was reserved
+        for it
+        """
+        # get the prototype
+        prototype = self.server
+        # carefully
+        try:
+            # make a copy
+            server = type(prototype)(name="{.pyre_name}.{}".format(self, number))
+            # with the same configuration
+            for trait in prototype.pyre_properties():
+                # one property at a time
+                setattr(server, trait.name, getattr(prototype, trait.name))
+            # connect it
+            server.attach()
+        # if anything goes wrong
+        except BaseException:
+            # grab the lock
+            with self.available:
+                # release the slot
+                self.opening -= 1
+                # and let anybody waiting for it know
+                self.available.notify()
+            # and let the caller know
+            raise
+        # grab the lock
+        with self.available:
+            # fill the slot
+            self.opening -= 1
+            # mark the server as busy
+            self.busy.add(server)
+            # and update the counter
+            self.opened += 1
+        # hand it over
+        return server
+
+
+    def healthy(self, server):
+        """
+        Check whether the connection of {server} still works
+        """
+        # if there is no health check
+        if not self.check:
+            # assume the best
+            return True
+        # attempt to
+        try:
+            # execute the check, and make sure the results are retrieved
+            tuple(server.execute(self.check))
+        # if anything goes wrong
+        except Exception:
+            # the connection is no good
+            return False
+        # otherwise, all is well
+        return True
+
+
+    def discard(self, server):
+        """
+        Remove {server} from the pool and close its connection
+        """
+        # grab the lock
+        with self.available:
+            # forget it
+            self.busy.discard(server)
+            # update the counter
+            self.discarded += 1
+            # and let anybody waiting for a slot know
+            self.available.notify()
+        # close it
+        return self.close(server)
+
+
+    # private data
+    pid = None # the id of the process that owns the connections
+    filled = False # whether the pool has been populated in this process
+    local = None # the checkout state of each context
+    available = None # the condition that signals that a connection was returned
+    idlers = None # the idle connections, along with the time they were returned
+    busy = None # the connections that are checked out
+    opening = 0 # the number of connections that are being opened
+    serial = 0 # the number of the next connection
+    opened = 0 # the number of connections i opened
+    discarded = 0 # the number of connections that failed their health check
+
+
+# end of file
@@ -8,8 +8,11 @@
 
 # externals
 import pyre
+import itertools
 # superclass
 from .Server import Server
+# the {NULL} literal
+from .literals import null
 
 
 # declaration
@@ -84,10 +87,14 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         # if i don't have an existing connection to the back end, do nothing
         if self.connection is None: return
 
-        # otherwise, close the connection
+        # otherwise, forget my statements; they go away along with the session
+        self.prepared.clear()
+        # close the connection
         status = self.postgres.disconnect(self.connection)
         # invalidate the member
         self.connection = None
+        # along with any transaction that was in progress
+        self.depth = 0
 
         # and return the status
         return status
@@ -102,7 +109,71 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         return self.postgres.execute(self.connection, "\n".join(sql))
 
 
+    def executePrepared(self, statement, parameters):
+        """
+        Execute the parameterized {statement} with the given {parameters}
+        """
+        # convert the parameters
+        parameters = tuple(self.marshal(value) for value in parameters)
+        # if the statement was prepared
+        if statement.name is not None:
+            # execute it by name
+            return self.postgres.executePrepared(self.connection, statement.name, parameters)
+        # otherwise, send its text along with the parameters
+        return self.postgres.executeParameters(self.connection, statement.text, parameters)
+
+
+    def executeStream(self, statement, parameters, batch):
+        """
+        Execute the parameterized {statement} through a server side cursor and generate batches
+        of at most {batch} rows
+        """
+        # convert the parameters
+        parameters = tuple(self.marshal(value) for value in parameters)
+        # name the cursor
+        name = "pyre_cursor_{}".format(next(self.names))
+        # build the commands that declare it and pull rows through it
+        declare = "DECLARE {} NO SCROLL CURSOR FOR\n{};".format(name, statement.text.rstrip(";"))
+        fetch = "FETCH FORWARD {} FROM {};".format(batch, name)
+        close = "CLOSE {};".format(name)
+        # cursors live inside transactions
+        with self:
+            # declare the cursor
+            self.postgres.executeParameters(self.connection, declare, parameters)
+            # carefully
+            try:
+                # pull the rows a batch at a time
+                while True:
+                    # grab a batch and skip the headers
+                    headers, *rows = self.execute(fetch)
+                    # if there's nothing left
+                    if not rows:
+                        # we are done
+                        break
+                    # otherwise, hand it over
+                    yield rows
+            # if the caller lost interest
+            except GeneratorExit:
+                # close the cursor, in case the transaction outlives me
+                self.execute(close)
+                # and bail
+                raise
+            # otherwise, close the cursor
+            self.execute(close)
+        # all done
+        return
+
+
     # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the source of the names of my prepared statements and cursors
+        self.names = itertools.count()
+        # all done
+        return
+
+
     def __new__(cls, **kwds):
         # if necessary
         if cls.postgres is None:
@@ -117,8 +188,12 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         """
         Hook invoked when the context manager is entered
         """
-        # mark the beginning of a transaction
-        self.execute(*self.sql.transaction())
+        # if i'm not in a transaction already
+        if not self.depth:
+            # mark the beginning of a transaction
+            self.execute(*self.sql.transaction())
+        # nested blocks are part of the outermost transaction
+        self.depth += 1
         # and hand me back to the caller
         return self
 
@@ -127,6 +202,12 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         """
         Hook invoked when the context manager's block exits
         """
+        # exit the block
+        self.depth -= 1
+        # if this is not the outermost one
+        if self.depth:
+            # the outermost block decides the fate of the transaction
+            return False
         # if there were no errors detected
         if exc_type is None:
             # commit the transaction to the datastore
@@ -142,6 +223,100 @@ class Postgres(Server, family="pyre.db.server.postgres"):
 
 
     # implementation details
+    def loadBatch(self, records):
+        """
+        Transfer a batch of {records} to the back end using the {COPY} protocol
+        """
+        # group consecutive records by their table and the fields that get their default value
+        for (table, defaults), group in itertools.groupby(records, key=self.layout):
+            # if every field gets its default value
+            if all(defaults):
+                # there is nothing to copy
+                self.insert(*group)
+                # move on
+                continue
+            # the fields that get explicit values, along with their position in the record
+            fields = tuple(
+                (index, field)
+                for index, (field, default) in enumerate(zip(table.pyre_fields, defaults))
+                if not default)
+            # build the command
+            command = "\n".join(self.sql.copyStatement(table=table, defaults=defaults))
+            # render the records
+            data = "".join(self.copyRow(record=record, fields=fields) for record in group)
+            # and send them
+            self.postgres.copy(self.connection, command, data)
+        # all done
+        return
+
+
+    def copyRow(self, record, fields):
+        """
+        Render the {fields} of {record} in the text format of the {COPY} protocol
+        """
+        # extract the values
+        values = tuple(record)
+        # the rendered values
+        row = []
+        # go through the fields
+        for index, field in fields:
+            # get the value
+            value = values[index]
+            # convert it
+            value = self.marshal(None if value is null else field.parameter(value))
+            # missing values have their own marker; everything else must have its delimiters
+            # escaped
+            row.append(r"\N" if value is None else value.translate(self.COPY_ESCAPES))
+        # put it all together
+        return "\t".join(row) + "\n"
+
+
+    def compile(self, statement):
+        """
+        Prepare {statement} in the back end, so that it gets planned only once
+        """
+        # give it a name
+        statement.name = "pyre_{}".format(next(self.names))
+        # and prepare it
+        self.postgres.prepare(self.connection, statement.name, statement.text)
+        # all done
+        return statement
+
+
+    def release(self, statement):
+        """
+        Release the back end resources of {statement}
+        """
+        # if it was prepared and i'm still connected
+        if statement.name is not None and self.connection is not None:
+            # deallocate it
+            self.execute("DEALLOCATE {};".format(statement.name))
+        # all done
+        return statement
+
+
+    def marshal(self, value):
+        """
+        Convert {value} into the text representation of a statement parameter
+        """
+        # {None} and {NULL} are missing values
+        if value is None or value is null:
+            # which the back end knows how to handle
+            return None
+        # booleans
+        if value is True or value is False:
+            # have their own spelling
+            return 'true' if value else 'false'
+        # everything else is converted to a string
+        return str(value)
+
+
+    # private data
+    names = None # the source of the names of my prepared statements and cursors
+    depth = 0 # the number of nested transaction blocks
+    # constants
+    COPY_ESCAPES = str.maketrans({
+        "\\": r"\\", "\t": r"\t", "\n": r"\n", "\r": r"\r"}) # the {COPY} escape sequences
     postgres = None # the handle to the extension module
     connection = None # the handle to the session with the back-end
 
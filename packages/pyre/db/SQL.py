@@ -35,9 +35,12 @@ class SQL(Mill, family="pyre.db.sql"):
 
 
     # queries
-    def select(self, query):
+    def select(self, query, parameters=None):
         """
         Generate the SELECT statement described by {query}
+
+        If {parameters} is not {None}, the values in the {WHERE} clause are bound to it and
+        rendered as placeholders
         """
         # start
         yield "SELECT"
@@ -113,7 +116,8 @@ class SQL(Mill, family="pyre.db.sql"):
                 # push out
                 self.outdent()
                 # build the filtering expression
-                predicate = self.expression(root=query.where, context=query)
+                predicate = self.expression(
+                    root=query.where, context=query, parameters=parameters)
                 # render the {WHERE} marker
                 yield self.place("WHERE")
                 # push in
@@ -366,11 +370,69 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
-    def deleteRecords(self, table, condition):
+    def insertStatement(self, table, defaults, parameters):
+        """
+        Generate a statement that inserts a single record into {table}; the record values are
+        bound to {parameters}, except for the fields flagged in {defaults}, which are left out
+        so they get their default values
+        """
+        # initiate the statement
+        yield self.place("INSERT INTO {}".format(table.pyre_name))
+        # indent
+        self.indent(increment=2)
+        # the fields that get explicit values, along with their position in the record
+        fields = tuple(
+            (index, field)
+            for index, (field, default) in enumerate(zip(table.pyre_fields, defaults))
+            if not default)
+        # if there aren't any
+        if not fields:
+            # the whole record gets the default values
+            yield self.place("DEFAULT VALUES;")
+            # bounce out to top level
+            self.outdent(decrement=2)
+            # all done
+            return
+        # the field names in declaration order
+        yield self.place("({})".format(", ".join(field.name for _, field in fields)))
+        # start the section with the record values
+        self.outdent()
+        yield self.place("VALUES")
+        # further in
+        self.indent()
+        # collect the values
+        values = (parameters.bind(index=index, field=field) for index, field in fields)
+        # render them
+        yield self.place("({});".format(", ".join(values)))
+        # bounce out to top level
+        self.outdent(decrement=2)
+        # all done
+        return
+
+
+    def copyStatement(self, table, defaults):
+        """
+        Generate the statement that starts a bulk transfer of records into {table}; the fields
+        flagged in {defaults} are left out so they get their default values
+        """
+        # the fields that get explicit values
+        names = (
+            field.name
+            for field, default in zip(table.pyre_fields, defaults)
+            if not default)
+        # render
+        yield self.place("COPY {} ({}) FROM STDIN;".format(table.pyre_name, ", ".join(names)))
+        # all done
+        return
+
+
+    def deleteRecords(self, table, condition, parameters=None):
         """
         Remove all {table} records that match {condition}
 
-        If condition is {None}, this routine will remove all records from the given {table}
+        If condition is {None}, this routine will remove all records from the given {table}. If
+        {parameters} is not {None}, the values in {condition} are bound to it and rendered as
+        placeholders
         """
         # if no condition was specified
         if condition is None:
@@ -384,7 +446,7 @@ class SQL(Mill, family="pyre.db.sql"):
         # indent
         self.indent()
         # build the filtering expression
-        predicate = self.expression(root=condition, context=table)
+        predicate = self.expression(root=condition, context=table, parameters=parameters)
         # and render it
         yield self.place("WHERE ({});".format(predicate))
         # outdent
@@ -393,12 +455,13 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
-    def updateRecords(self, template, condition):
+    def updateRecords(self, template, condition, parameters=None):
         """
         Update all table rows that match {condition} using information from {template}, a
         prototype row of a table. The update operation sets the fields in these rows to their
         corresponding values in {template}; fields set to {None} in {template} are not
-        affected.
+        affected. If {parameters} is not {None}, the new values and the values in {condition}
+        are bound to it and rendered as placeholders
         """
         # get the table
         table = template.pyre_layout
@@ -414,12 +477,21 @@ class SQL(Mill, family="pyre.db.sql"):
             # skip values set to {None}
             if value is None: continue
 
+            # this pair needs an update
+            names.append(name)
+            # if the caller is collecting parameters and this is not a keyword
+            if parameters is not None and value is not table.default:
+                # bind the value; {NULL} goes in as a missing value
+                values.append(parameters.bind(
+                    value=None if value is table.null else field.parameter(value)))
+                # and move on
+                continue
+
             # handle 'NULL'
             if value is table.null: value = 'NULL'
             # handle 'DEFAULT'
             elif value is table.default: value = 'DEFAULT'
-            # this pair needs an update
-            names.append(name)
+            # render the value
             values.append(field.sql(value))
 
         # render the names
@@ -439,7 +511,7 @@ class SQL(Mill, family="pyre.db.sql"):
         # outdent
         self.outdent()
         # build the filtering expression
-        predicate = self.expression(root=condition, context=table)
+        predicate = self.expression(root=condition, context=table, parameters=parameters)
         # and render it
         yield self.place("WHERE ({});".format(predicate))
         # outdent
@@ -481,7 +553,7 @@ class SQL(Mill, family="pyre.db.sql"):
 
 
     # implementation details
-    def _collationRenderer(self, order, context=None, **kwds):
+    def _collationRenderer(self, order, context=None, parameters=None, **kwds):
         """
         Render the collation order specification
         """
@@ -489,7 +561,7 @@ class SQL(Mill, family="pyre.db.sql"):
         return order.sql(context=context, **kwds)
 
 
-    def _fieldReferenceRenderer(self, node, context=None, **kwds):
+    def _fieldReferenceRenderer(self, node, context=None, parameters=None, **kwds):
         """
         Render {node} as reference to a field
         """
@@ -497,7 +569,7 @@ class SQL(Mill, family="pyre.db.sql"):
         return node.sql(context=context, **kwds)
 
 
-    def _primitiveSQLExpressionRenderer(self, node, context=None, **kwds):
+    def _primitiveSQLExpressionRenderer(self, node, context=None, parameters=None, **kwds):
         """
         Render {node} as a unary postfix operator
         """
@@ -22,6 +22,7 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
 
     # constants
     providesHeaders = False # sqlite queries do not return column headers
+    placeholder = "?{}" # the format of the statement placeholders
 
 
     # public state
@@ -37,8 +38,12 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         """
         # if i have an existing connection to the database, do nothing
         if self.connection is not None: return
-        # otherwise, make a connection
-        self.connection = sqlite3.connect(self.database)
+        # otherwise, make a connection; {sqlite3} keeps its own cache of prepared statements,
+        # indexed by their text, so make it at least as big as mine; connections may be handed
+        # from one thread to another by a {Pool}, which makes sure they are never shared
+        self.connection = sqlite3.connect(
+            self.database, cached_statements=max(self.statements, self.CACHED),
+            check_same_thread=False)
         # and a cursor
         self.cursor = self.connection.cursor()
         # and return
@@ -52,7 +57,9 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         """
         # if i don't have an existing connection to the database, do nothing
         if self.connection is None: return
-        # otherwise, close my cursor
+        # otherwise, forget my statements
+        self.prepared.clear()
+        # close my cursor
         self.cursor.close()
         # and the connection
         self.connection.close()
@@ -74,8 +81,86 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         return self.cursor
 
 
+    def executePrepared(self, statement, parameters):
+        """
+        Execute the parameterized {statement} with the given {parameters}
+        """
+        # hand the statement and its parameters to my cursor
+        self.cursor.execute(statement.text, parameters)
+        # return the cursor
+        return self.cursor
+
+
+    def executeMany(self, statement, parameters):
+        """
+        Execute the parameterized {statement} once for each tuple in {parameters}
+        """
+        # let my cursor iterate
+        self.cursor.executemany(statement.text, parameters)
+        # and return it
+        return self.cursor
+
+
+    def executeStream(self, statement, parameters, batch):
+        """
+        Execute the parameterized {statement} and generate batches of at most {batch} rows
+        """
+        # make a cursor of its own, so that other statements can be executed while the rows are
+        # being retrieved
+        cursor = self.connection.cursor()
+        # carefully
+        try:
+            # execute the statement
+            cursor.execute(statement.text, parameters)
+            # pull the rows a batch at a time
+            while True:
+                # grab a batch
+                rows = cursor.fetchmany(batch)
+                # if there's nothing left
+                if not rows:
+                    # we are done
+                    break
+                # otherwise, hand it over
+                yield rows
+        # no matter what
+        finally:
+            # clean up
+            cursor.close()
+        # all done
+        return
+
+
+    # context manager interface
+    def __enter__(self):
+        """
+        Hook invoked when the context manager is entered
+        """
+        # {sqlite3} starts transactions as soon as the data is modified, so there is nothing
+        # to do but hand me back to the caller
+        return self
+
+
+    def __exit__(self, exc_type, exc_instance, exc_traceback):
+        """
+        Hook invoked when the context manager's block exits
+        """
+        # if there were no errors detected
+        if exc_type is None:
+            # commit the transaction to the datastore
+            self.connection.commit()
+        # otherwise
+        else:
+            # roll back
+            self.connection.rollback()
+        # indicate that we want to re-raise any exceptions that occurred while executing the
+        # body of the {with} statement
+        return False
+
+
     # implementation details
     cursor = None
     connection = None
+    # constants
+    CACHED = 100 # the default size of the {sqlite3} statement cache
 
 # end of file
@@ -6,6 +6,10 @@
 #
 
 
+# externals
+import time
+import journal
+import itertools
 # packages
 import pyre
 import pyre.weaver
@@ -20,22 +24,41 @@ class Server(pyre.component, implements=datastore):
     This class is meant to be used as the base class for back end specific component
     implementations. It provides a complete but trivial implementation of the {DataStore}
     interface.
+
+    Records, queries, updates and deletions are rendered as parameterized statements, with
+    placeholders for their values that are supplied separately when they are executed. The
+    most recently used statements are cached, so that executing the same query, or inserting
+    records into the same table, skips the generation of the SQL statement; back ends that
+    support prepared statements also get to skip the planning phase.
     """
 
 
     # types
     # exceptions
     from . import exceptions
+    # statements and their cache
+    from .Statement import Statement as statement
+    from .Statements import Statements as cache
 
 
     # constants
     providesHeaders = True
+    placeholder = "${}" # the format of the statement placeholders
 
 
     # traits
     sql = pyre.weaver.language(default=sql)
     sql.doc = "the generator of the SQL statements"
 
+    statements = pyre.properties.int(default=100)
+    statements.doc = "the number of prepared statements to cache; zero disables the cache"
+
+    batch = pyre.properties.int(default=1000)
+    batch.doc = "the number of records in each transaction of a bulk load"
+
+    fetch = pyre.properties.int(default=1000)
+    fetch.doc = "the number of rows retrieved at a time by streaming queries"
+
 
     # required interface
     @pyre.export
@@ -64,6 +87,26 @@ class Server(pyre.component, implements=datastore):
             "class {.__name__!r} must override 'execute'".format(type(self)))
 
 
+    def executePrepared(self, statement, parameters):
+        """
+        Execute the parameterized {statement} with the given {parameters}
+        """
+        raise NotImplementedError(
+            "class {.__name__!r} must override 'executePrepared'".format(type(self)))
+
+
+    def executeMany(self, statement, parameters):
+        """
+        Execute the parameterized {statement} once for each tuple in {parameters}
+        """
+        # go through the parameters
+        for values in parameters:
+            # execute the statement
+            self.executePrepared(statement, values)
+        # all done
+        return
+
+
     # convenience
     def createDatabase(self, name):
         """
@@ -111,10 +154,66 @@ class Server(pyre.component, implements=datastore):
         """
         # if there are no records to insert, bail
         if not records: return
-        # build the sql statements
-        sql = self.sql.insertRecords(*records)
-        # and execute
-        return self.execute(*sql)
+        # group consecutive records by their table and the fields that get their default value
+        for (table, defaults), group in itertools.groupby(records, key=self.layout):
+            # get the statement that inserts them
+            statement = self.prepare(
+                key=("INSERT", table, defaults),
+                render=lambda parameters: self.sql.insertStatement(
+                    table=table, defaults=defaults, parameters=parameters))
+            # and execute it for each record in the group
+            self.executeMany(
+                statement, (statement.parameters(record=record) for record in group))
+        # all done
+        return
+
+
+    def load(self, records, batch=None):
+        """
+        Insert {records}, an iterable of table records, in batches of {batch} records, each in
+        its own transaction; return a summary of the transfer
+
+        The records are pulled from {records} one batch at a time, so the memory footprint of
+        the transfer is bounded by the size of a batch, no matter how many records there are
+        """
+        # the channel for the progress reports
+        channel = journal.debug("pyre.db.load")
+        # normalize the batch size
+        batch = self.batch if batch is None else batch
+        # make sure i can pull the records one batch at a time
+        records = iter(records)
+        # initialize the counters
+        rows = 0
+        batches = 0
+        # start the clock
+        start = time.perf_counter()
+        # as long as there are records
+        while True:
+            # grab a batch
+            chunk = tuple(itertools.islice(records, batch))
+            # if there's nothing left
+            if not chunk:
+                # we are done
+                break
+            # in a transaction
+            with self:
+                # transfer the batch
+                self.loadBatch(records=chunk)
+            # update the counters
+            rows += len(chunk)
+            batches += 1
+            # show me
+            channel.log("batch {}: {} rows, {:.0f} rows/s".format(
+                batches, rows, self.rate(rows=rows, elapsed=time.perf_counter()-start)))
+        # stop the clock
+        elapsed = time.perf_counter() - start
+        # build the summary
+        return {
+            'rows': rows,
+            'batches': batches,
+            'elapsed': elapsed,
+            'rate': self.rate(rows=rows, elapsed=elapsed),
+            }
 
 
     def update(self, *specifications):
@@ -128,10 +227,13 @@ class Server(pyre.component, implements=datastore):
         """
         # go through the {specifications}
         for template, condition in specifications:
-            # build the sql statement for this update
-            sql = self.sql.updateRecords(template=template, condition=condition)
+            # make a statement
+            statement = self.statement(placeholder=self.placeholder)
+            # render the update
+            sql = self.sql.updateRecords(
+                template=template, condition=condition, parameters=statement)
             # and execute it
-            self.execute(*sql)
+            self.executeRendered(statement=statement, sql=sql)
         # all done
         return
 
@@ -140,20 +242,25 @@ class Server(pyre.component, implements=datastore):
         """
         Delete all {table} records that match {condition}
         """
-        # build the sql statements
-        sql = self.sql.deleteRecords(table=table, condition=condition)
+        # make a statement
+        statement = self.statement(placeholder=self.placeholder)
+        # render the deletion
+        sql = self.sql.deleteRecords(table=table, condition=condition, parameters=statement)
         # and execute
-        return self.execute(*sql)
+        return self.executeRendered(statement=statement, sql=sql)
 
 
-    def select(self, query):
+    def select(self, query, bindings=None):
         """
         Execute the given {query} and return the retrieved data
+
+        The values of the named parameters in the {WHERE} clause of {query} are looked up in
+        the mapping {bindings}
         """
-        # build the sql statements
-        sql = self.sql.select(query=query)
-        # execute them
-        results = iter(self.execute(*sql))
+        # get the statement
+        statement = self.selectStatement(query=query)
+        # execute it
+        results = iter(self.executePrepared(statement, statement.parameters(bindings=bindings)))
 
         # get the headers, if the server provides them; ignore them, for now, since the order
         # of the results matches exactly the field order, by construction
@@ -167,7 +274,40 @@ class Server(pyre.component, implements=datastore):
         return
 
 
+    def stream(self, query, bindings=None, batch=None):
+        """
+        Execute the given {query} and return the retrieved data, pulling {batch} rows at a time
+        from the back end
+
+        Unlike {select}, the result set is never held in memory in its entirety, so this is the
+        way to process queries whose results are too large to fit
+        """
+        # normalize the batch size
+        batch = self.fetch if batch is None else batch
+        # get the statement
+        statement = self.selectStatement(query=query)
+        # get the parameters
+        parameters = statement.parameters(bindings=bindings)
+        # go through the batches of rows
+        for rows in self.executeStream(statement, parameters, batch=batch):
+            # and each row in the batch
+            for row in rows:
+                # build a named tuple
+                yield query.pyre_immutable(data=row)
+        # all done
+        return
+
+
     # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # build my statement cache
+        self.prepared = self.cache(capacity=self.statements)
+        # all done
+        return
+
+
     # context manager support
     def __enter__(self):
         """
@@ -184,4 +324,131 @@ class Server(pyre.component, implements=datastore):
         return False
 
 
+    # implementation details
+    def prepare(self, key, render, guard=()):
+        """
+        Retrieve the cached statement indexed by {key}; if it is not there, or its {guard} has
+        changed, invoke {render} to build a new one
+        """
+        # look for it
+        statement = self.prepared.get(key=key, guard=guard)
+        # if it's there
+        if statement is not None:
+            # all done
+            return statement
+        # otherwise, make a new one
+        statement = self.statement(placeholder=self.placeholder, guard=guard)
+        # render it
+        statement.text = "\n".join(render(parameters=statement))
+        # if i'm caching statements
+        if self.statements > 0:
+            # let the back end prepare it
+            self.compile(statement)
+        # my configuration may have changed since the cache was built
+        self.prepared.capacity = self.statements
+        # cache it, and release the statements that were evicted to make room for it
+        for evicted in self.prepared.add(key=key, statement=statement):
+            # by letting the back end know they are no longer needed
+            self.release(evicted)
+        # all done
+        return statement
+
+
+    def selectStatement(self, query):
+        """
+        Retrieve the statement for {query}; it must be rebuilt if the restriction or the ordering
+        of the query have changed since it was cached
+        """
+        # easy enough
+        return self.prepare(
+            key=("SELECT", query if isinstance(query, type) else type(query)),
+            guard=(getattr(query, "where", None), getattr(query, "order", None)),
+            render=lambda parameters: self.sql.select(query=query, parameters=parameters))
+
+
+    def executeStream(self, statement, parameters, batch):
+        """
+        Execute the parameterized {statement} and generate batches of at most {batch} rows
+
+        Back ends that can retrieve results incrementally should override this; by default,
+        the entire result set is retrieved and then carved up
+        """
+        # execute the statement
+        results = iter(self.executePrepared(statement, parameters))
+        # skip the headers, if the server provides them
+        if self.providesHeaders: next(results)
+        # carve up the results
+        while True:
+            # grab a batch
+            rows = tuple(itertools.islice(results, batch))
+            # if there's nothing left
+            if not rows:
+                # we are done
+                break
+            # otherwise, hand it over
+            yield rows
+        # all done
+        return
+
+
+    def executeRendered(self, statement, sql):
+        """
+        Execute a freshly rendered {statement}, reusing the prepared statement with the same
+        text, if there is one
+        """
+        # render the statement
+        statement.text = "\n".join(sql)
+        # look up the prepared statement with the same text
+        prepared = self.prepare(key=statement.text, render=lambda parameters: (statement.text,))
+        # execute it, with the parameters collected while rendering
+        return self.executePrepared(prepared, statement.parameters())
+
+
+    def loadBatch(self, records):
+        """
+        Transfer a batch of {records} to the back end
+        """
+        # insert them
+        return self.insert(*records)
+
+
+    def rate(self, rows, elapsed):
+        """
+        Compute the number of rows per second transferred by a bulk load
+        """
+        # easy enough
+        return rows / elapsed if elapsed > 0 else 0
+
+
+    def layout(self, record):
+        """
+        Extract the table of {record} and mark the fields that must get their default value
+        """
+        # get the table
+        table = record.pyre_layout
+        # and mark the fields
+        return table, tuple(value is table.default for value in record)
+
+
+    def compile(self, statement):
+        """
+        Hook that lets the back end prepare {statement} before it is cached
+        """
+        # nothing to do, by default
+        return statement
+
+
+    def release(self, statement):
+        """
+        Hook that lets the back end release the resources of {statement} once it is evicted from
+        the cache
+        """
+        # nothing to do, by default
+        return statement
+
+
+    # private data
+    prepared = None # the statement cache
+
+
 # end of file
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+from . import literals, exceptions
+
+
+# declaration
+class Statement:
+    """
+    An SQL statement whose values are supplied separately from its text
+
+    The SQL mill renders values as placeholders by calling {bind}, which records where the value
+    comes from: a field of the record being inserted, a named {Parameter} whose value is
+    supplied when the statement is executed, or a value that is fixed when the statement is
+    rendered. Servers cache statements and call {parameters} to assemble the values that go with
+    each execution.
+    """
+
+
+    # public data
+    text = None # the text of the statement, with placeholders for its values
+    name = None # the name of the statement in the back end, if it has been prepared
+    guard = () # the parts of the statement specification that must not change
+
+
+    # interface
+    def bind(self, value=None, index=None, field=None):
+        """
+        Record a new value and return the placeholder that stands for it in the statement text;
+        return {None} for values that must be rendered inline
+        """
+        # the {pyre.db} literals are SQL keywords
+        if isinstance(value, literals.Literal):
+            # so they can't be parameters
+            return None
+        # otherwise, record the value source
+        self.slots.append((index, field, value))
+        # and build the placeholder
+        return self.placeholder.format(len(self.slots))
+
+
+    def parameters(self, record=None, bindings=None):
+        """
+        Assemble the values of my placeholders given a {record} and the {bindings} of my named
+        parameters
+        """
+        # if i was given a record
+        if record is not None:
+            # extract its values
+            record = tuple(record)
+        # the values
+        values = []
+        # go through my slots
+        for index, field, value in self.slots:
+            # if this is a record field
+            if index is not None:
+                # get its value
+                value = record[index]
+                # and convert it
+                value = None if value is literals.null else field.parameter(value)
+            # if it is a named parameter
+            elif isinstance(value, literals.Parameter):
+                # attempt to
+                try:
+                    # look up its value
+                    value = bindings[value.name]
+                # if it's not there
+                except (KeyError, TypeError):
+                    # complain
+                    raise exceptions.ProgrammingError(
+                        command=self.text,
+                        diagnostic="no value for parameter {!r}".format(value.name))
+            # add it to the pile
+            values.append(value)
+        # all done
+        return tuple(values)
+
+
+    # meta-methods
+    def __init__(self, placeholder, guard=(), **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the format of my placeholders
+        self.placeholder = placeholder
+        # and my guard
+        self.guard = guard
+        # initialize the value sources
+        self.slots = []
+        # all done
+        return
+
+
+    def __str__(self):
+        # render my text
+        return self.text
+
+
+    # private data
+    slots = None # the sources of the values of my placeholders
+    placeholder = None # the format of my placeholders
+
+
+# end of file
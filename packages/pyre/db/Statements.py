@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import collections
+
+
+# class declaration
+class Statements:
+    """
+    A cache of the parameterized statements built by a server
+
+    Entries are indexed by a key that captures the structure of the statement, e.g. the query
+    or the table it was built from, and are checked against the {guard} of the statement every
+    time they are retrieved. The least recently used entries are evicted when the cache grows
+    past its {capacity}, and handed back to the server so it can release whatever resources the
+    back end has allocated for them.
+    """
+
+
+    # public data
+    hits = 0 # the number of lookups that found a current entry
+    misses = 0 # the number of lookups that didn't
+    capacity = 0 # the maximum number of entries
+
+
+    # interface
+    def get(self, key, guard=()):
+        """
+        Retrieve the statement indexed by {key}, provided it was built with the same {guard}
+        """
+        # look for the entry
+        statement = self.entries.get(key)
+        # if it's there and it's current
+        if statement is not None and self.current(statement.guard, guard):
+            # mark it as the most recently used
+            self.entries.move_to_end(key)
+            # update the counter
+            self.hits += 1
+            # and hand it over
+            return statement
+        # otherwise, update the counter
+        self.misses += 1
+        # and let the caller know
+        return None
+
+
+    def add(self, key, statement):
+        """
+        Store {statement} under {key}; return the statements that were evicted to make room
+        for it
+        """
+        # the statements that are no longer in the cache
+        evicted = []
+        # look for an existing entry
+        old = self.entries.pop(key, None)
+        # if there was one and it's a different statement
+        if old is not None and old is not statement:
+            # it's gone
+            evicted.append(old)
+        # if there is no room for anything
+        if self.capacity <= 0:
+            # nothing else to do
+            return evicted
+        # store the new one
+        self.entries[key] = statement
+        # and make room for it
+        while len(self.entries) > self.capacity:
+            # by removing the oldest entry
+            _, old = self.entries.popitem(last=False)
+            # and adding it to the pile
+            evicted.append(old)
+        # all done
+        return evicted
+
+
+    def clear(self):
+        """
+        Remove all entries and return them
+        """
+        # get the entries
+        statements = tuple(self.entries.values())
+        # clear the index
+        self.entries.clear()
+        # and return the statements
+        return statements
+
+
+    # meta-methods
+    def __init__(self, capacity, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my capacity
+        self.capacity = capacity
+        # the index of entries, in the order they were used
+        self.entries = collections.OrderedDict()
+        # all done
+        return
+
+
+    def __len__(self):
+        """
+        Compute the number of entries
+        """
+        # easy enough
+        return len(self.entries)
+
+
+    # implementation details
+    def current(self, old, new):
+        """
+        Check whether the guards {old} and {new} refer to the same objects
+        """
+        # guards are tuples of the parts of the statement specification
+        return len(old) == len(new) and all(o is n for o, n in zip(old, new))
+
+
+    # private data
+    entries = None # the index of entries
+
+
+# end of file
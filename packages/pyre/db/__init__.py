@@ -12,7 +12,7 @@ Machinery for building connections to database back ends
 
 
 # the literals
-from .literals import null, default
+from .literals import null, default, Parameter as parameter
 # cascade action markers for foreign keys
 from .actions import noAction, restrict, cascade, setNull, setDefault
 
@@ -76,6 +76,8 @@ from .Client import Client as client
 from .Backup import Backup as backup
 from .SQLite import SQLite as sqlite
 from .Postgres import Postgres as postgres
+# connection pools
+from .Pool import Pool as pool
 
 
 # templates: table rows with all fields set to None; used to update table entries
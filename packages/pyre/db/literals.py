@@ -23,6 +23,31 @@ class Literal(node.literal):
     def __repr__(self): return self.value
 
 
+# named placeholders
+class Parameter:
+    """
+    A placeholder for a value that is supplied when the statement that refers to it is executed
+    """
+
+    # interface
+    def sql(self):
+        # render as a named placeholder
+        return ":" + self.name
+
+    # meta-methods
+    def __init__(self, name, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my name
+        self.name = name
+        # all done
+        return
+
+    # my representations
+    def __str__(self): return self.sql()
+    def __repr__(self): return "parameter({!r})".format(self.name)
+
+
 # the constants
 null = Literal(value='NULL')
 default = Literal(value='DEFAULT')
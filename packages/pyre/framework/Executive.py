@@ -41,6 +41,7 @@ class Executive:
     configurator = None # configuration sources and events
     linker = None # the pyre plug-in manager
     timekeeper = None # the timer registry
+    snapshot = None # the persistent cache of configuration events; opt-in
 
     # the runtime environment; patched during discovery
     host = None
@@ -456,6 +457,36 @@ class Executive:
         return Schema(**kwds)
 
 
+    def newSnapshot(self, **kwds):
+        """
+        Build the persistent cache of configuration events, if the user has asked for one
+        """
+        # check whether the user has asked for a snapshot
+        try:
+            # by setting {pyre_snapshot} to {True} or a path in the {__main__} module
+            import __main__
+            request = __main__.pyre_snapshot
+        # if not
+        except AttributeError:
+            # nothing to build
+            return None
+        # if the request is trivial
+        if not request:
+            # nothing to build
+            return None
+        # figure out where the snapshot lives
+        path = self.fileserver.DOT_PYRE / 'snapshot.pickle' if request is True else request
+        # access the factory
+        from ..config.Snapshot import Snapshot
+        # build one
+        snapshot = Snapshot(path=path, **kwds)
+        # arrange for it to be saved when the process exits
+        import atexit
+        atexit.register(snapshot.save)
+        # and return it
+        return snapshot
+
+
     def newTimerRegistry(self, **kwds):
         """
         Build a new time registrar
@@ -508,7 +539,7 @@ class Executive:
         from ..platforms import platform
         # get the host class record; the default value already contains all we could discover
         # about the type of machine we are running on
-        host = platform().default()
+        host = self.discoverHost(protocol=platform)
 
         # hunt down the distribution configuration file and load it
         # make a locator
@@ -583,6 +614,56 @@ class Executive:
         return self
 
 
+    def discoverHost(self, protocol):
+        """
+        Identify the host class record, consulting the snapshot of previous discoveries first
+        """
+        # get the snapshot
+        snapshot = self.snapshot
+        # if there isn't one
+        if snapshot is None:
+            # ask the {protocol} for its default implementation
+            return protocol().default()
+
+        # the discovery depends on the configuration processed so far, and on the command line
+        # that may name a different host implementation
+        import sys
+        key = (snapshot.digest, tuple(sys.argv))
+        # look for a previous discovery
+        record = snapshot.retrieve(category='host', key=key)
+        # if there is one
+        if record is not None:
+            # unpack it
+            module, name, attributes = record
+            # attempt to
+            try:
+                # import the module
+                import importlib
+                # and retrieve the host class record
+                host = getattr(importlib.import_module(module), name)
+            # if anything goes wrong
+            except (ImportError, AttributeError):
+                # no worries; do it the hard way
+                pass
+            # if all went well
+            else:
+                # restore the discovered attributes
+                for attribute, value in attributes.items():
+                    setattr(host, attribute, value)
+                # and return the host class record
+                return host
+
+        # ask the {protocol} for its default implementation
+        host = protocol().default()
+        # build the record of the discovery
+        attributes = {name: getattr(host, name) for name in ('release', 'codename')}
+        # and save it
+        snapshot.remember(
+            category='host', key=key, value=(host.__module__, host.__name__, attributes))
+        # all done
+        return host
+
+
     def initializeNamespaces(self):
         """
         Create and initialize the default namespace entries
@@ -25,6 +25,7 @@ class Linker:
     # public data
     codecs = None
     shelves = None
+    indices = None
 
 
     # support for framework requests
@@ -125,6 +126,8 @@ class Linker:
 
         # the map from uris to known shelves
         self.shelves = {}
+        # the map from codecs to the indices they use to prune their candidate shelves
+        self.indices = {}
         # setup my default codecs and initialize my scheme index
         codecs, schemes = self.indexDefaultCodecs()
         # save them
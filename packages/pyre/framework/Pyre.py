@@ -94,6 +94,8 @@ class Pyre(Executive):
         # attach
         dashboard.pyre_registrar = weakref.proxy(self.registrar)
 
+        # the persistent cache of configuration events, if the user has asked for one
+        self.snapshot = self.newSnapshot()
         # handler of configuration events
         self.configurator = self.newConfigurator(executive=self)
         # attach
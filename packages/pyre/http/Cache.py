@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import gzip
+import collections
+
+
+# class declaration
+class Cache:
+    """
+    An in-process cache of the documents that a server delivers from the application filesystem
+
+    Entries are indexed by the document uri and hold its validators, i.e. its entity tag and the
+    time it was last modified, and, for documents that are small enough, its contents and
+    optionally a compressed variant. Entries are checked against the size and modification time
+    of the file every time they are retrieved, and rebuilt when the file changes. The least
+    recently used entries are evicted whenever the cache grows past the memory budget of the
+    server.
+    """
+
+
+    # public data
+    hits = 0 # the number of requests that found a current entry
+    misses = 0 # the number of requests that had to build one
+    footprint = 0 # the number of bytes held by the cache
+
+
+    # interface
+    def lookup(self, server, uri, node):
+        """
+        Retrieve the entry for the document at {uri}, served by {server} from the filesystem
+        {node}; return {None} if the filesystem doesn't keep track of the file metadata
+
+        Files on the local disk that are gone, or can't be read, raise {OSError}, or the
+        {GenericError} of their filesystem
+        """
+        # get the file metadata
+        modified, size = self.stat(node=node)
+        # if it's not available
+        if modified is None or size is None:
+            # there is nothing to validate against
+            return None
+
+        # look for the entry
+        entry = self.entries.get(uri)
+        # if it's there and it's current
+        if entry is not None and entry.modified == modified and entry.size == size:
+            # mark it as the most recently used
+            self.entries.move_to_end(uri)
+            # update the counter
+            self.hits += 1
+            # and hand it over
+            return entry
+
+        # otherwise, update the counter
+        self.misses += 1
+        # if there is a stale entry
+        if entry is not None:
+            # discard it
+            self.discard(uri=uri)
+        # build a new one
+        entry = self.build(server=server, node=node, modified=modified, size=size)
+        # charge it
+        entry.footprint = len(uri) + len(entry.body or b'') + len(entry.gzip or b'')
+        # if it fits in the budget
+        if entry.footprint <= server.budget:
+            # store it
+            self.entries[uri] = entry
+            # update the footprint
+            self.footprint += entry.footprint
+            # and make room for it
+            self.evict(budget=server.budget)
+        # hand it over
+        return entry
+
+
+    def discard(self, uri):
+        """
+        Remove the entry for the document at {uri}
+        """
+        # remove the entry
+        entry = self.entries.pop(uri, None)
+        # if it was there
+        if entry is not None:
+            # update the footprint
+            self.footprint -= entry.footprint
+        # all done
+        return
+
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        # clear the index
+        self.entries.clear()
+        # and reset the footprint
+        self.footprint = 0
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the index of entries, in the order they were used
+        self.entries = collections.OrderedDict()
+        # all done
+        return
+
+
+    def __len__(self):
+        """
+        Compute the number of entries
+        """
+        # easy enough
+        return len(self.entries)
+
+
+    # implementation details
+    def stat(self, node):
+        """
+        Get the modification time and size of the file associated with {node}
+        """
+        # get the node metadata
+        info = node.info
+        # get the location of the file on the local disk
+        location = getattr(info, 'uri', None)
+        # if it's not there
+        if location is None or not hasattr(location, 'stat'):
+            # use whatever the filesystem recorded
+            return getattr(info, 'modificationTime', None), getattr(info, 'size', None)
+        # otherwise, refresh the metadata, in case the file has changed since the filesystem was
+        # explored; files that are gone raise {OSError}, which is the caller's problem
+        meta = location.stat()
+        # otherwise, use the fresh metadata
+        return meta.st_mtime, meta.st_size
+
+
+    def build(self, server, node, modified, size):
+        """
+        Build the entry for the file at {node}
+        """
+        # make one
+        entry = self._entry(modified=modified, size=size)
+        # if the server wants a digest of the contents in the entity tag
+        if server.digest and size > 0:
+            # ask the filesystem for one
+            digest = node.checksum()
+        # otherwise
+        else:
+            # don't bother
+            digest = None
+        # if the filesystem knows how to compute a digest
+        if isinstance(digest, bytes):
+            # use it
+            entry.tag = '"{}"'.format(digest[:16].hex())
+        # otherwise
+        else:
+            # use the size and the modification time
+            entry.tag = '"{:x}-{:x}"'.format(size, int(modified * 1e6))
+
+        # if the file is too big to keep in memory
+        if size > self.LARGEST or size > server.budget:
+            # leave it on disk
+            return entry
+
+        # otherwise, read it
+        with node.open(mode='rb') as stream:
+            # and save its contents
+            entry.body = stream.read()
+        # if the server offers compressed variants
+        if server.compress:
+            # make one
+            compressed = gzip.compress(entry.body, compresslevel=self.COMPRESSION)
+            # if it's worth it
+            if len(compressed) < len(entry.body):
+                # save it
+                entry.gzip = compressed
+
+        # all done
+        return entry
+
+
+    def evict(self, budget):
+        """
+        Remove the least recently used entries until my footprint fits in the {budget}
+        """
+        # get the index
+        entries = self.entries
+        # as long as i'm over budget
+        while self.footprint > budget and entries:
+            # remove the oldest entry
+            _, entry = entries.popitem(last=False)
+            # and update the footprint
+            self.footprint -= entry.footprint
+        # all done
+        return
+
+
+    # private types
+    class _entry:
+        """Encapsulate the validators and the contents of a document"""
+
+        def __init__(self, modified, size):
+            self.modified = modified
+            self.size = size
+            self.tag = None
+            self.body = None
+            self.gzip = None
+            self.footprint = 0
+            return
+
+        __slots__ = ('modified', 'size', 'tag', 'body', 'gzip', 'footprint')
+
+
+    # private data
+    entries = None # the index of entries
+    # constants
+    LARGEST = 1024 * 1024 # files bigger than this are sent straight from the disk
+    COMPRESSION = 6 # the compression level of the compressed variants
+
+
+# end of file
@@ -12,9 +12,13 @@ PACKAGE = http
 
 # python packages
 EXPORT_PYTHON_MODULES = \
+    Cache.py \
+    Outbox.py \
+    Prefork.py \
     Request.py \
     Response.py \
     Server.py \
+    Worker.py \
     documents.py \
     exceptions.py \
     responses.py \
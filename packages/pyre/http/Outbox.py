@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import collections
+
+
+# class declaration
+class Outbox:
+    """
+    The responses that are waiting to be written to a client, in the order its requests arrived
+
+    Each response is a sequence of segments, as generated by the renderer of the server. Byte
+    strings are written as the channel can take them, without ever blocking; open files are
+    transferred directly from the file to the channel using {os.sendfile}, when the platform
+    supports it. Segments are pulled from a response only when the previous one has been
+    written, so responses that are generated on the fly are never assembled in memory.
+    """
+
+
+    # public data
+    waiting = False # am i waiting for the channel to drain?
+    closing = False # should the connection close once i'm done?
+
+
+    # interface
+    def push(self, head, segments, final=False):
+        """
+        Queue a response that starts with {head} and continues with {segments}; if {final} is
+        set, the connection closes once this response has been written
+        """
+        # add it to the pile
+        self.responses.append([head, segments, final])
+        # all done
+        return
+
+
+    def flush(self, channel):
+        """
+        Write as much as {channel} will take without blocking; return {True} if there is more
+        left to write
+        """
+        # for as long as it takes
+        while True:
+            # if i don't have a segment in progress and there isn't another one
+            if self.view is None and self.file is None and not self.advance():
+                # i'm done
+                return False
+            # attempt to
+            try:
+                # write the current segment
+                sent = self.write(channel=channel)
+            # if the channel can't take any more
+            except BlockingIOError:
+                # wait until it drains
+                return True
+            # if this was a byte string
+            if self.view is not None:
+                # skip the part that made it through
+                self.view = self.view[sent:]
+                # if there is nothing left
+                if not len(self.view):
+                    # move on
+                    self.view = None
+                # either way, try some more
+                continue
+            # otherwise, it's a file; update the cursor
+            self.offset += sent
+            self.remaining -= sent
+            # if we are done with it, or it got shorter under us
+            if self.remaining <= 0 or sent == 0:
+                # close it
+                self.file.close()
+                # and move on
+                self.file = None
+
+
+    def close(self):
+        """
+        Discard everything that hasn't been written yet
+        """
+        # if i have a file in progress
+        if self.file is not None:
+            # close it
+            self.file.close()
+        # clear the segment in progress
+        self.view = self.file = None
+        # go through the pending responses
+        for _, segments, _ in self.responses:
+            # if the response knows how to clean up after itself
+            if hasattr(segments, 'close'):
+                # let it
+                segments.close()
+        # and forget them
+        self.responses.clear()
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the pile of responses
+        self.responses = collections.deque()
+        # all done
+        return
+
+
+    def __len__(self):
+        # the number of responses that haven't been written completely
+        return len(self.responses)
+
+
+    # implementation details
+    def advance(self):
+        """
+        Get the next segment ready for writing; return {False} if there are none left
+        """
+        # go through the responses
+        while self.responses:
+            # get the oldest one
+            response = self.responses[0]
+            # unpack
+            head, segments, final = response
+            # if its head hasn't been written yet
+            if head is not None:
+                # it's next
+                segment = head
+                # mark it as done
+                response[0] = None
+            # otherwise
+            else:
+                # pull the next segment from the body
+                segment = next(segments, None)
+            # if there was one
+            if segment is not None:
+                # prepare it; if it's not empty
+                if self.prepare(segment=segment):
+                    # we have something to write
+                    return True
+                # otherwise, look for another one
+                continue
+            # if we get this far, the response is complete; remove it from the pile
+            self.responses.popleft()
+            # if it's the last one on this connection
+            if final:
+                # mark me
+                self.closing = True
+                # discard anything that came after it
+                self.close()
+        # nothing left
+        return False
+
+
+    def prepare(self, segment):
+        """
+        Set up the transfer of {segment}; return {False} if there is nothing to transfer
+        """
+        # if the segment is not a file
+        if not hasattr(segment, 'read'):
+            # make a flat view of it, so slicing doesn't copy
+            self.view = memoryview(segment).cast('B')
+            # and check whether there's anything in it
+            if len(self.view):
+                # there is
+                return True
+            # otherwise, discard it
+            self.view = None
+            # and let the caller know
+            return False
+
+        # if the platform can transfer the file directly
+        if self.sendfile is not None:
+            # attempt to
+            try:
+                # get the position of the file cursor
+                offset = segment.tell()
+                # and the size of the file
+                size = os.fstat(segment.fileno()).st_size
+            # if the file is not backed by a descriptor
+            except OSError:
+                # we will have to read it
+                pass
+            # if all went well
+            else:
+                # set up the transfer
+                self.file = segment
+                self.offset = offset
+                self.remaining = size - offset
+                # if there is something to send
+                if self.remaining > 0:
+                    # we are all set
+                    return True
+                # otherwise, close the file
+                segment.close()
+                # clear my state
+                self.file = None
+                # and let the caller know
+                return False
+
+        # if we get this far, read the file
+        page = segment.read()
+        # close it
+        segment.close()
+        # and send its contents along
+        return self.prepare(segment=page)
+
+
+    def write(self, channel):
+        """
+        Write as much of the segment in progress as {channel} will take
+        """
+        # if it's a byte string
+        if self.view is not None:
+            # send it
+            return channel.send(self.view)
+        # otherwise, it's a file; have the kernel copy it
+        return self.sendfile(channel.fileno(), self.file.fileno(), self.offset, self.remaining)
+
+
+    # private data
+    responses = None # the responses that haven't been written yet
+    view = None # the byte string in progress
+    file = None # the file in progress
+    offset = 0 # the location of the next byte to send from the file in progress
+    remaining = 0 # the number of bytes left to send from the file in progress
+    # zero-copy transfers, on the platforms that support it
+    sendfile = staticmethod(os.sendfile) if hasattr(os, 'sendfile') else None
+
+
+# end of file
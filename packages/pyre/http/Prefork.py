@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import signal
+import itertools
+import collections
+# support
+import pyre
+# base class
+from pyre.nexus.Peer import Peer
+# my protocol
+from pyre.nexus.Team import Team
+# my user configurable state
+from pyre.nexus.Recruiter import Recruiter
+
+
+# declaration
+class Prefork(Peer, family='pyre.nexus.teams.prefork', implements=Team):
+    """
+    A team of worker processes that serve http requests on a shared port
+
+    The team binds the port of its {server} once, and then clones {size} worker processes that
+    inherit it and take turns accepting connections on it, each with its own event loop. The
+    team itself never touches a request: it keeps the team at full strength, replacing workers
+    that exit unexpectedly, and, every {interval}, collects the reports of its workers and
+    samples the total number of requests they served; {statistics} summarizes them, along with
+    the request rate of the team over the last few samples.
+
+    Workers are replaced gracefully: they are dismissed, stop accepting connections, and exit
+    once the requests in progress are done, or when their {grace} period runs out, while their
+    replacements are already accepting connections on the same port. This is how workers are
+    recycled after serving {quota} requests, and how {reload} replaces the entire team, which
+    is what happens when the team receives {SIGHUP}; {SIGTERM} shuts the team down.
+    """
+
+
+    # constants
+    from pyre.units.SI import second
+
+
+    # types
+    from .Worker import Worker as crew
+
+
+    # user configurable state
+    size = pyre.properties.int(default=os.cpu_count() or 1)
+    size.doc = 'the number of worker processes'
+
+    recruiter = Recruiter()
+    recruiter.doc = 'the strategy for recruiting worker processes'
+
+    interval = pyre.properties.dimensional(default=1*second)
+    interval.doc = 'the interval between the reports of the worker processes'
+
+    quota = pyre.properties.int(default=0)
+    quota.doc = 'the number of requests after which a worker is replaced; zero for no limit'
+
+    grace = pyre.properties.dimensional(default=10*second)
+    grace.doc = 'the time dismissed workers have to finish the requests in progress'
+
+
+    # public data
+    server = None # the server that my workers run
+    application = None # the application context of the server
+    timeout = None # workers serve requests without a time limit
+
+
+    # protocol obligations
+    @pyre.export
+    def assemble(self, workplan=None, **kwds):
+        """
+        Recruit workers to take the team to full strength
+        """
+        # recruit
+        self.recruit()
+        # show me
+        self.debug.log('team of {} workers, {} active'.format(self.size, len(self.active)))
+        # all done
+        return self
+
+
+    @pyre.export
+    def vacancies(self):
+        """
+        Compute how may recruits are needed to take the team to full strength
+        """
+        # if i'm shutting down
+        if self.stopping:
+            # there are none
+            return 0
+        # otherwise, compare the current team size with my target
+        return self.size - len(self.registered) - len(self.active)
+
+
+    # life cycle
+    @pyre.export
+    def prepare(self):
+        """
+        Bind the port and assemble the team
+        """
+        # bind the port of the server before cloning any workers, so they all share it
+        port = self.server.bind()
+        # make sure that workers that lose the race for a connection don't block
+        port.channel.setblocking(False)
+        # take over reloads and terminations
+        signal.signal(signal.SIGHUP, self.handleSignal)
+        signal.signal(signal.SIGTERM, self.handleSignal)
+        # recruit
+        self.assemble()
+        # start sampling
+        self.dispatcher.alarm(interval=self.interval, call=self.sample)
+        # all done
+        return
+
+
+    @pyre.export
+    def shutdown(self):
+        """
+        Dismiss all workers and wait for them to exit
+        """
+        # mark me
+        self.stopping = True
+        # dismiss everybody
+        for crew in tuple(itertools.chain(self.registered, self.active)):
+            self.dismiss(crew=crew)
+        # if there are workers that are still finishing up
+        if self.retiring:
+            # wait until they are gone
+            self.dispatcher.watch()
+        # all done
+        return super().shutdown()
+
+
+    # interface
+    def reload(self):
+        """
+        Replace all my workers with a fresh generation
+        """
+        # show me
+        self.debug.log('reloading')
+        # go through the current generation
+        for crew in tuple(itertools.chain(self.registered, self.active)):
+            # dismiss
+            self.dismiss(crew=crew)
+        # and recruit the replacements
+        return self.recruit()
+
+
+    def statistics(self):
+        """
+        Summarize the work of the team
+        """
+        # the workers that are still around
+        crews = tuple(itertools.chain(self.registered, self.active, self.retiring))
+        # get the total number of requests and connections
+        requests = self.served + sum(crew.requests for crew in crews)
+        connections = self.accepted + sum(crew.connections for crew in crews)
+        # build the summary
+        return {
+            'workers': { crew.pid: crew.statistics for crew in crews },
+            'retired': self.retired,
+            'requests': requests,
+            'connections': connections,
+            'rate': self.rate(),
+            }
+
+
+    def rate(self):
+        """
+        Compute the number of requests per second served by the team over the last few samples
+        """
+        # if i don't have enough samples
+        if len(self.samples) < 2:
+            # i can't tell
+            return 0
+        # get the oldest and the most recent ones
+        (start, first), (end, last) = self.samples[0], self.samples[-1]
+        # and compute the rate
+        return (last - first) / (end - start) if end > start else 0
+
+
+    # meta-methods
+    def __init__(self, server=None, application=None, crew=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the server and its application context
+        self.server = server
+        self.application = application
+        # if i were given a non-trivial crew factory
+        if crew is not None:
+            # attach it
+            self.crew = crew
+        # initialize my crew registries
+        self.registered = set()
+        self.active = set()
+        self.retiring = set()
+        # and the samples of the total number of requests served
+        self.samples = collections.deque(maxlen=self.SAMPLES)
+        # all done
+        return
+
+
+    # implementation details
+    def recruit(self, **kwds):
+        """
+        Bring the team to full strength
+        """
+        # get my recruiter to recruit some workers
+        for crew in self.recruiter.recruit(
+                team=self, server=self.server, application=self.application,
+                interval=self.interval, grace=self.grace, **kwds):
+            # register them
+            self.registered.add(crew)
+        # all done
+        return self
+
+
+    def activate(self, crew):
+        """
+        The {crew} member has sent in its first report
+        """
+        # if it's been dismissed already
+        if crew not in self.registered:
+            # leave it alone
+            return self
+        # upgrade its status from registered
+        self.registered.remove(crew)
+        # to active
+        self.active.add(crew)
+        # all done
+        return self
+
+
+    def dismiss(self, crew):
+        """
+        Dismiss the {crew} member
+        """
+        # let it know
+        crew.dismissed()
+        # and let the recruiter know
+        self.recruiter.dismiss(team=self, crew=crew)
+        # remove it from the roster
+        self.registered.discard(crew)
+        self.active.discard(crew)
+        # and wait for it to finish up
+        self.retiring.add(crew)
+        # all done
+        return self
+
+
+    def lose(self, crew, error=None):
+        """
+        The connection to the {crew} member was lost
+        """
+        # if it's been taken care of already
+        if crew.finish is not None:
+            # nothing to do
+            return self
+        # clean up
+        crew.resign()
+        # add its work to the totals
+        self.served += crew.requests
+        self.accepted += crew.connections
+        self.retired += 1
+        # if it was dismissed
+        if crew in self.retiring:
+            # this was expected
+            self.retiring.discard(crew)
+            # all done
+            return self
+        # otherwise, show me
+        self.warning.log('lost worker {.pid}'.format(crew))
+        # let the recruiter know
+        self.recruiter.dismiss(team=self, crew=crew)
+        # remove it from the roster
+        self.registered.discard(crew)
+        self.active.discard(crew)
+        # and recruit a replacement
+        return self.recruit()
+
+
+    def handleSignal(self, number, frame):
+        """
+        Handle reloads and terminations
+
+        N.B.: this is a signal handler; it just makes a note of what needs to be done, and the
+        next {sample} takes care of it
+        """
+        # if this is a reload
+        if number == signal.SIGHUP:
+            # make a note
+            self.reloading = True
+        # otherwise
+        else:
+            # stop processing events
+            self.stop()
+        # all done
+        return
+
+
+    def sample(self, **kwds):
+        """
+        Check on the workers, and sample the number of requests they have served
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # get the time
+        now = self.timer.lap()
+        # if i was asked to reload
+        if self.reloading:
+            # do it
+            self.reloading = False
+            self.reload()
+        # if my workers have a quota
+        if self.quota:
+            # go through the active ones
+            for crew in tuple(self.active):
+                # if this one has served its share
+                if crew.requests >= self.quota:
+                    # replace it
+                    self.dismiss(crew=crew)
+                    self.recruit()
+        # go through the workers that are finishing up
+        for crew in self.retiring:
+            # if this one has exceeded its grace period by a lot
+            if now - crew.dismissal > 2 * self.grace / self.second:
+                # terminate it; it's removed from the team when its connection drops
+                self.recruiter.terminate(team=self, crew=crew)
+        # record the total number of requests served
+        self.samples.append((now, self.statistics()['requests']))
+        # if i'm shutting down and everybody is gone
+        if self.stopping and not self.retiring:
+            # don't reschedule
+            return None
+        # otherwise, do it again after a while
+        return self.interval
+
+
+    # private data
+    registered = None # the workers that haven't sent in their first report yet
+    active = None # the workers that are accepting connections
+    retiring = None # the workers that were dismissed but haven't exited yet
+    samples = None # the recent samples of the total number of requests served
+    served = 0 # the number of requests served by the workers that exited
+    accepted = 0 # the number of connections accepted by the workers that exited
+    retired = 0 # the number of workers that exited
+    stopping = False # am i shutting down?
+    reloading = False # was i asked to reload?
+    # constants
+    SAMPLES = 10 # the number of samples used to compute the request rate
+
+
+# end of file
@@ -36,50 +36,101 @@ class Request:
         """
         Process a {chunk} of bytes
         """
-        # if we are still doing headers, pull them from the chunk
-        offset = self.extractHeaders(server=server, chunk=chunk)
+        # add the chunk to the bytes that haven't been processed yet
+        self.buffer += chunk
+        # if we are still doing headers, pull them from the buffer; if they haven't arrived yet
+        if not self.extractHeaders(server=server):
+            # wait for more
+            return False
         # whatever is left is request payload
-        return self.extractPayload(server=server, chunk=chunk, offset=offset)
+        return self.extractPayload(server=server)
+
+
+    def residue(self):
+        """
+        Retrieve the bytes that arrived after the end of my payload
+
+        Clients that pipeline their requests send them back to back, so these bytes are the
+        beginning of the next request on the same connection
+        """
+        # easy enough
+        return bytes(self.buffer)
+
+
+    @property
+    def persistent(self):
+        """
+        Check whether the client expects the connection to stay open after it gets its response
+        """
+        # get the connection header
+        connection = self.headers.get('Connection', '').lower()
+        # HTTP/1.1 connections are persistent unless the client says otherwise
+        if self.version >= (1,1):
+            # so check for that
+            return connection != 'close'
+        # earlier clients must ask explicitly
+        return connection == 'keep-alive'
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the bytes that have arrived but haven't been processed yet
+        self.buffer = bytearray()
+        # all done
+        return
 
 
     # implementation details
-    def extractHeaders(self, server, chunk):
+    def extractHeaders(self, server):
         """
         Extract RFC2822 headers from the bytes sent by the peer
         """
         # if i am done processing headers
         if self.described:
-            # bail and indicate that no bytes from {chunk} were consumed
-            return 0
+            # nothing further to do
+            return True
+
+        # get my buffer
+        buffer = self.buffer
+        # look for the blank line that marks the end of the headers
+        end = self.terminator.search(buffer)
+        # if it's not there
+        if not end:
+            # and the client has sent more than a reasonable amount of headers
+            if len(buffer) > self.MAX_HEADER_BYTES:
+                # complain
+                raise self.responses.RequestHeaderFieldsTooLarge(server=server)
+            # otherwise, wait for the rest
+            return False
 
+        # the headers must not extend past it, lest we wander into the request that follows
+        limit = end.end()
         # get my header encoding
         encoding = self.HEADER_ENCODING
 
-        # a cursor into {chunk}
-        offset = 0
-        # if i don't know my command yet
-        if not self.command:
-            # this is a brand new request
-            match = self.protocol.match(chunk)
-            # if it didn't match
-            if not match:
-                # complain
-                raise self.responses.BadRequestSyntax(server=server)
-            # otherwise, unpack
-            command, url, major, minor = match.groups()
-            # and store
-            self.command = command.decode(encoding)
-            self.url = urllib.parse.unquote(url.decode(encoding))
-            self.version = (int(major), int(minor))
-            # initialize my headers
-            self.headers = {}
-            # update the cursor
-            offset = match.end()
+        # this is a brand new request
+        match = self.protocol.match(buffer, 0, limit)
+        # if it didn't match
+        if not match:
+            # complain
+            raise self.responses.BadRequestSyntax(server=server)
+        # otherwise, unpack
+        command, url, major, minor = match.groups()
+        # and store
+        self.command = command.decode(encoding)
+        self.url = urllib.parse.unquote(url.decode(encoding))
+        self.version = (int(major), int(minor))
+        # initialize my headers
+        self.headers = {}
+        # a cursor into {buffer}
+        offset = match.end()
 
         # until something happens
         while True:
             # look for a header
-            match = self.keyval.match(chunk, offset)
+            match = self.keyval.match(buffer, offset, limit)
             # if it didn't match
             if not match:
                 # bail
@@ -95,65 +146,57 @@ class Request:
             offset = match.end()
 
         # the next entry must be a blank line
-        match = self.blank.match(chunk, offset)
+        match = self.blank.match(buffer, offset, limit)
         # if it doesn't match
         if not match:
             # complain
             raise self.responses.BadRequestSyntax(server=server)
         # mark me as having processed success
         self.described = True
+        # and drop the part of the buffer i took care of
+        del buffer[:match.end()]
 
-        # and pass on how much of {chunk} i took care of
-        return match.end()
+        # all done
+        return True
 
 
-    def extractPayload(self, server, chunk, offset):
+    def extractPayload(self, server):
         """
-        Extract a {chunk} of bytes and store them
+        Move the bytes of my payload from my buffer to my payload
         """
         # if i am done, i am done
         if self.complete: return True
 
-        # compute the actual size of the unprocessed part of {chunk}
-        actual = len(chunk) - offset
-
         # check whether
         try:
             # the client specified what my payload size is
-            size = self.headers['Content-Length']
-        # if not
-        except (KeyError, TypeError) as error:
-            # the only option is that this is the end of the chunk
-            if actual == 0:
-                # in which case mark me as done
-                self.complete = True
-                # normalize my payload, if necessary
-                if self.payload is None: self.payload = []
-                # and get out of here
-                return True
-            # otherwise, complain
+            size = int(self.headers.get('Content-Length', 0))
+        # if it's not a number
+        except ValueError as error:
+            # complain
             raise self.responses.BadRequestSyntax(server=server) from error
-        # if all goes well
-        else:
-            # convert into an integer
-            size = int(size)
 
         # initialize the storage for my payload
         if self.payload is None: self.payload = []
 
-        # compute the total payload size, including what I have gathered so far
-        for portion in self.payload:
-            # by adding the length of each portion to the unprocessed {chunk}
-            actual += len(portion)
+        # get my buffer
+        buffer = self.buffer
+        # figure out how many bytes i'm still missing; anything past that belongs to the
+        # requests that follow
+        needed = size - self.received
+        # grab what's available
+        portion = bytes(buffer[:needed])
+        # and remove it from the buffer
+        del buffer[:needed]
+        # if there was anything
+        if portion:
+            # store it
+            self.payload.append(portion)
+            # and update the count
+            self.received += len(portion)
 
-        # if storing this chunk would go over the limit
-        if actual > size:
-            # complain
-            raise self.responses.RequestEntityTooLarge(server=server)
-        # otherwise, store
-        self.payload.append(chunk if offset == 0 else chunk[offset:])
         # check whether this was enough bytes
-        self.complete = True if actual == size else False
+        self.complete = self.received == size
         # and pass this info on
         return self.complete
 
@@ -179,7 +222,7 @@ class Request:
             # if there is a payload
             if self.payload:
                 channel.line("{}  payload:".format(indent))
-                channel.line("{}    {} bytes".format(indent, len(payload)))
+                channel.line("{}    {} bytes".format(indent, self.received))
                 channel.line(self.payload)
             # otherwise
             else:
@@ -194,11 +237,16 @@ class Request:
     # state
     described = False # am i done processing the request meta-data
     complete = False # have i received everything i expect from the client?
+    received = 0 # the number of payload bytes i have received so far
+    buffer = None # the bytes that haven't been processed yet
 
     # constants
     # the expected encoding of the headers
     HEADER_ENCODING = 'iso-8859-1'
+    # the largest request header i am willing to buffer
+    MAX_HEADER_BYTES = 64 * 1024
     # scanners
+    terminator = re.compile(b"\r?\n\r?\n")
     blank = re.compile(b"\r?\n")
     keyval = re.compile(
         br"(?P<key>[^:]+):\s+(?P<value>[^\r\n]+)" +
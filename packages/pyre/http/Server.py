@@ -7,6 +7,7 @@
 
 
 # externals
+import socket
 import pyre
 
 
@@ -14,12 +15,26 @@ import pyre
 class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
     """
     A server that understands HTTP
+
+    Servers keep count of the connections they {accepted} and the requests they {served}. A
+    server that is asked to {drain} stops accepting connections and closes the ones it has as
+    soon as they are idle, so that it can be shut down without dropping any requests. Clients
+    that pipeline their requests without reading the responses are not allowed to pile up more
+    than {MAX_PENDING} of them: the server stops reading from the connection until the pending
+    responses have been written.
     """
 
 
+    # public data
+    accepted = 0 # the number of connections i have accepted
+    served = 0 # the number of responses i have queued
+    draining = False # am i winding down?
+
+
     # types
     from .Request import Request as request
     from .Response import Response as response
+    from .Outbox import Outbox as outbox
     # exceptions
     from . import exceptions, responses, documents
 
@@ -28,6 +43,15 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
     renderer = pyre.weaver.language(default='http')
     renderer.doc = 'the renderer of the server responses to client requests'
 
+    budget = pyre.properties.int(default=32*1024*1024)
+    budget.doc = 'the memory budget of the document cache, in bytes; zero disables it'
+
+    compress = pyre.properties.bool(default=False)
+    compress.doc = 'keep compressed variants of cached documents for clients that accept them'
+
+    digest = pyre.properties.bool(default=False)
+    digest.doc = 'build the entity tags of documents from a digest of their contents'
+
 
     # public state
     @property
@@ -49,6 +73,24 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
 
 
     # protocol obligations
+    @pyre.export(tip='prepare to accept requests from the peer')
+    def connect(self, channel, address):
+        """
+        Prepare to start accepting requests from peers
+        """
+        # make sure that slow peers can't stall the server
+        channel.setblocking(False)
+        # responses are written in several segments, so don't let the network stack hold on
+        # to the tail of one while it waits for the peer to acknowledge the rest
+        channel.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # count it
+        self.accepted += 1
+        # add it to the pile of open connections
+        self.connections.add(channel)
+        # and chain up
+        return super().connect(channel=channel, address=address)
+
+
     @pyre.export(tip='respond to the peer request')
     def process(self, channel):
         """
@@ -61,75 +103,110 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
         # - this the first time this peer connects
         # - more data that for an existing request have arrived
         # - this is a known peer whose previous request was handled but has kept the connection
-        #   alive; this case may not survive as it can be handled by starting a new request
-        #   every time without closing the connection
-        # - the client has pipelined its requests; currently, this case is not handled
-        #   correctly because it involves saving the local buffers
+        #   alive, in which case this is the start of a new request
+        # - the client has pipelined its requests, so the data may contain the tail of one
+        #   request followed by any number of others; they are handled in order, and their
+        #   responses are queued in the same order
 
         # get the application context
         application = self.application
         # show me
         application.debug.log('reading data from {}'.format(channel.peer))
-        # get whatever data is available at this point
-        chunk = channel.read(maxlen=self.MAX_BYTES)
+        # attempt to
+        try:
+            # get whatever data is available at this point
+            chunk = channel.read(maxlen=self.MAX_BYTES)
+        # if there was nothing there after all
+        except BlockingIOError:
+            # try again later
+            return True
+        # if the peer went away abruptly
+        except ConnectionError as error:
+            # show me
+            application.debug.log('lost connection: {}'.format(error))
+            # close the connection and forget the peer
+            self.disconnect(channel=channel)
+            # stop listening
+            return False
 
         # if there was nothing to read
         if len(chunk) == 0:
             # show me
             application.debug.log('connection from {} was closed'.format(channel.peer))
-            # close the connection
-            channel.close()
-            # check whether we know this peer
-            try:
-                # in which case, forget him
-                del self.requests[channel]
-            # if not
-            except KeyError:
-                # no problem
-                pass
+            # close the connection and forget the peer
+            self.disconnect(channel=channel)
             # stop listening
             return False
 
-        # well, there is data to process; if we have a pending request
+        # process the requests in it
+        return self.consume(channel=channel, chunk=chunk)
+
+
+    # interface
+    def consume(self, channel, chunk):
+        """
+        Assemble requests out of the bytes in {chunk} and respond to them; return {True} if
+        the server should keep reading from {channel}
+        """
+        # if we have a pending request
         try:
             # get it
-            request = self.requests[channel]
+            request = self.requests.pop(channel)
         # otherwise
         except KeyError:
             # make a new one
             request = self.request()
 
-        # attempt to
-        try:
-            # hand the chunk to the request
-            complete = request.extract(server=self, chunk=chunk)
-        # if something wrong happened
-        except self.exceptions.ProtocolError as error:
-            # send an error report to the client
-            return self.respond(channel=channel, response=error)
-
-        # if request assembly is not finished yet
-        if not complete:
-            # we expect more data to arrive later; register this request so we can continue the
-            # processing next time there are data for it
-            self.requests[channel] = request
-            # and reschedule this channel
-            return True
+        # as long as there are bytes to process
+        while chunk:
+            # attempt to
+            try:
+                # hand the chunk to the request
+                complete = request.extract(server=self, chunk=chunk)
+            # if something wrong happened
+            except self.exceptions.ProtocolError as error:
+                # send an error report to the client; this closes the connection
+                return self.respond(channel=channel, response=error)
+
+            # if request assembly is not finished yet
+            if not complete:
+                # we expect more data to arrive later; register this request so we can continue
+                # the processing next time there are data for it
+                self.requests[channel] = request
+                # and reschedule this channel
+                return True
+
+            # whatever is left belongs to the requests that follow
+            chunk = request.residue()
+
+            # figuring out what the client is asking for is now complete; try to
+            try:
+                # fulfill the request
+                response = self.fulfill(request)
+            # if something bad happened
+            except self.exceptions.ProtocolError as error:
+                # send an error report to the client
+                response = error
+
+            # respond; if this is the last response on this connection
+            if not self.respond(channel=channel, response=response, request=request):
+                # stop listening
+                return False
+
+            # get ready for the next request
+            request = self.request()
 
-        # figuring out what the client is asking for is now complete; try to
-        try:
-            # fulfill the request
-            response = self.fulfill(request)
-        # if something bad happened
-        except self.exceptions.ProtocolError as error:
-            # send an error report to the client
-            return self.respond(channel=channel, response=error)
+            # if the client isn't reading its responses
+            if len(self.outboxes[channel]) >= self.MAX_PENDING:
+                # set aside the rest of its requests
+                self.backlog[channel] = chunk
+                # and stop reading until it catches up
+                return False
 
-        # if all goes well, respond
-        return self.respond(channel=channel, response=response)
+        # keep the channel alive
+        return True
 
 
-    # interface
     def fulfill(self, request):
         """
         Fulfill the given fully formed client {request}
@@ -138,37 +215,224 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
         return self.application.pyre_respond(server=self, request=request)
 
 
-    def respond(self, channel, response):
+    def respond(self, channel, response, request=None):
+        """
+        Queue {response} for delivery to the peer over {channel}; return {True} if the
+        connection is expected to remain open
+        """
+        # count it
+        self.served += 1
+        # if i'm winding down
+        if self.draining:
+            # this is the last response on this connection
+            response.headers['Connection'] = 'close'
         # attempt to
         try:
-            # ask the renderer to put together the byte stream
-            stream = b'\r\n'.join(self.renderer.render(server=self, document=response))
+            # render the response
+            stream, head = self.render(response=response, request=request)
         # if something goes wrong
         except self.exceptions.ProtocolError as error:
-            # render the error
-            stream = b'\r\n'.join(self.renderer.render(server=self, document=error))
+            # render the error instead
+            response = error
+            stream, head = self.render(response=error, request=request)
 
-        # either way, send the bytes to the client
-        channel.write(stream)
-        # keep the channel alive
-        return True
+        # check whether this is the last response on this connection
+        final = response.headers.get('Connection') == 'close'
+        # find the pile of responses for this channel
+        try:
+            # if there is one already
+            outbox = self.outboxes[channel]
+        # if not
+        except KeyError:
+            # make one
+            outbox = self.outboxes[channel] = self.outbox()
+        # add the response to it
+        outbox.push(head=head, segments=stream, final=final)
+
+        # if the channel is not already waiting to drain, try to write right away; if the
+        # client can't take everything
+        if not outbox.waiting and self.flush(channel=channel):
+            # finish when it can
+            outbox.waiting = True
+            self.dispatcher.whenWriteReady(channel=channel, call=self.flush)
+
+        # let the caller know whether to keep listening; careful not to resurrect connections
+        # that were closed while flushing
+        return not final and channel in self.outboxes
+
+
+    def render(self, response, request=None):
+        """
+        Negotiate the delivery of {response} to the client that made {request}, and ask the
+        renderer for the response head and a generator of the body segments
+        """
+        # if we know what the client asked for
+        if request is not None:
+            # don't speak a newer protocol than the client
+            if request.version < response.version: response.version = request.version
+            # if the response is closing the connection anyway
+            if response.headers.get('Connection') == 'close':
+                # nothing to negotiate
+                pass
+            # if the client doesn't want to keep the connection open
+            elif not request.persistent:
+                # let it know we agree
+                response.headers['Connection'] = 'close'
+            # if it does, but it speaks an older protocol
+            elif request.version < (1,1):
+                # let it know we agree
+                response.headers['Connection'] = 'keep-alive'
+
+        # ask the renderer to put together the byte stream
+        stream = self.renderer.render(server=self, document=response, request=request)
+        # get the response head
+        head = next(stream)
+        # and hand both over
+        return stream, head
+
+
+    def flush(self, channel):
+        """
+        Write as much of the pending responses as {channel} will take without blocking; return
+        {True} if there is more left to write
+        """
+        # get the pile of responses
+        outbox = self.outboxes[channel]
+        # as long as there are responses to write
+        while True:
+            # attempt to
+            try:
+                # write
+                pending = outbox.flush(channel=channel)
+            # if the peer went away
+            except OSError as error:
+                # show me
+                self.application.debug.log('lost connection: {}'.format(error))
+                # close the connection
+                self.disconnect(channel=channel)
+                # and stop writing
+                return False
+            # if a document failed while it was being generated
+            except self.exceptions.ProtocolError as error:
+                # show me
+                self.application.debug.log('response to {} failed: {}'.format(channel, error))
+                # it's too late to tell the client, so just close the connection
+                self.disconnect(channel=channel)
+                # and stop writing
+                return False
+
+            # if there is more to write
+            if pending:
+                # wait for the channel to drain
+                return True
+            # if i didn't set aside any requests because the client wasn't reading, or the
+            # last response on this connection has been sent
+            if channel not in self.backlog or outbox.closing:
+                # there's nothing left to write
+                break
+            # otherwise, process the requests i set aside; i'm still marked as waiting, so their
+            # responses are left for me to write
+            if self.consume(channel=channel, chunk=self.backlog.pop(channel)):
+                # and if they didn't fill the outbox again, start reading from the client
+                self.dispatcher.whenReadReady(channel=channel, call=self.process)
+            # if one of them closed the connection
+            if channel not in self.outboxes:
+                # stop writing
+                return False
+
+        # i'm no longer waiting
+        outbox.waiting = False
+        # if the last response on this connection has been sent, or i'm winding down and the
+        # peer isn't in the middle of a request
+        if outbox.closing or (self.draining and channel not in self.requests):
+            # close it
+            self.disconnect(channel=channel)
+        # either way, stop writing
+        return False
+
+
+    def disconnect(self, channel):
+        """
+        Close the connection over {channel} and forget everything about it
+        """
+        # forget its partial request
+        self.requests.pop(channel, None)
+        # and the ones i set aside
+        self.backlog.pop(channel, None)
+        # and its pending responses
+        outbox = self.outboxes.pop(channel, None)
+        # if there were any
+        if outbox is not None:
+            # discard them
+            outbox.close()
+        # stop watching the channel
+        self.dispatcher.forget(channel=channel)
+        # close it
+        channel.close()
+        # and remove it from the pile of open connections
+        self.connections.discard(channel)
+        # all done
+        return
+
+
+    def drain(self):
+        """
+        Stop accepting connections, and close the open ones as soon as they are idle
+        """
+        # mark me
+        self.draining = True
+        # if i have a port
+        if self.port is not None:
+            # stop watching it
+            self.dispatcher.forget(channel=self.port)
+            # close it; other processes that share it are not affected
+            self.port.close()
+            # and forget it
+            self.port = None
+        # go through the open connections
+        for channel in tuple(self.connections):
+            # skip the ones with a partial request
+            if channel in self.requests:
+                continue
+            # and the ones that are still writing responses
+            outbox = self.outboxes.get(channel)
+            if outbox is not None and outbox.waiting:
+                continue
+            # close the rest
+            self.disconnect(channel=channel)
+        # all done
+        return
 
 
     # meta-methods
     def __init__(self, **kwds):
         # chain up
         super().__init__(**kwds)
-        # initialize my connectionn index
+        # initialize my connection index
         self.requests = {}
+        # the requests i set aside while waiting for clients to read their responses
+        self.backlog = {}
+        # the open connections
+        self.connections = set()
+        # and the responses that are waiting to be written
+        self.outboxes = {}
+        # and the cache of the documents i serve from the application filesystem
+        from .Cache import Cache
+        self.cache = Cache()
         # all done
         return
 
 
     # implementation details
     # private data
+    connections = None
     requests = None
+    backlog = None
+    outboxes = None
+    cache = None
     # constants
     MAX_BYTES = 1024 * 1024
+    MAX_PENDING = 8
 
 
 # end of file
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import signal
+import functools
+# my base class
+from pyre.nexus.Peer import Peer
+
+
+# declaration
+class Worker(Peer, family="pyre.nexus.peers.http"):
+    """
+    A process that serves http requests on behalf of a {Prefork} team
+
+    Workers are instantiated in matching pairs by a recruiter. The worker side activates the
+    {server} of the team on its own event loop, and accepts connections on the port that the
+    team bound before the worker process was cloned, so that all the workers of a team share the
+    same port. It sends its twin the number of connections it accepted and requests it served
+    every {interval}. When the team dismisses it, or the team goes away, it stops accepting
+    connections, finishes the requests in progress and exits; connections that are still open
+    after {grace} are dropped.
+
+    The team side keeps track of the reports of its twin, and lets the team know when the
+    connection to its twin drops, which happens when the worker process exits.
+    """
+
+
+    # public data
+    requests = 0 # the number of requests served by the worker side
+    connections = 0 # the number of connections accepted by the worker side
+    heard = None # the last time the team side heard from its twin
+    dismissal = None # the time the team side dismissed its twin
+    finish = None # the time the team side lost contact with its twin
+    interval = None # the interval between the reports of the worker side
+    grace = None # the time the worker side has to finish up after it is dismissed
+    timeout = None # unused; workers serve requests without a time limit
+
+
+    @property
+    def statistics(self):
+        """
+        Summarize the work of my twin
+        """
+        # compute the time my twin has been a member of the team
+        elapsed = (self.timer.lap() if self.finish is None else self.finish) - self.start
+        # build the summary
+        return {
+            'requests': self.requests,
+            'connections': self.connections,
+            'uptime': elapsed,
+            }
+
+
+    # constants
+    from pyre.units.SI import second
+
+
+    # types
+    from pyre.nexus.CrewStatus import CrewStatus as crewcodes
+
+
+    # interface - team side
+    def join(self, team):
+        """
+        Join a team
+
+        This is invoked by my recruiter on the team side; the team hears about me when my twin
+        sends in its first report
+        """
+        # schedule the handler of the reports of my twin
+        self.dispatcher.whenReadReady(
+            channel = self.channel,
+            call = functools.partial(self.receive, team=team))
+        # all done
+        return self
+
+
+    def receive(self, channel, team, **kwds):
+        """
+        My twin has sent in a report
+
+        N.B.: this is an event handler; careful with its return value
+        """
+        # attempt to
+        try:
+            # get the report
+            status, self.requests, self.connections = self.marshaler.recv(channel=channel)
+        # if the connection dropped
+        except (EOFError, OSError):
+            # my twin is gone; let the team know
+            team.lose(crew=self)
+            # and do not reschedule this handler
+            return False
+        # if this is the first time i hear from my twin
+        if self.heard is None:
+            # let the team know it's ready
+            team.activate(crew=self)
+        # mark the time
+        self.heard = self.timer.lap()
+        # and keep listening
+        return True
+
+
+    def dismissed(self):
+        """
+        My team manager has dismissed me
+        """
+        # mark the time
+        self.dismissal = self.timer.lap()
+        # attempt to
+        try:
+            # send the end-of-work marker; my twin keeps reporting until it exits
+            self.marshaler.send(channel=self.channel, item=None)
+        # if the connection dropped
+        except OSError:
+            # my twin is gone already
+            pass
+        # leave a note
+        self.debug.log('{me.pid}: dismissed at {me.dismissal:.3f}'.format(me=self))
+        # all done
+        return self
+
+
+    def resign(self):
+        """
+        Clean up after the connection to my twin was lost
+        """
+        # if i have been through this already
+        if self.finish is not None:
+            # nothing to do
+            return self
+        # record my finish time
+        self.finish = self.timer.lap()
+        # forget the handlers that are still waiting for my channel
+        self.dispatcher.forget(channel=self.channel)
+        # and close it
+        self.channel.close()
+        # all done
+        return self
+
+
+    # interface - worker side
+    def register(self):
+        """
+        Initialize the worker side
+        """
+        # the team decides when i'm done, so don't let interrupts from the terminal take me down
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        # and reloads are the business of the team
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        # but do let me be terminated
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # send in my first report when my channel is ready to accept data
+        self.dispatcher.whenWriteReady(channel=self.channel, call=self.checkin)
+        # all done
+        return self
+
+
+    def checkin(self, channel):
+        """
+        Start serving requests now that my communication channel is open
+        """
+        # check it's me we are talking about
+        assert channel is self.channel
+        # activate the server on my event loop; it picks up the port bound by the team
+        self.server.activate(application=self.application, dispatcher=self.dispatcher)
+        # report in
+        self.report()
+        # listen for my twin
+        self.dispatcher.whenReadReady(channel=channel, call=self.listen)
+        # schedule my reports
+        self.dispatcher.alarm(interval=self.interval, call=self.beat)
+        # do not reschedule this handler
+        return False
+
+
+    def listen(self, channel, **kwds):
+        """
+        My twin has something to say, or it's gone
+
+        N.B.: this is an event handler; careful with its return value
+        """
+        # attempt to
+        try:
+            # get the message; the only thing my twin ever sends is the end-of-work marker
+            self.marshaler.recv(channel=channel)
+        # if the connection dropped
+        except (EOFError, OSError):
+            # my team is gone; finish up just the same
+            pass
+        # wind down
+        self.retire()
+        # and stop listening
+        return False
+
+
+    def retire(self):
+        """
+        Stop accepting connections and exit once the ones in progress are done
+        """
+        # if i'm already winding down
+        if self.deadline is not None:
+            # nothing to do
+            return self
+        # set the deadline
+        self.deadline = self.timer.lap() + self.grace / self.second
+        # leave a note
+        self.debug.log('{me.pid}: retiring'.format(me=self))
+        # drain the server
+        self.server.drain()
+        # and check on it every so often
+        self.dispatcher.alarm(interval=self.LINGER, call=self.linger)
+        # all done
+        return self
+
+
+    def linger(self, **kwds):
+        """
+        Wait for the server to finish the requests in progress
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # if the server still has open connections and there is still time
+        if self.server.connections and self.timer.lap() < self.deadline:
+            # check again later
+            return self.LINGER
+        # otherwise, drop whatever is left
+        for channel in tuple(self.server.connections):
+            self.server.disconnect(channel=channel)
+        # send in my final report
+        self.report()
+        # and stop
+        self.stop()
+        # don't reschedule
+        return None
+
+
+    def beat(self, **kwds):
+        """
+        Send my twin a report
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # send in my report; if the team is gone
+        if not self.report():
+            # there's no point in reporting any more
+            return None
+        # do it again after a while
+        return self.interval
+
+
+    def report(self):
+        """
+        Send my twin the number of connections and requests my server has handled; return
+        {False} if the connection to my twin dropped
+        """
+        # make a report
+        report = (self.crewcodes.healthy, self.server.served, self.server.accepted)
+        # attempt to
+        try:
+            # serialize and send
+            self.marshaler.send(channel=self.channel, item=report)
+        # if the connection dropped
+        except OSError:
+            # my team is gone
+            self.retire()
+            # let the caller know
+            return False
+        # all done
+        return True
+
+
+    # meta-methods
+    def __init__(self, pid, channel, server=None, application=None, interval=None, grace=None,
+                 **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my id; this is an opaque type, assigned to me by my recruiter
+        self.pid = pid
+        # the communication channel to my twin
+        self.channel = channel
+        # the worker side needs the server and the application context
+        self.server = server
+        self.application = application
+        # and the schedule of its reports
+        if interval is not None: self.interval = interval
+        if grace is not None: self.grace = grace
+        # the time i joined
+        self.start = self.timer.lap()
+        # all done
+        return
+
+
+    # private data
+    server = None # the server, on the worker side
+    application = None # the application context, on the worker side
+    deadline = None # the time by which the worker side must be done
+    # constants
+    LINGER = 0.05 * second # how often a retiring worker side checks on its connections
+
+
+# end of file
@@ -8,6 +8,7 @@
 
 # externals
 import json
+import email.utils
 # the base class
 from .Response import Response
 
@@ -111,9 +112,9 @@ class File(Document):
     uri = None # the file to serve
 
     # interface
-    def render(self, server, **kwds):
+    def render(self, server, request=None, **kwds):
         """
-        Pack the contents of the file into a binary buffer
+        Deliver the file, from the document cache of the {server} if possible
         """
         # get the uri
         uri = self.uri
@@ -121,14 +122,168 @@ class File(Document):
         app = self.application
         # attempt to
         try:
-            # open the file
-            stream = app.pfs[uri].open(mode='rb')
+            # find the file
+            node = app.pfs[uri]
         # if something goes wrong
         except app.pfs.GenericError:
             # raise something bad
             raise server.responses.NotFound(server=server)
-        # all is well, send it along
-        return stream.read()
+
+        # attempt to
+        try:
+            # look it up in the cache
+            entry = server.cache.lookup(server=server, uri=uri, node=node)
+        # if the file is gone, or can't be read
+        except (node.GenericError, OSError):
+            # forget whatever the cache knew about it
+            server.cache.discard(uri=uri)
+            # and raise something bad
+            raise server.responses.NotFound(server=server)
+        # if the filesystem doesn't know enough about the file to validate it
+        if entry is None:
+            # just send it
+            return self.open(server=server, node=node)
+
+        # check whether i have a compressed variant that the client can use
+        compressed = (
+            entry.gzip is not None and request is not None
+            and self.accepts(request=request, coding='gzip'))
+        # each variant has its own entity tag
+        tag = entry.tag[:-1] + '-gzip"' if compressed else entry.tag
+
+        # get my headers
+        headers = self.headers
+        # decorate them with the validators
+        headers['ETag'] = tag
+        headers['Last-Modified'] = self.timestamp(tick=entry.modified)
+        # if there are variants, let caches know how to tell them apart
+        if entry.gzip is not None: headers['Vary'] = 'Accept-Encoding'
+
+        # if the client has a current copy
+        if request is not None and self.current(request=request, tag=tag, modified=entry.modified):
+            # build the response
+            response = server.responses.NotModified(server=server)
+            # decorate it with my validators
+            for header in ('ETag', 'Last-Modified', 'Vary'):
+                # the ones that i have
+                if header in headers: response.headers[header] = headers[header]
+            # and send it
+            raise response
+
+        # if the client is getting the compressed variant
+        if compressed:
+            # mark it
+            headers['Content-Encoding'] = 'gzip'
+            # and send it
+            return entry.gzip
+        # if the contents are cached
+        if entry.body is not None:
+            # send them
+            return entry.body
+        # otherwise, send the file
+        return self.open(server=server, node=node)
+
+
+    # implementation details
+    def open(self, server, node):
+        """
+        Open the file at {node}
+        """
+        # attempt to
+        try:
+            # open the file
+            stream = node.open(mode='rb')
+        # if something goes wrong
+        except (node.GenericError, OSError):
+            # raise something bad
+            raise server.responses.NotFound(server=server)
+        # all is well; hand the open file to the renderer, so it can be transferred to the
+        # client without being read into memory
+        return stream
+
+
+    def accepts(self, request, coding):
+        """
+        Check whether the client that made {request} is willing to receive contents with the
+        given {coding}
+        """
+        # get the codings the client accepts
+        header = request.headers.get('Accept-Encoding')
+        # if it didn't say
+        if header is None:
+            # stay on the safe side
+            return False
+        # the preferences of the client, indexed by coding
+        preferences = {}
+        # go through the codings in the header
+        for item in header.split(','):
+            # split off the parameters
+            name, *parameters = item.split(';')
+            # normalize the coding name
+            name = name.strip().lower()
+            # skip empty entries
+            if not name: continue
+            # the default quality
+            quality = 1.0
+            # go through the parameters
+            for parameter in parameters:
+                # split into key and value
+                key, _, value = parameter.partition('=')
+                # if this is not the quality
+                if key.strip().lower() != 'q':
+                    # skip it
+                    continue
+                # attempt to
+                try:
+                    # convert the value
+                    quality = float(value)
+                # if it's malformed
+                except ValueError:
+                    # treat the coding as refused
+                    quality = 0.0
+            # record
+            preferences[name] = quality
+        # look for an explicit preference for the coding, and fall back to the wildcard
+        quality = preferences.get(coding, preferences.get('*', 0.0))
+        # the coding is acceptable if its quality is not zero
+        return quality > 0
+
+
+    def current(self, request, tag, modified):
+        """
+        Check whether the client that made {request} has a copy of the file with entity {tag}
+        that was last {modified} at the given time
+        """
+        # conditions apply only to retrievals
+        if request.command not in ('GET', 'HEAD'): return False
+        # get the request headers
+        headers = request.headers
+        # if the client sent the entity tags of its copies
+        tags = headers.get('If-None-Match')
+        # it takes precedence
+        if tags is not None:
+            # parse them
+            tags = { candidate.strip() for candidate in tags.split(',') }
+            # and look for a match
+            return '*' in tags or tag in tags or 'W/' + tag in tags
+        # otherwise, get the timestamp of its copy
+        since = headers.get('If-Modified-Since')
+        # if there isn't one
+        if since is None:
+            # the client doesn't have a copy
+            return False
+        # attempt to
+        try:
+            # parse it
+            since = email.utils.parsedate_to_datetime(since).timestamp()
+        # if it's malformed
+        except (TypeError, ValueError):
+            # ignore it
+            return False
+        # the copy is current if the file hasn't changed since; timestamps have a resolution
+        # of a second
+        return int(modified) <= since
+
 
     # meta-methods
     def __init__(self, uri, **kwds):
@@ -141,6 +141,27 @@ class NotModified(ProtocolError):
     status = __doc__
     description = "Document has not changed since given time"
 
+    # interface
+    def render(self, **kwds):
+        """
+        Generate the payload
+        """
+        # there isn't one; the client already has the document
+        return b''
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # get my headers
+        headers = self.headers
+        # this is not really an error, so there is no error page
+        del headers['Content-Type']
+        # and no reason to close the connection
+        del headers['Connection']
+        # all done
+        return
+
 
 class UseProxy(ProtocolError):
     """
@@ -6,6 +6,10 @@
 #
 
 
+# externals
+import os
+
+
 # declaration
 class Channel:
     """
@@ -66,4 +70,207 @@ class Channel:
             "class {.__name__!r} must implement 'write'".format(type(self)))
 
 
+    def readinto(self, buffer):
+        """
+        Fill {buffer} with bytes from my input channel; the number of bytes read is smaller
+        than the size of {buffer} only if the channel was closed
+        """
+        # make a flat view of the buffer, so slicing doesn't copy
+        view = self.flatten(buffer)
+        # reset the byte count
+        total = 0
+        # for as long as it takes
+        while total < len(view):
+            # read as much as is available into the rest of the buffer
+            got = self.readSome(view=view[total:])
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+        # return the number of bytes read
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the contents of {buffers} to my output channel, in order, without assembling
+        them into a single byte string
+        """
+        # make flat views of the non-empty buffers, so slicing doesn't copy
+        views = [ view for view in map(self.flatten, buffers) if len(view) ]
+        # reset the byte count
+        total = 0
+        # as long as there is something left to write
+        while views:
+            # write as much as the channel will take
+            sent = self.writeSome(views=views[:self.iovmax])
+            # update the total
+            total += sent
+            # drop the buffers that have been written completely
+            while views and sent >= len(views[0]):
+                # by updating the count
+                sent -= len(views[0])
+                # and removing them from the pile
+                views.pop(0)
+            # if the first one remaining was written partially
+            if sent:
+                # skip the part that made it through
+                views[0] = views[0][sent:]
+        # return the number of bytes written
+        return total
+
+
+    # asynchronous input/output
+    async def readAsync(self, minlen=0, maxlen=64*1024):
+        """
+        Read up to {maxlen} bytes from my input channel without blocking the running event
+        loop; keep going until at least {minlen} bytes have arrived or the channel is closed
+        """
+        # adjust the inputs
+        if maxlen < minlen: maxlen = minlen
+        # get the running loop
+        import asyncio
+        loop = asyncio.get_running_loop()
+        # reset the byte count
+        total = 0
+        # initialize the packet pile
+        packets = []
+        # for as long as it takes
+        while True:
+            # wait until there is something to read
+            await self.ready(
+                endpoint=self.inbound, watch=loop.add_reader, unwatch=loop.remove_reader)
+            # pull what's there; a single read does not block on a ready channel
+            packet = self.read(maxlen=maxlen-total)
+            # get its length
+            got = len(packet)
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+            # and save the packet
+            packets.append(packet)
+            # if we have reached our goal, bail
+            if total >= minlen: break
+        # assemble the byte string and return it
+        return b''.join(packets)
+
+
+    async def writeAsync(self, bstr):
+        """
+        Write the bytes in {bstr} to my output channel without blocking the running event loop
+        """
+        # get the running loop
+        import asyncio
+        loop = asyncio.get_running_loop()
+        # a ready channel is guaranteed to accept this many bytes without blocking
+        import select
+        chunk = select.PIPE_BUF
+        # make a view, so slicing doesn't copy
+        view = memoryview(bstr)
+        # reset the byte count
+        total = 0
+        # for as long as it takes
+        while total < len(view):
+            # wait until the channel can be written
+            await self.ready(
+                endpoint=self.outbound, watch=loop.add_writer, unwatch=loop.remove_writer)
+            # write the next chunk and update the byte count
+            total += self.write(bstr=view[total:total+chunk])
+        # return the number of bytes written
+        return total
+
+
+    async def readintoAsync(self, buffer):
+        """
+        Fill {buffer} with bytes from my input channel without blocking the running event
+        loop; the number of bytes read is smaller than the size of {buffer} only if the
+        channel was closed
+        """
+        # get the running loop
+        import asyncio
+        loop = asyncio.get_running_loop()
+        # make a flat view of the buffer, so slicing doesn't copy
+        view = self.flatten(buffer)
+        # reset the byte count
+        total = 0
+        # for as long as it takes
+        while total < len(view):
+            # wait until there is something to read
+            await self.ready(
+                endpoint=self.inbound, watch=loop.add_reader, unwatch=loop.remove_reader)
+            # pull what's there; a single read does not block on a ready channel
+            got = self.readSome(view=view[total:])
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+        # return the number of bytes read
+        return total
+
+
+    # implementation details
+    # the maximum number of buffers in a single scatter/gather call
+    iovmax = os.sysconf('SC_IOV_MAX') if 'SC_IOV_MAX' in os.sysconf_names else 16
+
+
+    def readSome(self, view):
+        """
+        Read as many bytes as are available, up to the size of {view}, into {view}; return the
+        number of bytes read
+
+        Subclasses should override with a call that reads directly into {view}
+        """
+        # pull something from the channel
+        packet = self.read(minlen=0, maxlen=len(view))
+        # get its length
+        got = len(packet)
+        # copy it into the buffer
+        view[:got] = packet
+        # and return the number of bytes read
+        return got
+
+
+    def writeSome(self, views):
+        """
+        Write as much of the contents of {views} as the channel will take; return the number of
+        bytes written
+
+        Subclasses should override with a call that writes all {views} at once
+        """
+        # write the first one
+        return self.write(bstr=views[0])
+
+
+    @staticmethod
+    def flatten(buffer):
+        """
+        Build a view of the bytes in {buffer}
+        """
+        # make a view and cast it to bytes
+        return memoryview(buffer).cast('B')
+
+
+    @staticmethod
+    async def ready(endpoint, watch, unwatch):
+        """
+        Suspend the caller until {endpoint} is reported ready by the event loop method {watch}
+        """
+        # get the descriptor
+        fd = endpoint if isinstance(endpoint, int) else endpoint.fileno()
+        # make a future
+        import asyncio
+        future = asyncio.get_running_loop().create_future()
+        # the loop keeps calling while the descriptor is ready, so mark the future only once
+        watch(fd, lambda: future.done() or future.set_result(fd))
+        # carefully
+        try:
+            # wait
+            return await future
+        # and no matter what happened
+        finally:
+            # stop watching
+            unwatch(fd)
+
+
 # end of file
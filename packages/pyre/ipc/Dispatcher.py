@@ -49,7 +49,14 @@ class Dispatcher(pyre.protocol, family="pyre.ipc.dispatchers"):
     def alarm(self, interval, call):
         """
         Schedule {call} to be invoked after {interval} elapses. {interval} is expected to be
-        a dimensional quantity from {pyre.units} with units of time
+        a dimensional quantity from {pyre.units} with units of time; returns a handle that
+        can be used to cancel the alarm
+        """
+
+    @pyre.provides
+    def cancel(self, alarm):
+        """
+        Prevent the {alarm} returned by a previous call to {alarm} from being raised
         """
 
     @pyre.export
@@ -71,5 +78,12 @@ class Dispatcher(pyre.protocol, family="pyre.ipc.dispatchers"):
         to {channel}
         """
 
+    @pyre.provides
+    def forget(self, channel):
+        """
+        Remove all the routines registered for {channel}; this must be done before the channel
+        is closed
+        """
+
 
 # end of file
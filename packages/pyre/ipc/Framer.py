@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import pyre
+import pickle
+import struct
+import functools
+# my base class
+from .Pickler import Pickler
+
+
+# class declaration
+class Framer(Pickler, family="pyre.ipc.marshalers.framer"):
+    """
+    A marshaler that ships the large buffers of python objects without copying them into the
+    message payload
+
+    Items are serialized using pickle protocol 5, which lets objects such as {numpy} arrays
+    and {pickle.PickleBuffer} instances hand their raw buffers to the marshaler; buffers with
+    fewer than {threshold} bytes are copied into the payload, since reading them separately
+    costs more than copying them. Each message is a frame that consists of a header with the
+    payload length and the number of buffers, the payload, the buffer lengths, and the buffers
+    themselves. {send} hands the pieces of the frame to the channel in a single scatter/gather
+    write, and {recv} reads the large ones directly into buffers of exactly the right size
+    that the rebuilt item then owns.
+    """
+
+
+    # user configurable state
+    threshold = pyre.properties.int(default=64*1024)
+    threshold.doc = "buffers smaller than this many bytes are copied into the payload"
+
+
+    # public data
+    protocol = 5 # the first pickle protocol that supports out-of-band buffers
+    packing = "<QL" # the struct format for encoding the payload length and the buffer count
+    headerSize = struct.calcsize(packing)
+    sizes = "<{}Q" # the struct format for encoding the buffer lengths
+
+
+    # interface
+    @pyre.export
+    def send(self, item, channel):
+        """
+        Pack and ship {item} over {channel}
+        """
+        # build the frame
+        frame = self.frame(item=item)
+        # and send it off
+        return channel.writev(buffers=frame)
+
+
+    @pyre.export
+    def recv(self, channel):
+        """
+        Extract and return a single item from {channel}
+        """
+        # get the header
+        header = self.pull(channel=channel, size=self.headerSize)
+        # unpack it
+        length, count = struct.unpack(self.packing, header)
+        # get the payload
+        body = self.pull(channel=channel, size=length)
+        # if there are no out-of-band buffers
+        if not count:
+            # rebuild the item and return it
+            return pickle.loads(body)
+        # otherwise, get the buffer lengths
+        sizes = self.pull(channel=channel, size=8*count)
+        # unpack them
+        sizes = struct.unpack(self.sizes.format(count), sizes)
+        # get the buffers
+        buffers = [ self.fill(channel=channel, buffer=bytearray(size)) for size in sizes ]
+        # rebuild the item and return it
+        return pickle.loads(body, buffers=buffers)
+
+
+    @pyre.export
+    async def sendAsync(self, item, channel):
+        """
+        Pack and ship {item} over {channel} without blocking the running event loop
+        """
+        # reset the byte count
+        total = 0
+        # go through the pieces of the frame
+        for piece in self.frame(item=item):
+            # send each one off
+            total += await channel.writeAsync(bstr=piece)
+        # return the number of bytes written
+        return total
+
+
+    @pyre.export
+    async def recvAsync(self, channel):
+        """
+        Extract and return a single item from {channel} without blocking the running event loop
+        """
+        # get the header
+        header = await self.pullAsync(channel=channel, size=self.headerSize)
+        # unpack it
+        length, count = struct.unpack(self.packing, header)
+        # get the payload
+        body = await self.pullAsync(channel=channel, size=length)
+        # if there are no out-of-band buffers
+        if not count:
+            # rebuild the item and return it
+            return pickle.loads(body)
+        # otherwise, get the buffer lengths
+        sizes = await self.pullAsync(channel=channel, size=8*count)
+        # unpack them
+        sizes = struct.unpack(self.sizes.format(count), sizes)
+        # make a pile for the buffers
+        buffers = []
+        # go through their lengths
+        for size in sizes:
+            # and get each one
+            buffers.append(await self.fillAsync(channel=channel, buffer=bytearray(size)))
+        # rebuild the item and return it
+        return pickle.loads(body, buffers=buffers)
+
+
+    # implementation details
+    def frame(self, item):
+        """
+        Build the list of the pieces of the frame that carries {item}
+        """
+        # make a pile for flat views of the out-of-band buffers
+        views = []
+        # pickle the item, collecting its large buffers
+        body = pickle.dumps(item, protocol=self.protocol,
+                            buffer_callback=functools.partial(self.collect, views=views))
+        # build the header
+        header = struct.pack(self.packing, len(body), len(views))
+        # if there are no out-of-band buffers
+        if not views:
+            # the frame is just the header and the payload
+            return [header, body]
+        # otherwise, build the table of buffer lengths
+        sizes = struct.pack(self.sizes.format(len(views)), *(view.nbytes for view in views))
+        # and put it all together
+        return [header, body, sizes] + views
+
+
+    def collect(self, buffer, views):
+        """
+        Add a flat view of {buffer} to {views}, unless it is small enough to be copied into the
+        payload
+
+        N.B.: this is the pickle {buffer_callback}; it returns {True} for the buffers that
+        should be serialized along with the rest of the item
+        """
+        # get a flat view of the buffer
+        view = buffer.raw()
+        # if it's small
+        if view.nbytes < self.threshold:
+            # leave it in the payload; it's cheaper than reading it separately
+            return True
+        # otherwise, add it to the pile
+        views.append(view)
+        # and let pickle know it will be shipped out of band
+        return False
+
+
+    def pull(self, channel, size):
+        """
+        Read exactly {size} bytes from {channel}
+        """
+        # if the piece is large
+        if size >= self.threshold:
+            # read it directly into a buffer of the right size
+            return self.fill(channel=channel, buffer=bytearray(size))
+        # otherwise, it's cheaper to let the channel assemble a byte string
+        piece = channel.read(minlen=size, maxlen=size)
+        # if the channel was closed before the message was complete
+        if len(piece) < size:
+            # complain
+            raise EOFError(f"{channel}: expected {size} bytes, got {len(piece)}")
+        # otherwise, return the piece
+        return piece
+
+
+    async def pullAsync(self, channel, size):
+        """
+        Read exactly {size} bytes from {channel} without blocking the running event loop
+        """
+        # if the piece is large
+        if size >= self.threshold:
+            # read it directly into a buffer of the right size
+            return await self.fillAsync(channel=channel, buffer=bytearray(size))
+        # otherwise, it's cheaper to let the channel assemble a byte string
+        piece = await channel.readAsync(minlen=size, maxlen=size)
+        # if the channel was closed before the message was complete
+        if len(piece) < size:
+            # complain
+            raise EOFError(f"{channel}: expected {size} bytes, got {len(piece)}")
+        # otherwise, return the piece
+        return piece
+
+
+    def fill(self, channel, buffer):
+        """
+        Read exactly enough bytes from {channel} to fill {buffer}
+        """
+        # read
+        got = channel.readinto(buffer=buffer)
+        # if the channel was closed before the message was complete
+        if got < len(buffer):
+            # complain
+            raise EOFError(f"{channel}: expected {len(buffer)} bytes, got {got}")
+        # otherwise, return the buffer
+        return buffer
+
+
+    async def fillAsync(self, channel, buffer):
+        """
+        Read exactly enough bytes from {channel} to fill {buffer} without blocking the running
+        event loop
+        """
+        # read
+        got = await channel.readintoAsync(buffer=buffer)
+        # if the channel was closed before the message was complete
+        if got < len(buffer):
+            # complain
+            raise EOFError(f"{channel}: expected {len(buffer)} bytes, got {got}")
+        # otherwise, return the buffer
+        return buffer
+
+
+# end of file
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis, leif strand
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import pyre
+import asyncio
+# my interface
+from . import dispatcher
+# my base class
+from .Scheduler import Scheduler
+
+
+# declaration
+class Loop(Scheduler, family='pyre.ipc.dispatchers.loop', implements=dispatcher):
+    """
+    An event demultiplexer that delegates the monitoring of channels and alarms to an
+    {asyncio} event loop
+
+    {Loop} has the same interface as {Selector}, so pyre applications can share their event
+    loop with {asyncio} based clients, timers and libraries in the same process. Registered
+    handlers are invoked by the loop as soon as their channels are ready, and the alarms are
+    raised by a single loop timer that always points to the next alarm that comes due.
+
+    Outside of a running loop, {watch} runs the loop of the current thread until there is
+    nothing left to do, just like {Selector}. Inside one, await {serve} instead. Note that
+    {asyncio} does not report exceptional conditions, so handlers registered through
+    {whenException} are never invoked.
+    """
+
+
+    # public data
+    @property
+    def loop(self):
+        """
+        The {asyncio} event loop that monitors my channels
+        """
+        # get my loop
+        loop = self._loop
+        # if i don't have one yet, or it has been closed, e.g. by {asyncio.run}
+        if loop is None or loop.is_closed():
+            # attempt to
+            try:
+                # use the running loop
+                loop = asyncio.get_running_loop()
+            # if there isn't one
+            except RuntimeError:
+                # use the loop of the current thread
+                loop = self.default()
+            # and move my registrations over
+            self.attach(loop=loop)
+        # all done
+        return loop
+
+
+    # interface
+    @pyre.export
+    def alarm(self, interval, call):
+        """
+        Schedule {call} to be invoked after {interval} elapses.
+        """
+        # schedule the alarm
+        alarm = super().alarm(interval=interval, call=call)
+        # if it comes due before the loop timer goes off
+        if self._timer is None or alarm.time < self._armed:
+            # adjust the timer
+            self.rearm()
+        # and return the alarm
+        return alarm
+
+
+    @pyre.export
+    def cancel(self, alarm):
+        """
+        Prevent {alarm} from being raised
+        """
+        # cancel the alarm
+        super().cancel(alarm=alarm)
+        # if the loop timer is set, it may be pointing to it
+        if self._timer is not None:
+            # so point it to the next alarm instead
+            self.rearm()
+            # and check whether there is anything left to do
+            self.check()
+        # all done
+        return
+
+
+    @pyre.export
+    def whenReadReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be read
+        """
+        # add it to the pile
+        return self.register(endpoint=channel.inbound, kind='read', channel=channel, call=call)
+
+
+    @pyre.export
+    def whenWriteReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be written
+        """
+        # add it to the pile
+        return self.register(endpoint=channel.outbound, kind='write', channel=channel, call=call)
+
+
+    @pyre.export
+    def whenException(self, channel, call):
+        """
+        Add {call} to the list of routines to call when something exceptional has happened
+        to {channel}
+        """
+        # {asyncio} can't report exceptional conditions, and a handler that never fires should
+        # not keep the loop alive, so there is nothing to do
+        return
+
+
+    @pyre.export
+    def forget(self, channel):
+        """
+        Remove all the routines registered for {channel}
+        """
+        # go through the endpoints of the channel
+        for endpoint in {channel.inbound, channel.outbound}:
+            # get the descriptor
+            fd = endpoint if isinstance(endpoint, int) else endpoint.fileno()
+            # remove its registration
+            entry = self._registry.pop(fd, None)
+            # if it wasn't there
+            if entry is None:
+                # move on
+                continue
+            # otherwise, stop monitoring it; don't rely on its handlers, since the pile is
+            # cleared while they are being invoked
+            self.loop.remove_reader(fd)
+            self.loop.remove_writer(fd)
+        # check whether there is anything left to do
+        return self.check()
+
+
+    @pyre.export
+    def stop(self):
+        """
+        Request the loop to stop watching for further events
+        """
+        # adjust my state
+        self._watching = False
+        # and let {serve} know
+        self.finish()
+        # all done
+        return
+
+
+    @pyre.export
+    def watch(self):
+        """
+        Run the event loop of the current thread until there are no more registered handlers
+        or alarms, or until someone calls {stop}
+        """
+        # attempt to
+        try:
+            # get the running loop
+            asyncio.get_running_loop()
+        # if there isn't one
+        except RuntimeError:
+            # all is well
+            pass
+        # otherwise
+        else:
+            # i can't block the loop that is supposed to invoke my handlers
+            raise RuntimeError("the event loop is already running; await 'serve' instead")
+        # run my loop until i'm done; it may have been picked up by an earlier registration
+        return self.loop.run_until_complete(self.serve())
+
+
+    async def serve(self):
+        """
+        Process events on the running loop until there are no more registered handlers or
+        alarms, or until someone calls {stop}
+        """
+        # move my registrations to the running loop
+        self.attach(loop=asyncio.get_running_loop())
+        # reset my state
+        self._watching = True
+        # make the future that marks the end of the session
+        self._done = self.loop.create_future()
+        # check whether there is anything to do
+        self.check()
+        # carefully
+        try:
+            # wait until we are done
+            return await self._done
+        # no matter what happened
+        finally:
+            # forget the future
+            self._done = None
+            # show me
+            self._debug.log("done watching")
+
+
+    # implementation details
+    def attach(self, loop):
+        """
+        Transfer my channels and alarms to {loop}
+        """
+        # get my current loop
+        current = self._loop
+        # if it's the same one
+        if current is loop:
+            # nothing to do
+            return
+        # if i have one, and it's still usable
+        if current is not None and not current.is_closed():
+            # go through my registrations
+            for fd, entry in self._registry.items():
+                # and remove them from the current loop
+                if entry.read: current.remove_reader(fd)
+                if entry.write: current.remove_writer(fd)
+        # if i have a timer
+        if self._timer is not None:
+            # cancel it
+            self._timer.cancel()
+            # and forget it
+            self._timer = None
+        # switch to the new loop
+        self._loop = loop
+        # go through my registrations
+        for fd, entry in self._registry.items():
+            # and add them to the new loop
+            if entry.read: loop.add_reader(fd, self.dispatch, fd, 'read')
+            if entry.write: loop.add_writer(fd, self.dispatch, fd, 'write')
+        # set up the timer for my alarms
+        self.rearm()
+        # all done
+        return
+
+
+    def register(self, endpoint, kind, channel, call):
+        """
+        Add {call} to the handlers of {kind} for {endpoint}
+        """
+        # get the descriptor
+        fd = endpoint if isinstance(endpoint, int) else endpoint.fileno()
+        # look up its registration
+        entry = self._registry.get(fd)
+        # if it's not there
+        if entry is None:
+            # make one
+            entry = self._entry()
+            # and add it to the registry
+            self._registry[fd] = entry
+        # get the handlers
+        handlers = getattr(entry, kind)
+        # if this is the first one
+        if not handlers:
+            # ask the loop to monitor the descriptor
+            self.watcher(kind=kind)(fd, self.dispatch, fd, kind)
+        # add the handler to the pile
+        handlers.append(self._event(channel=channel, handler=call))
+        # all done
+        return
+
+
+    def dispatch(self, fd, kind):
+        """
+        Invoke the handlers of {kind} for {fd}; called by the loop when {fd} is ready
+        """
+        # look up the registration
+        entry = self._registry.get(fd)
+        # if it's not there, the descriptor was dropped by another handler
+        if entry is None:
+            # nothing to do
+            return
+        # grab the handlers
+        handlers = getattr(entry, kind)
+        # and clear the pile, so handlers can register new ones while we are at it
+        setattr(entry, kind, [])
+        # carefully
+        try:
+            # invoke the handlers and save the ones that return {True}
+            keep = [ event for event in handlers if event.handler(channel=event.channel) ]
+        # if anything goes wrong
+        except Exception as error:
+            # make sure it gets to whoever is waiting for the loop, just like {Selector} would
+            return self.finish(error=error)
+        # if one of the handlers asked me to forget the descriptor
+        if self._registry.get(fd) is not entry:
+            # leave it alone
+            return self.check()
+        # combine with any registrations made by the handlers
+        handlers = keep + getattr(entry, kind)
+        # and put them back
+        setattr(entry, kind, handlers)
+        # if there is nobody left interested in this kind of event
+        if not handlers:
+            # stop monitoring the descriptor
+            self.unwatcher(kind=kind)(fd)
+            # and if there are no handlers at all
+            if not entry.read and not entry.write:
+                # forget it
+                del self._registry[fd]
+        # check whether there is anything left to do
+        return self.check()
+
+
+    def tick(self):
+        """
+        Raise the overdue alarms; called by the loop timer
+        """
+        # the timer has gone off
+        self._timer = None
+        # carefully
+        try:
+            # raise the alarms
+            self.awaken()
+        # if anything goes wrong
+        except Exception as error:
+            # make sure it gets to whoever is waiting for the loop
+            return self.finish(error=error)
+        # set up the timer for the next alarm
+        self.rearm()
+        # and check whether there is anything left to do
+        return self.check()
+
+
+    def rearm(self):
+        """
+        Point the loop timer to the next alarm
+        """
+        # if there is a timer
+        if self._timer is not None:
+            # cancel it
+            self._timer.cancel()
+            # and forget it
+            self._timer = None
+        # compute the time until the next alarm
+        timeout = self.poll()
+        # if there are no alarms
+        if timeout is None:
+            # nothing to do
+            return
+        # otherwise, set a timer
+        self._timer = self.loop.call_later(timeout, self.tick)
+        # and remember when the alarm comes due
+        self._armed = self._alarms[0].time
+        # all done
+        return
+
+
+    def check(self):
+        """
+        Wrap up the session when there are no more handlers or alarms
+        """
+        # if there are registered handlers or alarms
+        if self._watching and (self._registry or self._timer is not None):
+            # keep going
+            return
+        # show me
+        self._debug.log("** no registered handlers left; exiting")
+        # otherwise, we are done
+        return self.finish()
+
+
+    def finish(self, error=None):
+        """
+        Mark the end of the session, possibly because of {error}
+        """
+        # get the future
+        done = self._done
+        # if no one is waiting, or it has been marked already
+        if done is None or done.done():
+            # nothing to do
+            return
+        # if something went wrong
+        if error is not None:
+            # report it
+            done.set_exception(error)
+        # otherwise
+        else:
+            # mark the session as done
+            done.set_result(None)
+        # all done
+        return
+
+
+    def watcher(self, kind):
+        """
+        Get the loop method that starts monitoring descriptors for events of {kind}
+        """
+        # easy enough
+        return self.loop.add_reader if kind == 'read' else self.loop.add_writer
+
+
+    def unwatcher(self, kind):
+        """
+        Get the loop method that stops monitoring descriptors for events of {kind}
+        """
+        # easy enough
+        return self.loop.remove_reader if kind == 'read' else self.loop.remove_writer
+
+
+    @staticmethod
+    def default():
+        """
+        Retrieve the event loop of the current thread, making a new one if necessary
+        """
+        # attempt to
+        try:
+            # get the loop
+            loop = asyncio.get_event_loop()
+        # if there isn't one, e.g. because {asyncio.run} has already cleared it
+        except RuntimeError:
+            # no problem
+            loop = None
+        # if there is no usable loop
+        if loop is None or loop.is_closed():
+            # make a new one
+            loop = asyncio.new_event_loop()
+            # and install it
+            asyncio.set_event_loop(loop)
+        # all done
+        return loop
+
+
+    # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the map from descriptors to their handlers
+        self._registry = {}
+        # my debug aspect
+        import journal
+        self._debug = journal.debug('pyre.ipc.loop')
+        # all done
+        return
+
+
+    # private types
+    class _event:
+        """Encapsulate a channel and the associated call-back"""
+
+        def __init__(self, channel, handler):
+            self.channel = channel
+            self.handler = handler
+            return
+
+        __slots__ = ('channel', 'handler')
+
+
+    class _entry:
+        """The handlers registered for a descriptor"""
+
+        def __init__(self):
+            self.read = []
+            self.write = []
+            return
+
+        __slots__ = ('read', 'write')
+
+
+    # private data
+    _loop = None # the {asyncio} event loop
+    _done = None # the future that marks the end of a session
+    _timer = None # the loop timer for the next alarm
+    _armed = None # the due time of the alarm the timer points to
+    _watching = True # controls whether to continue monitoring the event sources
+
+
+# end of file
@@ -13,13 +13,17 @@ PACKAGE = ipc
 EXPORT_PYTHON_MODULES = \
     Channel.py \
     Dispatcher.py \
+    Framer.py \
+    Loop.py \
     Marshaler.py \
     Pickler.py \
     Pipe.py \
+    Poller.py \
     Port.py \
     PortTCP.py \
     Scheduler.py \
     Selector.py \
+    Shared.py \
     Socket.py \
     SocketTCP.py \
     __init__.py
@@ -40,4 +40,25 @@ class Marshaler(pyre.protocol, family="pyre.ipc.marshalers"):
         """
 
 
+    @pyre.provides
+    async def recvAsync(self, channel):
+        """
+        Extract and return one object from {channel} without blocking the running event loop
+        """
+
+
+    @pyre.provides
+    async def sendAsync(self, item, channel):
+        """
+        Pack and ship {item} over {channel} without blocking the running event loop
+        """
+
+
+    @pyre.provides
+    def release(self):
+        """
+        Reclaim the resources held on behalf of the items that are no longer in use
+        """
+
+
 # end of file
@@ -39,27 +39,98 @@ class Pickler(pyre.component, family="pyre.ipc.marshalers.pickler", implements=m
         Pack and ship {item} over {channel}
         """
         # pickle the item
-        body = pickle.dumps(item)
+        body = self.encode(item=item)
+        # build its header
+        header = struct.pack(self.packing, len(body))
+        # send them off without assembling them into a single byte string
+        return channel.writev(buffers=(header, body))
+
+
+    @pyre.export
+    def recv(self, channel):
+        """
+        Extract and return a single item from {channel}
+        """
+        # get the length; read exactly as much as needed, since there may be more messages
+        # behind this one
+        header = channel.read(minlen=self.headerSize, maxlen=self.headerSize)
+        # if the channel was closed before the header was complete
+        if len(header) < self.headerSize:
+            # complain
+            raise EOFError(f"{channel}: expected {self.headerSize} bytes, got {len(header)}")
+        # unpack it
+        length, = struct.unpack(self.packing, header)
+        # get the body
+        body = channel.read(minlen=length, maxlen=length)
+        # if the channel was closed before the body was complete
+        if len(body) < length:
+            # complain
+            raise EOFError(f"{channel}: expected {length} bytes, got {len(body)}")
+        # extract the object and return it
+        return self.decode(body=body)
+
+
+    @pyre.export
+    async def sendAsync(self, item, channel):
+        """
+        Pack and ship {item} over {channel} without blocking the running event loop
+        """
+        # pickle the item
+        body = self.encode(item=item)
         # build its header
         header = struct.pack(self.packing, len(body))
         # put it together
         message = header + body
         # send it off
-        return channel.write(bstr=message)
+        return await channel.writeAsync(bstr=message)
 
 
     @pyre.export
-    def recv(self, channel):
+    async def recvAsync(self, channel):
         """
-        Extract and return a single item from {channel}
+        Extract and return a single item from {channel} without blocking the running event loop
         """
         # get the length
-        header = channel.read(maxlen=self.headerSize)
+        header = await channel.readAsync(minlen=self.headerSize, maxlen=self.headerSize)
+        # if the channel was closed before the header was complete
+        if len(header) < self.headerSize:
+            # complain
+            raise EOFError(f"{channel}: expected {self.headerSize} bytes, got {len(header)}")
         # unpack it
         length, = struct.unpack(self.packing, header)
         # get the body
-        body = channel.read(minlen=length)
+        body = await channel.readAsync(minlen=length, maxlen=length)
+        # if the channel was closed before the body was complete
+        if len(body) < length:
+            # complain
+            raise EOFError(f"{channel}: expected {length} bytes, got {len(body)}")
         # extract the object and return it
+        return self.decode(body=body)
+
+
+    @pyre.export
+    def release(self):
+        """
+        Reclaim the resources held on behalf of the items that are no longer in use
+        """
+        # items are copied out of the message payload, so there is nothing to do
+        return self
+
+
+    # implementation details
+    def encode(self, item):
+        """
+        Convert {item} into a byte string
+        """
+        # easy enough
+        return pickle.dumps(item)
+
+
+    def decode(self, body):
+        """
+        Rebuild an item from its byte string representation
+        """
+        # easy enough
         return pickle.loads(body)
 
 
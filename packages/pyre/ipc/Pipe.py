@@ -105,6 +105,23 @@ class Pipe(Channel):
         return os.write(self.outfd, bstr)
 
 
+    # implementation details
+    def readSome(self, view):
+        """
+        Read as many bytes as are available, up to the size of {view}, into {view}
+        """
+        # read directly into the buffer
+        return os.readv(self.infd, [view])
+
+
+    def writeSome(self, views):
+        """
+        Write as much of the contents of {views} as the pipe will take
+        """
+        # gather the buffers in a single system call
+        return os.writev(self.outfd, views)
+
+
     # meta methods
     def __init__(self, infd, outfd, **kwds):
         # chain up
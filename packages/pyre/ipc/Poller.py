@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis, leif strand
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import pyre
+import errno
+import select
+# my interface
+from . import dispatcher
+# my base class
+from .Scheduler import Scheduler
+
+
+# declaration
+class Poller(Scheduler, family='pyre.ipc.dispatchers.poller', implements=dispatcher):
+    """
+    An event demultiplexer implemented using {epoll}, or {poll} on platforms that don't have it
+
+    {Poller} has the same interface as {Selector}, but it keeps persistent registrations with
+    the kernel: the interest of each descriptor is updated only when its set of handlers
+    changes, and each wake up costs time proportional to the number of descriptors that are
+    ready, rather than the number of descriptors that are watched. It is also not subject to
+    the {FD_SETSIZE} limit on the values of the descriptors that {select} can watch.
+    """
+
+
+    # constants
+    # the events that make a descriptor readable, writable, or exceptional; errors and hang
+    # ups are delivered to readers and writers, just like {select} does, and to the exception
+    # handlers as well, since the kernel reports them whether anybody asked or not
+    READ = select.POLLIN | select.POLLHUP | select.POLLERR
+    WRITE = select.POLLOUT | select.POLLHUP | select.POLLERR
+    EXCEPTION = select.POLLPRI | select.POLLHUP | select.POLLERR
+
+
+    # interface
+    @pyre.export
+    def whenReadReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be read
+        """
+        # add it to the pile
+        return self.register(endpoint=channel.inbound, kind='read', channel=channel, call=call)
+
+
+    @pyre.export
+    def whenWriteReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be written
+        """
+        # add it to the pile
+        return self.register(endpoint=channel.outbound, kind='write', channel=channel, call=call)
+
+
+    @pyre.export
+    def whenException(self, channel, call):
+        """
+        Add {call} to the list of routines to call when something exceptional has happened
+        to {channel}
+        """
+        # add both endpoints to the pile
+        self.register(endpoint=channel.inbound, kind='exception', channel=channel, call=call)
+        self.register(endpoint=channel.outbound, kind='exception', channel=channel, call=call)
+        # and return
+        return
+
+
+    @pyre.export
+    def forget(self, channel):
+        """
+        Remove all the routines registered for {channel}
+        """
+        # go through the endpoints of the channel
+        for endpoint in {channel.inbound, channel.outbound}:
+            # get the descriptor
+            fd = endpoint if isinstance(endpoint, int) else endpoint.fileno()
+            # look up its registration
+            entry = self._registry.get(fd)
+            # if it's not there
+            if entry is None:
+                # move on
+                continue
+            # otherwise, drop its handlers, in case it is being dispatched to right now
+            entry.read = entry.write = entry.exception = []
+            # and update the kernel registration
+            self.update(fd=fd, entry=entry)
+        # and return
+        return
+
+
+    @pyre.export
+    def stop(self):
+        """
+        Request the poller to stop watching for further events
+        """
+        # adjust my state
+        self._watching = False
+        # and return
+        return
+
+
+    @pyre.export
+    def watch(self):
+        """
+        Enter an indefinite loop of monitoring all registered event sources and invoking the
+        registered event handlers
+        """
+        # reset my state
+        self._watching = True
+        # grab a channel
+        channel = self._debug
+        # and my registry
+        registry = self._registry
+        # until someone says otherwise
+        while self._watching:
+            # compute how long i am allowed to be asleep
+            timeout = self.poll()
+            # show me
+            channel.log("watching {} descriptors; max sleep: {}", len(registry), timeout)
+
+            # check for indefinite block
+            if not registry and timeout is None:
+                # show me
+                channel.log("** no registered handlers left; exiting")
+                # and bail
+                return
+
+            # wait for an event
+            try:
+                # get the descriptors that are ready
+                events = self.wait(timeout)
+            # when a signal is delivered to a handler registered by the application, the
+            # system call is interrupted and raises {InterruptedError}
+            except InterruptedError as error:
+                # show me
+                channel.log("signal received: errno={}: {}", error.errno, error.strerror)
+                # keep going
+                continue
+
+            # show me
+            channel.log("activity detected on {} descriptors", len(events))
+            # go through the descriptors that are ready
+            for fd, mask in events:
+                # and dispatch to their handlers
+                self.dispatch(fd=fd, mask=mask)
+
+            # raise the overdue alarms
+            self.awaken()
+
+        # sign off
+        channel.log("done watching")
+        # all done
+        return
+
+
+    # implementation details
+    def register(self, endpoint, kind, channel, call):
+        """
+        Add {call} to the handlers of {kind} for {endpoint}
+        """
+        # get the descriptor
+        fd = endpoint if isinstance(endpoint, int) else endpoint.fileno()
+        # look up its registration
+        entry = self._registry.get(fd)
+        # if it's not there
+        if entry is None:
+            # make one
+            entry = self._entry()
+            # and add it to the registry
+            self._registry[fd] = entry
+        # add the handler to the pile
+        getattr(entry, kind).append(self._event(channel=channel, handler=call))
+        # update the kernel registration
+        self.update(fd=fd, entry=entry)
+        # all done
+        return
+
+
+    def dispatch(self, fd, mask):
+        """
+        Invoke the handlers of {fd} that are interested in the events in {mask}
+        """
+        # look up the registration
+        entry = self._registry.get(fd)
+        # if it's not there, the descriptor was dropped by an earlier handler in this batch
+        if entry is None:
+            # nothing to do
+            return
+        # if the descriptor is invalid, it was closed without telling us
+        if mask & select.POLLNVAL:
+            # show me
+            self._debug.log("descriptor {} was closed while being watched; dropping it", fd)
+            # forget its handlers
+            entry.read = entry.write = entry.exception = []
+        # otherwise
+        else:
+            # in the same order as {Selector}: exceptions first
+            if mask & self.EXCEPTION and entry.exception:
+                # invoke the handlers
+                entry.exception = self.invoke(entry=entry, kind='exception')
+            # then writers
+            if mask & self.WRITE and entry.write:
+                # invoke the handlers
+                entry.write = self.invoke(entry=entry, kind='write')
+            # and finally readers
+            if mask & self.READ and entry.read:
+                # invoke the handlers
+                entry.read = self.invoke(entry=entry, kind='read')
+        # if one of the handlers asked me to forget the descriptor
+        if self._registry.get(fd) is not entry:
+            # leave it alone
+            return
+        # update the kernel registration
+        self.update(fd=fd, entry=entry)
+        # all done
+        return
+
+
+    def invoke(self, entry, kind):
+        """
+        Invoke the handlers of {kind} in {entry} and return the ones that should remain
+        registered
+        """
+        # grab the handlers
+        handlers = getattr(entry, kind)
+        # and clear the pile, so handlers can register new ones while we are at it
+        setattr(entry, kind, [])
+        # invoke the handlers and save the ones that return {True}
+        keep = [ event for event in handlers if event.handler(channel=event.channel) ]
+        # combine with any registrations made by the handlers and return them
+        return keep + getattr(entry, kind)
+
+
+    def update(self, fd, entry):
+        """
+        Bring the kernel registration of {fd} in sync with its handlers
+        """
+        # compute the mask
+        mask = (
+            (select.POLLIN if entry.read else 0) |
+            (select.POLLOUT if entry.write else 0) |
+            (select.POLLPRI if entry.exception else 0))
+        # if nothing has changed
+        if mask == entry.mask:
+            # nothing to do
+            return
+        # get the kernel poller
+        poller = self._poller
+        # if there is no more interest in this descriptor
+        if not mask:
+            # forget it
+            del self._registry[fd]
+            # attempt to
+            try:
+                # remove it from the kernel registry
+                poller.unregister(fd)
+            # if the descriptor has been closed already, the kernel has already forgotten it
+            except (OSError, KeyError, ValueError):
+                # no worries
+                pass
+            # all done
+            return
+        # attempt to
+        try:
+            # if the descriptor is not known to the kernel yet
+            if not entry.mask:
+                # attempt to
+                try:
+                    # register it
+                    poller.register(fd, mask)
+                # if a closed descriptor with the same number is still registered
+                except FileExistsError:
+                    # replace its registration
+                    poller.modify(fd, mask)
+            # otherwise
+            else:
+                # attempt to
+                try:
+                    # adjust its registration
+                    poller.modify(fd, mask)
+                # if the kernel forgot about it because it was closed and reopened
+                except FileNotFoundError:
+                    # register it again
+                    poller.register(fd, mask)
+        # if something else went wrong
+        except OSError as error:
+            # and it's not because the descriptor was closed, e.g. by one of its handlers
+            if error.errno != errno.EBADF:
+                # let the caller know
+                raise
+            # otherwise, show me
+            self._debug.log("descriptor {} was closed while being watched; dropping it", fd)
+            # forget its handlers
+            entry.read = entry.write = entry.exception = []
+            # and its registration
+            del self._registry[fd]
+            # all done
+            return
+        # save the new mask
+        entry.mask = mask
+        # all done
+        return
+
+
+    # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+
+        # the map from descriptors to their handlers
+        self._registry = {}
+        # if the platform supports {epoll}
+        if hasattr(select, 'epoll'):
+            # use it
+            poller = select.epoll()
+            # it measures time in seconds, and wants -1 for an indefinite block
+            self.wait = lambda timeout: poller.poll(-1 if timeout is None else timeout)
+        # otherwise
+        else:
+            # fall back to {poll}
+            poller = select.poll()
+            # it measures time in milliseconds and wants {None} for an indefinite block
+            self.wait = lambda timeout: poller.poll(None if timeout is None else 1000*timeout)
+        # save the poller
+        self._poller = poller
+
+        # my debug aspect
+        import journal
+        self._debug = journal.debug('pyre.ipc.poller')
+
+        # all done
+        return
+
+
+    # private types
+    class _event:
+        """Encapsulate a channel and the associated call-back"""
+
+        def __init__(self, channel, handler):
+            self.channel = channel
+            self.handler = handler
+            return
+
+        __slots__ = ('channel', 'handler')
+
+
+    class _entry:
+        """The handlers registered for a descriptor, and its registration with the kernel"""
+
+        def __init__(self):
+            self.read = []
+            self.write = []
+            self.exception = []
+            self.mask = 0
+            return
+
+        __slots__ = ('read', 'write', 'exception', 'mask')
+
+
+    # private data
+    _watching = True # controls whether to continue monitoring the event sources
+
+
+# end of file
@@ -97,6 +97,17 @@ class PortTCP(Port, Channel):
         return self.channel
 
 
+    @property
+    def outbound(self):
+        """
+        Retrieve the output endpoint of the channel
+
+        Ports can't be written to; this is the same endpoint as {inbound}, and it is here so
+        that event dispatchers can forget a port before it is closed
+        """
+        return self.channel
+
+
     def close(self):
         """
         Close the port
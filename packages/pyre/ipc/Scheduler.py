@@ -7,8 +7,10 @@
 
 
 # externals
+import math
+import heapq
+import itertools
 import pyre
-import operator
 from time import time as now
 
 
@@ -19,12 +21,16 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
 
     Clients create alarms by invoking {alarm} and supplying an event handler to be invoked and
     specifying the number of seconds before the alarm comes due. The time interval is expected
-    to be a dimensional quantity with units of time.
+    to be a dimensional quantity with units of time. The {alarm} that is returned is a handle
+    that can be passed to {cancel} to prevent the handler from being invoked.
 
     The current implementation converts the time interval before the alarm comes due into an
     absolute time, and pairs it with the handler into an {_alarm} instance. The {_alarm} is
-    then stored into a list of such {_alarms}, and the list is sorted in reverse order,
-    i.e. with the alarm that is due next at the end of the list.
+    then pushed onto a heap, so the alarm that is due next is always the first one. Cancelled
+    alarms are marked as such and discarded when they reach the top of the heap, and the heap
+    is compacted when they become the majority. If {resolution} is non-zero, due times are
+    rounded up to the next multiple of it, so that alarms that come due within the same tick,
+    such as the heartbeats of a large number of peers, are raised together.
     """
 
 
@@ -32,6 +38,11 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
     from pyre.units.SI import second
 
 
+    # user configurable state
+    resolution = pyre.properties.dimensional(default=0*second)
+    resolution.doc = 'the granularity of the alarm times; alarms in the same tick are coalesced'
+
+
     # interface
     @pyre.export
     def alarm(self, interval, call):
@@ -43,12 +54,49 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
            {interval}: a dimensional quantity from {pyre.units} with units of time
         """
         # create a new alarm instance
-        alarm = self._alarm(time=now()+interval/self.second, handler=call)
-        # add it to my list
-        self._alarms.append(alarm)
-        # sort
-        self._alarms.sort(key=operator.attrgetter('time'), reverse=True)
-        # and return
+        alarm = self._alarm(
+            time=self.due(time=now(), interval=interval), sequence=next(self._sequence),
+            handler=call)
+        # add it to the heap
+        heapq.heappush(self._alarms, alarm)
+        # and mark it
+        alarm.queued = True
+        # and return it
+        return alarm
+
+
+    @pyre.export
+    def cancel(self, alarm):
+        """
+        Prevent {alarm} from being raised
+        """
+        # if it has been cancelled already
+        if alarm.handler is None:
+            # nothing to do
+            return
+        # mark it
+        alarm.handler = None
+        # if it is not on the heap, e.g. because it has already been raised
+        if not alarm.queued:
+            # there is nothing else to do
+            return
+        # otherwise, count it
+        self._cancelled += 1
+        # get the heap
+        alarms = self._alarms
+        # if the cancelled alarms are taking up most of the heap
+        if 2 * self._cancelled > len(alarms):
+            # go through the heap
+            for pending in alarms:
+                # and mark the cancelled alarms as no longer on it
+                if pending.handler is None: pending.queued = False
+            # filter them out; modify the heap in place, in case someone is holding on to it
+            alarms[:] = [ alarm for alarm in alarms if alarm.handler is not None ]
+            # restore the heap invariant
+            heapq.heapify(alarms)
+            # and reset the counter
+            self._cancelled = 0
+        # all done
         return
 
 
@@ -60,21 +108,16 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         returns 0. This slightly strange logic is designed to satisfy the requirements for
         calling {select}.
         """
-        # the necessary information is in the last entry in my {_alarms}, since they are
-        # always in descending order
-        try:
-            # try to grab it
-            alarm = self._alarms[-1]
-        # if there is nothing there
-        except IndexError:
+        # get my alarms
+        alarms = self._alarms
+        # discard the cancelled alarms at the top of the heap
+        self.purge()
+        # if there is nothing left
+        if not alarms:
             # we have no scheduled alarms
             return None
-        # if it succeeded
-        else:
-            # get the scheduled time
-            due = alarm.time
-        # return the number of seconds until it comes due, bound from below
-        return max(0, due - now())
+        # return the number of seconds until the next one comes due, bound from below
+        return max(0, alarms[0].time - now())
 
 
     def awaken(self):
@@ -83,33 +126,41 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         """
         # get my alarms
         alarms = self._alarms
-        # initialize the reschedule pile
-        reschedule = []
+        # initialize the pile of overdue alarms
+        overdue = []
         # get the time
         time = now()
 
-        # iterate through my alarms
-        while 1:
-            # attempt
-            try:
-                # to grab one
-                alarm = alarms.pop()
-            # if none are left
-            except IndexError:
-                # we are all done raising alarms
-                break
-            # if this alarm is not due yet
-            if time < alarm.time:
-                # put it back at the end of the list
-                alarms.append(alarm)
-                # no need to look any further
-                break
-            # otherwise, this alarm is overdue; invoke the handler
-            delta = alarm.handler(timestamp=time)
-            # if the handler indicated that it wants to reschedule this alarm
-            if delta:
+        # discard the cancelled alarms at the top of the heap
+        self.purge()
+        # as long as the next alarm is overdue
+        while alarms and alarms[0].time <= time:
+            # grab it
+            alarm = heapq.heappop(alarms)
+            # mark it as no longer on the heap
+            alarm.queued = False
+            # and add it to the pile
+            overdue.append(alarm)
+            # make sure the next one is live
+            self.purge()
+
+        # initialize the reschedule pile
+        reschedule = []
+        # go through the overdue alarms
+        for alarm in overdue:
+            # get the handler
+            handler = alarm.handler
+            # if the alarm was cancelled by one of the handlers we invoked
+            if handler is None:
+                # skip it
+                continue
+            # invoke the handler
+            delta = handler(timestamp=time)
+            # if the handler indicated that it wants to reschedule this alarm, and it didn't
+            # cancel it while it was running
+            if delta and alarm.handler is not None:
                 # save it
-                reschedule.append((delta, alarm.handler))
+                reschedule.append((delta, alarm))
 
         # if there is nothing to reschedule
         if not reschedule:
@@ -119,13 +170,14 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         # otherwise, get a fresh timestamp
         time = now()
         # go through the pile
-        for interval, call in reschedule:
-            # create a new alarm instance
-            alarm = self._alarm(time=time+interval/self.second, handler=call)
-            # add it to my list
-            self._alarms.append(alarm)
-        # sort
-        self._alarms.sort(key=operator.attrgetter('time'), reverse=True)
+        for interval, alarm in reschedule:
+            # reuse the alarm, so the handle held by the client stays valid
+            alarm.time = self.due(time=time, interval=interval)
+            alarm.sequence = next(self._sequence)
+            # put it back on the heap
+            heapq.heappush(alarms, alarm)
+            # and mark it
+            alarm.queued = True
 
         # all done
         return
@@ -135,30 +187,71 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
     def __init__(self, **kwds):
         # chain up
         super().__init__(**kwds)
-        # the list of alarms; kept sorted in descending order by alarm time, i.e. with the next
-        # alarm to go off at the end of the list
+        # the heap of alarms, ordered by their due time
         self._alarms = []
+        # the source of tie breakers, so alarms that come due together are raised in the
+        # order they were scheduled
+        self._sequence = itertools.count()
         # all done
         return
 
 
     # implementation details
+    def due(self, time, interval):
+        """
+        Compute the time an alarm scheduled at {time} for {interval} later comes due
+        """
+        # compute the due time in seconds
+        due = time + interval/self.second
+        # get the tick size
+        resolution = self.resolution/self.second
+        # if it is non-trivial
+        if resolution > 0:
+            # round up to the end of the tick, so alarms never go off early
+            due = math.ceil(due/resolution) * resolution
+        # all done
+        return due
+
+
+    def purge(self):
+        """
+        Discard the cancelled alarms at the top of the heap
+        """
+        # get my alarms
+        alarms = self._alarms
+        # as long as the top alarm is cancelled
+        while alarms and alarms[0].handler is None:
+            # discard it
+            heapq.heappop(alarms).queued = False
+            # and update the count
+            self._cancelled -= 1
+        # all done
+        return
+
+
     # private types
     class _alarm:
         """Encapsulate the time and event handler of an alarm"""
 
-        def __init__(self, time, handler):
+        def __init__(self, time, sequence, handler):
             self.time = time
+            self.sequence = sequence
             self.handler = handler
+            self.queued = False
             return
 
+        def __lt__(self, other):
+            return (self.time, self.sequence) < (other.time, other.sequence)
+
         def __str__(self): return "alarm: {.time}".format(self)
 
-        __slots__ = ('time', 'handler')
+        __slots__ = ('time', 'sequence', 'handler', 'queued')
 
 
     # private data
     _alarms = None
+    _sequence = None
+    _cancelled = 0
 
 
 # end of file
@@ -64,6 +64,21 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
         return
 
 
+    @pyre.export
+    def forget(self, channel):
+        """
+        Remove all the routines registered for {channel}
+        """
+        # go through the endpoints of the channel
+        for endpoint in {channel.inbound, channel.outbound}:
+            # and remove them from all my indices
+            self._read.pop(endpoint, None)
+            self._write.pop(endpoint, None)
+            self._exception.pop(endpoint, None)
+        # and return
+        return
+
+
     @pyre.export
     def stop(self):
         """
@@ -90,9 +105,9 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
             # show me
             channel.line("watching:")
             # compute how long i am allowed to be asleep
-            channel.line(f"    computing the allowed sleep interval")
+            channel.line("    computing the allowed sleep interval")
             timeout = self.poll()
-            channel.line(f"    max sleep: {timeout}")
+            channel.line("    max sleep: {}", timeout)
 
             # construct the descriptor containers
             channel.line("    collecting the event sources")
@@ -103,7 +118,7 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
             # if my channel is active
             if channel:
                 # show me the descriptors that have data to read
-                if iwtd: channel.line(f"      read:")
+                if iwtd: channel.line("      read:")
                 for fd in iwtd:
                     for event in self._read[fd]:
                         channel.line(f"        {event.channel}")
@@ -114,7 +129,7 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
                         channel.line(f"        {event.channel}")
                 # show me the channels with exceptions
                 if ewtd: channel.line("      exception:")
-                for channel in ewtd:
+                for fd in ewtd:
                     for event in self._exception[fd]:
                         channel.line(f"        {event.channel}")
 
@@ -125,7 +140,7 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
                 return
 
             # show me
-            channel.log(f"    calling select; timeout={timeout}")
+            channel.log("    calling select; timeout={}", timeout)
             # wait for an event
             try:
                 reads, writes, excepts = select.select(iwtd, owtd, ewtd, timeout)
@@ -136,8 +151,8 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
                 errno = error.errno
                 msg = error.strerror
                 # show me
-                channel.line(f"signal received: errno={errno}: {msg}")
-                channel.line(f"  more watching: {self._watching}")
+                channel.line("signal received: errno={}: {}", errno, msg)
+                channel.line("  more watching: {}", self._watching)
                 channel.log()
                 # keep going
                 continue
@@ -160,7 +175,7 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
             self.dispatch(index=self._read, entities=reads)
 
             # raise the overdue alarms
-            channel.log(f"    raising alarms: {len(self._alarms)} registered")
+            channel.log("    raising alarms: {} registered", len(self._alarms))
             self.awaken()
 
             # flush
@@ -179,11 +194,18 @@ class Selector(Scheduler, family='pyre.ipc.dispatchers.selector', implements=dis
         """
         # iterate over the active entities
         for active in entities:
-            # invoke the event handlers and save the events whose handlers return {True}
+            # get the registered handlers
+            handlers = index[active]
+            # invoke them and save the events whose handlers return {True}
             events = list(
-                event for event in index[active]
+                event for event in handlers
                 if event.handler(channel=event.channel)
                 )
+            # if one of the handlers asked me to forget the descriptor, it may have been closed
+            # and reused by a new channel with handlers of its own
+            if index.get(active) is not handlers:
+                # leave it alone
+                continue
             # if no handlers requested to be rescheduled
             if not events:
                 # remove the descriptor from the index
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import pyre
+import pickle
+import functools
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+# my base class
+from .Pickler import Pickler
+
+
+# class declaration
+class Shared(Pickler, family="pyre.ipc.marshalers.shared"):
+    """
+    A marshaler that moves large buffers between processes on the same host through shared
+    memory segments
+
+    Items are serialized using pickle protocol 5, which lets objects such as {numpy} arrays
+    and {pickle.PickleBuffer} instances hand their raw buffers to the marshaler instead of
+    copying them into the payload. Buffers with at least {threshold} bytes are copied into
+    fresh {multiprocessing.shared_memory} segments, and only the segment names travel over the
+    channel. The receiver maps the segments and rebuilds the items directly on top of them,
+    so bulk data never goes through the channel.
+
+    The receiver removes the segment names as soon as it maps them, so the memory is returned
+    to the system when the last view of the buffers is gone. The segments are held on to
+    until {release} finds they are no longer in use; the {nexus} peers call it after every
+    message they process. Segments that are never claimed, e.g. because the receiver died,
+    are removed by the {multiprocessing} resource tracker when the process tree exits; the
+    tracker is started by the constructor, so that processes that are forked later share it.
+    """
+
+
+    # user configurable state
+    threshold = pyre.properties.int(default=64*1024)
+    threshold.doc = "buffers with at least this many bytes are placed in shared memory"
+
+
+    # public data
+    protocol = 5 # the first pickle protocol that supports out-of-band buffers
+
+
+    # interface
+    @pyre.export
+    def release(self):
+        """
+        Reclaim the shared memory segments whose buffers are no longer in use
+        """
+        # make a pile for the segments that are still in use
+        live = []
+        # go through the segments i have mapped
+        for segment in self._segments:
+            # attempt to
+            try:
+                # unmap it
+                segment.close()
+            # if there are still views of its buffer
+            except BufferError:
+                # hold on to it
+                live.append(segment)
+        # replace my pile
+        self._segments = live
+        # all done
+        return self
+
+
+    # implementation details
+    def encode(self, item):
+        """
+        Convert {item} into a byte string, placing its large buffers in shared memory
+        """
+        # make a pile for the names and sizes of the segments
+        segments = []
+        # pickle the item; large buffers get placed in shared memory segments
+        body = pickle.dumps(item, protocol=self.protocol,
+                            buffer_callback=functools.partial(self.place, segments=segments))
+        # bundle the payload with the segment descriptors
+        return pickle.dumps((body, segments), protocol=self.protocol)
+
+
+    def decode(self, body):
+        """
+        Rebuild an item from its byte string representation, mapping its shared buffers
+        """
+        # unpack the payload and the segment descriptors
+        body, segments = pickle.loads(body)
+        # map the segments
+        buffers = [ self.claim(name=name, size=size) for name, size in segments ]
+        # and rebuild the item on top of them
+        return pickle.loads(body, buffers=buffers)
+
+
+    def place(self, buffer, segments):
+        """
+        Copy {buffer} into a new shared memory segment, unless it is small enough to be kept
+        in the message payload
+
+        N.B.: this is the pickle {buffer_callback}; it returns {True} for the buffers that
+        should be serialized along with the rest of the item
+        """
+        # attempt to
+        try:
+            # get a flat view of the buffer
+            raw = buffer.raw()
+        # if the buffer is not contiguous
+        except BufferError:
+            # leave it in the payload
+            return True
+        # get its size
+        size = raw.nbytes
+        # if it's small
+        if size < self.threshold:
+            # leave it in the payload
+            return True
+        # make a segment
+        segment = SharedMemory(create=True, size=max(size, 1))
+        # copy the buffer
+        segment.buf[:size] = raw
+        # record the segment name and the buffer size
+        segments.append((segment.name, size))
+        # unmap it; the segment stays around until the receiver claims it
+        segment.close()
+        # and let pickle know the buffer is taken care of
+        return False
+
+
+    def claim(self, name, size):
+        """
+        Map the shared memory segment {name} and return a view of its first {size} bytes
+        """
+        # map the segment
+        segment = SharedMemory(name=name)
+        # remove its name; the memory is returned to the system when it is no longer mapped
+        segment.unlink()
+        # hold on to it until its buffer is no longer in use
+        self._segments.append(segment)
+        # and build a view of its contents
+        return segment.buf[:size]
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make sure the resource tracker is running, so that processes forked from this one
+        # share it and can pass segments among them without triggering any leak warnings
+        resource_tracker.ensure_running()
+        # the segments i have mapped
+        self._segments = []
+        # all done
+        return
+
+
+    # private data
+    _segments = None
+
+
+# end of file
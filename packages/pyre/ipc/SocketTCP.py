@@ -68,6 +68,22 @@ class SocketTCP(Socket):
 
 
     # implementation details
+    def readSome(self, view):
+        """
+        Read as many bytes as are available, up to the size of {view}, into {view}
+        """
+        # read directly into the buffer
+        return self.recv_into(view)
+
+
+    def writeSome(self, views):
+        """
+        Write as much of the contents of {views} as the socket will take
+        """
+        # gather the buffers in a single system call
+        return self.sendmsg(views)
+
+
     __slots__ = () # socket has it, so why not...
 
 
@@ -78,6 +78,26 @@ def pickler():
     # and return it
     return pickler
 
+@foundry(implements=marshaler)
+def framer():
+    """
+    A marshaler that ships large buffers without copying them into the message payload
+    """
+    # grab the component class record
+    from .Framer import Framer as framer
+    # and return it
+    return framer
+
+@foundry(implements=marshaler)
+def shared():
+    """
+    A marshaler that moves large buffers to other processes through shared memory
+    """
+    # grab the component class record
+    from .Shared import Shared as shared
+    # and return it
+    return shared
+
 @foundry
 def scheduler():
     """
@@ -88,6 +108,26 @@ def scheduler():
     # and return it
     return scheduler
 
+@foundry
+def loop():
+    """
+    A scheduler that delegates the monitoring of file objects to an {asyncio} event loop
+    """
+    # grab the component class record
+    from .Loop import Loop as loop
+    # and return it
+    return loop
+
+@foundry
+def poller():
+    """
+    A scheduler that can listen to file objects using {epoll} or {poll}
+    """
+    # grab the component class record
+    from .Poller import Poller as poller
+    # and return it
+    return poller
+
 @foundry
 def selector():
     """
@@ -109,6 +149,24 @@ def newPickler(**kwds):
     # and return it
     return pickler(**kwds)
 
+def newFramer(**kwds):
+    """
+    A marshaler that ships large buffers without copying them into the message payload
+    """
+    # grab the component class record
+    from .Framer import Framer as framer
+    # and return it
+    return framer(**kwds)
+
+def newShared(**kwds):
+    """
+    A marshaler that moves large buffers to other processes through shared memory
+    """
+    # grab the component class record
+    from .Shared import Shared as shared
+    # and return it
+    return shared(**kwds)
+
 def newScheduler(**kwds):
     """
     A component that enables the construction of applications with event loops
@@ -118,6 +176,24 @@ def newScheduler(**kwds):
     # and return it
     return scheduler(**kwds)
 
+def newLoop(**kwds):
+    """
+    A scheduler that delegates the monitoring of file objects to an {asyncio} event loop
+    """
+    # grab the component class record
+    from .Loop import Loop as loop
+    # and return it
+    return loop(**kwds)
+
+def newPoller(**kwds):
+    """
+    A scheduler that can listen to file objects using {epoll} or {poll}
+    """
+    # grab the component class record
+    from .Poller import Poller as poller
+    # and return it
+    return poller(**kwds)
+
 def newSelector(**kwds):
     """
     A scheduler that can listen to file objects
@@ -7,7 +7,11 @@
 
 
 # externals
+import sys
+import signal
+import resource
 import functools
+import collections
 # my base class
 from .Peer import Peer
 
@@ -30,10 +34,57 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
     schedules the execution of a {task} by invoking the team side interface. The crew instance
     serializes the task and sends it off to its remote twin for execution, monitors progress,
     and reports the task result back to the host application.
+
+    When the worker side is given a {heartbeat} interval, it sends its twin a healthy status
+    code at that interval while it is connected, so that the team side can tell a crew member
+    that is busy with a long task from one that can't be reached any more; {heard} is the time
+    the team side last heard from its twin. Crew members whose connection drops are reported to
+    the team as lost.
+
+    The worker side aborts tasks that run for longer than their {timeout}, or the {timeout} of
+    the crew member if they don't have one, and reports its memory high-water mark along with
+    the results of every batch, so the team can replace crew members that have grown too large.
     """
 
+    # public data
+    affinity = None # the affinity of the last task i was given
+    finish = None # the time i resigned
+    completed = 0 # the number of tasks i completed
+    failed = 0 # the number of tasks that failed temporarily
+    aborted = 0 # the number of tasks that could not be completed
+    heartbeat = None # the interval between the status reports of the worker side
+    heard = None # the last time the team side heard from its twin
+    since = None # the time my twin started working on the oldest batch in flight
+    timeout = None # the time limit of the tasks that don't have one of their own
+    footprint = 0 # the memory high-water mark of my twin, in bytes
+
+
+    @property
+    def statistics(self):
+        """
+        Summarize the work i have done on the team side
+        """
+        # compute the time i have spent working; my timer is running while i have batches
+        # in flight
+        busy = self.busy.lap() if self.pending else self.busy.read()
+        # and the time i have been a member of the team
+        elapsed = (self.timer.lap() if self.finish is None else self.finish) - self.start
+        # build the summary
+        return {
+            'completed': self.completed,
+            'failed': self.failed,
+            'aborted': self.aborted,
+            'busy': busy,
+            'utilization': busy / elapsed if elapsed > 0 else 0,
+            }
+
+
+    # constants
+    from pyre.units.SI import second
+
+
     # types
-    from .exceptions import RecoverableError
+    from .exceptions import RecoverableError, TimeoutError
     from .CrewStatus import CrewStatus as crewcodes
     from .TaskStatus import TaskStatus as taskcodes
 
@@ -63,8 +114,18 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         """
         # check it's me we are talking about
         assert channel is self.channel
-        # get the status of my twin
-        status = self.marshaler.recv(channel=channel)
+        # attempt to
+        try:
+            # get the status of my twin
+            status = self.marshaler.recv(channel=channel)
+        # if the connection dropped
+        except (EOFError, OSError):
+            # let the team know
+            team.lose(crew=self)
+            # and do not reschedule this handler
+            return False
+        # mark the time
+        self.heard = self.timer.lap()
         # and if all is good
         if status is self.crewcodes.healthy:
             # let the team know
@@ -75,59 +136,123 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return False
 
 
-    def execute(self, team, task):
+    def execute(self, team, tasks):
         """
-        Send my twin the {task} to be executed
+        Send my twin a batch of {tasks} to be executed
         """
-        # send the task
-        self.marshaler.send(channel=self.channel, item=task)
-        # schedule the harvesting of the result
-        self.dispatcher.whenReadReady(
-            channel = self.channel,
-            call = functools.partial(self.assess, team=team, task=task))
+        # send the tasks
+        self.marshaler.send(channel=self.channel, item=tasks)
+        # add them to the pile of batches in flight
+        self.pending.append(tasks)
+        # if this is the only batch in flight
+        if len(self.pending) == 1:
+            # i'm busy now
+            self.busy.start()
+            # my twin is expected to stay in touch from now on, and it's working on this batch
+            self.heard = self.since = self.timer.lap()
+            # schedule the harvesting of the results; the handler stays registered for as long
+            # as there are batches in flight
+            self.dispatcher.whenReadReady(
+                channel = self.channel,
+                call = functools.partial(self.assess, team=team))
         # all done
         return self
 
 
-    def assess(self, channel, team, task, **kwds):
+    def assess(self, channel, team, **kwds):
         """
-        Harvest the task completion status
+        Harvest the completion status of the oldest batch of tasks in flight
         """
-        # grab the report
-        memberstatus, taskstatus, result = self.marshaler.recv(channel=channel)
-        # show me on the debug channel
-        self.debug.log('{me.pid}: {member}, {task}, {result}'.format(
-            me=self, member=memberstatus, task=taskstatus, result=result))
-
-        # first, let's figure out what to do with the task; if it failed due to some temporary
-        # condition
-        if taskstatus is self.taskcodes.failed:
-            # tell me
-            self.reportRecoverableError(team=team, task=task, error=result)
-            # put the task back in the workplan
-            team.workplan.add(task)
-
-        # now, let's figure out what to do with me; if i'm healthy
-        if memberstatus is self.crewcodes.healthy:
-            # put me back in the work queue
-            team.schedule(crew=self)
+        # attempt to
+        try:
+            # grab the next message
+            message = self.marshaler.recv(channel=channel)
+        # if the connection dropped
+        except (EOFError, OSError):
+            # let the team know
+            team.lose(crew=self)
+            # and do not reschedule this handler
+            return False
+        # mark the time
+        self.heard = self.timer.lap()
+        # if it's just a status code, my twin is letting me know it's still alive
+        if isinstance(message, self.crewcodes):
+            # keep harvesting
+            return True
+        # otherwise, it's a report
+        memberstatus, reports, self.footprint = message
+        # my twin executes the batches in the order they were sent
+        tasks = self.pending.popleft()
+        # if there are more batches in flight
+        if self.pending:
+            # my twin is working on the next one now
+            self.since = self.heard
         # otherwise
         else:
-            # tell me
-            self.reportUnrecoverableError(team=team, task=task, error=result)
-            # dismiss me
-            team.dismiss(crew=self)
-
-        # all done
-        return False
+            # i'm not busy any more
+            self.busy.stop()
+        # show me on the debug channel
+        self.debug.log('{me.pid}: {member}, {count} reports'.format(
+            me=self, member=memberstatus, count=len(reports)))
+
+        # go through the tasks and their reports
+        for task, (taskstatus, result) in zip(tasks, reports):
+            # if the task was completed
+            if taskstatus is self.taskcodes.completed:
+                # count it
+                self.completed += 1
+                # deliver the result
+                team.complete(task=task, result=result)
+            # if it failed due to some temporary condition
+            elif taskstatus is self.taskcodes.failed:
+                # count it
+                self.failed += 1
+                # tell me
+                self.reportRecoverableError(team=team, task=task, error=result)
+                # and let the team decide when to try again
+                team.retry(task=task, error=result)
+            # otherwise, it can't be completed
+            else:
+                # count it
+                self.aborted += 1
+                # deliver the error
+                team.abort(task=task, error=result)
+        # my twin stops executing a batch when it gets damaged; put the rest back in the workplan
+        team.workplan.update(tasks=tasks[len(reports):])
+        # and reclaim the resources held on behalf of results that are no longer in use
+        self.marshaler.release()
+
+        # record my status
+        self.status = memberstatus
+        # if i'm not healthy
+        if memberstatus is not self.crewcodes.healthy:
+            # tell me about the task that damaged me
+            self.reportUnrecoverableError(
+                team=team, task=tasks[len(reports)-1], error=reports[-1][1])
+        # either way, let the team decide what to do with me
+        team.schedule(crew=self)
+        # keep harvesting as long as there are batches in flight and i'm healthy
+        return bool(self.pending) and memberstatus is self.crewcodes.healthy
 
 
     def dismissed(self):
         """
         My team manager has dismissed me
         """
-        # send the end-of-tasks marker
-        self.marshaler.send(channel=self.channel, item=None)
+        # if i have batches in flight
+        if self.pending:
+            # forget them; my team has taken care of them
+            self.pending.clear()
+            # and stop my timer
+            self.busy.stop()
+        # attempt to
+        try:
+            # send the end-of-tasks marker
+            self.marshaler.send(channel=self.channel, item=None)
+        # if the connection dropped
+        except OSError:
+            # my twin is gone already
+            pass
         # clean up
         self.resign()
         # leave a note
@@ -136,6 +261,24 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return self
 
 
+    def abandon(self):
+        """
+        The connection to my twin was lost
+        """
+        # mark me
+        self.status = self.crewcodes.lost
+        # if i have batches in flight
+        if self.pending:
+            # forget them; my team has taken care of them
+            self.pending.clear()
+            # and stop my timer
+            self.busy.stop()
+        # leave a note
+        self.debug.log('{me.pid}: lost'.format(me=self))
+        # all done
+        return self
+
+
     def reportRecoverableError(self, team, task, error):
         """
         Report a task failure that can be reasonably expected to be temporary
@@ -177,59 +320,73 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         self.marshaler.send(channel=channel, item=self.crewcodes.healthy)
         # register the task execution handler
         self.dispatcher.whenReadReady(channel=self.channel, call=self.perform)
+        # if i'm supposed to stay in touch
+        if self.heartbeat:
+            # schedule my status reports
+            self.dispatcher.alarm(interval=self.heartbeat, call=self.beat)
         # do not reschedule this handler
         return False
 
 
     def perform(self, channel, **kwds):
         """
-        A notification has arrived that indicates there is a task waiting to be executed
+        A notification has arrived that indicates there is a batch of tasks waiting to be
+        executed
         """
-        # extract the task from the channel
-        task = self.marshaler.recv(channel=channel)
+        # reclaim the resources held on behalf of earlier batches
+        self.marshaler.release()
+        # attempt to
+        try:
+            # extract the tasks from the channel
+            tasks = self.marshaler.recv(channel=channel)
+        # if the connection dropped
+        except (EOFError, OSError):
+            # my team is gone; we are all done
+            self.stop()
+            # don't reschedule this handler
+            return False
         # leave a note
-        self.debug.log('{me.pid}: got {task}'.format(me=self, task=task))
+        self.debug.log('{me.pid}: got {tasks}'.format(me=self, tasks=tasks))
         # if it's a quit marker
-        if task is None:
+        if tasks is None:
             # we are all done
             self.stop()
             # don't reschedule this handler
             return False
-
-        # otherwise, try to
-        try:
-            # execute the task and collect its result
-            result = self.engage(task=task, **kwds)
-        # if the task failure is recoverable
-        except self.RecoverableError as error:
-            # prepare a report with an error code for the task
-            taskstatus = self.taskcodes.failed
-            # a clean bill of health for me
-            crewstatus = self.crewcodes.healthy
-            # and attach the error description
-            result = error
-        # if anything else goes wrong
-        except Exception as error:
-            # prepare a report with an error code for the task
-            taskstatus = self.taskcodes.aborted
-            # mark me as damaged
-            crewstatus = self.crewcodes.damaged
-            # and attach the error description
-            result = error
-        # if all goes well
-        else:
-            # indicate task success
-            taskstatus = self.taskcodes.completed
-            # and a clean bill of health for me
-            crewstatus = self.crewcodes.healthy
-
-        # schedule the reporting of the execution of this task
+        # if i'm damaged
+        if self.status is not self.crewcodes.healthy:
+            # my team has been told, and it will reassign these tasks; just wait for dismissal
+            return True
+
+        # initialize the pile of task reports
+        reports = []
+        # go through the tasks
+        for task in tasks:
+            # try to
+            try:
+                # execute the task and collect its result
+                result = self.engage(task=task, **kwds)
+            # if the task failure is recoverable
+            except self.RecoverableError as error:
+                # prepare a report with an error code for the task, and attach the error
+                reports.append((self.taskcodes.failed, error))
+            # if anything else goes wrong
+            except Exception as error:
+                # prepare a report with an error code for the task, and attach the error
+                reports.append((self.taskcodes.aborted, error))
+                # mark me as damaged
+                self.status = self.crewcodes.damaged
+                # and don't touch the rest of the tasks
+                break
+            # if all goes well
+            else:
+                # indicate task success
+                reports.append((self.taskcodes.completed, result))
+
+        # schedule the reporting of the execution of these tasks
         self.dispatcher.whenWriteReady(
             channel = channel,
-            call = functools.partial(self.report,
-                                     result = result,
-                                     crewstatus = crewstatus,
-                                     taskstatus = taskstatus))
+            call = functools.partial(self.report, crewstatus=self.status, reports=reports))
 
         # and go back to waiting for more
         return True
@@ -239,28 +396,97 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         """
         Carry out the task
         """
-        # just do it
-        return task(**kwds)
+        # get its time limit
+        timeout = getattr(task, 'timeout', None) or self.timeout
+        # convert it to seconds
+        timeout = 0 if timeout is None else timeout / self.second
+        # if there isn't one
+        if not timeout:
+            # just do it
+            return task(**kwds)
+        # otherwise, interrupt the task when the time is up
+        handler = signal.signal(signal.SIGALRM, self.expire)
+        # start the clock
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        # try to
+        try:
+            # carry out the task
+            return task(**kwds)
+        # no matter what happened
+        finally:
+            # stop the clock
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            # and restore the signal handler
+            signal.signal(signal.SIGALRM, handler)
+
+
+    def expire(self, signal, frame):
+        """
+        The task i'm executing ran out of time
+
+        N.B.: this is a signal handler; the exception it raises aborts the task and damages me,
+        since the task was interrupted at an arbitrary point
+        """
+        # complain
+        raise self.TimeoutError(description="the task ran out of time")
 
 
-    def report(self, channel, crewstatus, taskstatus, result, **kwds):
+    def highwater(self):
+        """
+        Compute the memory high-water mark of this process, in bytes
         """
-        Post the task completion {report}
+        # get the peak resident set size
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # it's in bytes on macOS and in kilobytes everywhere else
+        return peak if sys.platform == 'darwin' else 1024 * peak
+
+
+    def report(self, channel, crewstatus, reports, **kwds):
+        """
+        Post the completion {reports} of a batch of tasks
         """
         # make a report
-        report = (crewstatus, taskstatus, result)
+        report = (crewstatus, reports, self.highwater())
         # tell me
         self.debug.log('{me.pid}: sending report {report}'.format(me=self, report=report))
-        # serialize and send
-        self.marshaler.send(channel=channel, item=report)
+        # attempt to
+        try:
+            # serialize and send
+            self.marshaler.send(channel=channel, item=report)
+        # if the connection dropped
+        except OSError:
+            # my team is gone; we are all done
+            self.stop()
         # all done; don't reschedule
         return False
 
 
+    def beat(self, **kwds):
+        """
+        Let my twin know i'm still alive
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # attempt to
+        try:
+            # send in my status
+            self.marshaler.send(channel=self.channel, item=self.status)
+        # if the connection dropped
+        except OSError:
+            # my team is gone; we are all done
+            self.stop()
+            # and don't reschedule
+            return None
+        # do it again after a while
+        return self.heartbeat
+
+
     def resign(self):
         # record my finish time; don't mess with the timer too much as it might not belong to me
         self.finish = self.timer.lap()
-        # close my communication channel
+        # forget the handlers that are still waiting for my channel
+        self.dispatcher.forget(channel=self.channel)
+        # and close it
         self.channel.close()
         # all done
         return self
@@ -274,6 +500,14 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         self.pid = pid
         # save the communication channel to my twin
         self.channel = channel
+        # the batches of tasks in flight
+        self.pending = collections.deque()
+        # my health
+        self.status = self.crewcodes.healthy
+        # the time i joined
+        self.start = self.timer.lap()
+        # and the timer that measures the time i spend working
+        self.busy = self.pyre_executive.newTimer(name='pyre.nexus.crew.{}'.format(pid)).reset()
         # all done
         return
 
@@ -22,6 +22,8 @@ class CrewStatus(enum.Enum):
     # the crew member is compromised and can't be relied upon any more; it should be removed
     # from the team permanently
     damaged = 1
+    # the connection to the crew member was lost; its tasks in flight must be reassigned
+    lost = 2
 
 
 # end of file
@@ -8,6 +8,8 @@
 
 # externals
 import os
+import signal
+import functools
 # support
 import pyre
 # my protocol
@@ -18,9 +20,23 @@ from .Recruiter import Recruiter
 class Fork(pyre.component, family='pyre.nexus.recruiters.fork', implements=Recruiter):
     """
     Create worker processes by cloning the current one
+
+    The worker processes are checked on every {interval} using an alarm with the dispatcher of
+    the team, without blocking: the ones that were dismissed are reaped as soon as they exit,
+    and the team is told about the ones that exited without being dismissed, so it can put
+    their tasks back in the workplan and recruit replacements.
     """
 
 
+    # constants
+    from pyre.units.SI import second
+
+
+    # user configurable state
+    interval = pyre.properties.dimensional(default=0.05*second)
+    interval.doc = 'the interval between checks on the worker processes'
+
+
     # protocol obligations
     @pyre.provides
     def recruit(self, team, **kwds):
@@ -52,8 +68,14 @@ class Fork(pyre.component, family='pyre.nexus.recruiters.fork', implements=Recru
 
         # in the worker process
         if pid == 0:
+            # close the team end of the channel, so the worker notices when the team goes away
+            child.close()
             # make a team member
             crew = team.crew(pid=os.getpid(), channel=parent, **kwds)
+            # that speaks the same language as its twin
+            crew.marshaler = team.marshaler
+            # and enforces the time limit of the team
+            crew.timeout = team.timeout
             # ask it to register with the team
             crew.register()
             # spin up and carry out tasks until there is nothing more to do
@@ -61,12 +83,21 @@ class Fork(pyre.component, family='pyre.nexus.recruiters.fork', implements=Recru
             # at which point, this process must terminate
             raise SystemExit(status)
 
-        # make a member proxy for the team manager and return it
+        # close the worker end of the channel, so the team notices when the worker goes away
+        parent.close()
+        # make a member proxy for the team manager
         crew = team.crew(pid=pid, channel=child, timer=team.timer)
         # adjust its support for asynchrony
         crew.dispatcher = team.dispatcher
         # and its message serializer
         crew.marshaler = team.marshaler
+        # if i'm not checking on the workers
+        if not self.crews and not self.exiting:
+            # start
+            team.dispatcher.alarm(
+                interval=self.interval, call=functools.partial(self.reap, team=team))
+        # add it to my pile
+        self.crews[pid] = crew
         # spin it up and return it
         return crew.join(team=team)
 
@@ -76,10 +107,79 @@ class Fork(pyre.component, family='pyre.nexus.recruiters.fork', implements=Recru
         """
         The {team} manager has dismissed the given {member}
         """
-        # harvest the status
-        status = os.waitpid(crew.pid, 0)
+        # if the worker process has been reaped already
+        if self.crews.pop(crew.pid, None) is None:
+            # nothing to do
+            return
+        # otherwise, harvest its status, if it's done
+        done, status = os.waitpid(crew.pid, os.WNOHANG)
+        # if it's not done yet
+        if not done:
+            # reap it later
+            self.exiting.add(crew.pid)
+        # all done
+        return
+
+
+    @pyre.provides
+    def terminate(self, team, crew, **kwds):
+        """
+        Stop the {crew} member of {team} that is not responding
+        """
+        # kill the worker process; it gets reaped once the team dismisses it
+        os.kill(crew.pid, signal.SIGKILL)
         # all done
         return
 
 
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the map from process ids to the team side of the crew members
+        self.crews = {}
+        # the ids of the dismissed worker processes that haven't exited yet
+        self.exiting = set()
+        # all done
+        return
+
+
+    # implementation details
+    def reap(self, team, **kwds):
+        """
+        Harvest the status of the worker processes that are done
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # go through the dismissed workers
+        for pid in tuple(self.exiting):
+            # check on each one
+            done, status = os.waitpid(pid, os.WNOHANG)
+            # if it's gone
+            if done:
+                # forget it
+                self.exiting.discard(pid)
+        # go through the active workers
+        for pid, crew in tuple(self.crews.items()):
+            # check on each one
+            done, status = os.waitpid(pid, os.WNOHANG)
+            # if it's gone
+            if done:
+                # forget it
+                del self.crews[pid]
+                # and let the team know that its crew member was lost
+                team.lose(crew=crew)
+        # if there are workers left
+        if self.crews or self.exiting:
+            # check again later
+            return self.interval
+        # otherwise, don't reschedule
+        return None
+
+
+    # private data
+    crews = None # the map from process ids to the team side of the crew members
+    exiting = None # the ids of the dismissed worker processes that haven't exited yet
+
+
 # end of file
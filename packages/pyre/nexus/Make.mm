@@ -19,12 +19,15 @@ EXPORT_PYTHON_MODULES = \
     Node.py \
     Peer.py \
     Pool.py \
+    Queue.py \
     Recruiter.py \
+    Remote.py \
     Server.py \
     Service.py \
     Task.py \
     TaskStatus.py \
     Team.py \
+    Workplan.py \
     exceptions.py \
     __init__.py
 
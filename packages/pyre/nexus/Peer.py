@@ -63,6 +63,21 @@ class Peer(pyre.component, family='pyre.nexus.peers.peer', implements=Asynchrono
         return self.dispatcher.watch()
 
 
+    async def serve(self):
+        """
+        Start processing requests on the running {asyncio} event loop; this requires a
+        dispatcher that can share the loop, such as {pyre.ipc.loop}
+        """
+        # prepare the execution context
+        self.prepare()
+        # process events until the dispatcher runs out of things to do
+        status = await self.dispatcher.serve()
+        # when everything is done
+        self.shutdown()
+        # and report the status
+        return status
+
+
     @pyre.export
     def shutdown(self):
         """
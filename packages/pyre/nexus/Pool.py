@@ -8,6 +8,9 @@
 
 # externals
 import functools
+import itertools
+import collections
+import concurrent.futures
 # support
 import pyre
 # base class
@@ -16,17 +19,43 @@ from .Peer import Peer
 from .Team import Team
 # my user configurable state
 from .Recruiter import Recruiter
+from .Workplan import Workplan
 
 
 # declaration
 class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     """
     A process collective that coöperate to carry out a work plan
+
+    Tasks are sent to crew members in batches of up to {chunk} tasks, and each crew member
+    may have up to {prefetch} batches in flight, so that small tasks don't pay for a full round
+    trip each. Every task in the workplan gets a {concurrent.futures.Future} that receives its
+    result when it is completed, or its error when it is aborted; {map} executes a collection
+    of tasks and streams their results back in completion order.
+
+    The order in which tasks are handed out, and the policy for retrying tasks that failed
+    temporarily, are up to the {workplan}. Retries are scheduled as alarms with my dispatcher,
+    and tasks that run out of retries are aborted. The time each crew member spends working is
+    measured by its {busy} timer, and {statistics} summarizes the utilization of the team.
+
+    Crew members whose connection drops are retired, and replacements are recruited if there
+    is work left to do; the oldest batch they had in flight is retried, in case one of its tasks
+    is to blame, and the rest are put back in the workplan. Tasks that run for longer than their
+    {timeout}, or the {timeout} of the team if they don't have one, are aborted by their crew
+    member, which is then replaced; crew members that don't report back within the time limit
+    of their batch are checked every {checkup} and terminated. Crew members are also replaced
+    after executing {quota} tasks, or when their memory high-water mark exceeds {memory} bytes,
+    to contain leaks in long running pools.
     """
 
 
+    # constants
+    from pyre.units.SI import second
+
+
     # types
     from .Crew import Crew as crew
+    from .exceptions import TimeoutError, CrewLostError, IncompleteError
 
 
     # user configurable state
@@ -36,6 +65,27 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     recruiter = Recruiter()
     recruiter.doc = 'the strategy for recruiting crew members'
 
+    workplan = Workplan()
+    workplan.doc = 'the container of the tasks that are waiting to be executed'
+
+    prefetch = pyre.properties.int(default=1)
+    prefetch.doc = 'the number of task batches each crew member may have in flight'
+
+    chunk = pyre.properties.int(default=1)
+    chunk.doc = 'the maximum number of tasks sent to a crew member in a single message'
+
+    timeout = pyre.properties.dimensional(default=0*second)
+    timeout.doc = 'the time limit of the tasks that do not have one; zero for no limit'
+
+    checkup = pyre.properties.dimensional(default=0.1*second)
+    checkup.doc = 'the interval between checks for crew members that exceeded their time limit'
+
+    quota = pyre.properties.int(default=0)
+    quota.doc = 'the number of tasks after which a crew member is replaced; zero for no limit'
+
+    memory = pyre.properties.int(default=0)
+    memory.doc = 'the memory high-water mark, in bytes, after which a crew member is replaced'
+
 
     # interface
     @pyre.export
@@ -53,8 +103,14 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         channel.line('  registered crew members: {}'.format(len(self.registered)))
         channel.line('  active crew members: {}'.format(len(self.active)))
 
+        # make futures for the new tasks
+        for task in workplan:
+            # unless they have one already
+            if task not in self.futures:
+                # make one
+                self.futures[task] = concurrent.futures.Future()
         # add the new tasks to the workplan
-        self.workplan |= workplan
+        self.workplan.update(tasks=workplan)
         # tell me
         channel.line('extending the workplan')
         channel.line('  current outstanding tasks: {}'.format(len(self.workplan)))
@@ -73,6 +129,83 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         return self
 
 
+    def post(self, task):
+        """
+        Add {task} to the workplan and return the future that will hold its result
+        """
+        # add the task to the workplan
+        self.assemble(workplan={task})
+        # and return its future
+        return self.futures[task]
+
+
+    def map(self, tasks):
+        """
+        Execute {tasks} and generate their results in the order they are completed
+
+        Results are harvested by running my event loop until at least one of the tasks is
+        done; retrieving the result of an aborted task raises the error that aborted it. Tasks
+        that appear more than once in {tasks} are executed once, and their result is generated
+        once for each appearance. If the event loop runs out of things to do before all the
+        tasks are done, e.g. because no crew members could be recruited, {IncompleteError} is
+        raised with the unfinished tasks
+        """
+        # make a pile for the completed futures
+        finished = collections.deque()
+        # and a handler that saves completed futures and interrupts the event loop
+        def done(future):
+            # save the future
+            finished.append(future)
+            # and stop the event loop so the caller can get the result
+            self.dispatcher.stop()
+            # all done
+            return
+        # count the appearances of each task, preserving their order
+        counts = collections.Counter(tasks)
+        # add the distinct tasks to the workplan
+        self.assemble(workplan=list(counts))
+        # map their futures back to the tasks
+        owners = { self.futures[task]: task for task in counts }
+        # go through the futures
+        for future in owners:
+            # and ask to be notified when they are done
+            future.add_done_callback(done)
+
+        # the tasks we are waiting for
+        remaining = set(counts)
+        # as long as there are results to harvest
+        while remaining:
+            # if nothing is ready
+            if not finished:
+                # process events until something is
+                self.watch()
+            # if the event loop ran out of things to do without producing any results
+            if not finished:
+                # the remaining tasks can't be completed
+                break
+            # go through the completed tasks
+            while finished:
+                # get the future
+                future = finished.popleft()
+                # and its task
+                task = owners[future]
+                # update the pile
+                remaining.discard(task)
+                # and send off the result, once for each appearance of the task
+                for _ in range(counts[task]):
+                    yield future.result()
+
+        # process the events that wrap up the session, e.g. the dismissal of the crew members
+        # that ran out of work; otherwise they would wait for their next batch forever
+        self.watch()
+        # if there are tasks that were not completed
+        if remaining:
+            # complain, naming them in the order they were given
+            raise self.IncompleteError(tasks=[task for task in counts if task in remaining])
+        # all done
+        return
+
+
     @pyre.export
     def vacancies(self):
         """
@@ -104,8 +237,12 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         self.active = set()
         self.retired = set()
 
-        # my workplan is the set of tasks that are pending
-        self.workplan = set()
+        # the futures of the tasks that are not done yet
+        self.futures = {}
+        # the crew members that are waiting to receive tasks
+        self.scheduled = set()
+        # and the ones that are waiting for deferred tasks to become available
+        self.idle = set()
 
         # all done
         return
@@ -140,7 +277,13 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         Add the given {crew} member to the execution schedule
         """
-        # start sending tasks when the worker is ready to listen
+        # if it's already waiting for tasks
+        if crew in self.scheduled:
+            # nothing to do
+            return self
+        # otherwise, mark it
+        self.scheduled.add(crew)
+        # and start sending tasks when the worker is ready to listen
         self.dispatcher.whenWriteReady(
             channel = crew.channel,
             call = functools.partial(self.submit, crew=crew))
@@ -154,34 +297,347 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         # N.B.: {channel} is ready to write, because that's how we got here; so write away...
 
-        # tell me
-        self.debug.log('sending a task to {.pid}'.format(crew))
+        # the crew member is no longer waiting
+        self.scheduled.discard(crew)
         # get my workplan
         workplan = self.workplan
-        # and my marshaler
-        marshaler = self.marshaler
+
+        # if the connection to the worker was lost
+        if crew.status is crew.crewcodes.lost:
+            # retire it
+            self.retire(crew=crew)
+            # and don't send it any further work
+            return False
+
+        # if the worker is damaged
+        if crew.status is not crew.crewcodes.healthy:
+            # dismiss it
+            self.dismiss(crew=crew)
+            # and don't send it any further work
+            return False
+
+        # if the worker has done its share
+        if self.spent(crew=crew):
+            # and it's done with its batches in flight
+            if not crew.pending:
+                # replace it
+                self.dismiss(crew=crew)
+            # either way, don't send it any further work
+            return False
 
         # if there is nothing left to do
-        if not workplan:
-            # notify this worker we are done
+        if not len(workplan):
+            # if this worker is busy with earlier tasks
+            if crew.pending:
+                # let the handler that harvests the task status reschedule it
+                return False
+            # if there are tasks waiting to be attempted again
+            if workplan.deferred:
+                # park the worker until they are ready
+                self.idle.add(crew)
+                # and don't send it any further work
+                return False
+            # otherwise, notify it we are done
             self.dismiss(crew=crew)
             # and don't send it any further work
             return False
 
-        # otherwise, grab a task
-        task = workplan.pop()
-        # and send it to the worker
-        crew.execute(team=self, task=task)
+        # otherwise, as long as the worker has room for more
+        while len(crew.pending) < self.prefetch:
+            # grab a batch of tasks
+            tasks = self.batch(crew=crew)
+            # if there are none left
+            if not tasks:
+                # we are done
+                break
+            # tell me
+            self.debug.log('sending {} tasks to {.pid}'.format(len(tasks), crew))
+            # attempt to
+            try:
+                # send them to the worker
+                crew.execute(team=self, tasks=tasks)
+            # if the connection dropped
+            except OSError:
+                # put the tasks back in the workplan
+                workplan.update(tasks=tasks)
+                # if there are batches in flight, the handler that harvests their status will
+                # notice the dropped connection; otherwise
+                if not crew.pending:
+                    # let me know now
+                    self.lose(crew=crew)
+                # either way, don't send it any further work
+                return False
+            # if this batch has a time limit and no one is checking on the crew
+            if not self._supervising and self.limit(tasks=tasks) is not None:
+                # start checking
+                self._supervising = True
+                self.dispatcher.alarm(interval=self.checkup, call=self.supervise)
 
         # don't reschedule me; let the handler that harvests the task status decide the fate of
         # this worker
         return False
 
 
+    def batch(self, crew):
+        """
+        Remove up to {chunk} tasks from the workplan for the given {crew} member
+        """
+        # get my workplan
+        workplan = self.workplan
+        # and the task futures
+        futures = self.futures
+        # make a pile
+        tasks = []
+        # as long as there is room in the batch and work to do
+        while len(workplan) and len(tasks) < self.chunk:
+            # grab a task, preferably one related to the previous task of the worker
+            task = workplan.pop(affinity=crew.affinity)
+            # remember its affinity
+            crew.affinity = getattr(task, 'affinity', None)
+            # get its future
+            future = futures.get(task)
+            # if it's running already, i.e. the task is being retried, or it's not cancelled
+            if future is None or future.running() or future.set_running_or_notify_cancel():
+                # add the task to the pile
+                tasks.append(task)
+            # otherwise
+            else:
+                # forget the cancelled task
+                del futures[task]
+        # all done
+        return tasks
+
+
+    def complete(self, task, result):
+        """
+        A crew member reported that {task} was completed and produced {result}
+        """
+        # let the workplan know
+        self.workplan.retire(task=task)
+        # get the future of the task
+        future = self.futures.pop(task, None)
+        # if it is there
+        if future is not None:
+            # deliver the result
+            future.set_result(result)
+        # all done
+        return self
+
+
+    def abort(self, task, error):
+        """
+        A crew member reported that {task} could not be completed because of {error}
+        """
+        # let the workplan know
+        self.workplan.retire(task=task)
+        # get the future of the task
+        future = self.futures.pop(task, None)
+        # if it is there
+        if future is not None:
+            # deliver the error
+            future.set_exception(error)
+        # all done
+        return self
+
+
+    def retry(self, task, error):
+        """
+        A crew member reported that {task} failed because of the temporary condition {error}
+        """
+        # ask the workplan how long to wait before trying again
+        interval = self.workplan.retry(task=task)
+        # if the task should not be attempted again
+        if interval is None:
+            # abort it
+            self.abort(task=task, error=error)
+            # and wake up the idle crew members, since there may be nothing left to wait for
+            return self.wake()
+        # otherwise, schedule its return to the workplan
+        self.dispatcher.alarm(interval=interval, call=functools.partial(self.resume, task=task))
+        # all done
+        return self
+
+
+    def resume(self, task, **kwds):
+        """
+        The wait before attempting {task} again is over
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # put the task back in the workplan
+        self.workplan.resume(task=task)
+        # wake up the idle crew members
+        self.wake()
+        # if the entire team was retired while waiting
+        if not self.registered and not self.active:
+            # recruit a new one
+            self.recruit()
+        # don't reschedule
+        return None
+
+
+    def wake(self):
+        """
+        Put the idle crew members back in the execution schedule
+        """
+        # go through the idle crew members
+        for crew in self.idle:
+            # and schedule them
+            self.schedule(crew=crew)
+        # they are no longer idle
+        self.idle.clear()
+        # all done
+        return self
+
+
+    def statistics(self):
+        """
+        Build a table with the utilization statistics of the crew members
+        """
+        # go through all my crew members and collect their statistics
+        return {
+            crew.pid: crew.statistics
+            for crew in itertools.chain(self.active, self.retired)
+            }
+
+
+    def lose(self, crew, error=None):
+        """
+        The connection to the {crew} member was lost, possibly because of {error}
+        """
+        # show me
+        self.debug.log('lost contact with {.pid}'.format(crew))
+        # if it had batches in flight
+        if crew.pending:
+            # normalize the error
+            if error is None:
+                # by blaming the loss
+                error = self.CrewLostError(description="lost contact with the crew member")
+            # the oldest one was executing, and one of its tasks may be to blame
+            for task in crew.pending[0]:
+                # so let the workplan decide whether to try them again
+                self.retry(task=task, error=error)
+        # put the other tasks it had in flight back in the workplan
+        for tasks in itertools.islice(crew.pending, 1, None):
+            self.workplan.update(tasks=tasks)
+        # mark the crew member
+        crew.abandon()
+        # if it's waiting to receive tasks
+        if crew in self.scheduled:
+            # the handler that sends them will retire it
+            return self
+        # otherwise, retire it now
+        return self.retire(crew=crew)
+
+
+    def expire(self, crew):
+        """
+        The {crew} member did not report back within the time limit of its batch
+        """
+        # terminate it
+        self.recruiter.terminate(team=self, crew=crew)
+        # build the error
+        error = self.TimeoutError(description="the crew member ran out of time")
+        # and deal with the loss
+        return self.lose(crew=crew, error=error)
+
+
+    def supervise(self, **kwds):
+        """
+        Check for crew members that exceeded the time limit of the batch they are working on
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # get the time
+        now = self.timer.lap()
+        # allow for the time it takes for the results to arrive
+        grace = self.checkup / self.second
+        # go through the active crew members
+        for crew in tuple(self.active):
+            # skip the ones that are not busy, or that are known to be in trouble already
+            if not crew.pending or crew.status is not crew.crewcodes.healthy:
+                continue
+            # get the time limit of the batch it's working on
+            limit = self.limit(tasks=crew.pending[0])
+            # if there is one and it's been exceeded
+            if limit is not None and now - crew.since > limit + grace:
+                # terminate the crew member
+                self.expire(crew=crew)
+        # if the team is still at work
+        if self.registered or self.active:
+            # check again later
+            return self.checkup
+        # otherwise, stop checking
+        self._supervising = False
+        # and don't reschedule
+        return None
+
+
+    def limit(self, tasks):
+        """
+        Compute the time limit, in seconds, of a batch of {tasks}; {None} if there isn't one
+        """
+        # start with nothing
+        total = 0
+        # go through the tasks
+        for task in tasks:
+            # get the time limit of each one, in seconds
+            timeout = (getattr(task, 'timeout', None) or self.timeout) / self.second
+            # if it doesn't have one
+            if not timeout:
+                # neither does the batch
+                return None
+            # otherwise, add it to the total
+            total += timeout
+        # all done
+        return total
+
+
+    def spent(self, crew):
+        """
+        Check whether the {crew} member should be replaced
+        """
+        # if it has executed its quota of tasks
+        if self.quota and crew.completed + crew.failed + crew.aborted >= self.quota:
+            # it's done
+            return True
+        # if it has grown too large
+        if self.memory and crew.footprint > self.memory:
+            # it's done
+            return True
+        # otherwise, it can keep going
+        return False
+
+
+    def retire(self, crew):
+        """
+        Remove the {crew} member whose connection was lost from the team
+        """
+        # clean up
+        crew.resign()
+        # let the recruiter know
+        self.recruiter.dismiss(team=self, crew=crew)
+        # remove it from the roster, whatever its state
+        self.registered.discard(crew)
+        self.active.discard(crew)
+        self.idle.discard(crew)
+        # and add it to the pile of retired workers
+        self.retired.add(crew)
+        # if there is work left to do
+        if len(self.workplan):
+            # recruit a replacement
+            self.recruit()
+        # all done
+        return self
+
+
     def dismiss(self, crew):
         """
         Dismiss the {crew} member from the team
         """
+        # put any tasks it didn't get to back in the workplan
+        for tasks in crew.pending:
+            self.workplan.update(tasks=tasks)
         # notify this crew member it is dismissed
         crew.dismissed()
         # let the recruiter know
@@ -190,6 +646,10 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         self.active.discard(crew)
         # and add it to the pile of retired workers
         self.retired.add(crew)
+        # if it left work behind, the rest of the team may have been dismissed already
+        if len(self.workplan):
+            # so recruit replacements
+            self.recruit()
         # all done
         return self
 
@@ -197,6 +657,10 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     # private data
     active = None   # the set of currently deployed crew members
     retired = None  # the set of retired crew members
+    futures = None  # the futures of the tasks that are not done yet
+    scheduled = None  # the set of crew members waiting to receive tasks
+    idle = None  # the set of crew members waiting for deferred tasks
+    _supervising = False # whether the crew members are being checked for exceeding time limits
 
 
 # end of file
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import heapq
+import itertools
+# support
+import pyre
+# my protocol
+from .Workplan import Workplan
+
+
+# declaration
+class Queue(pyre.component, family='pyre.nexus.workplans.queue', implements=Workplan):
+    """
+    A workplan that hands out tasks in priority order, and keeps tasks with the same affinity
+    on the same crew member
+
+    Tasks may supply a {priority}, with larger values executed first, and an {affinity}, a key
+    that identifies the tasks that benefit from running on the same crew member, e.g. because
+    they use the same data. Tasks with the same priority are handed out in the order they were
+    added. When asked for a task on behalf of a crew member, the queue prefers tasks with the
+    same affinity as the previous one it got, unless there is a task with higher priority
+    waiting.
+
+    Tasks that fail due to temporary conditions are attempted again, up to {retries} times,
+    after waiting for an interval that starts at {backoff} and doubles after every attempt;
+    tasks that exhaust their retries are moved to the {dead} pile.
+    """
+
+
+    # constants
+    from pyre.units.SI import second
+
+
+    # user configurable state
+    retries = pyre.properties.int(default=5)
+    retries.doc = 'the number of times to attempt again a task that failed temporarily'
+
+    backoff = pyre.properties.dimensional(default=0.1*second)
+    backoff.doc = 'the wait before the first retry; it doubles after every attempt'
+
+
+    # public data
+    dead = None # the tasks that exhausted their retries
+    deferred = 0 # the number of tasks waiting to be attempted again
+
+
+    # interface
+    @pyre.export
+    def add(self, task):
+        """
+        Add {task} to the workplan
+        """
+        # if it's already there
+        if task in self._entries:
+            # nothing to do
+            return self
+        # get the task affinity
+        affinity = getattr(task, 'affinity', None)
+        # build its entry; the priority is negated because {heapq} is a min-heap, and the
+        # sequence number keeps tasks with the same priority in the order they were added
+        entry = [-getattr(task, 'priority', 0), next(self._sequence), task, affinity, True]
+        # index it
+        self._entries[task] = entry
+        # add it to the queue
+        heapq.heappush(self._queue, entry)
+        # if it has an affinity
+        if affinity is not None:
+            # add it to the queue of its peers
+            heapq.heappush(self._affinities.setdefault(affinity, []), entry)
+            # and count it
+            self._live[affinity] = self._live.get(affinity, 0) + 1
+        # all done
+        return self
+
+
+    @pyre.export
+    def update(self, tasks):
+        """
+        Add all {tasks} to the workplan
+        """
+        # go through the tasks
+        for task in tasks:
+            # and add each one
+            self.add(task)
+        # all done
+        return self
+
+
+    @pyre.export
+    def pop(self, affinity=None):
+        """
+        Remove and return the next task to execute, preferring tasks with the given {affinity}
+        """
+        # get the next task in priority order
+        best = self.top(queue=self._queue)
+        # if there isn't one
+        if best is None:
+            # complain, just like {set.pop}
+            raise KeyError('pop from an empty workplan')
+        # if the caller expressed a preference
+        if affinity is not None:
+            # get the next task with the same affinity
+            local = self.top(queue=self._affinities.get(affinity))
+            # if there is one and no other task has higher priority
+            if local is not None and local[0] <= best[0]:
+                # pick it
+                best = local
+        # mark the entry as taken; it will be discarded when it bubbles up in the other queue
+        best[-1] = False
+        # unpack it
+        _, _, task, peers, _ = best
+        # remove the task from the index
+        del self._entries[task]
+        # discard the taken entries at the top of the main queue
+        self.top(queue=self._queue)
+        # if it had an affinity
+        if peers is not None:
+            # update the number of its peers that are still waiting
+            live = self._live[peers] - 1
+            # if there are none left
+            if not live:
+                # forget the affinity, along with the taken entries in its queue
+                del self._live[peers]
+                del self._affinities[peers]
+            # otherwise
+            else:
+                # save the count
+                self._live[peers] = live
+                # and discard the taken entries at the top of the queue
+                self.top(queue=self._affinities[peers])
+        # return the task
+        return task
+
+
+    @pyre.export
+    def retry(self, task):
+        """
+        A temporary failure prevented {task} from being completed; return the time interval
+        to wait before attempting it again, or {None} if it should not be attempted again
+        """
+        # count this attempt
+        attempts = self._attempts.get(task, 0) + 1
+        # if the task is out of retries
+        if attempts > self.retries:
+            # forget its history
+            self._attempts.pop(task, None)
+            # move it to the dead pile
+            self.dead.append(task)
+            # and let the caller know
+            return None
+        # otherwise, update the count
+        self._attempts[task] = attempts
+        # mark the task as deferred
+        self.deferred += 1
+        # and compute the wait
+        return self.backoff * 2**(attempts-1)
+
+
+    @pyre.export
+    def resume(self, task):
+        """
+        The wait before attempting {task} again is over; put it back in the workplan
+        """
+        # the task is no longer deferred
+        self.deferred -= 1
+        # put it back
+        return self.add(task)
+
+
+    @pyre.export
+    def retire(self, task):
+        """
+        Forget everything known about {task}, since it is done
+        """
+        # forget its history
+        self._attempts.pop(task, None)
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the tasks that exhausted their retries
+        self.dead = []
+        # the heap of entries in priority order
+        self._queue = []
+        # the map from affinity keys to heaps of the entries that share them
+        self._affinities = {}
+        # the map from affinity keys to the number of their entries that haven't been taken
+        self._live = {}
+        # the map from tasks to their entries
+        self._entries = {}
+        # the map from tasks to the number of failed attempts to execute them
+        self._attempts = {}
+        # the source of tie breakers
+        self._sequence = itertools.count()
+        # all done
+        return
+
+
+    def __bool__(self):
+        # always true: trait descriptors fall back to the class defaults when handed a false
+        # instance, so use {len} to check whether there are tasks waiting to be handed out
+        return True
+
+
+    def __len__(self):
+        # the number of tasks waiting to be handed out
+        return len(self._entries)
+
+
+    def __contains__(self, task):
+        # check whether {task} is waiting to be handed out
+        return task in self._entries
+
+
+    def __iter__(self):
+        # go through the tasks waiting to be handed out
+        return iter(self._entries)
+
+
+    # implementation details
+    def top(self, queue):
+        """
+        Discard the taken entries at the top of {queue} and return the first live one
+        """
+        # if there is no queue
+        if queue is None:
+            # there is nothing to return
+            return None
+        # as long as there are taken entries at the top
+        while queue and not queue[0][-1]:
+            # discard them
+            heapq.heappop(queue)
+        # return the top entry, if any
+        return queue[0] if queue else None
+
+
+    # private data
+    _queue = None
+    _affinities = None
+    _live = None
+    _entries = None
+    _attempts = None
+    _sequence = None
+
+
+# end of file
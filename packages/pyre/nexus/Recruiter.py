@@ -35,6 +35,12 @@ class Recruiter(pyre.protocol, family='pyre.nexus.recruiters'):
         The {team} manager has dismissed the given {member}
         """
 
+    @pyre.provides
+    def terminate(self, team, crew, **kwds):
+        """
+        Stop the {crew} member of {team} that is not responding
+        """
+
 
     # default implementation
     @classmethod
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import time
+import socket
+import signal
+import select
+import functools
+# support
+import pyre
+# my protocol
+from .Recruiter import Recruiter
+
+
+# declaration
+class Remote(pyre.component, family='pyre.nexus.recruiters.remote', implements=Recruiter):
+    """
+    Recruit crew members that connect to the team over TCP, so that teams can span several
+    hosts
+
+    The recruiter listens for connections at {address}. Workers join the team by calling
+    {enlist} with the address of the port, e.g. from a script that was started on a remote
+    host; when {launch} is on, the recruiter also starts a local worker process for each
+    vacancy, and the new worker dials in on its own. Workers keep trying to connect for up to
+    {retries} times, so they may be started before the team is ready for them. The team admits
+    workers as their connections arrive, without waiting for them: the port is watched by the
+    dispatcher of the team for as long as the team has vacancies.
+
+    Crew members send the team a status report every {heartbeat}, and the team checks on them
+    on the same schedule using an alarm with its dispatcher. Crew members with batches in
+    flight that stay silent for longer than {timeout} are disconnected; their tasks are put back
+    in the workplan, and the team recruits replacements, just as it does for crew members whose
+    connection drops. Since workers execute tasks without interruption, {timeout} must be
+    longer than the longest batch of tasks. The connections also use TCP keep-alive probes, so
+    that hosts that vanish are eventually noticed by the network stack as well. Once the team is
+    done, its local workers are given {timeout} to exit before they are killed.
+
+    There is no need for any additional flow control: the team sends a batch only to a crew
+    member whose connection is ready to accept data and that has fewer than {prefetch} batches
+    in flight, so slow hosts are only handed as much work as they can keep up with, and workers
+    that dial in while the team is at full strength wait in the port backlog until there is a
+    vacancy.
+    """
+
+
+    # constants
+    from pyre.units.SI import second
+
+
+    # user configurable state
+    address = pyre.properties.inet()
+    address.doc = 'the address of the port that workers dial in to'
+
+    launch = pyre.properties.bool(default=True)
+    launch.doc = 'start local worker processes that dial in to fill the vacancies'
+
+    heartbeat = pyre.properties.dimensional(default=1*second)
+    heartbeat.doc = 'the interval between the status reports of the crew members'
+
+    timeout = pyre.properties.dimensional(default=30*second)
+    timeout.doc = 'the silence after which a crew member with batches in flight is dropped'
+
+    retries = pyre.properties.int(default=10)
+    retries.doc = 'the number of attempts a worker makes to connect, one every heartbeat'
+
+
+    # public data
+    port = None # the port that workers dial in to
+
+
+    # protocol obligations
+    @pyre.provides
+    def recruit(self, team, **kwds):
+        """
+        Recruit members for the {team}
+        """
+        # make sure i'm listening
+        port = self.listen(team=team)
+        # as long as there are vacancies and workers waiting to be let in
+        while team.vacancies() > 0 and self.ready(channel=port.channel):
+            # accept the connection
+            channel, address = port.accept()
+            # if i was expecting it, i'm not any more; there is no way to tell whether it came
+            # from one of my local workers, so assume it did
+            self.expected = max(self.expected - 1, 0)
+            # deploy the worker and add it to the team
+            yield self.deploy(team=team, channel=channel, address=address)
+        # if i'm supposed to fill the vacancies with local workers
+        if self.launch:
+            # go through the ones that aren't about to be filled by the workers i launched
+            for _ in range(team.vacancies() - self.expected):
+                # start a worker; it dials in on its own
+                self.spawn(team=team, address=port.address)
+                # so expect it
+                self.expected += 1
+        # if there are vacancies and no one is watching for workers dialing in
+        if team.vacancies() > 0 and not self.watching:
+            # ask the dispatcher of the team to let me know when they do
+            team.dispatcher.whenReadReady(
+                channel=port, call=functools.partial(self.admit, team=team))
+            # and mark me
+            self.watching = True
+        # all done
+        return
+
+
+    @pyre.provides
+    def deploy(self, team, channel, address, **kwds):
+        """
+        Build the team side of the crew member that dialed in from {address}
+        """
+        # ask the network stack to keep an eye on the connection
+        channel.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # make a member proxy for the team manager; use the worker address as its id
+        crew = team.crew(pid=str(address), channel=channel, timer=team.timer)
+        # adjust its support for asynchrony
+        crew.dispatcher = team.dispatcher
+        # and its message serializer
+        crew.marshaler = team.marshaler
+        # add it to my pile
+        self.crews.add(crew)
+        # spin it up and return it
+        return crew.join(team=team)
+
+
+    @pyre.provides
+    def dismiss(self, team, crew, **kwds):
+        """
+        The {team} manager has dismissed the given {member}
+        """
+        # forget the crew member
+        self.crews.discard(crew)
+        # and harvest the status of the workers that are done
+        self.reap()
+        # all done
+        return
+
+
+    @pyre.provides
+    def terminate(self, team, crew, **kwds):
+        """
+        Stop the {crew} member of {team} that is not responding
+        """
+        # workers may live on other hosts, so the best i can do is drop the connection
+        crew.channel.shutdown(socket.SHUT_RDWR)
+        # all done
+        return
+
+
+    # interface
+    def enlist(self, address, crew=None, marshaler=None, timeout=None, **kwds):
+        """
+        Connect to the team whose port is at {address} and carry out its tasks until dismissed
+
+        This is the entry point of workers; {crew} is the factory of the worker side crew
+        member, {marshaler} must match the one used by the team, and {timeout} is the time limit
+        of the tasks that don't have one of their own
+        """
+        # normalize the crew factory
+        if crew is None:
+            # get the default
+            from .Crew import Crew as crew
+        # go through the connection attempts
+        for attempt in range(self.retries + 1):
+            # try to
+            try:
+                # connect to the team
+                channel = pyre.ipc.tcp(address=address)
+            # if the team isn't there
+            except OSError:
+                # wait a bit
+                time.sleep(self.heartbeat / self.second)
+            # if all went well
+            else:
+                # move on
+                break
+        # if we ran out of attempts
+        else:
+            # report failure
+            return 1
+        # ask the network stack to keep an eye on the connection
+        channel.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # make a crew member
+        member = crew(pid=os.getpid(), channel=channel, **kwds)
+        # if i were given a marshaler
+        if marshaler is not None:
+            # make sure it speaks the same language as its twin
+            member.marshaler = marshaler
+        # ask it to stay in touch
+        member.heartbeat = self.heartbeat
+        # and to enforce the time limit
+        member.timeout = timeout
+        # register it with the team
+        member.register()
+        # and carry out tasks until there is nothing more to do
+        return member.run()
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the team side of the crew members that dialed in
+        self.crews = set()
+        # the ids of the local worker processes i started
+        self.launched = set()
+        # all done
+        return
+
+
+    # implementation details
+    def listen(self, team):
+        """
+        Make sure i have a port for the workers of {team} to dial in to
+        """
+        # if i have one already
+        if self.port is not None:
+            # nothing to do
+            return self.port
+        # otherwise, get one
+        self.port = pyre.ipc.port(address=self.address)
+        # the team is at work again
+        self.closing = None
+        # if i'm not checking on the team already
+        if not self.monitoring:
+            # start
+            team.dispatcher.alarm(
+                interval=self.heartbeat, call=functools.partial(self.monitor, team=team))
+            # and mark me
+            self.monitoring = True
+        # all done
+        return self.port
+
+
+    def admit(self, channel, team, **kwds):
+        """
+        Workers have dialed in to the port of {team}
+
+        N.B.: this is a dispatcher handler; careful with its return value
+        """
+        # let the team recruit them; this gets back to me, and i let them in if there are
+        # vacancies
+        team.recruit()
+        # keep watching for as long as the team has vacancies; otherwise, the workers that
+        # dial in wait in the port backlog, and {recruit} will watch for them again when needed
+        self.watching = self.port is not None and team.vacancies() > 0
+        # and let the dispatcher know
+        return self.watching
+
+
+    def spawn(self, team, address):
+        """
+        Start a local worker that dials in to the {team} port at {address}
+        """
+        # clone the current process
+        pid = os.fork()
+        # in the worker process
+        if pid == 0:
+            # close my port
+            self.port.close()
+            # and my copies of the connections to the other workers
+            for crew in self.crews:
+                crew.channel.close()
+            # join the team and carry out tasks until there is nothing more to do
+            status = self.enlist(
+                address=address, crew=team.crew, marshaler=team.marshaler, timeout=team.timeout)
+            # at which point, this process must terminate
+            raise SystemExit(status)
+        # in the team process, remember the worker
+        self.launched.add(pid)
+        # all done
+        return pid
+
+
+    def monitor(self, team, **kwds):
+        """
+        Check on the crew members of {team}
+
+        N.B.: this is an alarm handler; careful with its return value
+        """
+        # get the time
+        now = team.timer.lap()
+        # and the allowed silence
+        timeout = self.timeout / self.second
+        # go through the crew members
+        for crew in tuple(self.crews):
+            # skip the ones that are not active yet; their registration is on its way
+            if crew not in team.active:
+                continue
+            # if it has batches in flight
+            if crew.pending:
+                # and it's been silent for too long
+                if now - crew.heard > timeout:
+                    # drop the connection; the handler that harvests its reports takes it
+                    # from here
+                    crew.channel.shutdown(socket.SHUT_RDWR)
+                # either way, move on
+                continue
+            # otherwise, no one else is listening, so collect its status reports
+            self.drain(team=team, crew=crew)
+        # harvest the status of the local workers that are done
+        self.reap()
+
+        # if i don't launch workers and the team is not at full strength
+        if not self.launch and team.vacancies() > 0:
+            # admit the workers that dialed in
+            team.recruit()
+
+        # if the team is still at work
+        if team.registered or team.active or len(team.workplan) or team.workplan.deferred:
+            # check again later
+            return self.heartbeat
+
+        # otherwise, if my port is still open
+        if self.port is not None:
+            # stop watching it
+            team.dispatcher.forget(channel=self.port)
+            self.watching = False
+            # close it
+            self.port.close()
+            # forget it
+            self.port = None
+            # no more workers are on their way
+            self.expected = 0
+            # and mark the time
+            self.closing = now
+        # if my local workers are all gone
+        if not self.launched:
+            # i'm done checking on the team
+            self.monitoring = False
+            # so don't reschedule
+            return None
+        # if they have had enough time to exit
+        if now - self.closing > timeout:
+            # go through them
+            for pid in self.launched:
+                # carefully
+                try:
+                    # kill each one; it gets reaped the next time around
+                    os.kill(pid, signal.SIGKILL)
+                # if it's gone already
+                except ProcessLookupError:
+                    # no worries
+                    pass
+        # either way, check again later
+        return self.heartbeat
+
+
+    def drain(self, team, crew):
+        """
+        Read the status reports that {crew} received from its idle twin
+        """
+        # as long as there is something to read
+        while self.ready(channel=crew.channel):
+            # try to
+            try:
+                # get the message
+                crew.marshaler.recv(channel=crew.channel)
+            # if the connection dropped
+            except (EOFError, OSError):
+                # let the team know
+                team.lose(crew=crew)
+                # and stop reading
+                break
+            # mark the time
+            crew.heard = team.timer.lap()
+        # all done
+        return
+
+
+    def ready(self, channel):
+        """
+        Check whether there is something to read from {channel}, without blocking
+        """
+        # ask
+        readable, _, _ = select.select([channel], [], [], 0)
+        # and report
+        return bool(readable)
+
+
+    def reap(self):
+        """
+        Harvest the status of the local workers that have exited
+        """
+        # go through the workers i started
+        for pid in tuple(self.launched):
+            # check on each one
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            # if it's gone
+            if done:
+                # forget it
+                self.launched.discard(pid)
+        # the workers that are gone aren't going to dial in
+        self.expected = min(self.expected, len(self.launched))
+        # all done
+        return
+
+
+    # private data
+    crews = None # the team side of the crew members that dialed in
+    launched = None # the ids of the local worker processes i started
+    expected = 0 # the number of local workers that have not dialed in yet
+    watching = False # {True} while the dispatcher of the team is watching my port
+    monitoring = False # {True} while the alarm that checks on the team is set
+    closing = None # the time the team ran out of work
+
+
+# end of file
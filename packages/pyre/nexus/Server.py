@@ -38,23 +38,45 @@ class Server(pyre.component, implements=Service):
         self.application = weakref.proxy(application)
         # and the dispatcher
         self.dispatcher = weakref.proxy(dispatcher)
-        # build a port
-        port = pyre.ipc.port(address=self.address)
-        # adjust my address
-        self.address = port.address
-        # ask the application dispatcher to monitor my port
+        # get my port
+        port = self.bind()
+        # ask the application dispatcher to monitor it
         dispatcher.whenReadReady(channel=port, call=self.acknowledge)
         # all done
         return
 
 
+    @pyre.export(tip='grab the port on which to listen for connections')
+    def bind(self):
+        """
+        Build the port on which i listen for connections, unless i have one already
+
+        Binding the port before activating the server lets processes that are cloned from this
+        one inherit it, so they can all accept connections on the same port
+        """
+        # if i don't have a port yet
+        if self.port is None:
+            # build one
+            self.port = pyre.ipc.port(address=self.address)
+            # and adjust my address
+            self.address = self.port.address
+        # all done
+        return self.port
+
+
     @pyre.export(tip='acknowledge a peer that has initiated a connection')
     def acknowledge(self, channel):
         """
         A peer has attempted to establish a connection
         """
-        # accept the connection
-        newChannel, peerAddress = channel.accept()
+        # attempt to
+        try:
+            # accept the connection
+            newChannel, peerAddress = channel.accept()
+        # if another process that shares my port got to it first
+        except BlockingIOError:
+            # wait for the next one
+            return True
         # log the request
         self.application.debug.log(
             "{}: received 'connection' request from {}".format(channel, peerAddress))
@@ -126,6 +148,7 @@ class Server(pyre.component, implements=Service):
     # private data
     application = None
     dispatcher = None
+    port = None
 
 
 # end of file
@@ -20,6 +20,15 @@ class Task:
     from .TaskStatus import TaskStatus as taskcodes
 
 
+    # public data
+    # tasks with higher priority are handed out first
+    priority = 0
+    # tasks with the same affinity are kept on the same crew member, when possible
+    affinity = None
+    # tasks that run for longer than this are aborted; {None} defers to the team
+    timeout = None
+
+
     # interface
     def execute(self, **kwds):
         """
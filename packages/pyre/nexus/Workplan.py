@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# support
+import pyre
+
+
+# declaration
+class Workplan(pyre.protocol, family='pyre.nexus.workplans'):
+    """
+    The specification of the containers of the tasks that a team is expected to carry out
+    """
+
+
+    # interface
+    @pyre.provides
+    def add(self, task):
+        """
+        Add {task} to the workplan
+        """
+
+    @pyre.provides
+    def update(self, tasks):
+        """
+        Add all {tasks} to the workplan
+        """
+
+    @pyre.provides
+    def pop(self, affinity=None):
+        """
+        Remove and return the next task to execute, preferring tasks with the given {affinity}
+        """
+
+    @pyre.provides
+    def retry(self, task):
+        """
+        A temporary failure prevented {task} from being completed; return the time interval
+        to wait before attempting it again, or {None} if it should not be attempted again
+        """
+
+    @pyre.provides
+    def resume(self, task):
+        """
+        The wait before attempting {task} again is over; put it back in the workplan
+        """
+
+    @pyre.provides
+    def retire(self, task):
+        """
+        Forget everything known about {task}, since it is done
+        """
+
+
+    # my default
+    @classmethod
+    def pyre_default(cls, **kwds):
+        """
+        The default {Workplan} implementation
+        """
+        # use a priority queue
+        from .Queue import Queue
+        # so make its component factory available
+        return Queue
+
+
+# end of file
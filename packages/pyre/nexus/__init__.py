@@ -23,6 +23,7 @@ from .CrewStatus import CrewStatus as crewcodes
 # task distribution protocols
 from .Team import Team as team
 from .Recruiter import Recruiter as recruiter
+from .Workplan import Workplan as workplan
 from .Asynchronous import Asynchronous as asynchronous
 
 
@@ -38,6 +39,17 @@ def fork():
     return fork
 
 
+@pyre.foundry(implements=recruiter, tip="recruit team members that connect over TCP")
+def remote():
+    """
+    Recruit team members that connect over TCP, possibly from other hosts
+    """
+    # get the implementation
+    from .Remote import Remote as remote
+    # and return it
+    return remote
+
+
 @pyre.foundry(implements=asynchronous, tip="a component that endows a process with an event loop")
 def peer():
     """
@@ -49,6 +61,17 @@ def peer():
     return peer
 
 
+@pyre.foundry(implements=workplan, tip="a workplan that hands out tasks in priority order")
+def queue():
+    """
+    A workplan that hands out tasks in priority order and keeps related tasks together
+    """
+    # get the implementation
+    from .Queue import Queue as queue
+    # and return it
+    return queue
+
+
 @pyre.foundry(implements=team, tip="a team manager")
 def pool():
     """
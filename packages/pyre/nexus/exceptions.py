@@ -23,11 +23,46 @@ class RecoverableError(NexusError):
     A recoverable error has occurred
     """
 
+# a task ran out of time
+class TimeoutError(NexusError):
+    """
+    A task did not complete within its time limit
+    """
+
+# a crew member was lost
+class CrewLostError(RecoverableError):
+    """
+    The crew member that was executing a task could not be reached any more
+    """
+
 # connection reset by peer
 class ConnectionResetError(NexusError):
     """
     The connection was closed by the peer
     """
 
+# tasks left behind
+class IncompleteError(NexusError):
+    """
+    The team ran out of things to do before completing all of its tasks
+    """
+
+    # public data
+    description = "{0.count} task(s) could not be completed: {0.summary}"
+
+    # meta-methods
+    def __init__(self, tasks, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the unfinished tasks
+        self.tasks = tuple(tasks)
+        # count them
+        self.count = len(self.tasks)
+        # and name the first few
+        self.summary = ", ".join(repr(task) for task in self.tasks[:5]) + (
+            ", ..." if self.count > 5 else "")
+        # all done
+        return
+
 
 # end of file
@@ -5,6 +5,9 @@
 # (c) 1998-2020 all rights reserved
 #
 
+# externals
+import operator
+
 
 class CSV:
     """
@@ -70,10 +73,15 @@ class CSV:
         index = { name: offset for offset, name in enumerate(headers) }
         # adjust the column specification
         columns = tuple(layout.pyre_selectColumns(headers=index))
+        # build a function that assembles the requested data tuple from a row
+        select = (
+            operator.itemgetter(*columns) if len(columns) > 1
+            # {itemgetter} needs at least one column, and returns a bare value for just one
+            else lambda row: tuple(row[column] for column in columns))
         # start reading lines from the input source
         for row in reader:
             # assemble the requested data tuple and yield it
-            yield (row[column] for column in columns)
+            yield select(row)
         # all done
         return
 
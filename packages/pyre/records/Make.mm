@@ -22,6 +22,7 @@ EXPORT_PYTHON_MODULES = \
     NamedTuple.py \
     Record.py \
     Selector.py \
+    Specializer.py \
     Templater.py \
     exceptions.py \
     __init__.py
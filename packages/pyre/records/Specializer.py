@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import re
+from .. import schemata
+from ..descriptors.Typed import Typed
+
+
+# declaration
+class Specializer:
+    """
+    A strategy for pulling data from a stream that is specialized for a particular record
+    layout
+
+    The generic {Extractor} walks every value through the full processing pipeline of its
+    field descriptor. This strategy generates a function that unrolls the field list of the
+    layout and, for plain {int}, {float} and {str} fields that have no converters, normalizers
+    or validators, converts the value directly, falling back to the field descriptor for
+    everything else, such as expressions, or string representations of {None}. The stock
+    numeric coercions evaluate strings as python expressions, so strings are converted
+    directly only when they are plain ascii literals that the evaluation would convert the same
+    way; e.g. integers with leading zeros, or digits from other scripts, are left to the
+    descriptor, which rejects them. All other fields still go through their descriptor.
+
+    The generated function captures the value processors of the fields as they are when the
+    layout is built; fields that acquire processors afterwards are not noticed.
+    """
+
+
+    # interface
+    def compile(self, layout):
+        """
+        Generate the value extraction function for {layout}
+        """
+        # get the fields
+        fields = layout.pyre_fields
+        # the names of the variables that hold the raw values
+        names = tuple("v{}".format(index) for index in range(len(fields)))
+        # the namespace of the generated function
+        namespace = {
+            "integer": self.integer,
+            "real": self.real,
+            "string": self.string,
+            "generic": self.generic,
+            "fields": fields,
+            }
+        # the conversion expressions
+        conversions = []
+        # go through the fields
+        for index, (name, field) in enumerate(zip(names, fields)):
+            # make the descriptor available to the generated code
+            namespace["f{}".format(index)] = field
+            # figure out how to convert its value
+            conversions.append(self.conversion(field=field, value=name, index=index))
+
+        # build the source of the function
+        source = "\n".join([
+            "def extract(record, source):",
+            "    values = tuple(source)",
+            "    if len(values) != {}:".format(len(fields)),
+            "        return generic(fields=fields, values=values)",
+            "    {}, = values".format(", ".join(names)) if fields else "",
+            "    return ({}{})".format(", ".join(conversions), "," if fields else ""),
+            ])
+        # compile it
+        exec(compile(source, "<{.__name__}.extract>".format(layout), "exec"), namespace)
+        # and return it
+        return namespace["extract"]
+
+
+    # implementation details
+    def conversion(self, field, value, index):
+        """
+        Build the expression that converts {value}, the raw value of {field}
+        """
+        # the name of the descriptor in the generated code
+        descriptor = "f{}".format(index)
+        # fields with non-trivial processing
+        if not self.isPlain(field=field):
+            # go through their descriptor
+            return "{}.process({})".format(descriptor, value)
+        # get the coercion
+        coerce = type(field).coerce
+        # integers
+        if coerce is schemata.int.coerce:
+            # values that are integers already need no conversion
+            return "{0} if {0}.__class__ is int else integer({0}, {1})".format(value, descriptor)
+        # floats
+        if coerce is schemata.float.coerce:
+            # values that are floats already need no conversion
+            return "{0} if {0}.__class__ is float else real({0}, {1})".format(value, descriptor)
+        # strings
+        if coerce is schemata.str.coerce:
+            # strings are left alone, unless they are representations of {None}
+            return "string({}, {})".format(value, descriptor)
+        # everything else goes through the descriptor
+        return "{}.process({})".format(descriptor, value)
+
+
+    @staticmethod
+    def isPlain(field):
+        """
+        Check whether {field} processes its values with just its coercion
+        """
+        # the processing pipeline must not be customized, and there must be no processors
+        return (
+            type(field).process is Typed.process
+            and not field.converters and not field.normalizers and not field.validators)
+
+
+    @classmethod
+    def integer(cls, value, field):
+        """
+        Convert {value} into an integer
+        """
+        # strings that are not plain integer literals
+        if value.__class__ is str and not cls.INTEGER(value):
+            # are left to the descriptor
+            return field.process(value)
+        # attempt to
+        try:
+            # convert the rest directly
+            return int(value)
+        # if this fails
+        except (TypeError, ValueError):
+            # let the descriptor handle it
+            return field.process(value)
+
+
+    @classmethod
+    def real(cls, value, field):
+        """
+        Convert {value} into a float
+        """
+        # strings that are not plain numeric literals
+        if value.__class__ is str and not cls.REAL(value):
+            # are left to the descriptor
+            return field.process(value)
+        # attempt to
+        try:
+            # convert the rest directly
+            return float(value)
+        # if this fails
+        except (TypeError, ValueError):
+            # let the descriptor handle it
+            return field.process(value)
+
+
+    @staticmethod
+    def string(value, field):
+        """
+        Convert {value} into a string
+        """
+        # strings other than representations of {None}
+        if value.__class__ is str and value.strip().lower() != "none":
+            # need no conversion
+            return value
+        # let the descriptor handle the rest
+        return field.process(value)
+
+
+    @staticmethod
+    def generic(fields, values):
+        """
+        Convert {values} using their descriptors, the slow way
+
+        This is used when the data stream doesn't have a value for every field
+        """
+        # easy enough
+        return tuple(field.process(value) for field, value in zip(fields, values))
+
+
+    # constants
+    # the strings that {int} and the evaluation of python integer literals convert the same way
+    INTEGER = re.compile(r"[+-]?(?:0+|[1-9][0-9]*)").fullmatch
+    # and the ones that {float} and the evaluation of numeric literals convert the same way
+    REAL = re.compile(
+        r"[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+|[0-9]+(?=[eE])|0+|[1-9][0-9]*)(?:[eE][+-]?[0-9]+)?"
+        ).fullmatch
+
+
+# end of file
@@ -34,7 +34,8 @@ class Templater(AttributeClassifier):
     # my field value accessor
     from .Accessor import Accessor as pyre_accessor
     # the value extractors
-    from .Extractor import Extractor as pyre_extractor # simple immutable tuples
+    from .Extractor import Extractor as pyre_extractor # simple immutable tuples, generic
+    from .Specializer import Specializer as pyre_specializer # simple immutable tuples
     from .Evaluator import Evaluator as pyre_evaluator # complex immutable tuples
     from .Calculator import Calculator as pyre_calculator # simple mutable tuples
     from .Compiler import Compiler as pyre_compiler # complex mutable tuples
@@ -168,9 +169,10 @@ class Templater(AttributeClassifier):
             immutable.pyre_extract = self.pyre_evaluator()
         # otherwise
         else:
-            # attach the fast value extraction strategies
+            # attach the fast value extraction strategies; immutable tuples get one that is
+            # specialized to my layout
             mutable.pyre_extract = self.pyre_calculator()
-            immutable.pyre_extract = self.pyre_extractor()
+            immutable.pyre_extract = self.pyre_specializer().compile(layout=self)
 
         # mark them as mine
         mutable.pyre_layout = self
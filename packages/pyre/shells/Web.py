@@ -22,6 +22,9 @@ class Web(Script, family='pyre.shells.web'):
     auto = pyre.properties.bool(default=True)
     auto.doc = 'controls whether to automatically launch the browser'
 
+    workers = pyre.properties.int(default=0)
+    workers.doc = 'the number of processes that serve requests; zero to serve them in this one'
+
     # a marker that enables applications to deduce the type of shell that is hosting them
     model = pyre.properties.str(default='web')
     model.doc = "the programming model"
@@ -50,10 +53,25 @@ class Web(Script, family='pyre.shells.web'):
         application.nexus = nexus
         # register it with the nexus
         nexus.services['web'] = 'http'
-        # activate
-        nexus.prepare(application=application)
         # get the web server
         web = nexus.services['web']
+        # if the requests are to be served by a team of worker processes
+        if self.workers > 0:
+            # get the team factory
+            from pyre.http.Prefork import Prefork
+            # make one
+            team = Prefork(
+                name="{.pyre_name}.web".format(application), server=web, application=application)
+            # size it
+            team.size = self.workers
+            # bind the port and recruit the workers; the team watches over them from now on
+            team.prepare()
+            # and take the place of the nexus
+            nexus = team
+        # otherwise
+        else:
+            # activate the services of the nexus
+            nexus.prepare(application=application)
         # get the address of the web server
         address = web.address
         # show me
@@ -75,9 +93,18 @@ class Web(Script, family='pyre.shells.web'):
             status = nexus.watch()
         # if the user interrupted
         except KeyboardInterrupt as event:
+            # if the requests are served by a team of workers
+            if self.workers > 0:
+                # wait for them to finish up
+                nexus.shutdown()
             # launch the handler
             return application.pyre_interrupted(info=event)
 
+        # if the requests were served by a team of workers
+        if self.workers > 0:
+            # wait for them to finish up
+            nexus.shutdown()
+
         # if all went well
         application.pyre_shutdown(status=status)
 
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Average(Reduction):
+    """
+    A reduction that computes the mean of the values of a measure
+    """
+
+
+    # interface
+    def reduce(self, values):
+        """
+        Compute the mean of {values}; return {None} if there aren't any
+        """
+        # if {values} is not a sized container, such as a column
+        if not hasattr(values, "__len__"):
+            # collect them
+            values = tuple(values)
+        # count them
+        count = len(values)
+        # compute the mean
+        return sum(values) / count if count else None
+
+
+# end of file
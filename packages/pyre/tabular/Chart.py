@@ -43,8 +43,9 @@ class Chart(metaclass=Surveyor):
         """
         # identify the relevant bins
         bins = (getattr(self, name)[value] for name, value in kwds.items())
-        # build and return the restriction
-        return set.intersection(*bins)
+        # build and return the restriction, starting with the smallest bin so that the
+        # intermediate results stay as small as possible
+        return set.intersection(*sorted(bins, key=len))
 
 
     # meta-methods
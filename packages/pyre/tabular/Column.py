@@ -35,12 +35,8 @@ class Column(records.selector):
         """
         Build an iterator over the values in this column
         """
-        # go through all the records
-        for record in self.sheet.pyre_data:
-            # yielding the values of my column
-            yield record[self.index]
-        # all done
-        return
+        # ask my sheet for the values of my column
+        return iter(self.sheet.pyre_column(index=self.index))
 
 
 # end of file
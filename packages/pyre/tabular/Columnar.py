@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+from .. import schemata
+# superclass
+from .Sheet import Sheet
+
+
+# declaration
+class Columnar(Sheet):
+    """
+    A worksheet that stores its data by column
+
+    Regular sheets keep a record instance for every row. Columnar sheets extract the records
+    the same way, so the values go through the same conversions and checks, but store only the
+    values of the measures, each one in a column whose type is chosen based on the schema of
+    its field: integers and floats go in typed arrays, strings and booleans are dictionary
+    encoded, and everything else goes in a list. The values of derivations are computed when
+    they are accessed. Numeric columns take up a machine word per row, rather than a full
+    python object plus its slot in the record tuple.
+
+    The records in {pyre_data} are views of the rows that are built on demand; they have the
+    same named and indexed access to the values as the records in regular sheets. The rows of
+    sheets that were populated by {pyre_mutable} or {pyre_new} may be modified through them.
+    Column scans, such as the ones performed by charts when they bin the rows, or by
+    reductions, operate directly on the columns.
+    """
+
+
+    # types
+    from .Rows import Rows as pyre_rows
+    from .Vector import Vector as pyre_vector
+    from .Dictionary import Dictionary as pyre_dictionary
+
+
+    # public data
+    pyre_stores = None # the columns of my measures; {None} for derivations
+    pyre_size = 0 # the number of rows
+    pyre_writable = False # {True} when my rows may be modified
+
+
+    # interface
+    def pyre_mutable(self, data):
+        """
+        Iterate over {data} extracting records that are compatible with my layout and use them to
+        populate my data set; the values are checked as they are extracted, but the rows may be
+        modified afterwards
+        """
+        # mark me as modifiable
+        self.pyre_writable = True
+        # and extract the records
+        return self.pyre_immutable(data=data)
+
+
+    def pyre_append(self, row):
+        """
+        Add the given {row} to my data set
+        """
+        # go through the values in {row}
+        for store, value in zip(self.pyre_stores, row):
+            # skip the derivations
+            if store is None: continue
+            # store the rest
+            store.append(value)
+        # update the number of rows
+        self.pyre_size += 1
+        # all done
+        return self
+
+
+    def pyre_new(self):
+        """
+        Create a new row with the default values of my measures and return a view of it
+        """
+        # mark me as modifiable
+        self.pyre_writable = True
+        # build the row
+        self.pyre_append(row=(
+            # out of the processed default values of the measures
+            None if store is None else field.process(field.default)
+            # for each of my fields
+            for field, store in zip(self.pyre_fields, self.pyre_stores)))
+        # and hand a view of it to the caller
+        return self.pyre_view(sheet=self, row=self.pyre_size-1)
+
+
+    def pyre_column(self, index, rows=None):
+        """
+        Build an iterable over the values in column {index}, restricted to the given {rows} if
+        they are specified
+        """
+        # get the column
+        store = self.pyre_stores[index]
+        # derivations are not stored
+        if store is None:
+            # so compute their values the slow way
+            return super().pyre_column(index=index, rows=rows)
+        # if i were not given a subset of the rows, the column itself will do
+        if rows is None:
+            # so hand it over
+            return store
+        # otherwise, restrict it
+        return store.pick(rows)
+
+
+    def pyre_bin(self, index):
+        """
+        Partition my rows by the values in column {index}; return a map from each distinct value
+        to the set of rows where it occurs
+        """
+        # get the column
+        store = self.pyre_stores[index]
+        # derivations are not stored
+        if store is None:
+            # so bin them the slow way
+            return super().pyre_bin(index=index)
+        # otherwise, let the column do it
+        return store.bin()
+
+
+    def pyre_value(self, row, column):
+        """
+        Retrieve the value of the field at {column} in {row}
+        """
+        # get the column
+        store = self.pyre_stores[column]
+        # if it's stored
+        if store is not None:
+            # look up the value
+            return store[row]
+        # otherwise, compute all the values in {row} and pick the one i want
+        return self.pyre_record(row=row)[column]
+
+
+    def pyre_record(self, row):
+        """
+        Assemble the values of all my fields in {row}
+        """
+        # get my fields
+        fields = self.pyre_fields
+        # and my columns
+        stores = self.pyre_stores
+        # if i don't have any derivations
+        if not self.pyre_derivations:
+            # the values are all stored
+            return tuple(store[row] for store in stores)
+        # otherwise, prime a cache with the values of my measures
+        cache = dict(
+            (field, store[row]) for field, store in zip(fields, stores) if store is not None)
+        # make an evaluator for my derivations
+        evaluator = type(self).pyre_evaluator()
+        # and build the values
+        return tuple(
+            # by looking up the measures
+            cache[field] if store is not None
+            # and computing the derivations
+            else field.identify(authority=evaluator, cache=cache, source=None)
+            # for each of my fields
+            for field, store in zip(fields, stores))
+
+
+    def pyre_assign(self, row, column, value):
+        """
+        Set the value of the field at {column} in {row}
+        """
+        # if my rows can't be modified
+        if not self.pyre_writable:
+            # complain
+            raise TypeError("the rows of {.pyre_name!r} are read only".format(self))
+        # get the column
+        store = self.pyre_stores[column]
+        # derivations are computed
+        if store is None:
+            # so they can't be set
+            raise TypeError("can't assign to {.name!r}, a derivation".format(
+                self.pyre_fields[column]))
+        # otherwise, process the value and store it
+        store[row] = self.pyre_fields[column].process(value)
+        # all done
+        return
+
+
+    @classmethod
+    def pyre_storage(cls, field):
+        """
+        Build a column for the values of {field}, based on its schema
+        """
+        # booleans take very few distinct values
+        if isinstance(field, schemata.bool):
+            # so encode them, with a byte per row
+            return cls.pyre_dictionary(typecode="B")
+        # integers
+        if isinstance(field, schemata.int):
+            # go in an array of machine integers
+            return cls.pyre_vector(typecode="q")
+        # floats
+        if isinstance(field, schemata.float):
+            # go in an array of doubles
+            return cls.pyre_vector(typecode="d")
+        # strings
+        if isinstance(field, schemata.str):
+            # get encoded
+            return cls.pyre_dictionary()
+        # everything else goes in a list
+        return cls.pyre_vector()
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # get my measures
+        measures = set(self.pyre_measures)
+        # make a column for each one
+        self.pyre_stores = tuple(
+            self.pyre_storage(field=field) if field in measures else None
+            for field in self.pyre_fields)
+        # and provide access to my rows
+        self.pyre_data = self.pyre_rows(sheet=self)
+        # all done
+        return
+
+
+# end of file
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import array
+
+
+# declaration
+class Dictionary:
+    """
+    Dictionary encoded storage for the values of a sheet column
+
+    Each distinct value is stored once, and the column keeps a typed array of small integer
+    codes that refer to them. This is a good fit for columns of strings, such as names, skus or
+    dates, that take relatively few distinct values; it also makes binning the rows by value
+    cheap, since it only involves the codes.
+    """
+
+
+    # public data
+    codes = None # the code of the value in each row
+    values = None # the distinct values, indexed by their code
+    encoding = None # the map from the distinct values to their code
+
+
+    # interface
+    def append(self, value):
+        """
+        Add {value} to the end of the column
+        """
+        # encode it and store it
+        self.codes.append(self.encode(value))
+        # all done
+        return self
+
+
+    def encode(self, value):
+        """
+        Look up the code of {value}, assigning one if this is the first time it shows up
+        """
+        # get my encoding
+        encoding = self.encoding
+        # attempt to
+        try:
+            # look up the code
+            return encoding[value]
+        # if it's not there
+        except KeyError:
+            # assign the next available one
+            code = len(self.values)
+        # add the value to the pile
+        self.values.append(value)
+        # remember its code
+        encoding[value] = code
+        # and return it
+        return code
+
+
+    def pick(self, rows):
+        """
+        Build an iterable over my values in the given {rows}
+        """
+        # select the codes and decode them
+        return map(self.values.__getitem__, map(self.codes.__getitem__, rows))
+
+
+    def bin(self):
+        """
+        Partition the rows by their values; return a map from each distinct value to the set of
+        rows where it occurs
+        """
+        # make a bin for each code
+        bins = tuple(set() for value in self.values)
+        # go through the codes
+        for row, code in enumerate(self.codes):
+            # add this row to its bin
+            bins[code].add(row)
+        # decode, skipping the values that are no longer in use
+        return dict((value, rows) for value, rows in zip(self.values, bins) if rows)
+
+
+    # meta-methods
+    def __init__(self, typecode="I", **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize my state
+        self.codes = array.array(typecode)
+        self.values = []
+        self.encoding = {}
+        # all done
+        return
+
+
+    def __len__(self):
+        """
+        Compute the number of values in the column
+        """
+        # easy enough
+        return len(self.codes)
+
+
+    def __iter__(self):
+        """
+        Build an iterator over my values
+        """
+        # decode my codes
+        return map(self.values.__getitem__, self.codes)
+
+
+    def __getitem__(self, row):
+        """
+        Retrieve the value in {row}
+        """
+        # decode the code in {row}
+        return self.values[self.codes[row]]
+
+
+    def __setitem__(self, row, value):
+        """
+        Replace the value in {row}
+        """
+        # encode it and store it
+        self.codes[row] = self.encode(value)
+        # all done
+        return
+
+
+# end of file
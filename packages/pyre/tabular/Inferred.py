@@ -42,14 +42,8 @@ class Inferred(Dimension):
             # and my column number
             column = sheet.pyre_columns[measure]
 
-            # get the records
-            for row, record in enumerate(sheet.pyre_data):
-                # get the value of my column
-                value = record[column]
-                # get the set of rows that have the same value
-                rows = self.setdefault(value, set())
-                # add this one to the set
-                rows.add(row)
+            # partition the rows by the values in my column
+            self.update(sheet.pyre_bin(index=column))
 
             # all done
             return
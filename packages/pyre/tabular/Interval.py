@@ -64,10 +64,8 @@ class Interval(Dimension):
             # and a list of records that were rejected because they are outside my interval
             self.rejects = []
 
-            # get the records
-            for row, record in enumerate(sheet.pyre_data):
-                # get the value of my measure
-                value = record[column]
+            # go through the values of my measure
+            for row, value in enumerate(sheet.pyre_column(index=column)):
                 # bin it
                 rank = int((value - start)/width)
                 # check whether it falls within my bounds
@@ -11,19 +11,28 @@ include pyre.def
 PACKAGE = tabular
 # the python modules
 EXPORT_PYTHON_MODULES = \
+    Average.py \
     Chart.py \
     Column.py \
+    Columnar.py \
+    Dictionary.py \
     Dimension.py \
     Inferred.py \
     Interval.py \
+    Maximum.py \
     Measure.py \
+    Minimum.py \
     Pivot.py \
     Primary.py \
     Reduction.py \
+    Row.py \
+    Rows.py \
     Selector.py \
     Sheet.py \
+    Sum.py \
     Surveyor.py \
     Tabulator.py \
+    Vector.py \
     View.py \
     exceptions.py \
     __init__.py
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Maximum(Reduction):
+    """
+    A reduction that finds the largest value of a measure
+    """
+
+
+    # interface
+    def reduce(self, values):
+        """
+        Find the largest of {values}; return {None} if there aren't any
+        """
+        # easy enough
+        return max(values, default=None)
+
+
+# end of file
@@ -10,7 +10,45 @@ class Reduction:
     """
     The base class for all record aggregators that compute a single value from a set of records
     from a given sheet
+
+    Reductions are bound to a sheet measure when they are declared, and applied to sheet
+    instances, optionally restricted to a set of rows, such as the ones returned by
+    {pyre.tabular.Chart.pyre_filter}. They get the values they need from the column of their
+    measure, so when the sheet is columnar they never build any records.
     """
 
 
+    # public data
+    measure = None # the sheet descriptor to reduce
+
+
+    # interface
+    def reduce(self, values):
+        """
+        Compute my value out of {values}
+        """
+        # must be implemented by my subclasses
+        raise NotImplementedError(f"class '{type(self).__name__}' must override 'reduce'")
+
+
+    # meta-methods
+    def __init__(self, measure, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my measure
+        self.measure = measure
+        # all done
+        return
+
+
+    def __call__(self, sheet, rows=None):
+        """
+        Compute my value over the records of {sheet}, restricted to {rows} if they are given
+        """
+        # get the column number of my measure
+        column = sheet.pyre_columns[self.measure]
+        # get its values and reduce them
+        return self.reduce(values=sheet.pyre_column(index=column, rows=rows))
+
+
 # end of file
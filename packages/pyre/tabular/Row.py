@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# declaration
+class Row:
+    """
+    A view of a row of a columnar sheet
+
+    Views hold on to the sheet and the row number, and retrieve the values from the sheet
+    columns when they are accessed, so they are cheap to make. {Tabulator}, the sheet
+    metaclass, derives a class from this one for each sheet that provides named access to the
+    values, just like the data tuples of records do
+    """
+
+
+    # interface
+    @property
+    def pyre_values(self):
+        """
+        Assemble the values of all the fields in my row
+        """
+        # ask my sheet
+        return self.pyre_sheet.pyre_record(row=self.pyre_row)
+
+
+    # meta-methods
+    def __init__(self, sheet, row, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my location
+        self.pyre_sheet = sheet
+        self.pyre_row = row
+        # all done
+        return
+
+
+    def __len__(self):
+        """
+        Compute the number of values in my row
+        """
+        # one per field
+        return len(self.pyre_sheet.pyre_fields)
+
+
+    def __iter__(self):
+        """
+        Build an iterator over my values
+        """
+        # easy enough
+        return iter(self.pyre_values)
+
+
+    def __getitem__(self, index):
+        """
+        Retrieve the value of the field at {index}
+        """
+        # slices
+        if isinstance(index, slice):
+            # get handled by the values
+            return self.pyre_values[index]
+        # everything else, by my sheet
+        return self.pyre_sheet.pyre_value(row=self.pyre_row, column=index)
+
+
+    def __setitem__(self, index, value):
+        """
+        Set the value of the field at {index}
+        """
+        # delegate to my sheet
+        return self.pyre_sheet.pyre_assign(row=self.pyre_row, column=index, value=value)
+
+
+    def __eq__(self, other):
+        """
+        Compare my values with {other}
+        """
+        # views compare equal to views and tuples with the same values
+        if isinstance(other, (Row, tuple)):
+            # so compare the values
+            return self.pyre_values == tuple(other)
+        # otherwise, let {other} decide
+        return NotImplemented
+
+
+    def __hash__(self):
+        """
+        Hash my values, so that views can be used as keys
+        """
+        # easy enough
+        return hash(self.pyre_values)
+
+
+    def __repr__(self):
+        """
+        Build a representation of my values
+        """
+        # easy enough
+        return "{}{!r}".format(type(self.pyre_sheet).__name__, self.pyre_values)
+
+
+    # private data
+    __slots__ = ("pyre_sheet", "pyre_row")
+
+
+# end of file
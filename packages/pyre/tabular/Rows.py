@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# declaration
+class Rows:
+    """
+    The data set of a columnar sheet, as seen by clients that expect a sequence of records
+
+    The records are views of the rows of the sheet that are built as they are requested, so
+    they don't take up any space when they are not in use
+    """
+
+
+    # public data
+    sheet = None # the sheet whose rows i provide access to
+
+
+    # meta-methods
+    def __init__(self, sheet, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the sheet
+        self.sheet = sheet
+        # all done
+        return
+
+
+    def __len__(self):
+        """
+        Compute the number of rows in the sheet
+        """
+        # delegate to the sheet
+        return self.sheet.pyre_size
+
+
+    def __iter__(self):
+        """
+        Build an iterator over views of the rows in the sheet
+        """
+        # get the sheet
+        sheet = self.sheet
+        # and the type of its views
+        view = sheet.pyre_view
+        # go through the rows
+        for row in range(len(self)):
+            # and make a view for each one
+            yield view(sheet=sheet, row=row)
+        # all done
+        return
+
+
+    def __getitem__(self, row):
+        """
+        Build a view of the given {row}
+        """
+        # get the number of rows
+        size = len(self)
+        # interpret negative row numbers the usual way
+        index = row + size if row < 0 else row
+        # if the row doesn't exist
+        if not 0 <= index < size:
+            # complain
+            raise IndexError("row {} out of range".format(row))
+        # otherwise, make a view
+        return self.sheet.pyre_view(sheet=self.sheet, row=index)
+
+
+# end of file
@@ -79,6 +79,36 @@ class Sheet(records.record, metaclass=Tabulator):
         return record
 
 
+    def pyre_column(self, index, rows=None):
+        """
+        Build an iterable over the values in column {index}, restricted to the given {rows} if
+        they are specified
+        """
+        # get my dataset
+        dataset = self.pyre_data
+        # if i were given a subset of the rows
+        if rows is not None:
+            # restrict the dataset
+            dataset = map(dataset.__getitem__, rows)
+        # extract the values
+        return (record[index] for record in dataset)
+
+
+    def pyre_bin(self, index):
+        """
+        Partition my rows by the values in column {index}; return a map from each distinct value
+        to the set of rows where it occurs
+        """
+        # make a pile
+        bins = {}
+        # go through the values in the column
+        for row, value in enumerate(self.pyre_column(index=index)):
+            # add this row to the bin of its value
+            bins.setdefault(value, set()).add(row)
+        # all done
+        return bins
+
+
     @classmethod
     def pyre_offset(cls, measure):
         """
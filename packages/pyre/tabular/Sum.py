@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Sum(Reduction):
+    """
+    A reduction that adds up the values of a measure
+    """
+
+
+    # interface
+    def reduce(self, values):
+        """
+        Add up {values}
+        """
+        # easy enough
+        return sum(values)
+
+
+# end of file
@@ -19,6 +19,7 @@ class Tabulator(records.templater):
 
     # types
     from .Selector import Selector as pyre_selector # override the one in {records}
+    from .Row import Row as pyre_viewType # the base class for views of the rows of sheets
 
 
     # meta-methods
@@ -34,4 +35,26 @@ class Tabulator(records.templater):
         return sheet
 
 
+    def __init__(self, name, bases, attributes, **kwds):
+        """
+        Decorate a newly minted worksheet
+        """
+        # chain up
+        super().__init__(name, bases, attributes, **kwds)
+
+        # build value accessors for the views of my rows
+        attributes = dict(
+            # map the name of the field to an accessor
+            (field.name, self.pyre_accessor(field=field, index=index))
+            # for each of my fields
+            for index, field in enumerate(self.pyre_fields))
+        # views don't need any per instance storage beyond their base
+        attributes["__slots__"] = ()
+        # build the class of the views and attach it
+        self.pyre_view = type('view', (self.pyre_viewType,), attributes)
+
+        # all done
+        return
+
+
 # end of file
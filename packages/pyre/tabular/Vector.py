@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import array
+
+
+# declaration
+class Vector:
+    """
+    Storage for the values of a sheet column in a typed array
+
+    The values are kept in an {array.array} with the given {typecode}, so each one takes up a
+    machine word rather than a full python object. Columns that encounter values that don't fit
+    in the array, such as {None} or integers that are too large, switch to a plain list and
+    keep going. A {typecode} of {None} selects the plain list from the start.
+    """
+
+
+    # public data
+    data = None # the container with my values
+
+
+    # interface
+    def append(self, value):
+        """
+        Add {value} to the end of the column
+        """
+        # attempt to
+        try:
+            # store the value
+            self.data.append(value)
+        # if it doesn't fit
+        except (TypeError, OverflowError):
+            # switch to a list
+            self.data = list(self.data)
+            # and try again
+            self.data.append(value)
+        # all done
+        return self
+
+
+    def pick(self, rows):
+        """
+        Build an iterable over my values in the given {rows}
+        """
+        # select the values
+        return map(self.data.__getitem__, rows)
+
+
+    def bin(self):
+        """
+        Partition the rows by their values; return a map from each distinct value to the set of
+        rows where it occurs
+        """
+        # make a pile
+        bins = {}
+        # go through my values
+        for row, value in enumerate(self):
+            # add this row to the bin of its value
+            bins.setdefault(value, set()).add(row)
+        # all done
+        return bins
+
+
+    # meta-methods
+    def __init__(self, typecode=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make my container
+        self.data = [] if typecode is None else array.array(typecode)
+        # all done
+        return
+
+
+    def __len__(self):
+        """
+        Compute the number of values in the column
+        """
+        # easy enough
+        return len(self.data)
+
+
+    def __iter__(self):
+        """
+        Build an iterator over my values
+        """
+        # easy enough
+        return iter(self.data)
+
+
+    def __getitem__(self, row):
+        """
+        Retrieve the value in {row}
+        """
+        # easy enough
+        return self.data[row]
+
+
+    def __setitem__(self, row, value):
+        """
+        Replace the value in {row}
+        """
+        # attempt to
+        try:
+            # store the value
+            self.data[row] = value
+        # if it doesn't fit
+        except (TypeError, OverflowError):
+            # switch to a list
+            self.data = list(self.data)
+            # and try again
+            self.data[row] = value
+        # all done
+        return
+
+
+# end of file
@@ -39,6 +39,8 @@ tuple = measure.tuple
 
 # access to the basic objects in this package
 from .Sheet import Sheet as sheet
+# the variant that stores its data by column
+from .Columnar import Columnar as columnar
 
 # dimensions
 from .Inferred import Inferred as inferred
@@ -46,6 +48,12 @@ from .Interval import Interval as interval
 # support for charts
 from .Chart import Chart as chart
 
+# reductions
+from .Sum import Sum as sum
+from .Average import Average as average
+from .Minimum import Minimum as minimum
+from .Maximum import Maximum as maximum
+
 # reading and writing
 # the records class
 record = records.record
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# declaration
+class Frame:
+    """
+    A locator that records a position in a python script by holding on to the code object of a
+    stack frame and the line number being executed. It provides the same information as a
+    {Script} locator, but the file and function names are extracted only when someone asks
+    for them
+    """
+
+
+    # public data
+    @property
+    def source(self):
+        """
+        The name of the file that contains the code
+        """
+        # easy enough
+        return self.code.co_filename
+
+
+    @property
+    def function(self):
+        """
+        The name of the function that contains the code
+        """
+        # easy enough
+        return self.code.co_name
+
+
+    # meta methods
+    def __init__(self, code, line):
+        # save my info
+        self.code = code
+        self.line = line
+        # all done
+        return
+
+
+    def __str__(self):
+        text = [
+            "file={!r}".format(str(self.source))
+            ]
+        if self.line:
+            text.append("line={.line!r}".format(self))
+        if self.function:
+            text.append("function={.function!r}".format(self))
+
+        return ", ".join(text)
+
+
+    def __reduce__(self):
+        # code objects can't be pickled, so resolve my information and pickle a {Script}
+        from .Script import Script
+        # easy enough
+        return Script, (self.source, self.line, self.function)
+
+
+    # implementation details
+    __slots__ = "code", "line"
+
+
+# end of file
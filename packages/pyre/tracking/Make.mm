@@ -15,6 +15,7 @@ EXPORT_PYTHON_MODULES = \
     Command.py \
     File.py \
     FileRegion.py \
+    Frame.py \
     NameLookup.py \
     Script.py \
     Simple.py \
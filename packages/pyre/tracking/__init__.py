@@ -6,11 +6,16 @@
 #
 
 
+# externals
+import sys
+
+
 # factories
 from .Chain import Chain as chain
 from .Command import Command as command
 from .File import File as file
 from .FileRegion import FileRegion as region
+from .Frame import Frame as frame
 from .NameLookup import NameLookup as lookup
 from .Script import Script as script
 from .Simple import Simple as simple
@@ -37,14 +42,12 @@ def here(level=0):
     originating location. The default, {level}=0, indicates to use the caller's location;
     setting {level} to 1 will use the caller's caller's location, and so on.
     """
-    # externals
-    import traceback
-    # get a stack trace
-    trace = traceback.extract_stack(limit=callerStackDepth+level)
-    # grab the information from the current frame
-    source, line, function, text = trace[0]
-    # hand to the script locator
-    return script(source=source, line=line, function=function)
+    # get the frame of the caller; the frame at depth {callerStackDepth}-1 is the one that
+    # called us, so skip {level} more
+    caller = sys._getframe(callerStackDepth - 1 + level)
+    # grab its code and line number and hand them to the frame locator, which postpones the
+    # extraction of the rest of the information until someone asks for it
+    return frame(code=caller.f_code, line=caller.f_lineno)
 
 
 # end of file
@@ -7,7 +7,7 @@
 
 
 # externals
-import time # to generate timestamps
+import os # to measure files
 # framework
 import pyre
 # my protocol
@@ -29,7 +29,7 @@ class HTTP(pyre.component, implements=Language):
 
 
     # public data
-    version = 1,0 # my preferred protocol version
+    version = 1,1 # my preferred protocol version
 
 
     # mill obligations
@@ -37,33 +37,40 @@ class HTTP(pyre.component, implements=Language):
     def render(self, document, **kwds):
         """
         Render the document
+
+        The first segment is the response head; the rest are the segments of the body, which
+        may be byte strings or open files, and are meant to be written back to back
         """
         # the string used to assemble the output
         splicer = '\r\n'
         # unpack
         code = document.code
-        status = document.status
+        status = document.status.strip()
         headers = document.headers
         version = document.version
 
         # decide which protocol to use
         protocol = self.version if self.version < version else version
-        # the protocol version
-        protocol = "{}.{}".format(*protocol)
-        # start the response
-        yield "HTTP/{} {} {}".format(protocol, code, status).encode(self.encoding, 'strict')
 
-        # assemble the payload
+        # assemble the payload first, so that documents that fail to render do so before
+        # anything is sent to the client
         page = self.body(document=document, **kwds)
-        # inform the client about the size of the payload
-        headers['Content-Length'] = len(page)
-
-        # assemble the headers and send them off
-        yield splicer.join(self.header(document=document)).encode(self.encoding, 'strict')
-        # mark the end of the headers
-        yield b''
+        # if this is a response that can't have a payload
+        if code < 200 or code in (204, 304):
+            # don't send one
+            body = ()
+        # otherwise
+        else:
+            # decide how to deliver it
+            body = self.frame(page=page, protocol=protocol, headers=headers)
+
+        # start the response with the protocol version
+        line = "HTTP/{}.{} {} {}".format(*protocol, code, status)
+        # assemble the head and send it off
+        yield splicer.join(
+            (line, *self.header(document=document), '', '')).encode(self.encoding, 'strict')
         # send the page
-        yield page
+        yield from body
         # all done
         return
 
@@ -96,4 +103,63 @@ class HTTP(pyre.component, implements=Language):
         yield ''
 
 
+    # implementation details
+    def frame(self, page, protocol, headers):
+        """
+        Decide how to deliver {page} using {protocol} and adjust the {headers} accordingly
+        """
+        # if the page is a file
+        if hasattr(page, 'read'):
+            # attempt to
+            try:
+                # measure what's left of it
+                size = os.fstat(page.fileno()).st_size - page.tell()
+            # if it's not backed by a descriptor
+            except OSError:
+                # read it
+                page = page.read()
+            # otherwise
+            else:
+                # inform the client about the size of the payload
+                headers['Content-Length'] = size
+                # and send the file itself
+                return (page,)
+        # if the page is a byte string
+        if isinstance(page, (bytes, bytearray, memoryview)):
+            # inform the client about the size of the payload
+            headers['Content-Length'] = len(page)
+            # and send it
+            return (page,)
+        # otherwise, the page is generated on the fly; if the client understands it
+        if protocol >= (1,1):
+            # send it in chunks
+            headers['Transfer-Encoding'] = 'chunked'
+            # framed appropriately
+            return self.chunk(segments=page)
+        # if not, the only way to mark the end of the payload is to close the connection
+        headers['Connection'] = 'close'
+        # and send the segments as they come
+        return page
+
+
+    def chunk(self, segments):
+        """
+        Frame {segments} using the chunked transfer encoding
+        """
+        # go through the segments
+        for segment in segments:
+            # skip the empty ones, since they mark the end of the payload
+            if not len(segment): continue
+            # send the size
+            yield b'%x\r\n' % len(segment)
+            # the segment itself
+            yield segment
+            # and the terminator
+            yield b'\r\n'
+        # mark the end of the payload
+        yield b'0\r\n\r\n'
+        # all done
+        return
+
+
 # end of file
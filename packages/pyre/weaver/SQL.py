@@ -43,12 +43,20 @@ class SQL(LineMill, Expression):
 
 
     # overrides
-    def _literalRenderer(self, node, **kwds):
+    def _literalRenderer(self, node, parameters=None, **kwds):
         """
-        Render {node} as a literal
+        Render {node} as a literal, or as a placeholder if the caller is collecting {parameters}
         """
         # get the value of the node
         value = node._value
+        # if the caller is collecting parameters
+        if parameters is not None:
+            # bind the value
+            placeholder = parameters.bind(value=value)
+            # if it can be passed as a parameter
+            if placeholder is not None:
+                # use its placeholder
+                return placeholder
         # if it is already a string
         if isinstance(value, str):
             # just escape the single quotes
@@ -70,6 +70,8 @@ channels:
 	${PYTHON} ./debug_instance.py
 	${PYTHON} ./debug_loop.py
 	${PYTHON} ./debug_quiet.py
+	${PYTHON} ./debug_deferred.py
+	${PYTHON} ./debug_overhead.py
 	${PYTHON} ./error_cascade.py
 	${PYTHON} ./error_empty.py
 	${PYTHON} ./error_example.py
@@ -118,5 +120,7 @@ renderers:
 devices:
 	${PYTHON} ./null_inject.py
 	${PYTHON} ./file_example.py
+	${PYTHON} ./spooler_file.py
+	${PYTHON} ./spooler_overflow.py
 
 # end of file
@@ -0,0 +1,69 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+def test():
+    """
+    Verify that deferred message formatting is resolved only by active channels
+    """
+    # get the trash can
+    from journal.Trash import Trash as trash
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # make a debug channel
+    channel = debug(name="tests.journal.debug")
+    # send the output to trash
+    channel.device = trash()
+
+    # keep track of the number of times the message gets built
+    calls = []
+    # make a message builder
+    def message(value):
+        # record the call
+        calls.append(value)
+        # build the message
+        return f"value: {value}"
+
+    # debug channels start out inactive, so
+    assert not channel
+    # neither formatting nor message building should happen
+    channel.line("value: {}", 0).line(message, 0)
+    channel.log(message, 0)
+    # verify
+    assert calls == []
+    # and nothing should have been accumulated
+    assert channel.page == []
+
+    # activate the channel
+    channel.activate()
+    # inject
+    channel.line("value: {}", 1)
+    channel.line("value: {value}", value=2)
+    channel.line(message, 3)
+    # verify that everything was rendered
+    assert channel.page == ["value: 1", "value: 2", "value: 3"]
+    assert calls == [3]
+    # flush
+    channel.log(message, value=4)
+    # verify
+    assert calls == [3, 4]
+    # and that the page was flushed
+    assert channel.page == []
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+def test(repetitions=10**5):
+    """
+    Measure the cost of injecting messages into inactive debug channels
+    """
+    # externals
+    import timeit
+    # get the trash can
+    from journal.Trash import Trash as trash
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # make a debug channel
+    channel = debug(name="tests.journal.debug.overhead")
+    # send the output to trash
+    channel.device = trash()
+    # some data
+    value = 3.14
+
+    # the strategies to measure
+    strategies = {
+        # the baseline: an empty loop
+        "empty": lambda: None,
+        # guarding the channel explicitly
+        "guard": lambda: channel and channel.log(f"value: {value}"),
+        # deferred formatting
+        "deferred": lambda: channel.log("value: {}", value),
+        # deferred message building
+        "callable": lambda: channel.log(lambda: f"value: {value}"),
+        # formatting eagerly
+        "eager": lambda: channel.log(f"value: {value}"),
+        }
+
+    # time the inactive channel
+    inactive = {
+        name: min(timeit.repeat(strategy, number=repetitions, repeat=3))
+        for name, strategy in strategies.items()
+        }
+    # activate the channel
+    channel.activate()
+    # and time it again; this time, all messages get built and recorded
+    active = timeit.timeit(strategies["deferred"], number=repetitions)
+
+    # the inactive channel must be much cheaper than the active one
+    assert inactive["deferred"] < active
+
+    # all done
+    return inactive, active
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # the number of messages to inject
+    repetitions = 10**5
+    # run the benchmark
+    inactive, active = test(repetitions=repetitions)
+    # the cost of the empty loop
+    empty = inactive.pop("empty")
+    # the conversion from total seconds to nanoseconds per message
+    scale = 1e9 / repetitions
+    # show me
+    print("cost per message, net of the loop overhead, in ns:")
+    for name, cost in inactive.items():
+        print(f"  inactive, {name:>8}: {(cost-empty)*scale:8.1f}")
+    print(f"    active, deferred: {(active-empty)*scale:8.1f}")
+
+
+# end of file
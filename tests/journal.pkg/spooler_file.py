@@ -0,0 +1,60 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+def test():
+    """
+    Send channel output to a log file through a spooler
+    """
+    # get the channel
+    from journal.Informational import Informational as info
+    # the file device
+    from journal.File import File as file
+    # and the spooler
+    from journal.Spooler import Spooler as spooler
+
+    # make a log file
+    log = file(path="spooler_file.log")
+    # wrap it in a spooler that renders on the caller's thread
+    device = spooler(device=log, batch=16, render=True)
+    # and make it the default device for info channels
+    info.setDefaultDevice(device)
+
+    # make an info channel
+    channel = info(name="tests.journal.spooler")
+    # inject a bunch of messages
+    for idx in range(100):
+        channel.log("message {}", idx)
+    # wait until they have all been recorded
+    device.flush()
+    # nothing got lost
+    assert device.dropped == 0
+    assert device.failures == 0
+
+    # shut the spooler down
+    device.close()
+    # and close the file
+    log.close()
+    # read it back
+    with open("spooler_file.log") as stream:
+        contents = stream.read()
+    # verify that all the messages are there, in order
+    positions = [contents.index(f"message {idx}\n") for idx in range(100)]
+    assert positions == sorted(positions)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the test
+    test()
+
+
+# end of file
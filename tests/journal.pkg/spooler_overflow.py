@@ -0,0 +1,142 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+def test():
+    """
+    Verify the spooler overflow policies, and that urgent and fatal entries get flushed
+    """
+    # externals
+    import threading
+    # get the channels
+    from journal.Debug import Debug as debug
+    from journal.Error import Error as error
+    # the base device
+    from journal.Device import Device
+    # and the spooler
+    from journal.Spooler import Spooler as spooler
+
+    # a device that remembers the message bodies, once it's allowed to
+    class Recorder(Device):
+        # record the message
+        def memo(self, entry):
+            # wait until we are allowed to proceed
+            self.gate.wait()
+            # save the page
+            self.pages.append(list(entry.page))
+            # all done
+            return self
+        # same for alerts
+        alert = memo
+        # meta-methods
+        def __init__(self, **kwds):
+            # chain up
+            super().__init__(name="recorder", **kwds)
+            # the messages
+            self.pages = []
+            # the gate
+            self.gate = threading.Event()
+            # all done
+            return
+
+    # go through the policies that discard entries
+    for overflow, expected in [("drop-oldest", [[0], [3]]), ("count-dropped", [[0], [1]])]:
+        # make a device
+        recorder = Recorder()
+        # and a spooler with room for a single entry, one at a time
+        device = spooler(device=recorder, capacity=1, batch=1, overflow=overflow)
+        # make a channel
+        channel = debug(name="tests.journal.spooler")
+        # activate it
+        channel.activate()
+        # and attach the device
+        channel.device = device
+
+        # send a message; the writer takes it off the queue and waits at the gate
+        channel.log(0)
+        # wait until the writer is stuck
+        while device._queue: pass
+        # fill the queue
+        channel.log(1)
+        # overflow it
+        channel.log(2)
+        channel.log(3)
+        # verify the count
+        assert device.dropped == 2
+        # open the gate
+        recorder.gate.set()
+        # wait until everything is recorded
+        device.flush()
+        # verify that the right messages made it
+        assert recorder.pages == expected
+        # shut down
+        device.close()
+
+    # make a device that is always open
+    recorder = Recorder()
+    recorder.gate.set()
+    # and a spooler with default settings
+    device = spooler(device=recorder)
+    # make an error channel
+    channel = error(name="tests.journal.spooler")
+    # and attach the device
+    channel.device = device
+    # errors are fatal by default, so
+    try:
+        # this raises an exception
+        channel.log("fatal")
+        # so we shouldn't get here
+        assert False, "unreachable"
+    # when the exception is raised
+    except channel.ApplicationError:
+        # the message should have been recorded already
+        assert recorder.pages == [["fatal"]]
+
+    # non-fatal errors are urgent, so they get recorded before {log} returns
+    channel.fatal = False
+    channel.log("urgent")
+    # verify
+    assert recorder.pages == [["fatal"], ["urgent"]]
+    # shut down
+    device.close()
+
+    # a device that can't flush, e.g. because the disk is full
+    class Full(Recorder):
+        # flushing
+        def flush(self):
+            # fails
+            raise OSError("no space left on device")
+
+    # make one that is always open
+    recorder = Full()
+    recorder.gate.set()
+    # and a spooler that flushes when idle for a very short while
+    device = spooler(device=recorder, interval=0.01)
+    # attach it to the channel
+    channel.device = device
+    # send a couple of urgent entries; the failed flushes should not keep them from returning
+    channel.log("first")
+    channel.log("second")
+    # verify that they were recorded
+    assert recorder.pages == [["first"], ["second"]]
+    # and that the failures were noticed
+    assert device.failures >= 2
+    # shut down
+    device.close()
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the test
+    test()
+
+
+# end of file
@@ -13,7 +13,7 @@ PROJECT = pyre
 
 all: test
 
-test: sanity structural evaluators expressions interpolations memo hierarchical model
+test: sanity structural evaluators expressions interpolations memo hierarchical model plan
 
 sanity:
 	${PYTHON} ./sanity.py
@@ -57,6 +57,7 @@ memo:
 	${PYTHON} ./memo_model.py
 	${PYTHON} ./memo_expression.py
 	${PYTHON} ./memo_interpolation.py
+	${PYTHON} ./batch.py
 
 hierarchical:
 	${PYTHON} ./hierarchical.py
@@ -68,4 +69,7 @@ hierarchical:
 model:
 	${PYTHON} ./model.py
 
+plan:
+	${PYTHON} ./plan.py
+
 # end of file
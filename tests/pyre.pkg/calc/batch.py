@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that value changes are propagated iteratively, and that batches defer propagation
+"""
+
+
+def test():
+    # access the package
+    import pyre.calc
+    # set up the model
+    model = pyre.calc.model()
+
+    # build a long chain of nodes; deep enough to exhaust the python stack if the notifications
+    # were delivered recursively
+    depth = 5000
+    model["x0"] = 0
+    for level in range(1, depth):
+        model[f"x{level}"] = model.expression(f"{{x{level-1}}} + 1")
+    # get the last one
+    last = model.retrieve(f"x{depth-1}")
+    # evaluate it through a plan, which doesn't recurse either
+    plan = model.compile(f"x{depth-1}")
+    assert plan() == (depth-1,)
+    assert not last.dirty
+
+    # make a change
+    model.retrieve("x0").value = 1
+    # verify the change made it all the way down
+    assert last.dirty
+    assert plan() == (depth,)
+
+    # now, some nodes that depend on a shared setting
+    model["shared"] = 1
+    model["a"] = model.expression("{shared} + 1")
+    model["b"] = model.expression("{shared} + 2")
+    model["c"] = model.expression("{a} * {b}")
+    assert model["c"] == 6
+    # make a bunch of changes in a batch
+    with model.batch():
+        # set the shared value a few times
+        for value in range(10):
+            model["shared"] = value
+        # the replacement of {shared} lets {a} and {b} know, but the news haven't made it
+        # to their dependents yet
+        assert model.retrieve("a").dirty
+        assert model.retrieve("b").dirty
+        assert not model.retrieve("c").dirty
+    # but they have now
+    assert model.retrieve("c").dirty
+    # verify the values
+    assert model["c"] == 110
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
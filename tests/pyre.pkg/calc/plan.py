@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that evaluation plans compute the same values as the node-by-node path
+"""
+
+
+def test():
+    # access the package
+    import pyre.calc
+    # set up the model
+    model = pyre.calc.model()
+
+    # build some nodes
+    model["x"] = 2.
+    model["y"] = 3.
+    model["home"] = "/opt/local"
+    model["bin"] = model.interpolation("{home}/bin")
+    model["sum"] = model.expression("{x} + {y}")
+    model["scaled"] = model.expression("{sum} * {x} - {y}**2")
+    # and some operators
+    x = model.retrieve("x")
+    y = model.retrieve("y")
+    model["op"] = (x + y) * (x - y) / 2
+    model["total"] = pyre.calc.sum(x, y, model.retrieve("op"))
+
+    # the names of the nodes of interest
+    names = "sum", "scaled", "op", "total", "bin"
+    # compile them
+    plan = model.compile(*names)
+    # verify that the plan and the model agree
+    assert plan() == tuple(model[name] for name in names)
+    # check the sort order: every node comes after its operands
+    seen = set()
+    for node in plan.nodes:
+        assert all(id(operand) in seen for operand in plan.operands(node))
+        seen.add(id(node))
+
+    # make a change
+    model["x"] = 4.
+    # check that the dependents are now dirty
+    assert model.retrieve("sum").dirty
+    assert model.retrieve("scaled").dirty
+    # evaluate the plan
+    values = plan()
+    # verify that the plan refreshed the caches
+    assert not model.retrieve("sum").dirty
+    assert not model.retrieve("scaled").dirty
+    # and that the values are correct
+    assert values == (7., 19., 3.5, 10.5, "/opt/local/bin")
+    # and match the node-by-node path
+    assert values == tuple(model[name] for name in names)
+
+    # change the value of a node without replacing it
+    model.retrieve("y").value = 1.
+    # verify
+    assert plan() == (5., 19., 7.5, 12.5, "/opt/local/bin")
+
+    # change a formula
+    model.retrieve("sum").value = "{x} * {y}"
+    # verify
+    assert plan() == (4., 15., 7.5, 12.5, "/opt/local/bin")
+    assert plan() == tuple(model[name] for name in names)
+
+    # the kernel works on the leaves directly
+    kernel = plan.kernel
+    # make sure the leaves are what we expect: {x}, {y} and {home}
+    assert len(plan.leaves) == 3
+    # evaluate
+    values = kernel(*(leaf.value for leaf in plan.leaves))
+    # verify
+    assert values == plan()
+
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
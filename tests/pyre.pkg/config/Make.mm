@@ -30,6 +30,7 @@ configurator:
 	${PYTHON} ./configurator_load_pml.py
 	${PYTHON} ./configurator_load_cfg.py
 	${PYTHON} ./configurator_load_pfg.py
+	${PYTHON} ./snapshot.py
 
 commandline:
 	${PYTHON} ./command.py
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that configuration events can be replayed from a snapshot
+"""
+
+
+def test():
+    # externals
+    import os
+    import pyre
+    # access the snapshot factory
+    from pyre.config.Snapshot import Snapshot
+
+    # get the pyre executive
+    executive = pyre.executive
+    # and the nameserver
+    ns = executive.nameserver
+
+    # the location of the snapshot
+    path = "snapshot.pickle"
+    # the events are indexed by the locator of the request, so make sure all requests come
+    # from the same place
+    def load():
+        # load the sample configuration file
+        return pyre.loadConfiguration("sample.pfg")
+    # make a cold one
+    cold = Snapshot(path=path).clear()
+    # attach it
+    executive.snapshot = cold
+    # load a configuration file
+    load()
+    # verify that the file was parsed
+    assert cold.misses == 1
+    assert cold.hits == 0
+    # check the settings
+    assert ns["sample.user.name"] == "michael a.g. aïvázis"
+    # save the snapshot
+    cold.save()
+
+    # make a warm one
+    warm = Snapshot(path=path)
+    # attach it
+    executive.snapshot = warm
+    # load the file again
+    load()
+    # verify that the events were replayed
+    assert warm.misses == 0
+    assert warm.hits == 1
+    # and the configuration was processed identically
+    assert warm.digest == cold.digest
+    assert ns["sample.user.name"] == "michael a.g. aïvázis"
+    assert ns["sample.user.email"] == "michael.aivazis@orthologue.com"
+
+    # a snapshot taken in different circumstances is discarded
+    stale = Snapshot(path=path)
+    stale.fingerprint = ()
+    stale.clear().load()
+    # so the file has to be parsed again
+    executive.snapshot = stale
+    load()
+    assert stale.misses == 1
+    assert stale.hits == 0
+
+    # clean up
+    executive.snapshot = None
+    os.unlink(path)
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    test()
+
+
+# end of file
@@ -39,6 +39,7 @@ linker:
 	${PYTHON} ./linker.py
 	${PYTHON} ./linker_codecs.py
 	${PYTHON} ./linker_shelves.py
+	${PYTHON} ./linker_index.py
 
 externals:
 	${PYTHON} ./externals.py
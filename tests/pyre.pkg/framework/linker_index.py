@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the odb codec indexes the shelves in the system folders
+"""
+
+
+def test():
+    import pyre
+    # build the executive
+    executive = pyre.executive
+    # access the fileserver
+    fs = executive.fileserver
+    # and the odb codec
+    odb = executive.linker.schemes['vfs']
+
+    # get the index
+    index = odb.index(executive=executive)
+    # the startup folder is one of its roots
+    startup = str(fs.STARTUP_DIR)
+    assert startup in index.roots
+    # it knows about shelves in the startup folder
+    assert index.exists("{}/sample.py".format(startup))
+    # and that there is nothing where there is no file
+    assert not index.exists("{}/not-there.py".format(startup))
+    assert not index.viable("{}/not-there".format(startup))
+    # but it can't tell about addresses outside of its roots
+    assert index.exists("/elsewhere/sample.py")
+    # asking again gets the same index
+    assert odb.index(executive=executive) is index
+
+    # add a shelf to the startup folder
+    fs[fs.STARTUP_DIR / "extra.py"] = fs.node()
+    # the index notices the fileserver has changed
+    assert not index.isCurrent()
+    # so we get a new one
+    fresh = odb.index(executive=executive)
+    assert fresh is not index
+    # that knows about the new shelf
+    assert fresh.exists("{}/extra.py".format(startup))
+
+    # resolve a component from a file in the startup folder
+    d1, *_ = executive.resolve(uri="vfs:{}/sample.py/d1".format(startup))
+    # make sure we got what we expect
+    assert issubclass(d1, pyre.component)
+
+    # all done
+    return executive
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
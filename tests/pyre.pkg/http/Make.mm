@@ -0,0 +1,22 @@
+# -*- Makefile -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# project defaults
+include pyre.def
+
+all: test
+
+test: servers clean
+
+servers:
+	${PYTHON} ./server.py
+	${PYTHON} ./server_cache.py
+	${PYTHON} ./server_prefork.py
+	${PYTHON} ./server_benchmark.py
+
+# end of file
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the http server keeps connections alive, handles pipelined requests, streams
+generated documents using the chunked transfer encoding, and delivers large documents and
+files intact
+"""
+
+
+# support
+import pyre
+from pyre.http.documents import OK
+
+
+# a document that is generated on the fly
+class Countdown(OK):
+    """
+    A document that is produced one line at a time
+    """
+
+    # interface
+    def render(self, **kwds):
+        """
+        Generate the payload
+        """
+        # go through the lines
+        for n in reversed(range(self.lines)):
+            # and send each one off
+            yield "{}\n".format(n).encode(self.encoding)
+        # all done
+        return
+
+    # meta-methods
+    def __init__(self, lines, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the number of lines
+        self.lines = lines
+        # all done
+        return
+
+
+# the application
+class Web(pyre.application, family='tests.http.web'):
+    """
+    An application that responds to http requests
+    """
+
+    # the size of the big documents
+    size = 8 * 1024 * 1024
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Build a response to the {request}
+        """
+        # get the url
+        url = request.url
+        # documents generated on the fly
+        if url == "/countdown":
+            # count down
+            return Countdown(lines=1000, server=server)
+        # large documents
+        if url == "/big":
+            # make one
+            return server.documents.Literal(value="y"*self.size, server=server)
+        # files
+        if url == "/file":
+            # serve it
+            return server.documents.File(uri="/www/big", server=server, application=self)
+        # echo the payload of the request
+        if url == "/echo":
+            # assemble it and send it back
+            value = b''.join(request.payload).decode()
+            # send it back
+            return server.documents.Literal(value=value, server=server)
+        # if i'm asked to stop
+        if url == "/stop":
+            # do so
+            server.dispatcher.stop()
+        # otherwise, send back the url
+        return server.documents.Literal(value=url, server=server)
+
+
+def exchange(address, requests):
+    """
+    Send {requests} to the server at {address} in one go and collect everything it sends back
+    until it closes the connection
+    """
+    # externals
+    import socket
+    # connect
+    with socket.create_connection(address) as client:
+        # send the requests
+        client.sendall(requests)
+        # make a pile for the reply
+        reply = []
+        # read everything
+        while True:
+            # get a packet
+            packet = client.recv(64*1024)
+            # if the server closed the connection, we are done
+            if not packet: break
+            # otherwise, save it
+            reply.append(packet)
+    # assemble the reply and return it
+    return b''.join(reply)
+
+
+def converse(address, server, content):
+    """
+    Talk to the server at {address}
+    """
+    # externals
+    import time
+    import socket
+    import http.client
+    # connect
+    connection = http.client.HTTPConnection(*address)
+
+    # ask for a few small documents
+    for n in range(3):
+        # ask for a document
+        connection.request("GET", "/hello/{}".format(n))
+        # get the response
+        response = connection.getresponse()
+        # check it
+        assert response.status == 200
+        assert response.read() == "/hello/{}".format(n).encode()
+        # on the same connection
+        if n == 0: sock = connection.sock
+        assert connection.sock is sock
+
+    # ask for a generated document
+    connection.request("GET", "/countdown")
+    # get the response
+    response = connection.getresponse()
+    # check that it was sent in chunks
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    # and that it arrived intact
+    assert response.read() == "".join("{}\n".format(n) for n in reversed(range(1000))).encode()
+
+    # ask for a large document
+    connection.request("GET", "/big")
+    # check that it arrived intact
+    assert connection.getresponse().read() == b"y" * Web.size
+    # ask for a file
+    connection.request("GET", "/file")
+    # get the response
+    response = connection.getresponse()
+    # check its size
+    assert int(response.getheader("Content-Length")) == len(content)
+    # and its contents
+    assert response.read() == content
+    # send a payload
+    connection.request("POST", "/echo", body="hello world!")
+    # check that it made it
+    assert connection.getresponse().read() == b"hello world!"
+    # all still on the same connection
+    assert connection.sock is sock
+    # done with this one
+    connection.close()
+
+    # send a few requests back to back, including some with payloads
+    reply = exchange(address=address, requests=
+        b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\n" +
+        b"POST /echo HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello" +
+        b"GET /two HTTP/1.1\r\nHost: localhost\r\n\r\n" +
+        b"GET /three HTTP/1.1\r\nConnection: close\r\n\r\n")
+    # verify we got all the responses
+    assert reply.count(b"HTTP/1.1 200 OK\r\n") == 4
+    # in the right order
+    assert reply.index(b"/one") < reply.index(b"hello") < reply.index(b"/two") < reply.index(b"/three")
+
+    # pipeline a lot of requests for large documents without reading any of the responses
+    with socket.create_connection(address) as client:
+        # send the requests
+        count = 4 * server.MAX_PENDING
+        client.sendall(b"GET /big HTTP/1.1\r\n\r\n" * (count-1) + b"GET /one HTTP/1.1\r\n\r\n")
+        # give the server a chance to process them
+        time.sleep(0.5)
+        # verify that it stopped reading them once enough responses piled up
+        assert max(map(len, server.outboxes.values())) <= server.MAX_PENDING
+        assert server.backlog
+        # read all the responses
+        reply = bytearray()
+        while not reply.endswith(b"/one"):
+            # one packet at a time
+            reply += client.recv(1024*1024)
+    # verify we got all of them
+    assert reply.count(b"HTTP/1.1 200 OK\r\n") == count
+    assert len(reply) > (count-1) * Web.size
+    # and that the server forgot the requests it set aside
+    assert not server.backlog
+
+    # talk to the server in an older dialect
+    reply = exchange(address=address, requests=b"GET /countdown HTTP/1.0\r\n\r\n")
+    # verify it responded in kind
+    assert reply.startswith(b"HTTP/1.0 200 OK\r\n")
+    # without chunks, since the client doesn't understand them
+    assert b"chunked" not in reply
+    assert reply.endswith(b"\n1\n0\n")
+
+    # all done
+    return
+
+
+def test():
+    # externals
+    import os
+    import pathlib
+    import shutil
+    import tempfile
+    import threading
+    import http.client
+    # get the server
+    from pyre.http.Server import Server
+
+    # make an application
+    app = Web(name="tests.http.web")
+    # make a folder
+    scratch = pathlib.Path(tempfile.mkdtemp())
+    # with a big file in it
+    content = os.urandom(4 * 1024 * 1024)
+    (scratch / "big").write_bytes(content)
+    # and make it available to the application
+    app.pfs["www"] = pyre.filesystem.local(root=str(scratch)).discover()
+
+    # make a dispatcher
+    dispatcher = pyre.ipc.newSelector()
+    # and a server
+    server = Server(name="tests.http.server")
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # get its address
+    address = ("localhost", server.address.port)
+
+    # make a pile for the errors of the client
+    errors = []
+    # the client
+    def client():
+        # carefully
+        try:
+            # talk to the server
+            converse(address=address, server=server, content=content)
+        # if anything goes wrong
+        except Exception as error:
+            # save it
+            errors.append(error)
+        # either way
+        finally:
+            # ask the server to stop
+            connection = http.client.HTTPConnection(*address)
+            connection.request("GET", "/stop")
+            connection.getresponse().read()
+            connection.close()
+        # all done
+        return
+
+    # start the client
+    thread = threading.Thread(target=client)
+    thread.start()
+    # serve
+    dispatcher.watch()
+    # wait for the client to finish
+    thread.join()
+
+    # clean up
+    shutil.rmtree(scratch)
+    # if the client ran into trouble
+    if errors:
+        # report it
+        raise errors[0]
+    # all done
+    return server
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
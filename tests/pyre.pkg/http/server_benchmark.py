@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Put a local http server under load and measure its throughput with a connection per request,
+with persistent connections, and with pipelined requests
+"""
+
+
+# support
+import pyre
+
+
+# the application
+class Web(pyre.application, family='tests.http.web'):
+    """
+    An application that responds to http requests
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Build a response to the {request}
+        """
+        # if i'm asked to stop
+        if request.url == "/stop":
+            # do so
+            server.dispatcher.stop()
+        # send back the url
+        return server.documents.Literal(value=request.url, server=server)
+
+
+def collect(client, count):
+    """
+    Read {count} responses from {client}
+    """
+    # externals
+    import re
+    # the size scanner
+    scanner = re.compile(br"\r\nContent-Length: (\d+)\r\n")
+    # the unprocessed bytes
+    buffer = b''
+    # go through the responses
+    for _ in range(count):
+        # until we have the complete head of the next response
+        while True:
+            # look for its end
+            head = buffer.find(b"\r\n\r\n")
+            # if it's there, we are done
+            if head >= 0: break
+            # otherwise, get more bytes
+            packet = client.recv(64*1024)
+            # if the server closed the connection
+            if not packet:
+                # complain
+                raise EOFError("the server closed the connection")
+            # save what we got
+            buffer += packet
+        # find the size of the payload
+        match = scanner.search(buffer, 0, head+2)
+        # compute the end of the response
+        end = head + 4 + int(match.group(1))
+        # until we have all of it
+        while len(buffer) < end:
+            # get more bytes
+            packet = client.recv(64*1024)
+            # if the server closed the connection
+            if not packet:
+                # complain
+                raise EOFError("the server closed the connection")
+            # save what we got
+            buffer += packet
+        # drop it
+        buffer = buffer[end:]
+    # all done
+    return
+
+
+def load(address, requests, depth, persistent):
+    """
+    Send {requests} to the server at {address}, {depth} at a time, either over a single
+    {persistent} connection, or over a new connection per request
+    """
+    # externals
+    import socket
+    # the request
+    request = b"GET /load HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    # the request that closes a connection
+    last = b"GET /load HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+
+    # if we are supposed to open a connection per request
+    if not persistent:
+        # go through the requests
+        for _ in range(requests):
+            # connect
+            with socket.create_connection(address) as client:
+                # send the request
+                client.sendall(last)
+                # and get the response
+                collect(client=client, count=1)
+        # all done
+        return
+
+    # otherwise, connect once
+    with socket.create_connection(address) as client:
+        # go through the requests in batches
+        for _ in range(requests // depth):
+            # send a batch back to back
+            client.sendall(request * depth)
+            # and get the responses
+            collect(client=client, count=depth)
+    # all done
+    return
+
+
+def measure(address, clients, requests, depth=1, persistent=True):
+    """
+    Time {clients} that send {requests} each to the server at {address}
+    """
+    # externals
+    import time
+    import threading
+    # make the clients
+    threads = [
+        threading.Thread(target=load, kwargs={
+            "address": address, "requests": requests, "depth": depth, "persistent": persistent})
+        for _ in range(clients) ]
+    # start the clock
+    start = time.perf_counter()
+    # start the clients
+    for thread in threads: thread.start()
+    # wait for them to finish
+    for thread in threads: thread.join()
+    # stop the clock
+    elapsed = time.perf_counter() - start
+    # compute the throughput and return it
+    return clients * requests / elapsed
+
+
+def test(clients=4, requests=1000):
+    """
+    Compare the throughput of the server under different connection strategies
+    """
+    # externals
+    import os
+    import socket
+    # get the server
+    from pyre.http.Server import Server
+
+    # make an application
+    app = Web(name="tests.http.web")
+    # a dispatcher
+    dispatcher = pyre.ipc.newSelector()
+    # and a server
+    server = Server(name="tests.http.server")
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # get its address
+    address = ("localhost", server.address.port)
+
+    # run the server in its own process, so it doesn't compete with the clients
+    pid = os.fork()
+    # in the server process
+    if pid == 0:
+        # serve until asked to stop
+        dispatcher.watch()
+        # and exit
+        os._exit(0)
+
+    # carefully
+    try:
+        # with a connection per request
+        close = measure(address=address, clients=clients, requests=requests, persistent=False)
+        # with persistent connections
+        alive = measure(address=address, clients=clients, requests=requests)
+        # with pipelined requests
+        pipelined = measure(address=address, clients=clients, requests=requests, depth=16)
+    # no matter what happens
+    finally:
+        # ask the server to stop
+        with socket.create_connection(address) as client:
+            client.sendall(b"GET /stop HTTP/1.1\r\nConnection: close\r\n\r\n")
+            collect(client=client, count=1)
+        # and wait for it to exit
+        _, status = os.waitpid(pid, 0)
+
+    # check that the server exited cleanly
+    assert status == 0
+    # all done
+    return close, alive, pipelined
+
+
+# main
+if __name__ == "__main__":
+    # run the benchmark
+    close, alive, pipelined = test()
+    # show me
+    print("requests per second:")
+    print(f"  connection per request: {close:10.0f}")
+    print(f"  persistent connections: {alive:10.0f}")
+    print(f"    pipelined, 16 deep  : {pipelined:10.0f}")
+
+
+# end of file
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the http server caches the documents it serves from the application filesystem,
+validates them, answers conditional requests, and offers compressed variants
+"""
+
+
+# support
+import pyre
+
+
+# the application
+class Web(pyre.application, family='tests.http.web'):
+    """
+    An application that serves documents from its filesystem
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Build a response to the {request}
+        """
+        # if i'm asked to stop
+        if request.url == "/stop":
+            # do so
+            server.dispatcher.stop()
+            # and say goodbye
+            return server.documents.Literal(value="bye", server=server)
+        # otherwise, serve the document
+        return server.documents.File(uri="/www" + request.url, server=server, application=self)
+
+
+def converse(address, server, scratch):
+    """
+    Talk to the server at {address}
+    """
+    # externals
+    import gzip
+    import hashlib
+    import http.client
+    # get the cache
+    cache = server.cache
+    # and the contents of the document
+    page = (scratch / "page.html").read_bytes()
+
+    # connect
+    connection = http.client.HTTPConnection(*address)
+    # ask for a document
+    connection.request("GET", "/page.html")
+    # get the response
+    response = connection.getresponse()
+    # check it
+    assert response.status == 200
+    assert response.read() == page
+    # get its validators
+    tag = response.getheader("ETag")
+    modified = response.getheader("Last-Modified")
+    # verify the entity tag is derived from the contents
+    assert tag == '"{}"'.format(hashlib.sha256(page).digest()[:16].hex())
+    # and that this was the first time the server saw the document
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # ask again
+    connection.request("GET", "/page.html")
+    # check that it's the same document
+    assert connection.getresponse().read() == page
+    # but this time it came out of the cache
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # ask for it again, showing the entity tag of our copy
+    connection.request("GET", "/page.html", headers={"If-None-Match": tag})
+    # get the response
+    response = connection.getresponse()
+    # verify that our copy is still good
+    assert response.status == 304
+    assert response.getheader("ETag") == tag
+    assert response.read() == b""
+    # ask for it again, showing the timestamp of our copy
+    connection.request("GET", "/page.html", headers={"If-Modified-Since": modified})
+    # get the response
+    response = connection.getresponse()
+    # verify that our copy is still good
+    assert response.status == 304
+    assert response.read() == b""
+
+    # ask for the compressed variant
+    connection.request("GET", "/page.html", headers={"Accept-Encoding": "gzip"})
+    # get the response
+    response = connection.getresponse()
+    # check it
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("Vary") == "Accept-Encoding"
+    assert gzip.decompress(response.read()) == page
+    # verify that it has its own entity tag
+    zipped = response.getheader("ETag")
+    assert zipped != tag
+    # and that it can be validated as well
+    connection.request(
+        "GET", "/page.html", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped})
+    response = connection.getresponse()
+    assert response.status == 304
+    assert response.read() == b""
+    # clients that refuse the compressed variant
+    for refusal in ["gzip;q=0", "identity, *;q=0", "deflate", "gzip; q=0.0, br", "x-gzip"]:
+        # ask for the document
+        connection.request("GET", "/page.html", headers={"Accept-Encoding": refusal})
+        # get the response
+        response = connection.getresponse()
+        # verify they get the original
+        assert response.getheader("Content-Encoding") is None, refusal
+        assert response.read() == page
+    # while the ones that accept it, explicitly or through the wildcard
+    for acceptance in ["deflate, GZIP;q=0.5", "*", "identity;q=1, *;q=0.1", "gzip;q=1.0"]:
+        # ask for the document
+        connection.request("GET", "/page.html", headers={"Accept-Encoding": acceptance})
+        # get the response
+        response = connection.getresponse()
+        # verify they get the compressed variant
+        assert response.getheader("Content-Encoding") == "gzip", acceptance
+        assert gzip.decompress(response.read()) == page
+
+    # change the document
+    page = b"<html>changed</html>"
+    (scratch / "page.html").write_bytes(page)
+    # ask for it, showing the entity tag of our stale copy
+    connection.request("GET", "/page.html", headers={"If-None-Match": tag})
+    # get the response
+    response = connection.getresponse()
+    # verify that we got the new contents
+    assert response.status == 200
+    assert response.read() == page
+    assert response.getheader("ETag") != tag
+
+    # ask for a document that is too big for the cache
+    connection.request("GET", "/big")
+    # get the response
+    response = connection.getresponse()
+    # verify it arrived intact
+    assert response.read() == (scratch / "big").read_bytes()
+    # and that it can be validated
+    connection.request("GET", "/big", headers={"If-None-Match": response.getheader("ETag")})
+    response = connection.getresponse()
+    assert response.status == 304
+    assert response.read() == b""
+
+    # ask for a document, so it gets cached
+    connection.request("GET", "/doomed")
+    assert connection.getresponse().read() == b"doomed"
+    # remove it, along with one that was never requested, behind the back of the filesystem
+    (scratch / "doomed").unlink()
+    (scratch / "vanished").unlink()
+    # go through them
+    for name in ("doomed", "vanished"):
+        # ask for each one
+        connection.request("GET", "/" + name)
+        # and verify the server noticed that it's gone
+        response = connection.getresponse()
+        assert response.status == 404
+        response.read()
+    # and that the stale entry was discarded
+    assert "/www/doomed" not in cache.entries
+
+    # ask for a document that doesn't exist
+    connection.request("GET", "/missing")
+    # and verify the server noticed
+    response = connection.getresponse()
+    assert response.status == 404
+    response.read()
+    # done
+    connection.close()
+
+    # all done
+    return
+
+
+def test():
+    # externals
+    import os
+    import pathlib
+    import shutil
+    import tempfile
+    import threading
+    import http.client
+    # get the server
+    from pyre.http.Server import Server
+
+    # make an application
+    app = Web(name="tests.http.web")
+    # make a folder
+    scratch = pathlib.Path(tempfile.mkdtemp())
+    # with a small document
+    (scratch / "page.html").write_bytes(b"<html>" + b"hello world! " * 100 + b"</html>")
+    # a big file
+    (scratch / "big").write_bytes(os.urandom(2 * 1024 * 1024))
+    # and some more small ones
+    for name in ("one", "two", "three"):
+        (scratch / name).write_bytes(b"x" * 800)
+    # and a couple that get removed while the server is running
+    for name in ("doomed", "vanished"):
+        (scratch / name).write_bytes(name.encode())
+    # and make it available to the application
+    app.pfs["www"] = pyre.filesystem.local(root=str(scratch)).discover()
+
+    # make a dispatcher
+    dispatcher = pyre.ipc.newSelector()
+    # and a server
+    server = Server(name="tests.http.server")
+    # that keeps compressed variants and uses digests in the entity tags
+    server.compress = True
+    server.digest = True
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # get its address
+    address = ("localhost", server.address.port)
+
+    # make a pile for the errors of the client
+    errors = []
+    # the client
+    def client():
+        # carefully
+        try:
+            # talk to the server
+            converse(address=address, server=server, scratch=scratch)
+        # if anything goes wrong
+        except Exception as error:
+            # save it
+            errors.append(error)
+        # either way
+        finally:
+            # ask the server to stop
+            connection = http.client.HTTPConnection(*address)
+            connection.request("GET", "/stop")
+            connection.getresponse().read()
+            connection.close()
+        # all done
+        return
+
+    # start the client
+    thread = threading.Thread(target=client)
+    thread.start()
+    # serve
+    dispatcher.watch()
+    # wait for the client to finish
+    thread.join()
+    # if the client ran into trouble
+    if errors:
+        # report it
+        raise errors[0]
+
+    # now, check the memory budget
+    cache = server.cache
+    # start from scratch
+    cache.clear()
+    # shrink the budget so it holds only two of the small documents
+    server.budget = 2000
+    # and stop compressing
+    server.compress = False
+    # go through the small documents
+    for name in ("one", "two", "three"):
+        # look them up
+        cache.lookup(server=server, uri=name, node=app.pfs["www"][name])
+    # verify that the oldest one was evicted
+    assert list(cache.entries) == ["two", "three"]
+    assert cache.footprint <= server.budget
+
+    # clean up
+    shutil.rmtree(scratch)
+    # all done
+    return server
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that a team of pre-forked workers shares the port of a server, recycles workers that
+have served their quota, replaces the ones that crash, reloads gracefully, and keeps track of the
+number of requests served by the team
+"""
+
+
+# support
+import pyre
+
+
+# the application
+class Web(pyre.application, family='tests.http.web'):
+    """
+    An application that responds to http requests with the id of the process that served them
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Build a response to the {request}
+        """
+        # externals
+        import os
+        import time
+        # if i'm asked to take my time
+        if request.url == "/slow":
+            # do so
+            time.sleep(0.5)
+        # send back my process id
+        return server.documents.Literal(value=str(os.getpid()), server=server)
+
+
+def fetch(address, url="/"):
+    """
+    Retrieve {url} from the server at {address} over a new connection, and return the id of the
+    process that served it
+    """
+    # externals
+    import http.client
+    # connect
+    connection = http.client.HTTPConnection(*address)
+    # ask for the document
+    connection.request("GET", url, headers={"Connection": "close"})
+    # get the response
+    response = connection.getresponse()
+    # check it
+    assert response.status == 200
+    # extract the process id
+    pid = int(response.read())
+    # clean up
+    connection.close()
+    # and return the process id
+    return pid
+
+
+def client(address, master):
+    """
+    Put the team through its paces; {master} is the process id of the team
+    """
+    # externals
+    import os
+    import time
+    import signal
+    import threading
+    import http.client
+
+    # give the workers a chance to spin up
+    time.sleep(0.5)
+
+    # the process ids we get back
+    pids = []
+    # make three clients that each ask for a slow document
+    threads = [
+        threading.Thread(target=lambda: pids.append(fetch(address=address, url="/slow")))
+        for _ in range(3) ]
+    # start them one at a time, so each one finds the workers of the others busy
+    for thread in threads:
+        thread.start()
+        time.sleep(0.1)
+    # wait for them to finish
+    for thread in threads: thread.join()
+    # verify that every request was served by a different worker
+    assert len(set(pids)) == 3
+
+    # send enough requests to exhaust the quota of at least one worker
+    pids += [ fetch(address=address) for _ in range(60) ]
+    # give the team a chance to replace it
+    time.sleep(0.5)
+    # and send some more
+    pids += [ fetch(address=address) for _ in range(30) ]
+    # verify that some workers were replaced
+    assert len(set(pids)) > 3
+
+    # open a persistent connection
+    connection = http.client.HTTPConnection(*address)
+    # get the worker that is serving it
+    connection.request("GET", "/")
+    response = connection.getresponse()
+    worker = int(response.read())
+    # start a slow request
+    connection.request("GET", "/slow")
+    # and while it is in progress
+    time.sleep(0.1)
+    # ask the team to reload
+    os.kill(master, signal.SIGHUP)
+    # verify that the request in progress completed
+    response = connection.getresponse()
+    assert response.status == 200
+    assert int(response.read()) == worker
+    # clean up
+    connection.close()
+
+    # give the team a chance to replace its workers
+    time.sleep(0.5)
+    # send some requests
+    fresh = set(fetch(address=address) for _ in range(10))
+    # and verify that they were served by a new generation of workers
+    assert fresh.isdisjoint(pids)
+    assert worker not in fresh
+
+    # let the workers report
+    time.sleep(0.3)
+    # take one of them down
+    os.kill(fresh.pop(), signal.SIGKILL)
+    # give the team a chance to replace it
+    time.sleep(0.5)
+    # and verify that the team is still serving requests
+    for _ in range(10): fetch(address=address)
+
+    # all done; ask the team to shut down
+    os.kill(master, signal.SIGTERM)
+    # and return the number of requests we made
+    return 3 + 60 + 30 + 2 + 10 + 10
+
+
+def test():
+    # externals
+    import os
+    import traceback
+    # get the server and the team
+    from pyre.http.Server import Server
+    from pyre.http.Prefork import Prefork
+    # and the units of time
+    from pyre.units.SI import second
+
+    # make an application
+    app = Web(name="tests.http.web")
+    # a server
+    server = Server(name="tests.http.server")
+    # and a team to run it
+    team = Prefork(name="tests.http.prefork", server=server, application=app)
+    # configure it
+    team.size = 3
+    team.interval = 0.1*second
+    team.quota = 20
+    team.grace = 2*second
+
+    # bind the port, so the client knows where to find it
+    port = server.bind()
+    # and get its address
+    address = ("localhost", port.address.port)
+
+    # launch the client in its own process
+    pid = os.fork()
+    # in the client process
+    if pid == 0:
+        # carefully
+        try:
+            # put the team through its paces
+            client(address=address, master=os.getppid())
+        # if anything goes wrong
+        except BaseException:
+            # show me
+            traceback.print_exc()
+            # and indicate failure
+            os._exit(1)
+        # all done
+        os._exit(0)
+
+    # serve until the client asks us to stop
+    team.run()
+    # wait for the client to exit
+    _, status = os.waitpid(pid, 0)
+    # and check that all went well
+    assert status == 0
+
+    # get the team statistics
+    statistics = team.statistics()
+    # verify that all requests were accounted for
+    assert statistics['requests'] == 3 + 60 + 30 + 2 + 10 + 10
+    assert statistics['connections'] == 3 + 60 + 30 + 1 + 10 + 10
+    # that all the workers are gone
+    assert not statistics['workers']
+    assert not team.recruiter.crews and not team.recruiter.exiting
+    # and that the recycled, reloaded and crashed workers were replaced
+    assert statistics['retired'] > 2 * team.size + 1
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -11,7 +11,7 @@ include pyre.def
 
 all: test
 
-test: sanity channels scheduler selector clean
+test: sanity channels scheduler selector poller loop clean
 
 sanity:
 	${PYTHON} ./sanity.py
@@ -22,11 +22,15 @@ sanity:
 channels:
 	${PYTHON} ./pickler_over_pipe.py
 	${PYTHON} ./pickler_over_tcp.py
+	${PYTHON} ./shared_over_pipe.py
+	${PYTHON} ./framer_over_pipe.py
+	${PYTHON} ./framer_benchmark.py
 
 scheduler:
 	${PYTHON} ./scheduler.py
 	${PYTHON} ./scheduler_instantiation.py
 	${PYTHON} ./scheduler_alarms.py
+	${PYTHON} ./scheduler_cancel.py
 
 selector:
 	${PYTHON} ./selector.py
@@ -36,5 +40,14 @@ selector:
 	${PYTHON} ./selector_pickler_over_pipe.py
 	${PYTHON} ./selector_pickler_over_tcp.py
 
+poller:
+	${PYTHON} ./poller.py
+	${PYTHON} ./poller_pipe.py
+	${PYTHON} ./poller_benchmark.py
+
+loop:
+	${PYTHON} ./loop.py
+	${PYTHON} ./loop_asyncio.py
+
 
 # end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the throughput of the {pickler} and the {framer} for payloads of increasing size
+"""
+
+
+# externals
+import pickle
+
+
+def measure(marshaler, wrap, size, rounds):
+    """
+    Time {rounds} transfers of a payload of {size} bytes, wrapped by {wrap}, to a child process
+    through {marshaler}; return the throughput in bytes per second
+    """
+    # externals
+    import os
+    import time
+    # access the package
+    import pyre.ipc
+
+    # make a pair of pipes
+    parent, child = pyre.ipc.pipe()
+    # fork
+    pid = os.fork()
+
+    # in the child
+    if pid == 0:
+        # as long as there are payloads
+        while True:
+            # get one
+            payload = marshaler.recv(child)
+            # if it's the end-of-payloads marker
+            if payload is None:
+                # bail
+                break
+            # otherwise, acknowledge it
+            marshaler.send(len(payload), child)
+        # exit without running the parent's clean up
+        os._exit(0)
+
+    # make the payload
+    payload = wrap(bytearray(size))
+    # start the clock
+    start = time.perf_counter()
+    # for each round
+    for _ in range(rounds):
+        # send the payload
+        marshaler.send(payload, parent)
+        # and wait for the acknowledgment
+        assert marshaler.recv(parent) == size
+    # stop the clock
+    elapsed = time.perf_counter() - start
+
+    # tell the child we are done
+    marshaler.send(None, parent)
+    # wait for it to exit
+    os.waitpid(pid, 0)
+    # clean up
+    parent.close()
+    child.close()
+
+    # return the throughput
+    return size * rounds / elapsed
+
+
+def test(largest=2**24, volume=2**26):
+    """
+    Compare the throughput of the {pickler} and the {framer} for payloads from 1 KB up to
+    {largest} bytes; each measurement moves about {volume} bytes
+    """
+    # access the package
+    import pyre.ipc
+
+    # make the marshalers
+    pickler = pyre.ipc.newPickler()
+    framer = pyre.ipc.newFramer()
+
+    # make a pile for the results
+    results = []
+    # the payload size
+    size = 2**10
+    # go through the sizes
+    while size <= largest:
+        # figure out how many rounds to run
+        rounds = max(1, volume // size)
+        # time the pickler with payloads that are copied into the message
+        slow = measure(pickler, wrap=bytes, size=size, rounds=rounds)
+        # and the framer with payloads that are shipped out of band
+        fast = measure(framer, wrap=pickle.PickleBuffer, size=size, rounds=rounds)
+        # record
+        results.append((size, slow, fast))
+        # and move on to the next size
+        size *= 4
+
+    # all done
+    return results
+
+
+# main
+if __name__ == "__main__":
+    # externals
+    import sys
+    # the full range of payloads goes up to 1 GB; it takes a while and a lot of memory
+    largest = 2**30 if "--full" in sys.argv else 2**24
+    # run the benchmark
+    results = test(largest=largest)
+    # show me
+    print("throughput in MB/s:")
+    print(f"  {'payload':>10} {'pickler':>10} {'framer':>10}")
+    # go through the results
+    for size, slow, fast in results:
+        # and print each one
+        print(f"  {size:>10} {slow/2**20:>10.1f} {fast/2**20:>10.1f}")
+
+
+# end of file
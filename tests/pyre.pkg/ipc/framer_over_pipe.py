@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Build two processes that exchange objects with out-of-band buffers over a pair of pipes
+"""
+
+
+def test():
+    # externals
+    import os
+    # access the package
+    import pyre.ipc
+
+    # make a marshaler
+    m = pyre.ipc.newFramer()
+    # and a pair of pipes
+    parent, child = pyre.ipc.pipe()
+
+    # fork
+    pid = os.fork()
+    # in the parent process
+    if pid > 0:
+        # invoke the parent behavior
+        onParent(marshaler=m, pipe=parent)
+        # wait for the child to finish
+        _, status = os.waitpid(pid, 0)
+        # check it exited cleanly
+        assert status == 0
+        # all done
+        return
+    # in the child
+    try:
+        # invoke the child behavior
+        onChild(marshaler=m, pipe=child)
+    # if anything went wrong
+    except BaseException:
+        # let the parent know
+        os._exit(1)
+    # otherwise, exit without running the parent's clean up
+    os._exit(0)
+
+
+# the messages
+import pickle
+# a small one
+hello = "hello"
+# one with a buffer that is much larger than the pipe capacity
+large = bytearray(b"pyre" * (4*1024*1024))
+# and one with more buffers than fit in a single scatter/gather call
+many = [ bytearray([n % 256]) * (n % 7 + 1) for n in range(5000) ]
+
+
+def onParent(marshaler, pipe):
+    """Send some messages and check that they come back intact"""
+    # send a small message
+    marshaler.send(hello, pipe)
+    # check the response
+    assert marshaler.recv(pipe) == hello
+
+    # send the large buffer
+    marshaler.send(("large", pickle.PickleBuffer(large)), pipe)
+    # get the response
+    tag, buffer = marshaler.recv(pipe)
+    # it comes back as a freshly allocated buffer
+    assert tag == "large" and type(buffer) is bytearray and buffer == large
+
+    # send the many small ones out of band
+    marshaler.threshold = 0
+    marshaler.send([ pickle.PickleBuffer(buffer) for buffer in many ], pipe)
+    # and check that they come back intact
+    assert marshaler.recv(pipe) == many
+
+    # all done
+    return
+
+
+def onChild(marshaler, pipe):
+    """Echo the messages back"""
+    # get the small message
+    message = marshaler.recv(pipe)
+    # and send it back
+    marshaler.send(message, pipe)
+    # get the large one
+    tag, buffer = marshaler.recv(pipe)
+    # and send it back, out of band again
+    marshaler.send((tag, pickle.PickleBuffer(buffer)), pipe)
+    # get the many small ones
+    buffers = marshaler.recv(pipe)
+    # and send them back, out of band as well
+    marshaler.threshold = 0
+    marshaler.send([ pickle.PickleBuffer(buffer) for buffer in buffers ], pipe)
+    # and return
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
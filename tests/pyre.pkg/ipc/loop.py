@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise the asyncio dispatcher outside a running loop: select it by configuration, and watch
+over a pipe and a few alarms
+"""
+
+
+def test():
+    # externals
+    import os
+    import time
+    # access the package
+    import pyre.ipc
+    # the class record
+    from pyre.ipc.Loop import Loop
+    # get the units of time
+    from pyre.units.SI import second
+
+    # declare a component with a dispatcher
+    class server(pyre.component, family="tests.ipc.server"):
+        """a component with a dispatcher"""
+        dispatcher = pyre.ipc.dispatcher()
+
+    # instantiate it
+    s = server(name="server")
+    # select the loop
+    s.dispatcher = "loop"
+    # verify
+    assert isinstance(s.dispatcher, Loop)
+    # get the dispatcher
+    d = s.dispatcher
+
+    # build a pair of pipes
+    parent, child = pyre.ipc.pipe()
+    # the messages
+    messages = [ "hello", "world", "bye" ]
+    # what we received
+    received = []
+    # the alarms that went off
+    alarms = []
+
+    # write-ready handler
+    def send(channel, **kwds):
+        # write the next message
+        os.write(channel.outfd, messages[len(received)].encode())
+        # register the reader
+        d.whenReadReady(channel=child, call=receive)
+        # and don't reschedule; the reader will
+        return False
+
+    # read-ready handler
+    def receive(channel, **kwds):
+        # read the message
+        received.append(os.read(channel.infd, 1024).decode())
+        # if there are more messages
+        if len(received) < len(messages):
+            # schedule the next one
+            d.whenWriteReady(channel=parent, call=send)
+        # and don't reschedule
+        return False
+
+    # alarm handler
+    def ring(timestamp):
+        # record
+        alarms.append(timestamp)
+        # reschedule a couple of times
+        return 0.01*second if len(alarms) < 3 else None
+
+    # get things going
+    d.whenWriteReady(channel=parent, call=send)
+    d.alarm(interval=0.01*second, call=ring)
+    # and schedule an alarm that gets cancelled
+    d.cancel(d.alarm(interval=0.02*second, call=ring))
+    # watch; this returns when there are no more registered handlers or alarms
+    d.watch()
+
+    # verify that the messages made it
+    assert received == messages
+    # that the alarms went off
+    assert len(alarms) == 3
+    # and that the loop forgot about the descriptors
+    assert not d._registry
+
+    # do it again; the loop is reused
+    received.clear()
+    d.whenWriteReady(channel=parent, call=send)
+    d.watch()
+    # verify
+    assert received == messages
+
+    # schedule an alarm for much later
+    alarm = d.alarm(interval=10*second, call=ring)
+    # and a handler that cancels it
+    d.whenWriteReady(channel=parent, call=lambda channel: d.cancel(alarm))
+    # watch, and time it
+    start = time.monotonic()
+    d.watch()
+    # verify that the loop noticed it had nothing left to do as soon as the alarm was cancelled
+    assert time.monotonic() - start < 1
+    assert d._timer is None
+
+    # all done
+    return d
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
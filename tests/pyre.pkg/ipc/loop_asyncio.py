@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Share an asyncio event loop between the asyncio dispatcher and coroutines that use the
+awaitable channel and marshaler interface
+"""
+
+
+def test():
+    # externals
+    import asyncio
+    # access the package
+    import pyre.ipc
+    # get the units of time
+    from pyre.units.SI import second
+
+    # make a dispatcher and a marshaler
+    d = pyre.ipc.newLoop()
+    m = pyre.ipc.newPickler()
+    # build two pairs of pipes: one for the dispatcher
+    parent, child = pyre.ipc.pipe()
+    # and one for the coroutines
+    upstream, downstream = pyre.ipc.pipe()
+
+    # the objects to send; large enough to overflow the pipe, which must not block the loop
+    items = [ { "index": n, "payload": "x" * 1024 * n } for n in range(100) ]
+    # and the ones that go through the dispatcher, whose handlers use the blocking interface
+    notes = [ { "index": n } for n in range(100) ]
+    # what the handlers received
+    received = []
+    # what the coroutines received
+    collected = []
+
+    # the handler that receives from the dispatcher pipe
+    def receive(channel, **kwds):
+        # get the item and save it
+        received.append(m.recv(channel))
+        # don't reschedule; the next send will
+        return False
+
+    # the handler that sends over the dispatcher pipe
+    def send(channel, **kwds):
+        # send the next item
+        m.send(item=notes[len(received)], channel=channel)
+        # and wait for it to arrive
+        d.whenReadReady(channel=child, call=receive)
+        # don't reschedule
+        return False
+
+    # the alarm handler that drives the dispatcher pipe
+    def ring(timestamp):
+        # if the previous item has arrived
+        if not d._registry:
+            # send one more
+            d.whenWriteReady(channel=parent, call=send)
+        # and reschedule until all items have been sent
+        return 0.001*second if len(received) < len(notes)-1 else None
+
+    # the coroutine producer
+    async def produce():
+        # go through the items
+        for item in items:
+            # send them
+            await m.sendAsync(item=item, channel=upstream)
+            # and yield to others
+            await asyncio.sleep(0)
+
+    # the coroutine consumer
+    async def consume():
+        # get all items
+        while len(collected) < len(items):
+            # get one and save it
+            collected.append(await m.recvAsync(channel=downstream))
+
+    # the main coroutine
+    async def main():
+        # start the pyre alarm
+        d.alarm(interval=0*second, call=ring)
+        # and run everything concurrently on the same loop
+        await asyncio.gather(d.serve(), produce(), consume())
+        # watching from within a running loop is an error
+        try:
+            # try it
+            d.watch()
+            # and complain if it succeeded
+            assert False, "unreachable"
+        # if it failed as expected
+        except RuntimeError:
+            # no problem
+            pass
+
+    # run it
+    asyncio.run(main())
+
+    # verify that both sides got everything
+    assert received == notes
+    assert collected == items
+    # and that the dispatcher is done
+    assert not d._registry
+
+    # all done
+    return d
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
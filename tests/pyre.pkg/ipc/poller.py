@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Sanity check: verify that the poller factory is accessible and can be picked by configuration
+"""
+
+
+def test():
+    # access the package
+    import pyre.ipc
+    # the poller foundry is accessible
+    from pyre.ipc import poller
+    # and so is the class record
+    from pyre.ipc.Poller import Poller
+
+    # declare a component with a dispatcher
+    class server(pyre.component, family="tests.ipc.server"):
+        """a component with a dispatcher"""
+        dispatcher = pyre.ipc.dispatcher()
+
+    # instantiate it
+    s = server(name="server")
+    # select the poller
+    s.dispatcher = "poller"
+    # verify
+    assert isinstance(s.dispatcher, Poller)
+
+    # all done
+    return s
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
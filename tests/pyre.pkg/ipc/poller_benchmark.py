@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the cost of a wake up of a dispatcher that watches many idle and a few active channels
+"""
+
+
+def measure(dispatcher, idle, active, rounds):
+    """
+    Register {idle} channels that never have anything to say and {active} pipes that keep
+    talking to themselves, and time {rounds} wake ups of {dispatcher}
+    """
+    # externals
+    import os
+    import time
+    import socket
+    # access the package
+    import pyre.ipc
+    from pyre.ipc.Socket import Socket
+
+    # a handler for the idle channels; never called
+    def ignore(channel, **kwds):
+        # complain
+        assert False, "unreachable"
+
+    # make the idle channels: datagram sockets that no one sends anything to
+    quiet = [ Socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(idle) ]
+    # go through them
+    for channel in quiet:
+        # bind them to a local address
+        channel.bind(("127.0.0.1", 0))
+        # and watch them
+        dispatcher.whenReadReady(channel=channel, call=ignore)
+
+    # the number of messages received
+    received = 0
+    # the number of messages we are waiting for
+    expected = active * rounds
+    # a handler for the active channels
+    def bounce(channel, **kwds):
+        # get the counter
+        nonlocal received
+        # read the message
+        os.read(channel.infd, 1)
+        # count it
+        received += 1
+        # if we are done
+        if received >= expected:
+            # stop watching
+            dispatcher.stop()
+        # otherwise, send another message
+        os.write(channel.outfd, b"x")
+        # and stay registered
+        return True
+
+    # make the active channels: pipes whose output is connected to their own input, so they
+    # can talk to themselves
+    pipes = [ pyre.ipc.pipe(descriptors=os.pipe()) for _ in range(active) ]
+    # go through them
+    for channel in pipes:
+        # watch them
+        dispatcher.whenReadReady(channel=channel, call=bounce)
+        # and prime the pump by sending a message
+        os.write(channel.outfd, b"x")
+
+    # start the clock
+    start = time.perf_counter()
+    # watch
+    dispatcher.watch()
+    # stop the clock
+    elapsed = time.perf_counter() - start
+
+    # clean up
+    for channel in quiet: channel.close()
+    for channel in pipes: channel.close()
+
+    # return the time per wake up
+    return elapsed / rounds
+
+
+def test(idle=10000, active=100, rounds=100):
+    """
+    Compare the cost of a wake up of the {poller} and the {selector}
+    """
+    # externals
+    import resource
+    # access the package
+    import pyre.ipc
+
+    # get the limits on the number of open files
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # we need a descriptor per idle channel, two per active one, and some breathing room
+    needed = idle + 2*active + 64
+    # if the soft limit is too low
+    if soft < needed:
+        # raise it as high as we are allowed
+        soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    # if it's still not enough, scale back the number of idle channels
+    idle = min(idle, soft - 2*active - 64)
+
+    # time the poller
+    poller = measure(pyre.ipc.newPoller(), idle=idle, active=active, rounds=rounds)
+    # the selector can't watch descriptors past {FD_SETSIZE}, so give it a smaller load
+    small = 1024 - 2*active - 64
+    # and time it
+    selector = measure(pyre.ipc.newSelector(), idle=small, active=active, rounds=rounds)
+
+    # all done
+    return (idle, poller), (small, selector)
+
+
+# main
+if __name__ == "__main__":
+    # run the benchmark
+    (idle, poller), (small, selector) = test()
+    # show me
+    print("time per wake up with 100 active channels:")
+    print(f"    poller: {1e3*poller:8.3f} ms with {idle:5} idle channels")
+    print(f"  selector: {1e3*selector:8.3f} ms with {small:5} idle channels")
+
+
+# end of file
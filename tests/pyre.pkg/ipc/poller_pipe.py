@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise a poller watching over the two ends of a pipe
+"""
+
+
+def test():
+    # externals
+    import os
+    import types
+    # access the package
+    import pyre.ipc
+    # instantiate a poller
+    p = pyre.ipc.newPoller()
+    # build a pair of pipes
+    parent, child = pyre.ipc.pipe()
+
+    # the messages
+    messages = [ "hello", "world", "bye" ]
+    # what we received
+    received = []
+
+    # write-ready handler
+    def send(channel, **kwds):
+        # write the next message
+        os.write(channel.outfd, messages[len(received)].encode())
+        # register the reader
+        p.whenReadReady(channel=child, call=receive)
+        # and don't reschedule; the reader will
+        return False
+
+    # read-ready handler
+    def receive(channel, **kwds):
+        # read the message
+        received.append(os.read(channel.infd, 1024).decode())
+        # if there are more messages
+        if len(received) < len(messages):
+            # schedule the next one
+            p.whenWriteReady(channel=parent, call=send)
+        # and don't reschedule
+        return False
+
+    # get things going
+    p.whenWriteReady(channel=parent, call=send)
+    # watch; this returns when there are no more registered handlers
+    p.watch()
+
+    # verify that the messages made it
+    assert received == messages
+    # and that the poller forgot about the descriptors
+    assert not p._registry
+
+    # make a pipe
+    reader, fd = os.pipe()
+    # and a channel that reads and writes through one end of it
+    channel = types.SimpleNamespace(inbound=fd, outbound=fd)
+    # a write handler that closes the descriptor without telling the poller
+    def close(channel, **kwds):
+        # close it
+        os.close(channel.outbound)
+        # and don't reschedule
+        return False
+    # register it
+    p.whenWriteReady(channel=channel, call=close)
+    # along with an exception handler that keeps the descriptor registered
+    p.whenException(channel=channel, call=lambda channel, **kwds: True)
+    # watch; the closed descriptor should be dropped rather than bring the poller down
+    p.watch()
+    # verify
+    assert not p._registry
+    # clean up
+    os.close(reader)
+
+    # all done
+    return p
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
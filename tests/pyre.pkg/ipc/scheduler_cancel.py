@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that alarms can be cancelled through the handles returned by the scheduler
+"""
+
+
+def test():
+    # access the package
+    import pyre.ipc
+    # instantiate a scheduler
+    s = pyre.ipc.newScheduler()
+
+    # get select
+    import select
+    # get the units of time
+    from pyre.units.SI import second
+
+    # the log of raised alarms
+    log = []
+    # build a handler factory
+    def handler(name, repeat=0):
+        # the handler
+        def raised(timestamp):
+            # record the event
+            log.append(name)
+            # reschedule a few times
+            return 0.01*second if log.count(name) <= repeat else None
+        # all done
+        return raised
+
+    # setup some alarms
+    first = s.alarm(interval=0*second, call=handler("first"))
+    second_ = s.alarm(interval=0.02*second, call=handler("second"))
+    third = s.alarm(interval=0.01*second, call=handler("third", repeat=5))
+    # cancel one of them
+    s.cancel(second_)
+    # cancelling twice is harmless
+    s.cancel(second_)
+
+    # build a handler that cancels the periodic alarm after a few invocations
+    def stopper(timestamp):
+        # record the event
+        log.append("stopper")
+        # stop the periodic alarm, through the handle it had originally
+        s.cancel(third)
+        # and don't reschedule
+        return
+    # schedule it
+    s.alarm(interval=0.035*second, call=stopper)
+
+    # until there are no more alarms
+    while 1:
+        # get the timeout
+        timeout = s.poll()
+        # if there are no more alarms scheduled
+        if timeout is None:
+            # bail out
+            break
+        # otherwise, go to sleep
+        select.select([], [], [], timeout)
+        # raise any overdue alarms
+        s.awaken()
+
+    # verify that the cancelled alarm never fired
+    assert "second" not in log
+    # that the first fired once
+    assert log.count("first") == 1
+    # that the periodic alarm was stopped before running its course
+    assert 1 <= log.count("third") < 6
+    # and that nothing fired after the stopper
+    assert log[-1] == "stopper"
+    # and that the heap is empty
+    assert len(s._alarms) == 0
+    # cancelling an alarm that has already been raised
+    s.cancel(first)
+    # doesn't count against the heap
+    assert s._cancelled == 0
+
+    # schedule a couple of alarms that come due together, with the first cancelling the second
+    later = s.alarm(interval=0*second, call=lambda timestamp: s.cancel(sooner))
+    sooner = s.alarm(interval=0*second, call=handler("sooner"))
+    # and a few that are not due for a while
+    pending = [ s.alarm(interval=10*second, call=handler(n)) for n in range(3) ]
+    # raise the overdue ones
+    s.awaken()
+    # verify that the second one was cancelled before it went off
+    assert "sooner" not in log
+    # without counting against the alarms left on the heap, which would trigger a compaction
+    assert s._cancelled == 0
+    assert len(s._alarms) == len(pending)
+    # now cancel the rest
+    for alarm in pending: s.cancel(alarm)
+    # and verify that the heap was compacted
+    assert len(s._alarms) == 0 and s._cancelled == 0
+
+    # now, coalesce alarms into ticks
+    s.resolution = 0.05*second
+    # alarms that come due within the same tick share their due time
+    assert s.due(time=100.001, interval=0*second) == s.due(time=100.004, interval=0*second)
+    # which is never earlier than requested
+    assert s.due(time=100.001, interval=0*second) >= 100.001
+    # but alarms in different ticks don't
+    assert s.due(time=100.001, interval=0*second) < s.due(time=100.001, interval=0.05*second)
+
+    # schedule a few alarms
+    handles = [ s.alarm(interval=n*0.001*second, call=handler(n)) for n in range(5) ]
+    # verify their due times are on tick boundaries
+    assert all(abs(round(alarm.time/0.05)*0.05 - alarm.time) < 1e-6 for alarm in handles)
+    # clear the log
+    log.clear()
+    # until there are no more alarms
+    while 1:
+        # get the timeout
+        timeout = s.poll()
+        # if there are no more alarms scheduled
+        if timeout is None:
+            # bail out
+            break
+        # otherwise, go to sleep
+        select.select([], [], [], timeout)
+        # raise any overdue alarms
+        s.awaken()
+    # verify they all went off, in the order they were scheduled
+    assert log == list(range(5))
+
+    # all done
+    return s
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Build two processes that exchange large buffers through shared memory
+"""
+
+
+def test():
+    # externals
+    import os
+    # access the package
+    import pyre.ipc
+
+    # make a marshaler
+    m = pyre.ipc.newShared()
+    # and a pair of pipes
+    parent, child = pyre.ipc.pipe()
+
+    # fork
+    pid = os.fork()
+    # in the parent process
+    if pid > 0:
+        # invoke the parent behavior
+        onParent(marshaler=m, pipe=parent)
+        # wait for the child to finish
+        _, status = os.waitpid(pid, 0)
+        # check it exited cleanly
+        assert status == 0
+        # all done
+        return
+    # in the child
+    try:
+        # invoke the child behavior
+        onChild(marshaler=m, pipe=child)
+    # if anything went wrong
+    except BaseException:
+        # let the parent know
+        os._exit(1)
+    # otherwise, exit without running the parent's clean up
+    os._exit(0)
+
+
+# the messages
+import pickle
+hello = bytearray(b"hello" * 100000)
+goodbye = bytearray(b"goodbye" * 100000)
+
+
+def onParent(marshaler, pipe):
+    """Send a large buffer along with some small data and wait for the response"""
+    # send a message
+    marshaler.send(("hello", pickle.PickleBuffer(hello)), pipe)
+    # get the response
+    tag, response = marshaler.recv(pipe)
+    # check it
+    assert tag == "goodbye"
+    # the buffer was delivered as a view of a shared memory segment
+    assert isinstance(response, memoryview)
+    # with the correct contents
+    assert response == goodbye
+    # the segment can't be reclaimed while the view is alive
+    marshaler.release()
+    assert len(marshaler._segments) == 1
+    # but once it's gone
+    response.release()
+    # it can
+    marshaler.release()
+    assert len(marshaler._segments) == 0
+    # and return
+    return
+
+
+def onChild(marshaler, pipe):
+    """Wait for a message and send a response"""
+    # get the message
+    tag, message = marshaler.recv(pipe)
+    # check it
+    assert tag == "hello"
+    assert message == hello
+    # send the response
+    marshaler.send(("goodbye", pickle.PickleBuffer(goodbye)), pipe)
+    # and return
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -22,7 +22,14 @@ nodes:
 	${PYTHON} ./node_signals.py
 
 teams:
+	${PYTHON} ./workplan.py
 	${PYTHON} ./pool.py
 	${PYTHON} ./pool.py --tasks=4 --team.size=2
+	${PYTHON} ./pool.py --tasks=20 --team.size=3 --team.prefetch=2 --team.chunk=3
+	${PYTHON} ./pool_map.py
+	${PYTHON} ./pool_retry.py
+	${PYTHON} ./pool_shared.py
+	${PYTHON} ./pool_remote.py
+	${PYTHON} ./pool_supervision.py
 
 # end of file
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise a pool that sends batches of tasks to its crew members and streams results back
+"""
+
+
+# support
+import pyre
+
+
+# my task
+class Square(pyre.nexus.task):
+    """
+    A small task that computes the square of a number
+    """
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # the unlucky number damages the worker
+        if self.value == 13:
+            # by failing badly
+            raise ValueError("unlucky")
+        # otherwise, compute the square
+        return self.value**2
+
+    # meta-methods
+    def __init__(self, value, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my value
+        self.value = value
+        # all done
+        return
+
+
+def test():
+    # get the pool
+    from pyre.nexus.Pool import Pool
+    # make one
+    team = Pool(name="tests.nexus.pool")
+    # configure it
+    team.size = 3
+    team.prefetch = 4
+    team.chunk = 8
+
+    # make some tasks
+    tasks = [ Square(value=n) for n in range(200) if n != 13 ]
+    # run them and collect the results
+    results = list(team.map(tasks))
+    # verify we got them all
+    assert sorted(results) == [ task.value**2 for task in tasks ]
+    # and that the workplan is empty
+    assert len(team.workplan) == 0
+    assert not team.futures
+
+    # now post a task that aborts, along with some more work
+    unlucky = team.post(task=Square(value=13))
+    values = [ n for n in range(50) if n != 13 ]
+    futures = [ team.post(task=Square(value=n)) for n in values ]
+    # run until everything is done
+    team.run()
+    # verify that the unlucky task reported its error
+    assert isinstance(unlucky.exception(), ValueError)
+    # and the rest of the tasks were completed, possibly by another crew member
+    assert [ future.result() for future in futures ] == [ n**2 for n in values ]
+
+    # tasks that appear more than once are executed once, but their results are not lost
+    twice = Square(value=7)
+    results = list(team.map([ twice, Square(value=2), twice ]))
+    # verify
+    assert sorted(results) == [ 4, 49, 49 ]
+
+    # a team that can't recruit anybody
+    team.size = 0
+    # can't complete its tasks
+    stranded = [ Square(value=n) for n in range(3) ]
+    # so
+    try:
+        # mapping them
+        list(team.map(stranded))
+        # should fail
+        assert False, "unreachable"
+    # with an error
+    except team.IncompleteError as error:
+        # that names the unfinished tasks
+        assert error.tasks == tuple(stranded)
+
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise a pool whose crew members connect over TCP, using local processes that stand in for
+workers on remote hosts
+"""
+
+
+# support
+import pyre
+
+
+# my task
+class Square(pyre.nexus.task):
+    """
+    A task that computes the square of a number, and can be asked to take down its worker or
+    stall the first time it is attempted
+    """
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # if i'm supposed to misbehave and this is my first attempt
+        if self.mishap and not self.marker.exists():
+            # leave a note
+            self.marker.write_text(self.mishap)
+            # if i'm supposed to take down my worker
+            if self.mishap == "crash":
+                # exit without any notice
+                import os
+                os._exit(1)
+            # otherwise, go silent for a while
+            import time
+            time.sleep(1)
+        # compute the square
+        return self.value**2
+
+    # meta-methods
+    def __init__(self, value, scratch, mishap=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.value = value
+        self.mishap = mishap
+        self.marker = scratch / str(value)
+        # all done
+        return
+
+
+def test():
+    # externals
+    import os, pathlib, shutil, socket, tempfile, time
+    # get the pool
+    from pyre.nexus.Pool import Pool
+    # and the recruiter
+    from pyre.nexus.Remote import Remote
+    # get the units of time
+    from pyre.units.SI import second
+
+    # make a scratch area for the tasks
+    scratch = pathlib.Path(tempfile.mkdtemp())
+
+    # make a pool
+    team = Pool(name="tests.nexus.pool")
+    # that launches local workers that dial in
+    team.recruiter = Remote(name="tests.nexus.remote")
+    # configure it
+    team.size = 3
+    team.prefetch = 2
+    team.chunk = 4
+    team.recruiter.heartbeat = 0.05*second
+    team.recruiter.timeout = 0.5*second
+
+    # make some tasks
+    tasks = [ Square(value=n, scratch=scratch) for n in range(50) ]
+    # run them and collect the results
+    results = list(team.map(tasks))
+    # verify we got them all
+    assert sorted(results) == [ n**2 for n in range(50) ]
+    # and that the team wrapped up
+    assert not team.active and team.recruiter.port is None and not team.recruiter.launched
+
+    # now add a task that takes down its worker, and one that goes silent for too long
+    values = range(50, 80)
+    tasks = [ Square(value=n, scratch=scratch) for n in values ]
+    tasks[3].mishap = "crash"
+    tasks[17].mishap = "stall"
+    # run them
+    results = list(team.map(tasks))
+    # verify that the tasks of the lost crew members were completed by their replacements
+    assert sorted(results) == [ n**2 for n in values ]
+    # and that the mishaps did happen
+    assert (scratch / "53").read_text() == "crash"
+    assert (scratch / "67").read_text() == "stall"
+
+    # make a local process that won't exit when the team is done
+    stuck = os.fork()
+    # in the child
+    if stuck == 0:
+        # go to sleep for much longer than the test takes
+        time.sleep(60)
+        # and exit without running any of the parent's clean up
+        os._exit(0)
+    # in the parent, pretend it's one of the workers of the team
+    team.recruiter.launched.add(stuck)
+    # post some tasks, and time it
+    start = time.monotonic()
+    futures = [ team.post(task=Square(value=n, scratch=scratch)) for n in range(80, 90) ]
+    # recruiting doesn't wait for the launched workers to dial in
+    assert time.monotonic() - start < 1
+    # but it launched enough of them, some of which may have dialed in already
+    assert len(team.registered) + team.recruiter.expected == team.size
+    # run until everything is done
+    team.run()
+    # verify we got the results
+    assert [ future.result() for future in futures ] == [ n**2 for n in range(80, 90) ]
+    # that the stuck process was killed and reaped, rather than waited for indefinitely
+    assert not team.recruiter.launched
+    assert time.monotonic() - start < 10
+    # and that the team can still launch workers afterwards
+    assert list(team.map([ Square(value=90, scratch=scratch) ])) == [ 8100 ]
+
+    # find an available port
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    host, port = probe.getsockname()
+    probe.close()
+    # make a recruiter that waits for workers to dial in
+    recruiter = Remote(name="tests.nexus.dialin")
+    recruiter.launch = False
+    recruiter.address = "{}:{}".format(host, port)
+    recruiter.heartbeat = 0.05*second
+    # start a couple of workers before the team is listening
+    workers = []
+    for _ in range(2):
+        # clone the current process
+        pid = os.fork()
+        # in the worker
+        if pid == 0:
+            # join the team
+            status = recruiter.enlist(address=recruiter.address)
+            # and exit without running any of the parent's clean up
+            os._exit(status or 0)
+        # in the parent, remember the worker
+        workers.append(pid)
+
+    # make another pool
+    team = Pool(name="tests.nexus.pool.dialin")
+    team.recruiter = recruiter
+    team.size = 4
+    # open its port
+    recruiter.listen(team=team)
+    # and give the workers a chance to dial in, so that neither gets all the work
+    time.sleep(0.5)
+    # run some tasks
+    tasks = [ Square(value=n, scratch=scratch) for n in range(20) ]
+    results = list(team.map(tasks))
+    # verify we got them all
+    assert sorted(results) == [ n**2 for n in range(20) ]
+    # from the workers that dialed in
+    assert len(team.retired) == 2
+    # wait for them to exit
+    for pid in workers:
+        assert os.waitpid(pid, 0)[1] == 0
+
+    # clean up
+    shutil.rmtree(scratch)
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
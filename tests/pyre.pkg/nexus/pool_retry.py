@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that a pool retries tasks that fail temporarily, gives up on the ones that keep failing,
+and keeps track of the utilization of its crew members
+"""
+
+
+# support
+import pyre
+
+
+# my task
+class Flaky(pyre.nexus.task):
+    """
+    A task that fails temporarily a few times before succeeding
+    """
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # look for a marker in the scratch area
+        marker = self.scratch / str(self.value)
+        # count the attempts
+        attempts = len(marker.read_text()) if marker.exists() else 0
+        # record this one
+        marker.write_text("x" * (attempts + 1))
+        # if i haven't failed enough times yet
+        if attempts < self.failures:
+            # fail
+            raise self.RecoverableError("try again")
+        # otherwise, succeed
+        return self.value
+
+    # meta-methods
+    def __init__(self, value, failures, scratch, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.value = value
+        self.failures = failures
+        self.scratch = scratch
+        # all done
+        return
+
+
+def test():
+    # externals
+    import pathlib, shutil, tempfile
+    # get the pool
+    from pyre.nexus.Pool import Pool
+    # get the units of time
+    from pyre.units.SI import second
+
+    # make a scratch area for the tasks; not a context manager, since the crew members would
+    # remove it when they exit
+    scratch = pathlib.Path(tempfile.mkdtemp())
+    # make a pool
+    team = Pool(name="tests.nexus.pool")
+    # configure it
+    team.size = 2
+    team.workplan.retries = 2
+    team.workplan.backoff = 0.01*second
+
+    # make some tasks that succeed eventually
+    good = [ team.post(task=Flaky(value=n, failures=n%3, scratch=scratch)) for n in range(9) ]
+    # and one that never does
+    bad = team.post(task=Flaky(value=99, failures=10, scratch=scratch))
+    # run until everything is done
+    team.run()
+    # clean up
+    shutil.rmtree(scratch)
+
+    # verify that the good tasks completed
+    assert [ future.result() for future in good ] == list(range(9))
+    # and that the bad one gave up
+    assert isinstance(bad.exception(), pyre.nexus.task.RecoverableError)
+    assert len(team.workplan.dead) == 1
+
+    # get the crew statistics
+    statistics = team.statistics()
+    # verify there was one entry per crew member
+    assert len(statistics) == 2
+    # that they account for all completed tasks
+    assert sum(entry['completed'] for entry in statistics.values()) == 9
+    # and all failures: three from each task that failed twice, one from each task that failed
+    # once, and three from the task that never succeeded
+    assert sum(entry['failed'] for entry in statistics.values()) == 3*2 + 3*1 + 3
+    # and that the crew did some work
+    assert all(0 < entry['utilization'] <= 1 for entry in statistics.values())
+
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise a pool whose crew members exchange bulk data with the team through shared memory
+"""
+
+
+# externals
+import pickle
+# support
+import pyre
+
+
+# my task
+class Reverse(pyre.nexus.task):
+    """
+    A task that reverses a large buffer
+    """
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # the payload arrives as a view of a shared memory segment
+        assert isinstance(self.payload, memoryview)
+        # build the result
+        result = bytearray(self.payload[::-1])
+        # and ship it back out of band
+        return pickle.PickleBuffer(result)
+
+    # meta-methods
+    def __init__(self, payload, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my payload
+        self.payload = payload
+        # all done
+        return
+
+    # serialization
+    def __reduce_ex__(self, protocol):
+        # ship the payload out of band
+        return type(self), (pickle.PickleBuffer(self.payload),)
+
+
+def test():
+    # externals
+    import os
+    # get the pool
+    from pyre.nexus.Pool import Pool
+    # make one
+    team = Pool(name="tests.nexus.pool")
+    # configure it
+    team.size = 2
+    # and switch it to the shared memory marshaler
+    team.marshaler = pyre.ipc.newShared()
+
+    # make some payloads
+    payloads = [ bytearray(os.urandom(256*1024)) for _ in range(8) ]
+    # the tasks
+    tasks = [ Reverse(payload=payload) for payload in payloads ]
+    # run them and collect the results
+    results = [ bytes(result) for result in team.map(tasks) ]
+    # verify we got them all
+    assert sorted(results) == sorted(bytes(payload[::-1]) for payload in payloads)
+
+    # release the results
+    del results
+    # and reclaim the segments
+    team.marshaler.release()
+    # verify nothing is left behind
+    assert not team.marshaler._segments
+
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
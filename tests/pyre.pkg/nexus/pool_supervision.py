@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that a pool enforces time limits on its tasks, recovers from crew members that crash or
+hang, and replaces crew members that have done their share
+"""
+
+
+# support
+import pyre
+
+
+# my task
+class Chore(pyre.nexus.task):
+    """
+    A task that returns its value, after possibly misbehaving
+    """
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # externals
+        import os, time, signal
+        # if i'm supposed to run for too long
+        if self.mishap == "slow":
+            # do so
+            time.sleep(5)
+        # if i'm supposed to hang in a way that can't be interrupted
+        if self.mishap == "hang":
+            # block the timer signal
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+            # and do so
+            time.sleep(5)
+        # if i'm supposed to take down my worker, but only the first time around
+        if self.mishap == "crash" and not self.marker.exists():
+            # leave a note
+            self.marker.write_text("crash")
+            # and exit without any notice
+            os._exit(1)
+        # all done
+        return self.value
+
+    # meta-methods
+    def __init__(self, value, scratch, mishap=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.value = value
+        self.mishap = mishap
+        self.marker = scratch / str(value)
+        # all done
+        return
+
+
+def test():
+    # externals
+    import pathlib, shutil, tempfile
+    # get the pool
+    from pyre.nexus.Pool import Pool
+    # the exceptions
+    from pyre.nexus.exceptions import TimeoutError
+    # and the units of time
+    from pyre.units.SI import second
+
+    # make a scratch area for the tasks
+    scratch = pathlib.Path(tempfile.mkdtemp())
+
+    # make a pool
+    team = Pool(name="tests.nexus.pool")
+    # configure it
+    team.size = 2
+    team.timeout = 0.5*second
+    team.workplan.retries = 1
+    team.workplan.backoff = 0.01*second
+
+    # post a task that runs for too long
+    slow = team.post(task=Chore(value=0, scratch=scratch, mishap="slow"))
+    # one that hangs its worker
+    hang = team.post(task=Chore(value=1, scratch=scratch, mishap="hang"))
+    # one that crashes its worker
+    crash = team.post(task=Chore(value=2, scratch=scratch, mishap="crash"))
+    # and some well behaved ones
+    good = [ team.post(task=Chore(value=n, scratch=scratch)) for n in range(3, 20) ]
+    # run until everything is done
+    team.run()
+
+    # verify that the slow task was aborted by its crew member
+    assert isinstance(slow.exception(), TimeoutError)
+    # that the one that hung was given up on by the team
+    assert isinstance(hang.exception(), TimeoutError)
+    assert len(team.workplan.dead) == 1
+    # that the one that crashed was completed after its worker was replaced
+    assert crash.result() == 2
+    # and that the rest were completed
+    assert [ future.result() for future in good ] == list(range(3, 20))
+    # verify that the team is back to normal
+    assert not team.active and not team.registered
+    assert not team.recruiter.crews and not team.recruiter.exiting
+
+    # make another pool that replaces its crew members after a few tasks
+    team = Pool(name="tests.nexus.pool.quota")
+    team.size = 2
+    team.quota = 4
+    # run some tasks
+    results = list(team.map(Chore(value=n, scratch=scratch) for n in range(20)))
+    # verify we got them all
+    assert sorted(results) == list(range(20))
+    # and that no crew member went over its quota
+    statistics = team.statistics()
+    assert all(entry['completed'] <= 4 for entry in statistics.values())
+    assert len(statistics) >= 5
+
+    # make another pool whose crew members can't use any memory
+    team = Pool(name="tests.nexus.pool.memory")
+    team.size = 2
+    team.memory = 1
+    # run some tasks
+    results = list(team.map(Chore(value=n, scratch=scratch) for n in range(6)))
+    # verify we got them all
+    assert sorted(results) == list(range(6))
+    # and that every crew member was replaced after its first task
+    assert len(team.statistics()) == 6
+
+    # clean up
+    shutil.rmtree(scratch)
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
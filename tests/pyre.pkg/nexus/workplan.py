@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the default workplan respects priorities, affinities and retry limits
+"""
+
+
+def test():
+    # access the package
+    import pyre.nexus
+    # get the units of time
+    from pyre.units.SI import second
+
+    # a task
+    class Task(pyre.nexus.task):
+        """a task with a name, a priority and an affinity"""
+        def __init__(self, name, priority=0, affinity=None, **kwds):
+            super().__init__(**kwds)
+            self.name = name
+            self.priority = priority
+            self.affinity = affinity
+            return
+
+    # make a workplan
+    workplan = pyre.nexus.queue()(name="tests.nexus.workplan")
+    # verify it's the default
+    assert isinstance(workplan, pyre.nexus.workplan.pyre_default())
+
+    # make some tasks
+    a = Task(name="a")
+    b = Task(name="b", priority=10)
+    c = Task(name="c", affinity="x")
+    d = Task(name="d", affinity="x")
+    e = Task(name="e", priority=10, affinity="y")
+    f = Task(name="f", priority=10, affinity="x")
+    # add them
+    workplan.update(tasks=[a, b, c, d, e, f])
+    # adding a task twice is harmless
+    workplan.add(a)
+    # verify
+    assert len(workplan) == 6
+
+    # higher priorities go first, in the order they were added
+    assert workplan.pop() is b
+    # unless there is a task with the same priority and the right affinity
+    assert workplan.pop(affinity="x") is f
+    # which doesn't beat tasks with higher priority
+    assert workplan.pop(affinity="x") is e
+    # but wins over tasks with the same priority that were added earlier
+    assert workplan.pop(affinity="x") is c
+    # tasks with no affinity are handed out in order
+    assert workplan.pop() is a
+    # along with the rest
+    assert workplan.pop(affinity="z") is d
+    # and now the workplan is empty
+    assert len(workplan) == 0
+    # so popping from it
+    try:
+        # should fail
+        workplan.pop()
+        # so we shouldn't be here
+        assert False, "unreachable"
+    # with a key error
+    except KeyError:
+        # just like {set}
+        pass
+
+    # fill the workplan with tasks that have distinct affinities, and some that share them
+    tasks = [ Task(name=str(n), affinity=n if n % 2 else -(n % 10)) for n in range(1000) ]
+    workplan.update(tasks=tasks)
+    # drain it, mostly through the main queue
+    for n in range(1000):
+        workplan.pop(affinity=None if n % 3 else n % 7)
+    # verify that the workplan doesn't hold on to any of the tasks that were handed out
+    assert not workplan._affinities and not workplan._live and not workplan._queue
+
+    # configure the retry policy
+    workplan.retries = 2
+    workplan.backoff = 1*second
+    # the first retry waits for the backoff interval
+    assert workplan.retry(task=a) == 1*second
+    # and the task is deferred
+    assert workplan.deferred == 1
+    # until it resumes
+    workplan.resume(task=a)
+    assert workplan.deferred == 0 and a in workplan
+    # the wait doubles after each attempt
+    assert workplan.retry(task=a) == 2*second
+    workplan.resume(task=a)
+    # until the task runs out of retries
+    assert workplan.retry(task=a) is None
+    # and ends up in the dead pile
+    assert workplan.dead == [a]
+
+    # all done
+    return workplan
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -14,7 +14,7 @@ PROJECT = pyre
 
 all: test
 
-test: sanity simple complex csv
+test: sanity simple complex csv benchmarks
 
 sanity:
 	${PYTHON} ./sanity.py
@@ -32,6 +32,7 @@ simple-immutable:
 	${PYTHON} ./simple_immutable_kwds.py
 	${PYTHON} ./simple_immutable_conversions.py
 	${PYTHON} ./simple_immutable_validations.py
+	${PYTHON} ./simple_immutable_specialized.py
 
 simple-mutable:
 	${PYTHON} ./simple_mutable_data.py
@@ -66,5 +67,8 @@ csv:
 	${PYTHON} ./csv_read_complex.py
 	${PYTHON} ./csv_bad_source.py
 
+benchmarks:
+	${PYTHON} ./extractor_benchmark.py
+
 
 # end of file
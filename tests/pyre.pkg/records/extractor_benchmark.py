@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Compare the rate at which the generic and the specialized extraction strategies build simple
+immutable records from csv formatted data
+"""
+
+
+def measure(layout, lines, rounds):
+    """
+    Time building records of {layout} from {lines} of csv data, {rounds} times; return the
+    number of records per second
+    """
+    # externals
+    import io
+    import time
+    # access the package
+    import pyre.records
+
+    # make a reader
+    reader = pyre.records.csv()
+    # start the clock
+    start = time.perf_counter()
+    # for each round
+    for _ in range(rounds):
+        # build the records
+        records = tuple(reader.immutable(layout=layout, stream=io.StringIO(lines)))
+    # stop the clock
+    elapsed = time.perf_counter() - start
+    # make sure they came out right
+    assert records[7] == ("sku-7", 7, 3.5, 0.75, "crate")
+    # return the rate
+    return len(records) * rounds / elapsed
+
+
+def test(rows=10**4, rounds=5):
+    """
+    Build {rows} records, {rounds} times, with each strategy, and return their rates
+    """
+    # access the package
+    import pyre.records
+
+    # declare the layout
+    class item(pyre.records.record):
+        """
+        A sample record
+        """
+        # field declarations
+        sku = pyre.records.str()
+        count = pyre.records.int()
+        cost = pyre.records.float()
+        discount = pyre.records.float()
+        packaging = pyre.records.str()
+
+    # make a copy of the layout that uses the generic strategy
+    generic = type("generic", (item.pyre_immutableTuple,), {})
+    generic.pyre_extract = item.pyre_extractor()
+
+    # make some data
+    lines = "\n".join(
+        ["sku,count,cost,discount,packaging"] +
+        ["sku-{0},{0},{1},0.75,crate".format(index, index/2) for index in range(rows)])
+
+    # time the generic strategy
+    item.pyre_immutableTuple, specialized = generic, item.pyre_immutableTuple
+    slow = measure(layout=item, lines=lines, rounds=rounds)
+    # and the specialized one
+    item.pyre_immutableTuple = specialized
+    fast = measure(layout=item, lines=lines, rounds=rounds)
+
+    # all done
+    return slow, fast
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # externals
+    import sys
+    # the full benchmark builds a million records
+    rows = 10**6 if "--full" in sys.argv else 10**4
+    # run the benchmark
+    slow, fast = test(rows=rows)
+    # show me
+    print("records per second:")
+    print(f"  generic:     {slow:>12.0f}")
+    print(f"  specialized: {fast:>12.0f}")
+    print(f"  speedup:     {fast/slow:>12.1f}")
+
+
+# end of file
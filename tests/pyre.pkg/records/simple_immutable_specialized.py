@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the extraction strategy that is specialized to the layout of simple immutable
+records agrees with the generic one
+"""
+
+
+def test():
+    import pyre.records
+    import pyre.constraints
+
+    class item(pyre.records.record):
+        """
+        A sample record
+        """
+        # field declarations
+        sku = pyre.records.str()
+        count = pyre.records.int()
+        cost = pyre.records.float()
+        discount = pyre.records.float()
+        flag = pyre.records.bool()
+
+        # constraints
+        discount.validators = pyre.constraints.isLess(value=1)
+
+    # get the specialized strategy
+    specialized = item.pyre_immutableTuple.pyre_extract
+    # and make a generic one
+    generic = item.pyre_extractor()
+
+    # a variety of raw data, including values that need the full processing pipeline
+    rows = [
+        ("4013", "3", ".85", ".1", "true"),
+        ("4013", 3, .85, 0, True),
+        ("None", "none", " None ", "0", "no"),
+        (None, None, None, None, None),
+        ("kiwi", "2*3", "1/4", ".5", "yes"),
+        ("kiwi", 2.0, 3, ".5", False),
+        ]
+    # go through them
+    for row in rows:
+        # verify that the two strategies agree
+        assert specialized(record=item, source=iter(row)) == tuple(generic(item, iter(row)))
+
+    # check that the records are built correctly
+    record = item.pyre_immutable(data=("kiwi", "2*3", "1/4", ".5", "yes"))
+    assert record == ("kiwi", 6, .25, .5, True)
+    assert type(record.count) is int
+    # including the ones built from keywords
+    record = item.pyre_immutable(sku="kiwi", count="7", cost=2, discount=0, flag=False)
+    assert record == ("kiwi", 7, 2.0, 0.0, False)
+    assert type(record.cost) is float
+
+    # verify that bad values are still caught
+    try:
+        item.pyre_immutable(data=("kiwi", "many", "1", ".5", "yes"))
+        assert False
+    except pyre.records.int.CastingError:
+        pass
+    # and that the validators still run
+    try:
+        item.pyre_immutable(data=("kiwi", "1", "1", "2", "yes"))
+        assert False
+    except item.ConstraintViolationError as error:
+        assert error.value == 2
+
+    # the outcome of building a record, including the type of error, if any
+    def outcome(strategy, row):
+        # attempt to
+        try:
+            # extract the values
+            return tuple(strategy(item, iter(row)))
+        # if this fails
+        except Exception as error:
+            # report the type of error
+            return type(error)
+    # strings that {int} and {float} accept but python literals don't, and vice versa
+    numbers = ["010", "00", "-0", "+5", "1_0", " 7", "٣", "01.5", "010e1", ".5", "5.", "1e"]
+    # go through them
+    for number in numbers:
+        # make a row with the string in both numeric fields
+        row = ("kiwi", number, number, "0", "no")
+        # verify that the two strategies agree
+        assert outcome(specialized, row) == outcome(generic, row), number
+    # in particular, integers with leading zeros are rejected
+    assert outcome(specialized, ("kiwi", "010", "1", "0", "no")) is pyre.records.int.CastingError
+
+    # short data streams leave the trailing fields out, just like the generic strategy does
+    assert specialized(record=item, source=iter(("kiwi", "1"))) == ("kiwi", 1)
+
+    # all done
+    return item
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -30,6 +30,8 @@ sheets:
 	${PYTHON} ./sheet_columns.py
 	${PYTHON} ./sheet_index.py
 	${PYTHON} ./sheet_updates.py
+	${PYTHON} ./sheet_columnar.py
+	${PYTHON} ./sheet_columnar_footprint.py
 
 views:
 	${PYTHON} ./view.py
@@ -44,6 +46,7 @@ charts:
 	${PYTHON} ./chart_interval.py
 	${PYTHON} ./chart_filter.py
 	${PYTHON} ./chart_sales.py
+	${PYTHON} ./chart_columnar.py
 
 pivots:
 	${PYTHON} ./pivot.py
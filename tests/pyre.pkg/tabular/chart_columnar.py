@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that charts and reductions over columnar sheets agree with the ones over regular sheets
+"""
+
+
+def test():
+    # get the package
+    import pyre.tabular
+
+    # make a sheet
+    class sales(pyre.tabular.sheet):
+        """The transaction data"""
+        # layout
+        date = pyre.tabular.str()
+        time = pyre.tabular.str()
+        sku = pyre.tabular.str()
+        quantity = pyre.tabular.float()
+        discount = pyre.tabular.float()
+        sale = pyre.tabular.float()
+
+    # and a columnar version of it
+    class columns(sales, pyre.tabular.columnar):
+        """The transaction data, stored by column"""
+
+    # build a chart
+    class chart(pyre.tabular.chart, sheet=sales):
+        """
+        Aggregate the information in the {sales} table
+        """
+        sku = pyre.tabular.inferred(sales.sku)
+        date = pyre.tabular.inferred(sales.date)
+        quantity = pyre.tabular.interval(measure=sales.quantity, interval=(0,10), subdivisions=5)
+
+    # make a csv reader
+    csv = pyre.tabular.csv()
+    # populate the sheets
+    rows = sales(name="sales").pyre_immutable(csv.read(layout=sales, uri='sales.csv'))
+    cols = columns(name="sales").pyre_immutable(csv.read(layout=sales, uri='sales.csv'))
+    # check that they have the same contents
+    assert len(rows) == len(cols)
+    assert all(row == col for row, col in zip(rows, cols))
+
+    # build the charts
+    slow = chart(sheet=rows)
+    fast = chart(sheet=cols)
+    # check that the rows were binned the same way
+    assert slow.sku == fast.sku
+    assert slow.date == fast.date
+    assert tuple(slow.quantity) == tuple(fast.quantity)
+    assert slow.quantity.rejects == fast.quantity.rejects
+    # and that filtering agrees
+    selection = fast.pyre_filter(date="2010/11/01", sku="4000")
+    assert selection == slow.pyre_filter(date="2010/11/01", sku="4000") == {0, 5, 6}
+
+    # make some reductions
+    total = pyre.tabular.sum(sales.sale)
+    mean = pyre.tabular.average(sales.quantity)
+    least = pyre.tabular.minimum(sales.discount)
+    most = pyre.tabular.maximum(sales.sku)
+    # apply them to both sheets, over all rows and over the selection
+    for subset in (None, selection):
+        for reduction in (total, mean, least, most):
+            assert reduction(sheet=rows, rows=subset) == reduction(sheet=cols, rows=subset)
+    # check some of the values
+    assert abs(total(sheet=cols, rows=selection) - sum(cols[row].sale for row in selection)) < 1e-9
+    assert most(sheet=cols) == "4005"
+    # reductions over empty selections
+    assert mean(sheet=cols, rows=set()) is None
+
+    # and return the charts and the sheets
+    return fast, cols
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that columnar sheets store their data by column and hand out views of their rows that
+behave like records
+"""
+
+
+def test():
+    # get the package
+    import pyre.tabular
+
+    # make a sheet
+    class pricing(pyre.tabular.columnar):
+        """
+        The sheet layout
+        """
+        # layout
+        sku = pyre.tabular.str().primary()
+        description = pyre.tabular.str()
+        production = pyre.tabular.float()
+        shipping = pyre.tabular.float()
+        margin = pyre.tabular.float()
+        overhead = pyre.tabular.float()
+        units = pyre.tabular.int()
+        organic = pyre.tabular.bool()
+
+        msrp = (production*(1+margin/100) + shipping)*(1+overhead/100)
+
+    # our data set
+    data = [
+        ("4000", "tomatoes", "2.95", "5", ".2", "50", "10", "yes"),
+        ("4001", "peppers", "0.35", "15", ".1", "25", "20", "no"),
+        ("4002", "grapes", "1.65", "15", ".15", "15", "2**40", "yes"),
+        ("4003", "kiwis", "0.95", "7", ".15", "75", "5", "no"),
+        ("4004", "lemons", "0.50", "4", ".25", "50", "none", "no"),
+        ("4005", "oranges", "0.50", "4", ".25", "50", "2**70", "yes"),
+        ]
+    # make a sheet
+    p = pricing(name="vegetables").pyre_immutable(data)
+
+    # verify that the measures are stored by column
+    assert type(p.pyre_stores[0]) is pricing.pyre_dictionary
+    assert type(p.pyre_stores[2]) is pricing.pyre_vector
+    assert p.pyre_stores[2].data.typecode == "d"
+    assert p.pyre_stores[-2].codes.typecode == "B"
+    # except for the derivations
+    assert p.pyre_stores[-1] is None
+    # and that the integer column switched to a list when it encountered values that don't fit
+    assert type(p.pyre_stores[6].data) is list
+
+    # check the contents, along with the values of the derivations
+    assert len(p) == len(data)
+    assert p[1] == ("4001", "peppers", .35, 15, .1, 25, 20, False, p[1].msrp)
+    assert tuple(p.organic) == (True, False, True, False, False, True)
+    assert tuple(p.units) == (10, 20, 2**40, 5, None, 2**70)
+    assert [record.sku for record in p] == ["4000", "4001", "4002", "4003", "4004", "4005"]
+    assert p[-1].description == "oranges"
+    assert p[3][:2] == ("4003", "kiwis")
+    assert abs(p[3].msrp - 13.92) < .01
+    # and that the primary key index works
+    assert p.sku["4002"].description == "grapes"
+
+    # the rows were built by {pyre_immutable}, so they can't be modified
+    try:
+        p[3].production = 1.15
+        assert False
+    except TypeError:
+        pass
+
+    # make a modifiable one
+    m = pricing(name="vegetables").pyre_mutable(data)
+    # grab the kiwi record
+    kiwi = m[3]
+    # make small change in the production cost
+    kiwi.production = "1.15"
+    # check that the update is stored
+    assert m.pyre_stores[2][3] == 1.15
+    # and reflected in the msrp of kiwis
+    assert abs(kiwi.msrp - 14.26) < .01
+    # change a string
+    kiwi.description = "golden kiwis"
+    # check that the update is visible through other views
+    assert m[3].description == "golden kiwis"
+    # derivations can't be set
+    try:
+        kiwi.msrp = 0
+        assert False
+    except TypeError:
+        pass
+
+    # add a row
+    blank = m.pyre_new()
+    assert len(m) == len(data) + 1
+    assert blank == ("", "", 0, 0, 0, 0, 0, True, 0)
+    # fill it
+    blank.sku = "4006"
+    blank.production = 1
+    # and check
+    assert m[-1].sku == "4006"
+    assert m[-1].msrp == 1
+
+    # and return the sheets
+    return p, m
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
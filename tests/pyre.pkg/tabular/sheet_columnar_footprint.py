@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Compare the memory taken up by the rows of numeric sheets, when stored as records and when
+stored by column
+"""
+
+
+def measure(sheet, data):
+    """
+    Populate an instance of {sheet} with {data}; return the number of bytes it takes up per row
+    """
+    # externals
+    import gc
+    import tracemalloc
+
+    # clean up
+    gc.collect()
+    # start tracing
+    tracemalloc.start()
+    # populate the sheet
+    instance = sheet(name="footprint").pyre_immutable(data)
+    # measure
+    size, _ = tracemalloc.get_traced_memory()
+    # stop tracing
+    tracemalloc.stop()
+    # make sure it came out right
+    assert instance[7] == (7, 7, 3.5, 0.75, 14.0, 1.5)
+    # compute the footprint per row
+    return size / len(instance)
+
+
+def test(rows=10**4):
+    """
+    Measure the footprint of {rows} rows with each storage strategy
+    """
+    # access the package
+    import pyre.tabular
+
+    # declare the layout
+    class readings(pyre.tabular.sheet):
+        """
+        A numeric sheet
+        """
+        # layout
+        station = pyre.tabular.int()
+        sensor = pyre.tabular.int()
+        temperature = pyre.tabular.float()
+        humidity = pyre.tabular.float()
+        pressure = pyre.tabular.float()
+        wind = pyre.tabular.float()
+
+    # and a columnar version of it
+    class columns(readings, pyre.tabular.columnar):
+        """
+        The same sheet, stored by column
+        """
+
+    # make some data; use strings, just like a csv file would, so the records can't share the
+    # value objects with the data set
+    data = tuple(
+        tuple(map(str, (index, index, index/2, .75, 2.0*index, 1.5))) for index in range(rows))
+
+    # measure
+    records = measure(sheet=readings, data=data)
+    vectors = measure(sheet=columns, data=data)
+    # check that the columns are substantially smaller
+    assert records > 4 * vectors
+
+    # all done
+    return records, vectors
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the benchmark
+    records, vectors = test()
+    # show me
+    print("bytes per row:")
+    print(f"  records:  {records:>8.1f}")
+    print(f"  columnar: {vectors:>8.1f}")
+    print(f"  ratio:    {records/vectors:>8.1f}")
+
+
+# end of file
@@ -25,6 +25,7 @@ tracking:
 	${PYTHON} ./file.py
 	${PYTHON} ./fileregion.py
 	${PYTHON} ./script.py
+	${PYTHON} ./frame.py
 	${PYTHON} ./chain.py
 
 
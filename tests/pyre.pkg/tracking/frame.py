@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the frame locator returns the correct location tag
+"""
+
+
+def frame():
+    # get the package
+    import pyre.tracking
+    # make a locator that points to the next line
+    locator = pyre.tracking.here()
+    # check that the message is formatted correctly
+    assert str(locator) == "file={!r}, line=19, function='frame'".format(__file__)
+    # check that it can stand in for a script locator
+    assert locator.source == __file__
+    assert locator.line == 19
+    assert locator.function == "frame"
+
+    # frames get pickled as script locators
+    import pickle
+    clone = pickle.loads(pickle.dumps(locator))
+    # verify
+    assert isinstance(clone, pyre.tracking.script)
+    assert str(clone) == str(locator)
+
+    # all done
+    return locator
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    frame()
+
+
+# end of file
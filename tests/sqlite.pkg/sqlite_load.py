@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that bulk loads pull records in batches and commit each one in its own transaction
+"""
+
+
+import pyre.db
+
+
+class Measurement(pyre.db.table, id="measurements"):
+
+    id = pyre.db.int().primary()
+    id.doc = "the measurement id"
+
+    station = pyre.db.str()
+    station.doc = "the name of the station"
+
+    value = pyre.db.float()
+    value.doc = "the measured value"
+
+
+def measurements(count, fail=None):
+    """
+    Generate {count} measurements; raise an exception when asked for the one at {fail}
+    """
+    # make the records
+    for index in range(count):
+        # if this is the one that fails
+        if index == fail:
+            # complain
+            raise ValueError(index)
+        # otherwise, make a record
+        yield Measurement.pyre_immutable(
+            id=index, station="station {}".format(index % 7),
+            value=Measurement.null if index % 5 == 0 else index / 10)
+    # all done
+    return
+
+
+def test():
+    # build a database component that keeps its data in memory
+    db = pyre.db.sqlite(name="load").attach()
+    # create the table
+    db.createTable(Measurement)
+
+    # load a bunch of records
+    summary = db.load(measurements(count=10000), batch=1000)
+    # check the summary
+    assert summary["rows"] == 10000
+    assert summary["batches"] == 10
+    assert summary["rate"] > 0
+    # and the data
+    assert tuple(db.execute("SELECT COUNT(*), COUNT(value) FROM measurements")) == ((10000, 8000),)
+    assert tuple(db.execute("SELECT station, value FROM measurements WHERE id = 4321")) == (
+        ("station 2", 432.1),)
+
+    # clear the table
+    db.delete(Measurement, None)
+    # attempt to load records from a source that fails half way through a batch
+    try:
+        db.load(measurements(count=10000, fail=2500), batch=1000)
+        assert False
+    except ValueError:
+        pass
+    # verify that only the complete batches made it
+    assert tuple(db.execute("SELECT COUNT(*) FROM measurements")) == ((2000,),)
+
+    # clean up
+    db.dropTable(Measurement)
+    db.detach()
+    # and return the connection and the table
+    return db, Measurement
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that connection pools hand out servers to threads, check their health, close the idle
+ones, and start afresh in forked processes
+"""
+
+
+import pyre.db
+
+
+def test():
+    # externals
+    import os
+    import time
+    import asyncio
+    import tempfile
+    import threading
+    # the units of time
+    from pyre.units.SI import second
+
+    # pooled connections to in-memory databases don't share any data, so use a file
+    directory = tempfile.TemporaryDirectory()
+    # make a pool
+    pool = pyre.db.pool(name="pool")
+    # point its prototype to the file
+    pool.server.database = os.path.join(directory.name, "pool.sql")
+    # and configure it
+    pool.minimum = 1
+    pool.maximum = 2
+    pool.timeout = 0.2*second
+
+    # check out a server
+    with pool.connection() as server:
+        # create a table
+        server.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, owner TEXT);")
+        # nested blocks get the same server
+        with pool.connection() as nested:
+            assert nested is server
+        # which is still checked out
+        assert pool.statistics["busy"] == 1
+    # until the outermost block is done
+    assert pool.statistics == {"idle": 1, "busy": 0, "opened": 1, "discarded": 0}
+
+    # the servers checked out by the workers
+    servers = []
+    # a barrier that makes sure the workers hold on to their servers at the same time
+    barrier = threading.Barrier(2)
+    # the workers
+    def work(owner):
+        # check out a server
+        with pool.connection() as server:
+            # save it
+            servers.append(server)
+            # wait for the other worker
+            barrier.wait()
+            # do some work
+            with server:
+                server.execute("INSERT INTO items (owner) VALUES ('{}');".format(owner))
+        # all done
+        return
+    # launch two of them
+    threads = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    # verify that they got different servers
+    assert len(set(servers)) == 2
+    # that the pool is at full strength
+    assert pool.statistics == {"idle": 2, "busy": 0, "opened": 2, "discarded": 0}
+    # and that the work was done
+    with pool.connection() as server:
+        assert tuple(server.execute("SELECT owner FROM items ORDER BY owner;")) == (
+            ("a",), ("b",))
+
+    # concurrent tasks on the same thread
+    async def task(owner, ready, done):
+        # check out a server
+        with pool.connection() as server:
+            # nested blocks get the same server
+            with pool.connection() as nested:
+                assert nested is server
+            # let the other task know
+            ready.set()
+            # and wait for it to check out its own server
+            await done.wait()
+            # use it
+            tuple(server.execute("SELECT COUNT(*) FROM items;"))
+        # hand it back
+        return server
+    # run two of them
+    async def race():
+        # make the events
+        first, second = asyncio.Event(), asyncio.Event()
+        # and run the tasks, each waiting on the other while it holds its server
+        return await asyncio.gather(task("a", first, second), task("b", second, first))
+    # verify they got different servers
+    a, b = asyncio.run(race())
+    assert a is not b
+    # that they both returned them
+    assert pool.statistics["busy"] == 0
+    # and that this thread has no server checked out any more
+    with pool.connection() as server:
+        assert pool.statistics["busy"] == 1
+
+    # check out every connection
+    with pool.connection() as server:
+        # from another thread
+        def hog():
+            with pool.connection():
+                # and try to get another one
+                try:
+                    pool.checkout()
+                    assert False
+                # which should time out
+                except pool.OperationalError:
+                    pass
+        thread = threading.Thread(target=hog)
+        thread.start()
+        thread.join()
+
+    # break one of the idle servers
+    server, _ = pool.idlers[-1]
+    server.detach()
+    # make sure the next checkout checks on it
+    pool.probe = 0*second
+    # verify that the broken server gets replaced
+    with pool.connection() as replacement:
+        assert replacement is not server
+        assert tuple(replacement.execute("SELECT COUNT(*) FROM items;")) == ((2,),)
+    assert pool.statistics["discarded"] == 1
+
+    # close the connections as soon as they are idle
+    pool.idle = 0*second
+    pool.prune()
+    # verify that the pool kept its minimum
+    assert pool.statistics["idle"] == pool.minimum
+
+    # the server in the pool
+    inherited, _ = pool.idlers[0]
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # check out a server
+        with pool.connection() as server:
+            # verify that it's not the one inherited from the parent
+            status = 0 if server is not inherited else 1
+            # and that it works
+            with server:
+                server.execute("INSERT INTO items (owner) VALUES ('child');")
+        # all done
+        os._exit(status)
+    # in the parent, wait for the child to exit
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+    # and verify that the inherited server is still usable
+    with pool.connection() as server:
+        assert server is inherited
+        assert tuple(server.execute("SELECT COUNT(*) FROM items;")) == ((3,),)
+
+    # clean up
+    pool.close()
+
+    # a server that takes its time to connect
+    class Slow(pyre.db.sqlite):
+        # connecting
+        @pyre.export
+        def attach(self):
+            # takes a while
+            time.sleep(0.5)
+            # and then proceeds normally
+            return super().attach()
+    # make a pool of them
+    pool = pyre.db.pool(name="slow")
+    pool.server = Slow(name="slow.prototype")
+    pool.server.database = os.path.join(directory.name, "pool.sql")
+    pool.maximum = 2
+    # check one out
+    server = pool.checkout()
+    # while another thread is connecting
+    thread = threading.Thread(target=pool.checkout)
+    thread.start()
+    # give it a chance to start
+    time.sleep(0.1)
+    # check the server in and out again
+    start = time.monotonic()
+    pool.checkin(server)
+    assert pool.checkout() is server
+    # without waiting for the other connection
+    assert time.monotonic() - start < 0.3
+    # wait for the other thread
+    thread.join()
+    # and verify that both connections are in use
+    assert pool.statistics["busy"] == 2 and pool.statistics["opened"] == 2
+    # clean up
+    pool.close()
+
+    # make a pool that keeps a couple of connections around
+    pool = pyre.db.pool(name="warm")
+    pool.server.database = os.path.join(directory.name, "pool.sql")
+    pool.minimum = 2
+    # populate it
+    pool.fill()
+    # verify that the connections are ready before anybody asks for them
+    assert pool.statistics == {"idle": 2, "busy": 0, "opened": 2, "discarded": 0}
+    # check one out and throw it away
+    pool.discard(pool.checkout())
+    # verify that pruning the pool
+    pool.prune()
+    # tops it up
+    assert pool.statistics == {"idle": 2, "busy": 0, "opened": 3, "discarded": 1}
+    # even after all its connections are closed
+    pool.close()
+    pool.prune()
+    assert pool.statistics["idle"] == 2
+    # clean up
+    pool.close()
+
+    # pools that are populated on first use also open their minimum
+    pool = pyre.db.pool(name="lazy")
+    pool.server.database = os.path.join(directory.name, "pool.sql")
+    pool.minimum = 2
+    with pool.connection():
+        assert pool.statistics == {"idle": 1, "busy": 1, "opened": 2, "discarded": 0}
+    # clean up
+    pool.close()
+    directory.cleanup()
+    # all done
+    return pool
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
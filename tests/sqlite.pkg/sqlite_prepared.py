@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that records, queries, updates and deletions are executed as parameterized statements,
+and that repeated queries reuse the cached statement
+"""
+
+
+import pyre.db
+
+
+class Weather(pyre.db.table, id="weather"):
+
+    city = pyre.db.str()
+    city.doc = "the city name"
+
+    date = pyre.db.date()
+    date.doc = "the date of the measurement"
+
+    low = pyre.db.int()
+    low.doc = "the temperature low"
+
+    high = pyre.db.int().setDefault(100)
+    high.doc = "the temperature high"
+
+
+class Hot(pyre.db.query, weather=Weather):
+
+    city = weather.city
+    high = weather.high
+
+    where = (high > pyre.db.parameter("threshold"))
+    order = weather.city
+
+
+def test():
+    # build a database component that keeps its data in memory
+    db = pyre.db.sqlite(name="prepared").attach()
+    # create the table
+    db.createTable(Weather)
+
+    # insert some records, with awkward strings, missing values and defaults
+    db.insert(
+        Weather.pyre_immutable(city="Pasadena", date="2020-06-01", low=60, high=90),
+        Weather.pyre_immutable(city="Boston", date="2020-06-01", low=50, high=70),
+        Weather.pyre_immutable(city="O'Hare", date="2020-06-01", low=Weather.null,
+                               high=Weather.default),
+        )
+    # verify they made it intact
+    assert tuple(db.execute("SELECT city, low, high FROM weather ORDER BY city")) == (
+        ("Boston", 50, 70), ("O'Hare", None, 100), ("Pasadena", 60, 90))
+
+    # run the query
+    assert tuple(db.select(Hot, bindings={"threshold": 75})) == (("O'Hare", 100), ("Pasadena", 90))
+    # remember the cache state
+    hits = db.prepared.hits
+    # run it again with a different value
+    assert tuple(db.select(Hot, bindings={"threshold": 95})) == (("O'Hare", 100),)
+    # verify it was served from the cache
+    assert db.prepared.hits == hits + 1
+    # and that the value is not part of the statement text
+    statement = db.prepared.get(key=("SELECT", Hot), guard=(Hot.where, Hot.order))
+    assert "((weather.high) > (?1))" in statement.text
+
+    # a query without a value for its parameter is an error
+    try:
+        tuple(db.select(Hot))
+        assert False
+    except db.exceptions.ProgrammingError as error:
+        assert error.diagnostic == "no value for parameter 'threshold'"
+
+    # update a record
+    db.update(
+        (Weather.pyre_immutable(city=None, date=None, low=Weather.null, high=75),
+         Weather.city == "Boston"))
+    # remove another
+    db.delete(Weather, Weather.city == "Pasadena")
+    # and verify
+    assert tuple(db.execute("SELECT city, low, high FROM weather ORDER BY city")) == (
+        ("Boston", None, 75), ("O'Hare", None, 100))
+
+    # shrink the cache
+    db.statements = 1
+    # remove a record with a statement that is not in the cache
+    db.delete(Weather, Weather.high > 1000)
+    # verify that the cache respects its capacity
+    assert len(db.prepared) == 1
+    # and that the evicted statements get rebuilt
+    assert tuple(db.select(Hot, bindings={"threshold": 90})) == (("O'Hare", 100),)
+    assert len(db.prepared) == 1
+
+    # clean up
+    db.dropTable(Weather)
+    db.detach()
+    # and return the connection and the table
+    return db, Weather
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
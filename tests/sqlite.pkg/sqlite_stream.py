@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that streaming queries retrieve their results a batch at a time
+"""
+
+
+import pyre.db
+
+
+class Measurement(pyre.db.table, id="measurements"):
+
+    id = pyre.db.int().primary()
+    id.doc = "the measurement id"
+
+    value = pyre.db.float()
+    value.doc = "the measured value"
+
+
+class Large(pyre.db.query, measurements=Measurement):
+
+    id = measurements.id
+    value = measurements.value
+
+    where = (value >= pyre.db.parameter("low"))
+    order = measurements.id
+
+
+def test():
+    # build a database component that keeps its data in memory
+    db = pyre.db.sqlite(name="stream").attach()
+    # create the table
+    db.createTable(Measurement)
+    # and populate it
+    db.load(Measurement.pyre_immutable(id=index, value=index/2) for index in range(1000))
+
+    # run the query both ways
+    everything = tuple(db.select(Large, bindings={"low": 100}))
+    streamed = tuple(db.stream(Large, bindings={"low": 100}, batch=64))
+    # verify they agree
+    assert len(everything) == 800
+    assert streamed == everything
+    # and that the records are built correctly
+    assert streamed[0].id == 200 and streamed[0].value == 100
+
+    # start streaming
+    records = db.stream(Large, bindings={"low": 0}, batch=10)
+    # pull a few records
+    first = [next(records) for _ in range(15)]
+    # run another query while the stream is open
+    assert len(tuple(db.select(Large, bindings={"low": 499}))) == 2
+    # pull the rest
+    rest = list(records)
+    # and verify that the stream was not disturbed
+    assert [record.id for record in first + rest] == list(range(1000))
+
+    # abandon a stream half way through
+    records = db.stream(Large, bindings={"low": 0}, batch=10)
+    next(records)
+    records.close()
+
+    # clean up
+    db.dropTable(Measurement)
+    db.detach()
+    # and return the connection and the table
+    return db, Measurement
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file